@@ -0,0 +1,393 @@
+"""
+API HTTP locale (JSON / Arrow) sur les fonctions de ``core/stats_pandas``, sans Streamlit.
+
+Le jeu de données est chargé une fois au démarrage (``JeuDonnees``, partagé en lecture
+seule) ; chaque requête est traitée dans son propre thread (``ThreadingHTTPServer``).
+Les réponses encodées sont conservées dans un cache LRU (clé : chemin, paramètres, format)
+avec un ETag : une requête ``If-None-Match`` dont l'ETag est à jour reçoit un 304 sans corps.
+
+Format : JSON par défaut ; flux Arrow IPC avec ``?format=arrow`` ou l'en-tête
+``Accept: application/vnd.apache.arrow.stream``.
+
+Points d'accès (GET) :
+    /pathologies                              liste des pathologies
+    /catalogue                                catalogue des dimensions
+    /resume                                   résumé global du jeu
+    /anomalies?seuil_z=3.5&seuil_p=0.002      cellules (pathologie, année, département) signalées par les méthodes robustes
+    /moran                                    I de Moran de chaque (pathologie, année)
+    /hierarchie?parent=&debut=&fin=           effectifs des catégories (ou des enfants du nœud parent)
+    /pathologies/{p}/departements             stats_par_departement
+    /pathologies/{p}/regions                  stats_par_region (effectifs régionaux précalculés)
+    /pathologies/{p}/standardisee?debut=&fin=&sexe=   prévalences brute et standardisée sur l'âge par département
+    /pathologies/{p}/intervalles?tirages=1000&niveau=0.95&modele=binomial&graine=0   prévalence et rang par département avec intervalles de confiance
+    /pathologies/{p}/moran                    I de Moran de la prévalence départementale par année
+    /pathologies/{p}/lisa?annee=              indicateurs locaux de Moran (période complète par défaut)
+    /pathologies/{p}/robustes?cumul=0         z-score robuste et SMR (p-valeur de Poisson, entonnoir) par département
+    /pathologies/{p}/annees?debut=&fin=       stats_par_annee (période facultative)
+    /pathologies/{p}/sexes                    stats_par_sexe
+    /pathologies/{p}/ages                     stats_par_tranche_age
+    /pathologies/{p}/aberrantes?seuil=2       valeurs_aberrantes
+    /pathologies/{p}/stats?sexe=&age=&departement=&annee=      stats_patho
+    /top_pathologies?annee=&sexe=&age=&departement=&top_n=     top_pathologies
+    /croissance?depart=&arrivee=&sexe=&age=&departement=&top_n=  pathologies_croissance_forte
+    /resume_avance?annee=&sexe=&age=&departement=              resume_global_avance
+    /statut                                   statistiques du cache (non mis en cache)
+
+Le nom de pathologie est encodé dans l'URL (``urllib.parse.quote(p, safe="")``).
+
+Utilisation (depuis la racine du projet) :
+    python api.py --port 8765
+    curl "http://127.0.0.1:8765/top_pathologies?annee=2020&top_n=5"
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import socket
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from core import stats_pandas
+from core.jeu_donnees import JeuDonnees, charger_jeu_donnees
+from core.standardisation import stats_par_departement_standardise
+from core.bootstrap import intervalles_departements, MODELES
+from core.spatial import moran_toutes_pathologies, moran_pathologie, lisa_pathologie
+from core.anomalies import detecter_anomalies, anomalies_signalees
+from utils.cache_pages import CachePages
+
+FORMAT_JSON = "application/json"
+FORMAT_ARROW = "application/vnd.apache.arrow.stream"
+TAILLE_CACHE_PAR_DEFAUT = 256
+
+
+class ErreurRequete(Exception):
+    """
+    Requête invalide : statut HTTP et message renvoyés au client.
+    """
+
+    def __init__(self, statut: HTTPStatus, message: str):
+        super().__init__(message)
+        self.statut = statut
+
+
+class Reponse:
+    """
+    Réponse encodée, partagée entre les requêtes par le cache.
+    """
+
+    __slots__ = ("corps", "type_contenu", "etag")
+
+    def __init__(self, corps: bytes, type_contenu: str):
+        self.corps = corps
+        self.type_contenu = type_contenu
+        self.etag = '"' + hashlib.blake2b(corps, digest_size=16).hexdigest() + '"'
+
+
+# Paramètres de requête
+
+def _texte(params: dict, nom: str) -> str | None:
+    valeur = params.get(nom)
+    return valeur if valeur not in (None, "") else None
+
+
+def _entier(params: dict, nom: str) -> int | None:
+    valeur = _texte(params, nom)
+    if valeur is None:
+        return None
+    try:
+        return int(valeur)
+    except ValueError:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"Paramètre {nom} : entier attendu, reçu {valeur!r}")
+
+
+def _reel(params: dict, nom: str, defaut: float) -> float:
+    valeur = _texte(params, nom)
+    if valeur is None:
+        return defaut
+    try:
+        return float(valeur)
+    except ValueError:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"Paramètre {nom} : nombre attendu, reçu {valeur!r}")
+
+
+def _filtres(params: dict, avec_annee: bool = True) -> dict:
+    filtres = {"sexe": _texte(params, "sexe"), "age": _texte(params, "age"),
+               "departement": _texte(params, "departement")}
+    if avec_annee:
+        filtres["annee"] = _entier(params, "annee")
+    return filtres
+
+
+def _periode(params: dict, jeu: JeuDonnees) -> tuple[int, int] | None:
+    debut, fin = _entier(params, "debut"), _entier(params, "fin")
+    if debut is None and fin is None:
+        return None
+    bornes = jeu.catalogue.bornes_annees or (0, 0)
+    return (bornes[0] if debut is None else debut, bornes[1] if fin is None else fin)
+
+
+def _valider(jeu: JeuDonnees, pathologie: str) -> str:
+    try:
+        return jeu.catalogue.valider_pathologie(pathologie)
+    except ValueError as e:
+        raise ErreurRequete(HTTPStatus.NOT_FOUND, str(e))
+
+
+def _bloc(jeu: JeuDonnees, pathologie: str) -> pd.DataFrame:
+    return jeu.pathologie(_valider(jeu, pathologie))
+
+
+# Points d'accès : (motif du chemin, fonction(jeu, params, **groupes))
+
+def _croissance(jeu: JeuDonnees, params: dict):
+    depart, arrivee = _entier(params, "depart"), _entier(params, "arrivee")
+    if depart is None or arrivee is None:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, "Paramètres depart et arrivee obligatoires")
+    return stats_pandas.pathologies_croissance_forte(jeu.df, depart, arrivee, **_filtres(params, avec_annee=False),
+                                                     top_n=_entier(params, "top_n"))
+
+
+def _intervalles(jeu: JeuDonnees, params: dict, pathologie: str):
+    tirages = _entier(params, "tirages") or 1000
+    niveau = _reel(params, "niveau", 0.95)
+    modele = _texte(params, "modele") or "binomial"
+    if not 0 < tirages <= 100_000 or not 0 < niveau < 1 or modele not in MODELES:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST,
+                            f"Paramètres attendus : 0 < tirages <= 100000, 0 < niveau < 1, modele parmi {', '.join(MODELES)}")
+    return intervalles_departements(jeu.cube, _valider(jeu, pathologie), tirages, niveau, modele,
+                                    _entier(params, "graine") or 0)
+
+
+def _hierarchie(jeu: JeuDonnees, params: dict):
+    parent = _entier(params, "parent")
+    if parent is not None and not 0 <= parent < len(jeu.hierarchie):
+        raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Nœud inconnu : {parent}")
+    return jeu.hierarchie.detail(parent, _periode(params, jeu))
+
+
+ROUTES = [
+    (r"/pathologies", lambda jeu, params: jeu.catalogue.pathologies),
+    (r"/catalogue", lambda jeu, params: jeu.catalogue.en_dict()),
+    (r"/resume", lambda jeu, params: jeu.resume["stats"]),
+    (r"/hierarchie", _hierarchie),
+    (r"/anomalies", lambda jeu, params: anomalies_signalees(detecter_anomalies(jeu.cube), _reel(params, "seuil_z", 3.5),
+                                                            _reel(params, "seuil_p", 0.002))),
+    (r"/moran", lambda jeu, params: moran_toutes_pathologies(jeu.cube)),
+    (r"/pathologies/(?P<p>[^/]+)/departements",
+     lambda jeu, params, p: stats_pandas.stats_par_departement(_bloc(jeu, p), p)),
+    (r"/pathologies/(?P<p>[^/]+)/regions",
+     lambda jeu, params, p: jeu.cube.stats_par_region(_valider(jeu, p))),
+    (r"/pathologies/(?P<p>[^/]+)/standardisee",
+     lambda jeu, params, p: stats_par_departement_standardise(jeu.cube, _valider(jeu, p), jeu.standard,
+                                                              _periode(params, jeu), _texte(params, "sexe"))),
+    (r"/pathologies/(?P<p>[^/]+)/intervalles", lambda jeu, params, p: _intervalles(jeu, params, p)),
+    (r"/pathologies/(?P<p>[^/]+)/moran", lambda jeu, params, p: moran_pathologie(jeu.cube, _valider(jeu, p))),
+    (r"/pathologies/(?P<p>[^/]+)/lisa",
+     lambda jeu, params, p: lisa_pathologie(jeu.cube, _valider(jeu, p), annee=_entier(params, "annee"))),
+    (r"/pathologies/(?P<p>[^/]+)/robustes",
+     lambda jeu, params, p: detecter_anomalies(jeu.cube, [_valider(jeu, p)], cumul=bool(_entier(params, "cumul")))),
+    (r"/pathologies/(?P<p>[^/]+)/annees",
+     lambda jeu, params, p: stats_pandas.stats_par_annee(_bloc(jeu, p), p, _periode(params, jeu))),
+    (r"/pathologies/(?P<p>[^/]+)/sexes",
+     lambda jeu, params, p: stats_pandas.stats_par_sexe(_bloc(jeu, p), p)),
+    (r"/pathologies/(?P<p>[^/]+)/ages",
+     lambda jeu, params, p: stats_pandas.stats_par_tranche_age(_bloc(jeu, p), p)),
+    (r"/pathologies/(?P<p>[^/]+)/aberrantes",
+     lambda jeu, params, p: stats_pandas.valeurs_aberrantes(_bloc(jeu, p), p, _reel(params, "seuil", 2))),
+    (r"/pathologies/(?P<p>[^/]+)/stats",
+     lambda jeu, params, p: stats_pandas.stats_patho(_bloc(jeu, p), p, **_filtres(params))),
+    (r"/top_pathologies",
+     lambda jeu, params: stats_pandas.top_pathologies(jeu.df, **_filtres(params), top_n=_entier(params, "top_n"))),
+    (r"/croissance", _croissance),
+    (r"/resume_avance", lambda jeu, params: stats_pandas.resume_global_avance(jeu.df, **_filtres(params))),
+]
+_ROUTES = [(re.compile(motif + r"/?"), fonction) for motif, fonction in ROUTES]
+
+
+# Encodage
+
+def _python(valeur):
+    """
+    Valeur compatible JSON : scalaires numpy convertis, NaN -> None, conteneurs parcourus.
+    """
+    if isinstance(valeur, dict):
+        return {str(k): _python(v) for k, v in valeur.items()}
+    if isinstance(valeur, (list, tuple)):
+        return [_python(v) for v in valeur]
+    if isinstance(valeur, np.generic):
+        valeur = valeur.item()
+    if isinstance(valeur, float) and math.isnan(valeur):
+        return None
+    return valeur
+
+
+def _en_table(resultat) -> pd.DataFrame:
+    """
+    DataFrame à plat : index nommé en colonnes, noms de colonnes en texte.
+    """
+    if isinstance(resultat, pd.Series):
+        resultat = resultat.to_frame(resultat.name if resultat.name is not None else "valeur")
+    nomme = any(n is not None for n in resultat.index.names)
+    df = resultat.reset_index(drop=not nomme)
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def encoder(resultat, format_: str) -> Reponse:
+    """
+    Encode le résultat d'une fonction d'analyse en JSON ou en flux Arrow IPC.
+    """
+    # Série d'indicateurs nommés (stats_patho) : un enregistrement, comme un dict
+    if isinstance(resultat, pd.Series) and resultat.index.name is None:
+        resultat = resultat.to_dict()
+
+    if format_ == FORMAT_ARROW:
+        if resultat is None:
+            table = pa.table({})
+        elif isinstance(resultat, (pd.DataFrame, pd.Series)):
+            table = pa.Table.from_pandas(_en_table(resultat), preserve_index=False)
+        elif isinstance(resultat, dict):
+            table = pa.Table.from_pylist([_python(resultat)])
+        else:
+            table = pa.table({"valeur": _python(list(resultat))})
+        puits = pa.BufferOutputStream()
+        with pa.ipc.new_stream(puits, table.schema) as flux:
+            flux.write_table(table)
+        return Reponse(puits.getvalue().to_pybytes(), FORMAT_ARROW)
+
+    if isinstance(resultat, (pd.DataFrame, pd.Series)):
+        corps = _en_table(resultat).to_json(orient="records", force_ascii=False)
+    else:
+        corps = json.dumps(_python(resultat), ensure_ascii=False)
+    return Reponse(corps.encode("utf-8"), FORMAT_JSON + "; charset=utf-8")
+
+
+class ServiceAnalyses:
+    """
+    Résolution des requêtes sur le jeu partagé, avec cache des réponses encodées.
+    """
+
+    def __init__(self, jeu: JeuDonnees, taille_cache: int = TAILLE_CACHE_PAR_DEFAUT):
+        self.jeu = jeu
+        self.cache = CachePages(taille_cache)
+
+    def repondre(self, cible: str, accept: str | None = None) -> Reponse:
+        """
+        :param cible: chemin et paramètres de la requête (``/croissance?depart=2015&arrivee=2023``)
+        :param accept: en-tête Accept (choix du format si ``format`` n'est pas donné)
+        """
+        morceaux = urlsplit(cible)
+        params = {nom: valeurs[-1] for nom, valeurs in parse_qs(morceaux.query).items()}
+
+        format_ = params.pop("format", None)
+        if format_ is None:
+            format_ = "arrow" if accept and FORMAT_ARROW in accept else "json"
+        if format_ not in ("json", "arrow"):
+            raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"Format inconnu : {format_}")
+        format_ = FORMAT_ARROW if format_ == "arrow" else FORMAT_JSON
+
+        if morceaux.path.rstrip("/") == "/statut":
+            return encoder(self.cache.statistiques(), FORMAT_JSON)
+
+        for motif, fonction in _ROUTES:
+            correspondance = motif.fullmatch(morceaux.path)
+            if correspondance is not None:
+                groupes = {nom: unquote(v) for nom, v in correspondance.groupdict().items()}
+                cle = (correspondance.re.pattern, tuple(groupes.values()), tuple(sorted(params.items())), format_)
+                return self.cache.obtenir(cle, lambda: encoder(fonction(self.jeu, params, **groupes), format_))
+
+        raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Chemin inconnu : {morceaux.path}")
+
+
+class _Gestionnaire(BaseHTTPRequestHandler):
+    server_version = "AnalysePathologies/1"
+    # Connexions persistantes (toutes les réponses ont un Content-Length)
+    protocol_version = "HTTP/1.1"
+    # En-têtes et corps sont écrits séparément : sans TCP_NODELAY, l'accusé de réception différé ajoute ~40 ms
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        try:
+            reponse = self.server.service.repondre(self.path, self.headers.get("Accept"))
+        except ErreurRequete as e:
+            self._envoyer(e.statut, encoder({"erreur": str(e)}, FORMAT_JSON))
+            return
+        except Exception as e:
+            self._envoyer(HTTPStatus.INTERNAL_SERVER_ERROR, encoder({"erreur": f"{type(e).__name__} : {e}"}, FORMAT_JSON))
+            return
+
+        if reponse.etag in (self.headers.get("If-None-Match") or ""):
+            self._envoyer(HTTPStatus.NOT_MODIFIED, reponse, avec_corps=False)
+        else:
+            self._envoyer(HTTPStatus.OK, reponse)
+
+    def _envoyer(self, statut: HTTPStatus, reponse: Reponse, avec_corps: bool = True):
+        self.send_response(statut)
+        self.send_header("ETag", reponse.etag)
+        self.send_header("Cache-Control", "no-cache")
+        if avec_corps:
+            self.send_header("Content-Type", reponse.type_contenu)
+            self.send_header("Content-Length", str(len(reponse.corps)))
+        else:
+            self.send_header("Content-Length", "0")
+        self.end_headers()
+        if avec_corps:
+            self.wfile.write(reponse.corps)
+
+    def log_message(self, format, *args):
+        if self.server.journal:
+            super().log_message(format, *args)
+
+
+class ServeurAnalyses(ThreadingHTTPServer):
+    """
+    ``ThreadingHTTPServer`` à file d'attente de connexions large : avec la file par défaut
+    (5), quelques clients simultanés la saturent et les connexions refusées ne sont
+    retentées par le client TCP qu'après une seconde.
+    """
+    request_queue_size = socket.SOMAXCONN
+    daemon_threads = True
+
+
+def creer_serveur(jeu: JeuDonnees, hote: str = "127.0.0.1", port: int = 8765,
+                  taille_cache: int = TAILLE_CACHE_PAR_DEFAUT, journal: bool = False) -> ServeurAnalyses:
+    """
+    Serveur HTTP multithread sur le jeu partagé (``serve_forever()`` pour le démarrer).
+
+    :param port: port d'écoute (0 : port libre choisi par le système, voir ``serveur.server_port``)
+    :param journal: affiche une ligne par requête
+    """
+    serveur = ServeurAnalyses((hote, port), _Gestionnaire)
+    serveur.service = ServiceAnalyses(jeu, taille_cache)
+    serveur.journal = journal
+    return serveur
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parquet", default=None, help="fichier effectifs.parquet (par défaut data/effectifs.parquet)")
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--taille-cache", type=int, default=TAILLE_CACHE_PAR_DEFAUT, help="réponses conservées")
+    parser.add_argument("--journal", action="store_true", help="affiche une ligne par requête")
+    args = parser.parse_args()
+
+    jeu = charger_jeu_donnees(Path(args.parquet) if args.parquet else None)
+    serveur = creer_serveur(jeu, args.hote, args.port, args.taille_cache, args.journal)
+    print(f"{len(jeu):,} lignes, {len(jeu.pathologies)} pathologies ; écoute sur http://{args.hote}:{serveur.server_port}")
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serveur.server_close()
+
+
+if __name__ == "__main__":
+    main()
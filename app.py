@@ -1,17 +1,16 @@
 import streamlit as st
-from core.stats_pandas import charger_effectifs
-from modules.Resume_Global import resume_global, page_resume_global
-from modules.Analyse_Pathologies import analyse_pathologie
-from modules.Analyse_territoriale import analyse_territoriale
-from modules.Analyse_temporelle import analyse_temporelle
-from modules.Anomalies import anomalies
+from core.jeu_donnees import charger_jeu_donnees
+from modules.registre import PAGES, avec_pathologie, afficher_page
+from utils import latence
+from utils.cache_pages import CachePages
+from utils.resultats_precalcules import MagasinResultats, magasin_disponible
 
 """
 Application principale du dashboard d'analyse des pathologies/traitements pris en charge.
 
 ### Rôle de l’application
 
-- Charger les données  
+- Charger les données (une fois par processus, partagées en lecture seule entre les sessions)  
 - Appeler les fonctions d'analyse (`stats_pandas.py`)  
 - Visualiser les statistiques par pathologies/traitements  s
 
@@ -19,12 +18,30 @@ Application principale du dashboard d'analyse des pathologies/traitements pris e
 La navigation s’effectue exclusivement via le **menu déroulant dans la barre latérale**.
 """
 
-# Chargement des données
-@st.cache_data
+# Résultats précalculés (python precalcul.py) : lus directement, sans agrégation des données brutes
+@st.cache_resource
+def load_magasin():
+    if not magasin_disponible():
+        return None
+    magasin = MagasinResultats()
+    return magasin if magasin.est_a_jour() else None
+
+magasin = load_magasin()
+
+# Chargement des données : ressource unique du processus, sans copie par session
+@st.cache_resource
 def load_data():
-    return charger_effectifs()
+    return charger_jeu_donnees()
+
+# Le magasin remplace le jeu de données (il charge les données brutes seulement pour une clé absente)
+jeu = magasin if magasin is not None else load_data()
 
-df = load_data()
+# Résultats des pages (page, pathologie, période), partagés entre les sessions
+@st.cache_resource
+def load_cache():
+    return CachePages(magasin=magasin)
+
+cache = load_cache()
 
 st.set_page_config(page_title="Dashboard Pathologies/Traitements", layout="wide")
 
@@ -32,40 +49,32 @@ st.divider()
 
 # Sidebar : sélection de la page
 st.sidebar.title("Navigation")
-page = st.sidebar.selectbox(
-    "Choisir une page",
-    [
-        "Résumé global",
-        "Analyse par pathologie",
-        "Analyse territoriale",
-        "Analyse temporelle",
-        "Anomalies"
-    ]
-)
+# Les modules des pages ne sont importés qu'à leur première sélection (modules/registre.py)
+page = st.sidebar.selectbox("Choisir une page", list(PAGES))
 
 # Sidebar : sélection pathologie
 pathologie = None
-if page != "Résumé global":
-    pathologie = st.sidebar.selectbox("Choisir une pathologie/traitements", sorted(df["pathologie"].unique()))
+if avec_pathologie(page):
+    # Valeurs lues dans le catalogue construit au chargement (aucun parcours des colonnes)
+    pathologie = st.sidebar.selectbox("Choisir une pathologie/traitements", jeu.catalogue.pathologies)
 
 st.sidebar.divider()
-st.sidebar.caption("Dashboard d'analyse des pathologies")
 
+# Sidebar : panneau développeur (latence du rendu)
+panneau_latence = st.sidebar.checkbox("Panneau développeur (latence)")
+budget_latence = None
+if panneau_latence:
+    budget_latence = st.sidebar.number_input("Budget de latence (s)", min_value=0.1, value=2.0, step=0.5)
+    st.sidebar.caption("Cache des pages : " + ", ".join(f"{k} {v}" for k, v in cache.statistiques().items()))
 
-# Navigation
-if page == "Résumé global":
-    resume_global(df)
-    page_resume_global(df)
-
-elif page == "Analyse par pathologie":
-    analyse_pathologie(df, pathologie)
-
-elif page == "Analyse territoriale":
-    analyse_territoriale(df, pathologie)
+st.sidebar.caption("Dashboard d'analyse des pathologies")
 
-elif page == "Analyse temporelle":
-    analyse_temporelle(df, pathologie)
 
-elif page == "Anomalies":
-    anomalies(df, pathologie)
+# Navigation
+if panneau_latence:
+    with latence.suivre(page, pathologie) as suivi:
+        afficher_page(page, jeu, pathologie, cache)
+    latence.panneau(suivi, budget_latence)
+else:
+    afficher_page(page, jeu, pathologie, cache)
 
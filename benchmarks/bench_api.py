@@ -0,0 +1,193 @@
+"""
+Benchmark de charge de l'API HTTP locale (api.py).
+
+Démarre le serveur dans le processus sur un port libre (ou vise un serveur déjà
+lancé avec --url), puis des clients concurrents (connexions persistantes) rejouent
+un ensemble de requêtes en trois passes :
+- « froid » : premières requêtes, réponses calculées
+- « chaud » : mêmes requêtes, réponses servies par le cache
+- « etag »  : mêmes requêtes avec If-None-Match, réponses 304 sans corps
+
+Vérifie les statuts attendus et que le flux Arrow d'une réponse contient les mêmes
+lignes que sa version JSON ; code de sortie 1 en cas d'erreur.
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_api --lignes 200000 --clients 8
+    python -m benchmarks.bench_api --url http://127.0.0.1:8765 --clients 16
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+import pyarrow as pa
+from api import creer_serveur
+from core.jeu_donnees import charger_jeu_donnees
+from benchmarks.generateur import generer_effectifs, ecrire_effectifs
+
+def requetes(pathologies: list[str], annees: list[int], nb_pathologies: int) -> list[str]:
+    """
+    Chemins rejoués par les clients (toutes les familles de points d'accès).
+    """
+    chemins = ["/pathologies", "/resume", "/resume_avance",
+               f"/croissance?depart={annees[0]}&arrivee={annees[-1]}&top_n=20"]
+    chemins += [f"/top_pathologies?annee={a}&top_n=10" for a in annees]
+    for p in pathologies[:nb_pathologies]:
+        p = quote(p, safe="")
+        chemins += [f"/pathologies/{p}/departements", f"/pathologies/{p}/annees", f"/pathologies/{p}/sexes",
+                    f"/pathologies/{p}/ages", f"/pathologies/{p}/aberrantes", f"/pathologies/{p}/stats",
+                    f"/pathologies/{p}/annees?debut={annees[0]}&fin={annees[len(annees) // 2]}"]
+    return chemins
+
+
+def _get(connexion: http.client.HTTPConnection, chemin: str, entetes: dict | None = None) -> tuple[int, dict, bytes]:
+    connexion.request("GET", chemin, headers=entetes or {})
+    reponse = connexion.getresponse()
+    return reponse.status, dict(reponse.getheaders()), reponse.read()
+
+
+def passe(hote: str, port: int, chemins: list[str], clients: int, etags: dict | None = None) -> dict:
+    """
+    Répartit ``chemins`` entre ``clients`` threads ; chacun garde sa connexion ouverte.
+
+    :param etags: {chemin: ETag} à envoyer en If-None-Match (passe « etag »)
+    :return: latences, statuts, ETags reçus et débit
+    """
+    latences, statuts, recus = [], {}, {}
+    verrou = threading.Lock()
+
+    def client(lot: list[str]):
+        connexion = http.client.HTTPConnection(hote, port, timeout=120)
+        try:
+            for chemin in lot:
+                entetes = {"If-None-Match": etags[chemin]} if etags else None
+                debut = time.perf_counter()
+                statut, reponse, _ = _get(connexion, chemin, entetes)
+                duree = time.perf_counter() - debut
+                with verrou:
+                    latences.append(duree)
+                    statuts[statut] = statuts.get(statut, 0) + 1
+                    recus[chemin] = reponse.get("ETag")
+        finally:
+            connexion.close()
+
+    lots = [chemins[i::clients] for i in range(clients)]
+    threads = [threading.Thread(target=client, args=(lot,)) for lot in lots if lot]
+    debut = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duree = time.perf_counter() - debut
+
+    latences.sort()
+    return {
+        "requetes": len(latences),
+        "duree_s": round(duree, 3),
+        "requetes_par_s": round(len(latences) / duree, 1) if duree else 0.0,
+        "p50_ms": round(statistics.median(latences) * 1000, 2),
+        "p95_ms": round(latences[int(0.95 * (len(latences) - 1))] * 1000, 2),
+        "max_ms": round(latences[-1] * 1000, 2),
+        "statuts": statuts,
+        "etags": recus,
+    }
+
+
+def verifier_arrow(hote: str, port: int, chemin: str) -> bool:
+    """
+    Le flux Arrow de ``chemin`` contient les mêmes lignes que sa réponse JSON.
+    """
+    connexion = http.client.HTTPConnection(hote, port, timeout=120)
+    try:
+        _, _, corps_json = _get(connexion, chemin)
+        _, entetes, corps_arrow = _get(connexion, chemin, {"Accept": "application/vnd.apache.arrow.stream"})
+    finally:
+        connexion.close()
+    table = pa.ipc.open_stream(corps_arrow).read_all()
+    return entetes.get("Content-Type", "").startswith("application/vnd.apache.arrow") \
+        and table.to_pylist() == json.loads(corps_json)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="serveur déjà lancé (sinon démarré dans le processus)")
+    parser.add_argument("--parquet", default=None, help="fichier parquet servi (par défaut : jeu synthétique)")
+    parser.add_argument("--lignes", type=int, default=200_000, help="lignes du jeu synthétique")
+    parser.add_argument("--pathologies", type=int, default=30, help="pathologies interrogées")
+    parser.add_argument("--clients", type=int, default=8, help="clients concurrents")
+    parser.add_argument("--sortie", default=None, help="fichier JSON de résultats")
+    args = parser.parse_args()
+
+    serveur = None
+    if args.url:
+        morceaux = urlsplit(args.url)
+        hote, port = morceaux.hostname, morceaux.port or 80
+        connexion = http.client.HTTPConnection(hote, port, timeout=120)
+        _, _, corps = _get(connexion, "/catalogue")
+        connexion.close()
+        catalogue = json.loads(corps)
+        pathologies, annees = catalogue["dimensions"]["pathologie"], catalogue["dimensions"]["annee"]
+    else:
+        if args.parquet:
+            jeu = charger_jeu_donnees(Path(args.parquet))
+        else:
+            with tempfile.TemporaryDirectory() as dossier:
+                _, chemin_parquet = ecrire_effectifs(generer_effectifs(args.lignes), dossier)
+                jeu = charger_jeu_donnees(chemin_parquet)
+        serveur = creer_serveur(jeu, port=0)
+        threading.Thread(target=serveur.serve_forever, daemon=True).start()
+        hote, port = "127.0.0.1", serveur.server_port
+        pathologies, annees = jeu.pathologies, jeu.annees
+        print(f"{len(jeu):,} lignes, serveur sur le port {port}")
+
+    chemins = requetes(pathologies, annees, args.pathologies)
+    rapport = {"clients": args.clients, "chemins": len(chemins)}
+
+    try:
+        rapport["froid"] = passe(hote, port, chemins, args.clients)
+        rapport["chaud"] = passe(hote, port, chemins, args.clients)
+        rapport["etag"] = passe(hote, port, chemins, args.clients, etags=rapport["chaud"]["etags"])
+        rapport["arrow_identique"] = verifier_arrow(hote, port, chemins[-1])
+        if serveur is not None:
+            rapport["cache"] = serveur.service.cache.statistiques()
+    finally:
+        if serveur is not None:
+            serveur.shutdown()
+            serveur.server_close()
+
+    print(f"{'passe':<8}{'requêtes':>10}{'req/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'max (ms)':>10}  statuts")
+    for nom in ("froid", "chaud", "etag"):
+        r = rapport[nom]
+        print(f"{nom:<8}{r['requetes']:>10}{r['requetes_par_s']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['max_ms']:>10.2f}  {r['statuts']}")
+    if "cache" in rapport:
+        print(f"Cache : {rapport['cache']}")
+
+    erreurs = []
+    if set(rapport["froid"]["statuts"]) != {200} or set(rapport["chaud"]["statuts"]) != {200}:
+        erreurs.append("statuts autres que 200 sans ETag")
+    if set(rapport["etag"]["statuts"]) != {304}:
+        erreurs.append("statuts autres que 304 avec ETag à jour")
+    if rapport["froid"]["etags"] != rapport["chaud"]["etags"]:
+        erreurs.append("ETags différents entre deux passes")
+    if not rapport["arrow_identique"]:
+        erreurs.append("réponse Arrow différente de la réponse JSON")
+
+    for nom in ("froid", "chaud", "etag"):
+        del rapport[nom]["etags"]
+    if args.sortie:
+        Path(args.sortie).write_text(json.dumps(rapport, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if erreurs:
+        print("Erreurs : " + " ; ".join(erreurs))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Benchmark comparé de core/stats_python, core/stats_pandas et core/stats_sql sur un jeu synthétique.
+
+Pour chaque fonction d'analyse présente dans les cœurs : meilleur temps sur
+plusieurs répétitions et pics d'allocation : tracemalloc (allocations Python et numpy)
+et pool mémoire Arrow (tampons pyarrow, invisibles pour tracemalloc : cœur arrow,
+chaînes pandas).
+Les résultats sont écrits en JSON ; avec --reference, chaque temps est comparé à
+celui d'un précédent fichier et tout dépassement de la tolérance est signalé
+comme régression (code de sortie 1).
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_cores --lignes 1000000 --sortie bench_cores.json
+    python -m benchmarks.bench_cores --lignes 1000000 --reference bench_cores.json --tolerance 1.5
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import pandas as pd
+import pyarrow as pa
+from core import stats_pandas, stats_python, stats_sql, stats_arrow, loader_csv, loader_parquet
+from benchmarks.generateur import generer_effectifs, ecrire_effectifs
+
+COEURS = {"python": stats_python, "pandas": stats_pandas, "sql": stats_sql, "arrow": stats_arrow}
+
+
+def cas_analyses(annees: list[int]) -> list[dict]:
+    """
+    Liste des analyses communes aux deux cœurs avec leurs arguments.
+    Les analyses de portée "pathologie" reçoivent la pathologie étudiée en second argument.
+    """
+    premiere, derniere = annees[0], annees[-1]
+
+    globales = [
+        ("nombre_de_lignes", (), {}),
+        ("pathologies_distinctes", (), {}),
+        ("departements_distincts", (), {}),
+        ("annees_distinctes", (), {}),
+        ("nombre_de_cas", (), {}),
+        ("population_reference", (), {}),
+        ("prevalence_globale", (), {}),
+        ("prevalence_moyenne", (), {}),
+        ("top_pathologies", (), {"top_n": 10}),
+        ("top_pathologies", (), {"annee": derniere, "sexe": "femmes"}),
+        ("pathologies_croissance_forte", (premiere, derniere), {"top_n": 10}),
+        ("resume_global_avance", (), {}),
+        ("resume_global_avance", (), {"annee": derniere}),
+    ]
+
+    par_pathologie = [
+        "stats_par_sexe", "ratio_cas_hf", "difference_prevalence_sexe",
+        "stats_par_tranche_age", "age_central_pathologie",
+        "stats_par_annee", "variation_annuelle", "tendance_generale", "pente_tendance",
+        "stats_par_departement", "classement_departements", "moyenne_nationale",
+        "ecart_a_la_moyenne", "top_departements", "bottom_departements",
+        "z_score_prevalence", "valeurs_aberrantes",
+        "stats_par_departement_annee", "moyenne_nationale_annee",
+        "z_score_prevalence_annee", "annees_anormales",
+    ]
+
+    cas = [{"fonction": nom, "portee": "global", "args": args, "kwargs": kwargs} for nom, args, kwargs in globales]
+    cas += [{"fonction": nom, "portee": "pathologie", "args": (), "kwargs": {}} for nom in par_pathologie]
+
+    return cas
+
+
+def libelle(cas: dict) -> str:
+    """
+    Identifiant lisible et stable d'un cas (fonction + arguments).
+    """
+    arguments = [repr(a) for a in cas["args"]] + [f"{k}={v!r}" for k, v in cas["kwargs"].items()]
+    return f"{cas['fonction']}({', '.join(arguments)})"
+
+
+def appeler(coeur, cas: dict, donnees, pathologie: str):
+    fonction = getattr(coeur, cas["fonction"])
+    if cas["portee"] == "pathologie":
+        return fonction(donnees, pathologie, *cas["args"], **cas["kwargs"])
+    return fonction(donnees, *cas["args"], **cas["kwargs"])
+
+
+def mesurer(appel, repetitions: int) -> tuple[float, int, int]:
+    """
+    Retourne le meilleur temps (s) sur ``repetitions`` appels et les pics
+    d'allocation (octets) mesurés sur un appel supplémentaire : tracemalloc, puis
+    pool Arrow (pool mandataire installé comme pool par défaut le temps de l'appel).
+    """
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        appel()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+
+    pool_defaut = pa.default_memory_pool()
+    pool = pa.proxy_memory_pool(pool_defaut)
+    tracemalloc.start()
+    pa.set_memory_pool(pool)
+    try:
+        appel()
+        _, pic = tracemalloc.get_traced_memory()
+    finally:
+        pa.set_memory_pool(pool_defaut)
+        tracemalloc.stop()
+
+    return meilleur, pic, pool.max_memory()
+
+
+def charger_jeux(nb_lignes: int, nb_pathologies: int, graine: int) -> dict:
+    """
+    Génère le jeu brut, l'écrit en CSV + parquet puis le recharge avec
+    les chargeurs de chaque cœur (temps de chargement inclus dans le résultat ;
+    "python_parquet" : cœur Python pur chargé depuis le parquet par core/loader_parquet).
+    """
+    brut = generer_effectifs(nb_lignes, nb_pathologies, graine)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin_csv, chemin_parquet = ecrire_effectifs(brut, dossier)
+
+        debut = time.perf_counter()
+        donnees_python = loader_csv.charger_effectifs(chemin_csv)
+        temps_python = time.perf_counter() - debut
+
+        debut = time.perf_counter()
+        loader_parquet.charger_effectifs(chemin_parquet)
+        temps_python_parquet = time.perf_counter() - debut
+
+        debut = time.perf_counter()
+        donnees_pandas = stats_pandas.charger_effectifs(chemin_parquet)
+        temps_pandas = time.perf_counter() - debut
+
+        debut = time.perf_counter()
+        donnees_sql = stats_sql.charger_effectifs(chemin_parquet)
+        temps_sql = time.perf_counter() - debut
+
+        debut = time.perf_counter()
+        donnees_arrow = stats_arrow.charger_effectifs(chemin_parquet)
+        temps_arrow = time.perf_counter() - debut
+
+    return {
+        "lignes_brutes": len(brut),
+        "donnees": {"python": donnees_python, "pandas": donnees_pandas, "sql": donnees_sql, "arrow": donnees_arrow},
+        "chargement": {"python": temps_python, "python_parquet": temps_python_parquet, "pandas": temps_pandas, "sql": temps_sql, "arrow": temps_arrow},
+    }
+
+
+def pathologie_de_reference(df: pd.DataFrame) -> str:
+    """
+    Pathologie la plus représentée (cas le plus coûteux pour les analyses par pathologie).
+    """
+    return df["pathologie"].value_counts().idxmax()
+
+
+def comparer(resultats: list[dict], reference: dict, tolerance: float) -> list[dict]:
+    """
+    Compare les temps à ceux d'un fichier de référence : une mesure est une
+    régression si elle dépasse temps_reference * tolerance.
+    """
+    anciens = {(r["coeur"], r["analyse"]): r["temps_s"] for r in reference.get("resultats", [])}
+
+    regressions = []
+    for r in resultats:
+        ancien = anciens.get((r["coeur"], r["analyse"]))
+        if ancien is None:
+            continue
+        seuil = ancien * tolerance
+        r["seuil_s"] = round(seuil, 6)
+        if r["temps_s"] > seuil:
+            regressions.append({"coeur": r["coeur"], "analyse": r["analyse"],
+                                "temps_s": r["temps_s"], "reference_s": ancien, "seuil_s": r["seuil_s"]})
+
+    return regressions
+
+
+def executer_benchmark(nb_lignes: int, nb_pathologies: int = 300, graine: int = 0,
+                       repetitions: int = 3, coeurs: list[str] | None = None) -> dict:
+    """
+    Exécute le benchmark complet et retourne le rapport (dict sérialisable en JSON).
+    """
+    coeurs = coeurs or list(COEURS)
+    jeux = charger_jeux(nb_lignes, nb_pathologies, graine)
+
+    df = jeux["donnees"]["pandas"]
+    pathologie = pathologie_de_reference(df)
+    annees = sorted(df["annee"].unique().tolist())
+
+    resultats = []
+    for coeur_nom in coeurs:
+        coeur = COEURS[coeur_nom]
+        donnees = jeux["donnees"][coeur_nom]
+        for cas in cas_analyses(annees):
+            temps, pic, pic_arrow = mesurer(lambda: appeler(coeur, cas, donnees, pathologie), repetitions)
+            resultats.append({
+                "coeur": coeur_nom,
+                "analyse": libelle(cas),
+                "portee": cas["portee"],
+                "temps_s": round(temps, 6),
+                "pic_memoire_octets": pic,
+                "pic_arrow_octets": pic_arrow,
+            })
+
+    # Rapport de chaque cœur à pandas par analyse (ratio_python_pandas, ratio_sql_pandas)
+    temps_par_coeur = {(r["coeur"], r["analyse"]): r["temps_s"] for r in resultats}
+    for r in resultats:
+        if r["coeur"] != "pandas" or r["temps_s"] <= 0:
+            continue
+        for autre in coeurs:
+            if autre != "pandas" and (autre, r["analyse"]) in temps_par_coeur:
+                r[f"ratio_{autre}_pandas"] = round(temps_par_coeur[(autre, r["analyse"])] / r["temps_s"], 3)
+
+    points_chauds = sorted(resultats, key=lambda r: r["temps_s"], reverse=True)[:10]
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "plateforme": platform.platform(),
+            "lignes_brutes": jeux["lignes_brutes"],
+            "lignes_python": len(jeux["donnees"]["python"]),
+            "lignes_pandas": len(df),
+            "pathologies": nb_pathologies,
+            "graine": graine,
+            "repetitions": repetitions,
+            "pathologie_etudiee": pathologie,
+        },
+        "chargement_s": {c: round(t, 6) for c, t in jeux["chargement"].items()},
+        "taille_donnees_octets": {
+            "pandas": int(df.memory_usage(deep=True).sum()),
+            "arrow": jeux["donnees"]["arrow"].get_total_buffer_size(),
+        },
+        "resultats": resultats,
+        "points_chauds": [{"coeur": r["coeur"], "analyse": r["analyse"], "temps_s": r["temps_s"]} for r in points_chauds],
+    }
+
+
+def afficher(rapport: dict):
+    print(f"{rapport['meta']['lignes_pandas']:,} lignes nettoyées, pathologie étudiée : {rapport['meta']['pathologie_etudiee']}")
+    for coeur, temps in rapport["chargement_s"].items():
+        print(f"chargement {coeur:<15}{temps:>10.3f} s")
+    for coeur, taille in rapport["taille_donnees_octets"].items():
+        print(f"données {coeur:<18}{taille / 1e6:>10.1f} Mo")
+    print()
+    print(f"{'coeur':<8}{'analyse':<70}{'temps (s)':>12}{'pic (Mo)':>10}{'arrow (Mo)':>12}")
+    for r in rapport["resultats"]:
+        print(f"{r['coeur']:<8}{r['analyse'][:68]:<70}{r['temps_s']:>12.4f}{r['pic_memoire_octets'] / 1e6:>10.1f}"
+              f"{r['pic_arrow_octets'] / 1e6:>12.1f}")
+    print()
+    print("Points chauds :")
+    for r in rapport["points_chauds"]:
+        print(f"  {r['coeur']:<8}{r['analyse'][:68]:<70}{r['temps_s']:>10.4f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lignes", type=int, default=200_000, help="nombre de lignes brutes générées")
+    parser.add_argument("--pathologies", type=int, default=300)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--coeurs", nargs="+", choices=list(COEURS), default=list(COEURS))
+    parser.add_argument("--sortie", default="bench_cores.json", help="fichier JSON de résultats")
+    parser.add_argument("--reference", help="fichier JSON d'un précédent benchmark")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="facteur de temps toléré avant régression")
+    args = parser.parse_args()
+
+    rapport = executer_benchmark(args.lignes, args.pathologies, args.graine, args.repetitions, args.coeurs)
+
+    regressions = []
+    if args.reference:
+        with open(args.reference, "r", encoding="utf-8") as f:
+            regressions = comparer(rapport["resultats"], json.load(f), args.tolerance)
+        rapport["seuils"] = {"reference": args.reference, "tolerance": args.tolerance}
+        rapport["regressions"] = regressions
+
+    with open(args.sortie, "w", encoding="utf-8") as f:
+        json.dump(rapport, f, ensure_ascii=False, indent=2)
+
+    afficher(rapport)
+
+    if regressions:
+        print()
+        print(f"{len(regressions)} régression(s) au-delà de x{args.tolerance} :")
+        for r in regressions:
+            print(f"  {r['coeur']:<8}{r['analyse'][:68]:<70}{r['temps_s']:.4f} s > {r['seuil_s']:.4f} s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Profil du temps d'import (démarrage à froid) du dashboard.
+
+Chaque scénario est importé dans un processus Python neuf avec ``-X importtime`` :
+- « démarrage » : les imports de app.py puis la page d'accueil
+- une ligne par page : le module de la page seul, importé après le démarrage
+
+Le temps est attribué au paquet de premier niveau (pandas, matplotlib, plotly…)
+par somme des temps propres. Avec --verifier, le démarrage ne doit importer aucun
+des modules de graphiques réservés aux autres pages (code de sortie 1 sinon).
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_imports --repetitions 5
+    python -m benchmarks.bench_imports --verifier --sortie bench_imports.json
+"""
+
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from modules.registre import PAGES, PAGE_ACCUEIL
+
+RACINE = Path(__file__).parent.parent
+
+# Modules que le démarrage ne doit pas importer (streamlit importe lui-même le paquet plotly de base)
+INTERDITS_AU_DEMARRAGE = ("seaborn", "plotly.express")
+
+
+def imports_de_app(chemin: Path = RACINE / "app.py") -> list[str]:
+    """
+    Modules importés au niveau supérieur de app.py.
+    """
+    arbre = ast.parse(chemin.read_text(encoding="utf-8"))
+    modules = []
+    for noeud in arbre.body:
+        if isinstance(noeud, ast.Import):
+            modules.extend(alias.name for alias in noeud.names)
+        elif isinstance(noeud, ast.ImportFrom) and noeud.module:
+            modules.append(noeud.module)
+    return modules
+
+
+def profiler(modules: list[str], deja_importes: list[str] = ()) -> dict:
+    """
+    Importe ``deja_importes`` puis ``modules`` dans un processus neuf ; seul le temps
+    d'import de ``modules`` est compté.
+
+    :return: {"total_ms", "paquets": {paquet: ms}, "modules": noms importés, "processus_s"}
+    """
+    code = "".join(f"import {m}\n" for m in deja_importes)
+    code += "import sys; sys.stderr.write('--debut--\\n')\n"
+    code += "".join(f"import {m}\n" for m in modules)
+
+    debut = time.perf_counter()
+    sortie = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=RACINE,
+                            capture_output=True, text=True, check=True)
+    duree = time.perf_counter() - debut
+
+    lignes = sortie.stderr.split("--debut--\n", 1)[1].splitlines()
+    paquets, importes = {}, []
+    for ligne in lignes:
+        if not ligne.startswith("import time:") or "|" not in ligne:
+            continue
+        propre, _, nom = ligne[len("import time:"):].split("|")
+        if not propre.strip().isdigit():
+            continue
+        nom = nom.strip()
+        importes.append(nom)
+        paquet = nom.split(".")[0]
+        paquets[paquet] = paquets.get(paquet, 0.0) + int(propre) / 1000
+
+    return {"total_ms": sum(paquets.values()), "paquets": paquets, "modules": importes, "processus_s": duree}
+
+
+def scenarios() -> dict:
+    demarrage = imports_de_app() + [PAGES[PAGE_ACCUEIL][0]]
+    resultat = {"démarrage": (demarrage, [])}
+    for page, (module, _, _) in PAGES.items():
+        if page != PAGE_ACCUEIL:
+            resultat[page] = ([module], demarrage)
+    return resultat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repetitions", type=int, default=3, help="processus neufs par scénario (médiane)")
+    parser.add_argument("--top", type=int, default=5, help="paquets les plus coûteux affichés par scénario")
+    parser.add_argument("--verifier", action="store_true", help="échec si le démarrage importe un module interdit")
+    parser.add_argument("--sortie", default=None, help="fichier JSON de résultats")
+    args = parser.parse_args()
+
+    rapport = {}
+    print(f"{'scénario':<26} {'import (ms)':>12} {'processus (s)':>14}  paquets les plus coûteux")
+    for nom, (modules, deja_importes) in scenarios().items():
+        mesures = [profiler(modules, deja_importes) for _ in range(args.repetitions)]
+        mediane = sorted(mesures, key=lambda m: m["total_ms"])[len(mesures) // 2]
+        top = sorted(mediane["paquets"].items(), key=lambda x: x[1], reverse=True)[:args.top]
+
+        rapport[nom] = {
+            "modules": modules,
+            "import_ms": round(statistics.median(m["total_ms"] for m in mesures), 1),
+            "processus_s": round(statistics.median(m["processus_s"] for m in mesures), 3),
+            "paquets_ms": {p: round(t, 1) for p, t in top},
+            "interdits": [m for m in mediane["modules"] if m in INTERDITS_AU_DEMARRAGE] if nom == "démarrage" else [],
+        }
+        print(f"{nom:<26} {rapport[nom]['import_ms']:>12.1f} {rapport[nom]['processus_s']:>14.3f}  "
+              + ", ".join(f"{p} {t:.0f}" for p, t in top))
+
+    if args.sortie:
+        Path(args.sortie).write_text(json.dumps(rapport, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    interdits = rapport["démarrage"]["interdits"]
+    if interdits:
+        print(f"Modules importés au démarrage alors qu'ils sont réservés à d'autres pages : {interdits}")
+        if args.verifier:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
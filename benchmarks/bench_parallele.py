@@ -0,0 +1,92 @@
+"""
+Benchmark de mise à l'échelle (1 → N processus) de core/stats_python_parallele.
+
+Vérifie que chaque résultat partitionné est identique au résultat séquentiel
+puis affiche les temps et l'accélération par nombre de processus.
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_parallele --lignes 2000000 --max-processus 8
+"""
+
+import argparse
+import os
+import time
+from core import stats_python
+from core.loader_csv import nettoyer_lignes
+from core.stats_python_parallele import AnalyseParallele
+from benchmarks.generateur import generer_effectifs
+
+def donnees_synthetiques(nb_lignes: int, graine: int = 0) -> list[dict]:
+    """
+    Génère un jeu synthétique et le nettoie comme le chargeur CSV.
+    """
+    brut = generer_effectifs(nb_lignes, graine=graine).astype(object)
+    brut = brut.where(brut.notna(), "")
+    return nettoyer_lignes(brut.to_dict("records"))
+
+
+def analyses(donnees: list[dict]) -> dict:
+    annees = sorted(stats_python.annees_distinctes(donnees))
+    pathologies = sorted(stats_python.pathologies_distinctes(donnees))[:5]
+
+    return {
+        "prevalence_globale": ((), {}),
+        "prevalence_moyenne": ((), {}),
+        "top_pathologies": ((), {"top_n": 10}),
+        "pathologies_croissance_forte": ((annees[0], annees[-1]), {}),
+        "resume_global_avance": ((), {}),
+        "z_score_prevalence": ((pathologies,), {}),
+    }
+
+
+def executer(nom: str, donnees: list[dict], analyse: AnalyseParallele | None, args: tuple, kwargs: dict):
+    if nom == "z_score_prevalence":
+        pathologies = args[0]
+        if analyse is None:
+            return {p: stats_python.z_score_prevalence(donnees, p) for p in pathologies}
+        return analyse.par_pathologie("z_score_prevalence", pathologies)
+
+    if analyse is None:
+        return getattr(stats_python, nom)(donnees, *args, **kwargs)
+    return getattr(analyse, nom)(*args, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lignes", type=int, default=500_000, help="nombre de lignes brutes générées")
+    parser.add_argument("--max-processus", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    donnees = donnees_synthetiques(args.lignes)
+    print(f"{len(donnees):,} lignes")
+
+    taches = analyses(donnees)
+
+    reference = {}
+    temps_sequentiel = {}
+    for nom, (a, k) in taches.items():
+        debut = time.perf_counter()
+        reference[nom] = executer(nom, donnees, None, a, k)
+        temps_sequentiel[nom] = time.perf_counter() - debut
+
+    print(f"{'fonction':<30}{'processus':>10}{'temps (s)':>12}{'accélération':>14}")
+    for nom in taches:
+        print(f"{nom:<30}{'séquentiel':>10}{temps_sequentiel[nom]:>12.3f}{1:>14.2f}")
+
+    processus = 1
+    while processus <= args.max_processus:
+        with AnalyseParallele(donnees, processus=processus) as analyse:
+            for nom, (a, k) in taches.items():
+                debut = time.perf_counter()
+                resultat = executer(nom, donnees, analyse, a, k)
+                duree = time.perf_counter() - debut
+
+                if resultat != reference[nom]:
+                    raise AssertionError(f"{nom} : résultat différent du séquentiel avec {processus} processus")
+
+                print(f"{nom:<30}{processus:>10}{duree:>12.3f}{temps_sequentiel[nom] / duree:>14.2f}")
+        processus *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark des lectures d'une pathologie : lecture complète vs lecture élaguée.
+
+- « complet » : ``stats_pandas.charger_effectifs`` sur le fichier d'origine puis filtre
+  sur la pathologie (ce que fait un outil qui n'a besoin que d'une pathologie)
+- « trie » : fichier trié par (pathologie, annee, dept), lu par ``charger_pathologie``
+- « annees » : même tri, partitionné par année
+
+Pour chaque disposition : temps médian par pathologie, groupes de lignes décodés
+sur le total, et égalité des lignes avec la lecture complète (code de sortie 1 sinon).
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_parquet --lignes 2000000 --pathologies 20
+    python -m benchmarks.bench_parquet --parquet data/effectifs.parquet
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from core import stats_pandas
+from disposition_parquet import reorganiser, charger_pathologie, groupes_de_lignes
+from benchmarks.generateur import generer_effectifs, ecrire_effectifs
+
+CLES = ["annee", "dept", "libelle_sexe", "libelle_classe_age"]
+
+
+def chronometrer(appel, repetitions: int) -> tuple[object, float]:
+    """
+    Résultat du dernier appel et temps médian (s) sur ``repetitions`` appels.
+    """
+    temps = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = appel()
+        temps.append(time.perf_counter() - debut)
+    return resultat, statistics.median(temps)
+
+
+def _lecture_complete(source: Path, pathologie: str):
+    df = stats_pandas.charger_effectifs(source)
+    return df[df["pathologie"] == pathologie]
+
+
+def _identiques(a, b) -> bool:
+    a = a.sort_values(CLES).reset_index(drop=True)
+    b = b.sort_values(CLES).reset_index(drop=True)
+    return a.equals(b)
+
+
+def executer(source: Path, dossier: Path, nb_pathologies: int, repetitions: int) -> dict:
+    dispositions = {
+        "trie": (dossier / "effectifs_trie.parquet", False),
+        "annees": (dossier / "effectifs_annees", True),
+    }
+    rapport = {"ecriture": {}}
+    for nom, (chemin, partitionner) in dispositions.items():
+        debut = time.perf_counter()
+        rapport["ecriture"][nom] = reorganiser(source, chemin, partitionner)
+        rapport["ecriture"][nom]["duree_s"] = round(time.perf_counter() - debut, 3)
+
+    # Pathologies de tailles variées : de la plus représentée à la moins représentée
+    effectifs = stats_pandas.charger_effectifs(source)["pathologie"].value_counts()
+    pas = max(len(effectifs) // nb_pathologies, 1)
+    pathologies = effectifs.index[::pas][:nb_pathologies].tolist()
+
+    mesures = {"complet": [], **{nom: [] for nom in dispositions}}
+    erreurs = []
+    for pathologie in pathologies:
+        reference, temps = chronometrer(lambda: _lecture_complete(source, pathologie), repetitions)
+        mesures["complet"].append({"temps_s": temps, "groupes_lus": None})
+        for nom, (chemin, _) in dispositions.items():
+            lignes, temps = chronometrer(lambda: charger_pathologie(chemin, pathologie), repetitions)
+            groupes = groupes_de_lignes(chemin, pathologie)
+            mesures[nom].append({"temps_s": temps, "groupes_lus": groupes["groupes_lus"], "groupes": groupes["groupes"]})
+            if not _identiques(reference, lignes):
+                erreurs.append(f"{nom} : lignes différentes pour {pathologie}")
+
+    complet = statistics.median(m["temps_s"] for m in mesures["complet"])
+    rapport["pathologies"] = len(pathologies)
+    rapport["lectures"] = {}
+    for nom, liste in mesures.items():
+        median = statistics.median(m["temps_s"] for m in liste)
+        resume = {"temps_median_s": round(median, 5), "acceleration": round(complet / median, 1) if median else None}
+        if nom in dispositions:
+            resume["groupes_lus_moyen"] = round(statistics.mean(m["groupes_lus"] for m in liste), 2)
+            resume["groupes"] = liste[0]["groupes"]
+        rapport["lectures"][nom] = resume
+    rapport["erreurs"] = erreurs
+    return rapport
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parquet", default=None, help="fichier effectifs.parquet (par défaut : jeu synthétique)")
+    parser.add_argument("--lignes", type=int, default=1_000_000, help="lignes du jeu synthétique")
+    parser.add_argument("--pathologies", type=int, default=10, help="pathologies lues")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--sortie", default=None, help="fichier JSON de résultats")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as dossier:
+        dossier = Path(dossier)
+        if args.parquet:
+            source = Path(args.parquet)
+        else:
+            _, source = ecrire_effectifs(generer_effectifs(args.lignes), dossier)
+        rapport = executer(Path(source), dossier, args.pathologies, args.repetitions)
+
+    for nom, ecriture in rapport["ecriture"].items():
+        print(f"écriture {nom:<8}{ecriture['duree_s']:>8.2f} s  {ecriture['fichiers']} fichier(s), "
+              f"{ecriture['groupes']} groupes de {ecriture['lignes_par_groupe']:,} lignes au plus")
+    print()
+    print(f"{'lecture':<10}{'médiane (ms)':>14}{'accélération':>14}{'groupes lus':>14}")
+    for nom, r in rapport["lectures"].items():
+        groupes = f"{r['groupes_lus_moyen']:.1f}/{r['groupes']}" if "groupes" in r else "tous"
+        print(f"{nom:<10}{r['temps_median_s'] * 1000:>14.1f}{r['acceleration']:>13.1f}x{groupes:>14}")
+
+    if args.sortie:
+        Path(args.sortie).write_text(json.dumps(rapport, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if rapport["erreurs"]:
+        print("Erreurs : " + " ; ".join(rapport["erreurs"]))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Générateur de jeux de données synthétiques au format du fichier effectifs.csv
+(mêmes colonnes que data/echantillon_effectifs.csv), pour mesurer les deux cœurs
+d'analyse à grande échelle.
+
+Cardinalités réalistes : années 2015 à 2023, 101 départements (+ les lignes "999"
+France entière), 20 classes d'âge (+ "tous âges"), hommes / femmes / tous sexes
+et plusieurs centaines de pathologies réparties sur trois niveaux (patho_niv1/2/3).
+Les lignes filtrées par les chargeurs sont aussi produites : pseudo-pathologie
+"Total consommants tous régimes", département 999 et effectifs non significatifs (< 11).
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.generateur --lignes 2000000 --sortie /tmp/effectifs_synthetiques
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from utils.conversion import Conversion_donnees
+
+ANNEES = list(range(2015, 2024))
+
+SEXES = [("1", "hommes"), ("2", "femmes"), ("9", "tous sexes")]
+
+CODES_AGE = [
+    "00-04", "05-09", "10-14", "15-19", "20-24", "25-29", "30-34", "35-39", "40-44", "45-49",
+    "50-54", "55-59", "60-64", "65-69", "70-74", "75-79", "80-84", "85-89", "90-94", "95et+",
+]
+
+GROUPES_PATHOLOGIES = [
+    "Maladies cardioneurovasculaires", "Diabète", "Cancers", "Maladies psychiatriques",
+    "Traitements psychotropes (hors pathologies)", "Maladies neurologiques",
+    "Maladies respiratoires chroniques (hors mucoviscidose)",
+    "Maladies inflammatoires ou rares ou infection VIH",
+    "Insuffisance rénale chronique terminale", "Maladies du foie ou du pancréas (hors mucoviscidose)",
+    "Hospitalisations ponctuelles (avec ou sans pathologies, traitements ou maternité)",
+    "Maternité (avec ou sans pathologies)", "Traitement antalgique ou anti-inflammatoire (hors pathologies, traitements, maternité ou hospitalisations)",
+    "Traitements du risque vasculaire (hors pathologies)", "Maladies infectieuses",
+]
+
+TOTAL_CONSOMMANTS = "Total consommants tous régimes"
+
+
+def catalogue_pathologies(nb_pathologies: int) -> pd.DataFrame:
+    """
+    Construit une hiérarchie synthétique de nb_pathologies pathologies (niveaux 1 à 3),
+    précédée de la pseudo-pathologie "Total consommants tous régimes".
+
+    :return: DataFrame (patho_niv1, patho_niv2, patho_niv3, top)
+    """
+    lignes = [(TOTAL_CONSOMMANTS, TOTAL_CONSOMMANTS, TOTAL_CONSOMMANTS, "POP_TOT_IND")]
+
+    i = 0
+    while len(lignes) <= nb_pathologies:
+        groupe = GROUPES_PATHOLOGIES[i % len(GROUPES_PATHOLOGIES)]
+        g = i % len(GROUPES_PATHOLOGIES)
+        sous_groupe = i // len(GROUPES_PATHOLOGIES)
+
+        if sous_groupe == 0:
+            # Niveau 1 seul (ligne "catégorie")
+            lignes.append((groupe, None, None, f"P{g:02d}_CAT_CAT"))
+        else:
+            niv2 = f"{groupe} - groupe {sous_groupe}"
+            lignes.append((groupe, niv2, None, f"P{g:02d}_G{sous_groupe:02d}_CAT"))
+            for k in range(1, 4):
+                if len(lignes) > nb_pathologies:
+                    break
+                lignes.append((groupe, niv2, f"{niv2} - forme {k}", f"P{g:02d}_G{sous_groupe:02d}_F{k}"))
+        i += 1
+
+    return pd.DataFrame(lignes[:nb_pathologies + 1], columns=["patho_niv1", "patho_niv2", "patho_niv3", "top"])
+
+
+def _departements() -> tuple[list[str], list[str]]:
+    codes = [c for c in Conversion_donnees.DEPARTEMENTS]
+    return codes, [Conversion_donnees.region_du_departement(c) for c in codes]
+
+
+def generer_effectifs(nb_lignes: int, nb_pathologies: int = 300, graine: int = 0) -> pd.DataFrame:
+    """
+    Génère nb_lignes lignes brutes distinctes (année, pathologie, âge, sexe, département)
+    tirées dans le cube complet des combinaisons.
+
+    :param nb_lignes: nombre de lignes (plafonné à la taille du cube)
+    :param nb_pathologies: nombre de pathologies (hors "Total consommants tous régimes")
+    :param graine: graine du générateur aléatoire
+    :return: DataFrame au format brut de effectifs.csv
+    """
+    rng = np.random.default_rng(graine)
+
+    pathologies = catalogue_pathologies(nb_pathologies)
+    depts, regions = _departements()
+    ages = CODES_AGE + ["tsage"]
+    libelles_age = Conversion_donnees.ORDRE_TRANCHES_AGE + ["tous âges"]
+
+    dimensions = [len(ANNEES), len(pathologies), len(ages), len(SEXES), len(depts)]
+    taille_cube = int(np.prod(dimensions))
+    nb_lignes = min(nb_lignes, taille_cube)
+
+    # Tirage sans remise dans le cube, puis décodage en base mixte
+    indices = np.sort(rng.choice(taille_cube, size=nb_lignes, replace=False))
+    i_annee, i_patho, i_age, i_sexe, i_dept = np.unravel_index(indices, dimensions)
+
+    # Population : taille du département x part de la classe d'âge x part du sexe
+    pop_dept = rng.lognormal(mean=13.0, sigma=0.8, size=len(depts))
+    france = depts.index("999")
+    pop_dept[france] = pop_dept.sum() - pop_dept[france]
+    part_age = np.append(np.full(20, 1 / 20), 1.0)
+    part_sexe = np.array([0.49, 0.51, 1.0])
+    npop = pop_dept[i_dept] * part_age[i_age] * part_sexe[i_sexe] * (1 + 0.005 * i_annee)
+    npop = np.maximum(10, np.round(npop / 10) * 10).astype(np.int64)
+
+    # Prévalence : niveau de la pathologie x effet âge x effet département x tendance annuelle
+    prev_patho = rng.lognormal(mean=-6.0, sigma=1.5, size=len(pathologies)).clip(max=0.3)
+    effet_age = np.append(np.linspace(0.2, 3.0, 20), 1.0)
+    effet_dept = rng.lognormal(mean=0.0, sigma=0.15, size=len(depts))
+    tendance = rng.normal(0.02, 0.03, size=len(pathologies))
+    taux = prev_patho[i_patho] * effet_age[i_age] * effet_dept[i_dept] * (1 + tendance[i_patho]) ** i_annee
+    taux = taux.clip(max=0.95)
+
+    ntop = np.round(rng.binomial(npop, taux) / 10) * 10
+    ns = ntop < 11   # secret statistique (NS)
+    prev = np.where(ns, np.nan, np.round(ntop / npop * 100, 3))
+    ntop = pd.array(np.where(ns, 0, ntop).astype(np.int64), dtype="Int64")
+    ntop[ns] = pd.NA
+
+    sexe_codes = np.array([s[0] for s in SEXES])
+    sexe_libelles = np.array([s[1] for s in SEXES])
+    depts_arr = np.array(depts)
+
+    df = pd.DataFrame({
+        "annee": np.array(ANNEES)[i_annee],
+        "patho_niv1": pathologies["patho_niv1"].to_numpy()[i_patho],
+        "patho_niv2": pathologies["patho_niv2"].to_numpy()[i_patho],
+        "patho_niv3": pathologies["patho_niv3"].to_numpy()[i_patho],
+        "top": pathologies["top"].to_numpy()[i_patho],
+        "cla_age_5": np.array(ages)[i_age],
+        "sexe": sexe_codes[i_sexe],
+        "region": np.array(regions)[i_dept],
+        "dept": depts_arr[i_dept],
+        "Ntop": ntop,
+        "Npop": npop,
+        "prev": prev,
+        "Niveau prioritaire": "1",
+        "libelle_classe_age": np.array(libelles_age)[i_age],
+        "libelle_sexe": sexe_libelles[i_sexe],
+        "tri": (i_patho + 1).astype(float),
+    })
+
+    return df
+
+
+def ecrire_effectifs(df: pd.DataFrame, dossier: str | Path) -> tuple[Path, Path]:
+    """
+    Écrit le jeu brut en effectifs.csv (séparateur ";") et effectifs.parquet
+    dans le dossier indiqué.
+
+    :return: chemins (csv, parquet)
+    """
+    dossier = Path(dossier)
+    dossier.mkdir(parents=True, exist_ok=True)
+
+    chemin_csv = dossier / "effectifs.csv"
+    chemin_parquet = dossier / "effectifs.parquet"
+
+    df.to_csv(chemin_csv, sep=";", index=False)
+    df.to_parquet(chemin_parquet, index=False)
+
+    return chemin_csv, chemin_parquet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lignes", type=int, default=1_000_000)
+    parser.add_argument("--pathologies", type=int, default=300)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--sortie", required=True, help="dossier de sortie")
+    args = parser.parse_args()
+
+    df = generer_effectifs(args.lignes, args.pathologies, args.graine)
+    chemin_csv, chemin_parquet = ecrire_effectifs(df, args.sortie)
+
+    print(f"{len(df):,} lignes -> {chemin_csv}, {chemin_parquet}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,543 @@
+"""
+Matrice de parité et de performance entre les cœurs d'analyse.
+
+Chaque résultat est converti dans une forme commune (scalaires, dictionnaires
+clé -> valeur, classements ordonnés) puis comparé au cœur de référence (pandas),
+avec une tolérance correspondant à l'arrondi à 3 décimales des fonctions.
+Dans le même passage, le meilleur temps de chaque cœur est enregistré afin
+de valider à la fois l'exactitude et le gain d'une optimisation.
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.parite --lignes 20000 100000 --graines 0 1 2
+
+Le rapport est écrit dans rapports/parite.json (ignoré par git) sauf ``--sortie``.
+
+Le chargement de chaque jeu est aussi instrumenté : les lignes enregistrées par
+``@mesurer`` pour chaque chargeur doivent être celles des données chargées.
+
+Les définitions propres au cœur python (écart-type des z-scores autour de la moyenne
+nationale, tendance sans arrondi de la moyenne) sont vérifiées contre la référence
+pandas recalculée selon ces définitions (``RECALCULS_PYTHON``).
+
+Code de sortie 1 si une divergence est détectée.
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+import pandas as pd
+from core import stats_pandas, stats_python, stats_sql, stats_arrow, instrumentation
+from benchmarks.bench_cores import cas_analyses, libelle, appeler, charger_jeux
+
+# Cœurs comparés : module et forme de retour (les adaptateurs dépendent de la forme)
+COEURS = {
+    "pandas": (stats_pandas, "pandas"),
+    "python": (stats_python, "python"),
+    "sql": (stats_sql, "pandas"),
+    "arrow": (stats_arrow, "pandas"),
+}
+
+REFERENCE = "pandas"
+
+# Écart maximal toléré sur une valeur arrondie à 3 décimales (arrondis successifs compris)
+TOLERANCE = 0.0015
+
+# Formes communes
+
+def _vide(resultat) -> bool:
+    return resultat is None or (isinstance(resultat, (pd.DataFrame, pd.Series, dict, list)) and len(resultat) == 0)
+
+
+def _nombre(valeur):
+    if valeur is None or (isinstance(valeur, float) and math.isnan(valeur)):
+        return None
+    if hasattr(valeur, "item"):
+        valeur = valeur.item()
+    return valeur
+
+
+def _descriptives_python(stats: dict | None) -> dict | None:
+    if stats is None:
+        return None
+    return {
+        "Ntop": stats["Ntop totale"], "Npop": stats["Npop totale"],
+        "moyenne": stats["Prevalence moyenne"], "mediane": stats["Prevalence mediane"],
+        "min": stats["Prevalence min"], "max": stats["Prevalence max"], "ecart_type": stats["Ecart-type prevalence"],
+    }
+
+
+def _descriptives_pandas(ligne) -> dict:
+    return {
+        "Ntop": _nombre(ligne["Ntop_totale"]), "Npop": _nombre(ligne["Npop_totale"]),
+        "moyenne": _nombre(ligne["prevalence_moyenne"]), "mediane": _nombre(ligne["prevalence_mediane"]),
+        "min": _nombre(ligne["prevalence_min"]), "max": _nombre(ligne["prevalence_max"]),
+        # écart-type d'une seule valeur : NaN pour pandas, 0.0 pour statistiques_descriptives
+        "ecart_type": _nombre(ligne["ecart_type"]) or 0.0,
+    }
+
+
+def _totaux_python(par_cle: dict) -> dict:
+    return {cle: {"Ntop": s["Ntop totale"], "Npop": s["Npop totale"]} for cle, s in par_cle.items() if s is not None}
+
+
+def _totaux_pandas(df: pd.DataFrame) -> dict:
+    return {_nombre(cle) if not isinstance(cle, str) else cle: {"Ntop": _nombre(l["Ntop_totale"]), "Npop": _nombre(l["Npop_totale"])}
+            for cle, l in df.iterrows()}
+
+
+def _classement_pandas(df: pd.DataFrame, cle: str, valeur: str) -> list[tuple]:
+    return [(c, _nombre(v)) for c, v in zip(df[cle], df[valeur])]
+
+
+def _variations(variations: dict | None) -> dict:
+    return {int(annee): v for annee, v in (variations or {}).items()}
+
+
+def _ratio(ratio) -> float | None:
+    # aucun cas chez les hommes : 0.0 (python, sexe sans ligne compris) ou None (pandas, sexe sans ligne)
+    return _nombre(ratio) or None
+
+
+# Adaptateurs par fonction : forme -> conversion vers la forme commune
+ADAPTATEURS = {
+    "nombre_de_lignes": {"python": int, "pandas": int},
+    "pathologies_distinctes": {"python": len, "pandas": int},
+    "departements_distincts": {"python": len, "pandas": int},
+    "annees_distinctes": {"python": len, "pandas": int},
+    "nombre_de_cas": {"python": int, "pandas": int},
+    "population_reference": {"python": int, "pandas": int},
+    "prevalence_globale": {"python": float, "pandas": float},
+    "prevalence_moyenne": {"python": float, "pandas": float},
+    "top_pathologies": {
+        "python": lambda r: ("classement tronqué", list(r or [])),
+        "pandas": lambda r: ("classement tronqué", [] if _vide(r) else _classement_pandas(r, "pathologie", "prevalence_globale")),
+    },
+    "pathologies_croissance_forte": {
+        "python": lambda r: ("classement tronqué", list(r or [])),
+        "pandas": lambda r: ("classement tronqué", [] if _vide(r) else _classement_pandas(r, "pathologie", "croissance")),
+    },
+    "resume_global_avance": {
+        "python": lambda r: r,
+        "pandas": lambda r: None if r is None else {k: _nombre(v) for k, v in r.items()},
+    },
+    "stats_par_sexe": {
+        "python": lambda r: {s: _descriptives_python(v) for s, v in r.items() if v is not None},
+        "pandas": lambda r: {} if _vide(r) else {s: _descriptives_pandas(l) for s, l in r.iterrows()},
+    },
+    "ratio_cas_hf": {"python": _ratio, "pandas": _ratio},
+    "difference_prevalence_sexe": {"python": _nombre, "pandas": _nombre},
+    "stats_par_tranche_age": {
+        "python": _totaux_python,
+        "pandas": lambda r: {} if _vide(r) else _totaux_pandas(r),
+    },
+    "age_central_pathologie": {
+        "python": lambda r: None if r is None else (r[0], _nombre(r[1])),
+        "pandas": lambda r: None if r is None else (r[0], _nombre(r[1])),
+    },
+    "stats_par_annee": {
+        "python": lambda r: {int(a): v for a, v in _totaux_python(r).items()},
+        "pandas": lambda r: {} if _vide(r) else _totaux_pandas(r),
+    },
+    "variation_annuelle": {"python": _variations, "pandas": _variations},
+    "tendance_generale": {"python": lambda r: r, "pandas": lambda r: r},
+    "pente_tendance": {"python": _nombre, "pandas": _nombre},
+    "stats_par_departement": {
+        "python": _totaux_python,
+        "pandas": lambda r: {} if _vide(r) else _totaux_pandas(r),
+    },
+    "classement_departements": {
+        "python": lambda r: ("classement", [(dept, prev) for _, dept, prev in r or []]),
+        "pandas": lambda r: ("classement", [] if _vide(r) else _classement_pandas(r, "departement_nom", "prevalence_globale")),
+    },
+    "moyenne_nationale": {"python": _nombre, "pandas": _nombre},
+    "ecart_a_la_moyenne": {
+        "python": lambda r: ("classement", list(r or [])),
+        "pandas": lambda r: ("classement", [] if _vide(r) else _classement_pandas(r, "departement_nom", "ecart_a_la_moyenne")),
+    },
+    "top_departements": {
+        "python": lambda r: ("classement tronqué", [(dept, prev) for _, dept, prev in r or []]),
+        "pandas": lambda r: ("classement tronqué", [] if _vide(r) else _classement_pandas(r, "departement_nom", "prevalence_globale")),
+    },
+    "bottom_departements": {
+        "python": lambda r: ("classement tronqué", [(dept, prev) for _, dept, prev in r or []]),
+        "pandas": lambda r: ("classement tronqué", [] if _vide(r) else _classement_pandas(r, "departement_nom", "prevalence_globale")),
+    },
+    "z_score_prevalence": {
+        "python": lambda r: ("classement", list(r or [])),
+        "pandas": lambda r: ("classement", [] if _vide(r) else _classement_pandas(r, "departement_nom", "z_score")),
+    },
+    "valeurs_aberrantes": {
+        "python": lambda r: ("classement", list(r or [])),
+        "pandas": lambda r: ("classement", [] if _vide(r) else _classement_pandas(r, "departement_nom", "z_score")),
+    },
+    "stats_par_departement_annee": {
+        "python": lambda r: {(int(a), code): {"Ntop": s["Ntop totale"], "Npop": s["Npop totale"]}
+                             for a, depts in r or [] for code, s in depts.items()},
+        "pandas": lambda r: {} if _vide(r) else {(int(l.annee), l.dept): {"Ntop": int(l.Ntop_totale), "Npop": int(l.Npop_totale)}
+                                                 for l in r.itertuples()},
+    },
+    "moyenne_nationale_annee": {
+        "python": lambda r: {int(a): v for a, v in (r or {}).items()},
+        "pandas": lambda r: {} if _vide(r) else {int(a): _nombre(v) for a, v in zip(r["annee"], r["moyenne_nationale"])},
+    },
+    "z_score_prevalence_annee": {
+        "python": lambda r: {(int(a), dept): z for a, liste in (r or {}).items() for dept, z in liste or []},
+        "pandas": lambda r: {} if _vide(r) else {(int(a), d): _nombre(z) for a, d, z in zip(r["annee"], r["departement_nom"], r["z_score"])},
+    },
+    "annees_anormales": {
+        "python": lambda r: {int(a): v for entree in r or [] for a, v in entree.items()},
+        "pandas": lambda r: {} if _vide(r) else {int(a): _nombre(v) for a, v in zip(r["annee"], r["moyenne_abs_z"])},
+    },
+}
+
+
+# Références recalculées selon les définitions du cœur python
+
+def _z_definition_python(z: pd.Series) -> pd.Series:
+    """
+    z-scores pandas (écart-type autour de la moyenne des départements) ramenés à la définition
+    python (écart-type autour de la moyenne nationale) : avec z = (p - m) / s, on a
+    s_nationale / s = sqrt(somme(z²) / (n - 1)).
+    """
+    z = z[z.notna() & (z.abs() != math.inf)]
+    if len(z) < 2:
+        return z.iloc[:0]
+    return (z / math.sqrt((z ** 2).sum() / (len(z) - 1))).round(3)
+
+
+def _z_python(df: pd.DataFrame, pathologie: str) -> list[tuple]:
+    df_z = stats_pandas.z_score_prevalence(df, pathologie)
+    if _vide(df_z):
+        return []
+    z = _z_definition_python(df_z.set_index("departement_nom")["z_score"])
+    return [(d, _nombre(v)) for d, v in z.sort_values(kind="stable").items()]
+
+
+def _z_annee_python(df: pd.DataFrame, pathologie: str) -> dict:
+    df_z = stats_pandas.z_score_prevalence_annee(df, pathologie)
+    if _vide(df_z):
+        return {}
+    resultat = {}
+    for annee, groupe in df_z.groupby("annee"):
+        z = _z_definition_python(groupe.set_index("departement_nom")["z_score"])
+        resultat.update({(int(annee), d): _nombre(v) for d, v in z.items()})
+    return resultat
+
+
+def _annees_anormales_python(df: pd.DataFrame, pathologie: str, seuil=2) -> dict:
+    par_annee = {}
+    for (annee, _), z in _z_annee_python(df, pathologie).items():
+        par_annee.setdefault(annee, []).append(abs(z))
+    moyennes = {annee: sum(z) / len(z) for annee, z in par_annee.items()}
+    return {annee: round(m, 3) for annee, m in moyennes.items() if m >= seuil}
+
+
+def _tendance_python(df: pd.DataFrame, pathologie: str) -> str | None:
+    differences = [v["difference absolue"] for v in stats_pandas.variation_annuelle(df, pathologie).values()
+                   if v.get("difference absolue") is not None]
+    if not differences:
+        return None
+    moyenne = sum(differences) / len(differences)
+    return "hausse" if moyenne > 0 else ("baisse" if moyenne < 0 else "stable")
+
+
+# Pour ces analyses, le cœur python est comparé à la référence pandas recalculée selon sa propre
+# définition (forme commune) ; toute autre différence reste une divergence
+RECALCULS_PYTHON = {
+    "z_score_prevalence": ("écart-type autour de la moyenne nationale",
+                           lambda df, p: ("classement", _z_python(df, p))),
+    "valeurs_aberrantes": ("z_score_prevalence python, seuil de 2",
+                           lambda df, p: ("classement", [(d, z) for d, z in _z_python(df, p) if abs(z) >= 2])),
+    "z_score_prevalence_annee": ("écart-type autour de la moyenne nationale annuelle", _z_annee_python),
+    "annees_anormales": ("z_score_prevalence_annee python, seuil de 2", _annees_anormales_python),
+    "tendance_generale": ("moyenne des variations non arrondie", _tendance_python),
+}
+
+
+# Comparaison
+
+def _valeurs_egales(a, b, tolerance: float) -> bool:
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return abs(a - b) <= tolerance
+    return a == b
+
+
+def comparer(a, b, tolerance: float = TOLERANCE, chemin: str = "") -> list[str]:
+    """
+    Compare récursivement deux résultats en forme commune.
+
+    :return: liste des écarts (vide si les résultats concordent)
+    """
+    if isinstance(a, tuple) and isinstance(b, tuple) and a[:1] == b[:1] and a[0] in CLASSEMENTS:
+        return comparer_classements(a[1], b[1], tolerance, chemin, tronque=a[0] == "classement tronqué")
+
+    if isinstance(a, dict) and isinstance(b, dict):
+        ecarts = []
+        for cle in set(a) ^ set(b):
+            ecarts.append(f"{chemin}[{cle!r}] présent d'un seul côté")
+        for cle in set(a) & set(b):
+            ecarts += comparer(a[cle], b[cle], tolerance, f"{chemin}[{cle!r}]")
+        return ecarts
+
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        if len(a) != len(b):
+            return [f"{chemin} longueurs différentes ({len(a)} / {len(b)})"]
+        ecarts = []
+        for i, (x, y) in enumerate(zip(a, b)):
+            ecarts += comparer(x, y, tolerance, f"{chemin}[{i}]")
+        return ecarts
+
+    if not _valeurs_egales(a, b, tolerance):
+        return [f"{chemin} {a!r} != {b!r}"]
+
+    return []
+
+
+def comparer_classements(a: list[tuple], b: list[tuple], tolerance: float, chemin: str = "",
+                         tronque: bool = False) -> list[str]:
+    """
+    Compare deux classements (clé, valeur) : même suite de valeurs, mêmes clés et mêmes
+    valeurs pour les clés communes. L'ordre des ex aequo peut différer ; dans un classement
+    tronqué (top / bottom N), une clé d'un seul côté est admise si sa valeur est celle de
+    la coupure (ex aequo en limite de classement).
+    """
+    if len(a) != len(b):
+        return [f"{chemin} classements de longueurs différentes ({len(a)} / {len(b)})"]
+
+    ecarts = []
+    for i, ((_, x), (_, y)) in enumerate(zip(a, b)):
+        if not _valeurs_egales(x, y, tolerance):
+            ecarts.append(f"{chemin} rang {i + 1} : {x!r} != {y!r}")
+
+    valeurs_a, valeurs_b = dict(a), dict(b)
+    for cle, x in a:
+        if cle in valeurs_b and not _valeurs_egales(x, valeurs_b[cle], tolerance):
+            ecarts.append(f"{chemin}[{cle!r}] {x!r} != {valeurs_b[cle]!r}")
+
+    for classement, autre in ((a, valeurs_b), (b, valeurs_a)):
+        coupure = classement[-1][1] if classement else None
+        for cle, x in classement:
+            if cle not in autre and not (tronque and _valeurs_egales(x, coupure, tolerance)):
+                ecarts.append(f"{chemin}[{cle!r}] présent d'un seul côté")
+
+    return ecarts
+
+
+def comparer_variations(a: dict, b: dict, tolerance: float = TOLERANCE) -> list[str]:
+    """
+    Les variations relatives héritent de l'écart d'arrondi des différences absolues,
+    divisé par la prévalence de l'année précédente : la tolérance est propagée.
+    """
+    ecarts = []
+    for cle in set(a) ^ set(b):
+        ecarts.append(f"[{cle!r}] présent d'un seul côté")
+
+    for annee in set(a) & set(b):
+        va, vb = a[annee], b[annee]
+        if not _valeurs_egales(va["difference absolue"], vb["difference absolue"], tolerance):
+            ecarts.append(f"[{annee}] difference absolue {va['difference absolue']!r} != {vb['difference absolue']!r}")
+
+        rel_a, rel_b = va["valeur relative"], vb["valeur relative"]
+        if rel_a is None or rel_b is None:
+            if rel_a != rel_b:
+                ecarts.append(f"[{annee}] valeur relative {rel_a!r} != {rel_b!r}")
+            continue
+
+        # prévalence précédente déduite de diff / relatif (d'un côté ou de l'autre) ;
+        # sans diff non nulle, seule l'égalité à l'arrondi est attendue
+        tolerance_rel = tolerance
+        for v in (vb, va):
+            if v["valeur relative"] and v["difference absolue"]:
+                prev_precedente = abs(v["difference absolue"] / v["valeur relative"] * 100)
+                tolerance_rel = 100 * tolerance / prev_precedente + tolerance
+                break
+        if not _valeurs_egales(rel_a, rel_b, tolerance_rel):
+            ecarts.append(f"[{annee}] valeur relative {rel_a!r} != {rel_b!r}")
+
+    return ecarts
+
+
+COMPARATEURS = {"variation_annuelle": comparer_variations}
+
+# Formes de classement (clé, valeur) ; « tronqué » : top / bottom N
+CLASSEMENTS = ("classement", "classement tronqué")
+
+# Chargeurs instrumentés, par cœur (nom enregistré par ``@mesurer``)
+CHARGEURS = {
+    "pandas": "stats_pandas.charger_effectifs",
+    "sql": "stats_sql.charger_effectifs",
+    "arrow": "stats_arrow.charger_effectifs",
+}
+
+
+def verifier_chargeurs(jeux: dict, mesures: list[dict]) -> list[str]:
+    """
+    Compare les lignes enregistrées par l'instrumentation pour chaque chargeur aux lignes chargées.
+    """
+    lignes = {m["fonction"]: m["lignes"] for m in mesures}
+    ecarts = []
+    for nom, fonction in CHARGEURS.items():
+        attendu = len(jeux["donnees"][nom])
+        if lignes.get(fonction) != attendu:
+            ecarts.append(f"{fonction} : {lignes.get(fonction)!r} lignes enregistrées, {attendu} chargées")
+    return ecarts
+
+
+def chronometrer(appel, repetitions: int):
+    """
+    Retourne (résultat du premier appel, meilleur temps en secondes).
+    """
+    meilleur = float("inf")
+    resultat = None
+    for i in range(repetitions):
+        debut = time.perf_counter()
+        r = appel()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+        if i == 0:
+            resultat = r
+    return resultat, meilleur
+
+
+def pathologies_etudiees(df: pd.DataFrame, nb_frequentes: int = 3) -> list[str]:
+    """
+    Pathologies les plus fréquentes et la plus rare du jeu.
+    """
+    frequences = df["pathologie"].value_counts()
+    return list(dict.fromkeys(list(frequences.index[:nb_frequentes]) + [frequences.index[-1]]))
+
+
+def executer_matrice(tailles: list[int], graines: list[int], coeurs: list[str], repetitions: int = 1,
+                     nb_pathologies: int = 300) -> dict:
+    """
+    Exécute la matrice (taille x graine x analyse x pathologie) et retourne le rapport.
+    """
+    cases = []
+
+    for taille in tailles:
+        for graine in graines:
+            with instrumentation.session():
+                jeux = charger_jeux(taille, nb_pathologies, graine)
+                ecarts = verifier_chargeurs(jeux, instrumentation.mesures())
+            cases.append({
+                "lignes": taille,
+                "graine": graine,
+                "analyse": "instrumentation des chargeurs",
+                "pathologie": None,
+                "statut": "divergence" if ecarts else "ok",
+                "temps_s": {},
+                "acceleration": {},
+                "ecarts": {"chargeurs": ecarts} if ecarts else {},
+                "erreurs": {},
+            })
+
+            df = jeux["donnees"]["pandas"]
+            annees = sorted(df["annee"].unique().tolist())
+
+            for cas in cas_analyses(annees):
+                pathologies = pathologies_etudiees(df) if cas["portee"] == "pathologie" else [None]
+
+                for pathologie in pathologies:
+                    formes = {}
+                    temps = {}
+                    erreurs = {}
+
+                    for nom in coeurs:
+                        module, forme = COEURS[nom]
+                        donnees = jeux["donnees"][nom]
+                        try:
+                            brut, temps[nom] = chronometrer(lambda: appeler(module, cas, donnees, pathologie), repetitions)
+                            formes[nom] = ADAPTATEURS[cas["fonction"]][forme](brut)
+                        except Exception as e:
+                            erreurs[nom] = f"{type(e).__name__}: {e}"
+
+                    if "python" in formes and cas["fonction"] in RECALCULS_PYTHON:
+                        try:
+                            reference_python = RECALCULS_PYTHON[cas["fonction"]][1](df, pathologie)
+                        except Exception as e:
+                            erreurs["python (référence recalculée)"] = f"{type(e).__name__}: {e}"
+                            del formes["python"]
+
+                    ecarts = {}
+                    for nom in coeurs:
+                        if nom == REFERENCE or nom not in formes or REFERENCE in erreurs:
+                            continue
+                        comparateur = COMPARATEURS.get(cas["fonction"], comparer)
+                        reference = reference_python if nom == "python" and cas["fonction"] in RECALCULS_PYTHON else formes[REFERENCE]
+                        ecarts[nom] = comparateur(formes[nom], reference)
+
+                    divergent = bool(erreurs) or any(ecarts.values())
+
+                    cases.append({
+                        "lignes": taille,
+                        "graine": graine,
+                        "analyse": libelle(cas),
+                        "pathologie": pathologie,
+                        "statut": "divergence" if divergent else "ok",
+                        "temps_s": {nom: round(t, 6) for nom, t in temps.items()},
+                        "acceleration": {nom: round(t / temps[REFERENCE], 3) for nom, t in temps.items()
+                                         if REFERENCE in temps and temps[REFERENCE] > 0 and nom != REFERENCE},
+                        "ecarts": {nom: e[:5] for nom, e in ecarts.items() if e},
+                        "erreurs": erreurs,
+                    })
+
+    statuts = [c["statut"] for c in cases]
+    return {
+        "reference": REFERENCE,
+        "coeurs": coeurs,
+        "tolerance": TOLERANCE,
+        "recalculs_python": {fonction: raison for fonction, (raison, _) in RECALCULS_PYTHON.items()},
+        "bilan": {s: statuts.count(s) for s in ("ok", "divergence")},
+        "cases": cases,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lignes", type=int, nargs="+", default=[20_000, 100_000])
+    parser.add_argument("--graines", type=int, nargs="+", default=[0, 1])
+    parser.add_argument("--coeurs", nargs="+", choices=list(COEURS), default=list(COEURS))
+    parser.add_argument("--repetitions", type=int, default=1)
+    parser.add_argument("--sortie", default="rapports/parite.json", help="fichier JSON du rapport")
+    args = parser.parse_args()
+
+    coeurs = [REFERENCE] + [c for c in args.coeurs if c != REFERENCE]
+    rapport = executer_matrice(args.lignes, args.graines, coeurs, args.repetitions)
+
+    Path(args.sortie).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.sortie, "w", encoding="utf-8") as f:
+        json.dump(rapport, f, ensure_ascii=False, indent=2, default=str)
+
+    for case in rapport["cases"]:
+        if case["statut"] == "divergence":
+            print(f"DIVERGENCE {case['lignes']:>9,} g{case['graine']} {case['analyse']} [{case['pathologie']}]")
+            for nom, ecarts in case["ecarts"].items():
+                for ecart in ecarts:
+                    print(f"    {nom}: {ecart}")
+            for nom, erreur in case["erreurs"].items():
+                print(f"    {nom}: {erreur}")
+
+    print(f"Bilan : {rapport['bilan']}")
+
+    # Temps cumulés par cœur et par analyse
+    cumul = {}
+    for case in rapport["cases"]:
+        for nom, t in case["temps_s"].items():
+            cumul.setdefault(case["analyse"], {}).setdefault(nom, 0.0)
+            cumul[case["analyse"]][nom] += t
+
+    print()
+    print(f"{'analyse':<60}" + "".join(f"{nom:>12}" for nom in coeurs))
+    for analyse, par_coeur in cumul.items():
+        print(f"{analyse[:58]:<60}" + "".join(f"{par_coeur.get(nom, float('nan')):>12.4f}" for nom in coeurs))
+
+    if rapport["bilan"]["divergence"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
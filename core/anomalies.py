@@ -0,0 +1,278 @@
+"""
+Détection d'anomalies robuste sur toutes les cellules (pathologie, année, département) du cube.
+
+Deux méthodes, calculées ensemble sur des tableaux (pathologie, année, département) :
+
+- z-score robuste (médiane / MAD) : z = 0,6745 x (prévalence - médiane) / MAD, la médiane et
+  l'écart absolu médian étant pris sur les départements de chaque (pathologie, année). Une
+  valeur extrême ne déplace ni la médiane ni la MAD, contrairement à la moyenne et à l'écart-type
+  de ``z_score_prevalence`` ; le seuil usuel est |z| >= 3,5.
+- ratio standardisé de morbidité (SMR) : cas observés / cas attendus, les cas attendus appliquant
+  les taux nationaux par sexe et classe d'âge à la population du département de chaque sexe et
+  classe d'âge (standardisation indirecte). Sans détail par âge, les taux bruts sont utilisés. La p-valeur
+  est la probabilité exacte de Poisson (bilatérale) d'observer un écart au moins aussi grand,
+  obtenue par la fonction gamma incomplète régularisée, sans scipy : série ou fraction continue
+  pour a < 100, quadrature de Gauss-Legendre à 18 points de l'intégrale au-delà (nombre
+  d'opérations fixe, quel que soit l'effectif du département).
+  Les limites de l'entonnoir (funnel plot) sont celles du SMR à 95 % et 99,8 % autour de 1
+  pour le nombre de cas attendus de la cellule.
+
+Le SMR tient compte de la taille de la population : un petit département n'est signalé que
+si son écart est improbable pour son effectif.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from utils.conversion import Conversion_donnees
+from core.standardisation import effectifs_par_age, TOUS_SEXES
+
+SEUIL_ROBUSTE = 3.5
+NIVEAUX_ENTONNOIR = {"95": 1.959964, "998": 3.090232}
+FACTEUR_MAD = 0.6745
+_ITERATIONS_MAX = 1_000
+_PRECISION = 1e-14
+_MINUSCULE = 1e-300
+
+# Au-delà, l'intégrale est calculée par quadrature (la série et la fraction continue demandent O(racine(a)) itérations)
+A_QUADRATURE = 100
+_NOEUDS, _POIDS = np.polynomial.legendre.leggauss(18)
+_NOEUDS, _POIDS = (_NOEUDS + 1) / 2, _POIDS / 2
+
+
+def _lgamma(valeurs: np.ndarray) -> np.ndarray:
+    return np.frompyfunc(math.lgamma, 1, 1)(valeurs).astype(np.float64)
+
+
+def _serie(a: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    P(a, x) par la série (x < a + 1).
+    """
+    somme = 1 / a
+    terme = somme.copy()
+    actifs = np.arange(len(a))
+    resultat = np.empty(len(a))
+    diviseur = a.copy()
+    for iteration in range(_ITERATIONS_MAX):
+        diviseur[actifs] += 1
+        terme[actifs] *= x[actifs] / diviseur[actifs]
+        somme[actifs] += terme[actifs]
+        if iteration % 32 == 0:
+            finis = np.abs(terme[actifs]) < np.abs(somme[actifs]) * _PRECISION
+            resultat[actifs[finis]] = somme[actifs[finis]]
+            actifs = actifs[~finis]
+            if not len(actifs):
+                break
+    resultat[actifs] = somme[actifs]
+    return resultat * np.exp(-x + a * np.log(x) - _lgamma(a))
+
+
+def _fraction_continue(a: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Q(a, x) par la fraction continue de Lentz (x >= a + 1).
+    """
+    b = x + 1 - a
+    c = np.full(len(a), 1 / _MINUSCULE)
+    d = 1 / b
+    h = d.copy()
+    actifs = np.arange(len(a))
+    for i in range(1, _ITERATIONS_MAX):
+        an = -i * (i - a[actifs])
+        b[actifs] += 2
+        dd = an * d[actifs] + b[actifs]
+        dd = np.where(np.abs(dd) < _MINUSCULE, _MINUSCULE, dd)
+        cc = b[actifs] + an / c[actifs]
+        cc = np.where(np.abs(cc) < _MINUSCULE, _MINUSCULE, cc)
+        d[actifs] = 1 / dd
+        c[actifs] = cc
+        delta = d[actifs] * cc
+        h[actifs] *= delta
+        if i % 32 == 0:
+            actifs = actifs[np.abs(delta - 1) >= _PRECISION]
+            if not len(actifs):
+                break
+    return h * np.exp(-x + a * np.log(x) - _lgamma(a))
+
+
+def _quadrature(a: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Intégrale de la densité gamma(a) de x jusqu'à une borne où elle est négligeable, du côté
+    opposé au mode a - 1 : Q(a, x) si x > a - 1, -P(a, x) sinon (grands a).
+    """
+    a1 = a - 1
+    racine = np.sqrt(a1)
+    borne = np.where(x > a1, np.maximum(a1 + 11.5 * racine, x + 6 * racine),
+                     np.maximum(0, np.minimum(a1 - 7.5 * racine, x - 5 * racine)))
+    t = x[:, None] + (borne - x)[:, None] * _NOEUDS
+    # t^(a-1) e^-t / ((a-1)^(a-1) e^-(a-1)), écrit a1 (log(1 + u) - u) pour éviter la compensation
+    u = t / a1[:, None] - 1
+    densite = np.exp(a1[:, None] * (np.log1p(u) - u))
+    # (a-1)^(a-1) e^-(a-1) / Gamma(a) par la série de Stirling (a - 1 >= 99)
+    normalisation = np.exp(-0.5 * np.log(2 * np.pi * a1) - 1 / (12 * a1) + 1 / (360 * a1 ** 3) - 1 / (1260 * a1 ** 5))
+    return (densite @ _POIDS) * (borne - x) * normalisation
+
+
+def gamma_incomplete(a, x) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fonctions gamma incomplètes régularisées P(a, x) et Q(a, x) = 1 - P(a, x), élément par élément.
+
+    :param a: paramètres de forme (> 0)
+    :param x: bornes (>= 0)
+    :return: (P, Q), chacune calculée directement pour garder sa précision dans les queues
+    """
+    a, x = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(x, dtype=np.float64))
+    a, x = a.ravel(), x.ravel()
+    inferieure = np.zeros(len(a))
+    superieure = np.ones(len(a))
+
+    grands = (x > 0) & (a >= A_QUADRATURE)
+    integrale = _quadrature(a[grands], x[grands])
+    # l'intégrale donne directement la queue la plus petite, l'autre s'en déduit
+    inferieure[grands] = np.where(integrale > 0, 1 - integrale, -integrale)
+    superieure[grands] = np.where(integrale > 0, integrale, 1 + integrale)
+
+    serie = (x > 0) & (x < a + 1) & ~grands
+    fraction = (x >= a + 1) & ~grands
+    inferieure[serie] = _serie(a[serie], x[serie])
+    superieure[serie] = 1 - inferieure[serie]
+    superieure[fraction] = _fraction_continue(a[fraction], x[fraction])
+    inferieure[fraction] = 1 - superieure[fraction]
+    return np.clip(inferieure, 0, 1), np.clip(superieure, 0, 1)
+
+
+def p_valeurs_poisson(observes, attendus) -> np.ndarray:
+    """
+    p-valeurs exactes bilatérales de Poisson : 2 x min(P(X <= O), P(X >= O)) pour X ~ P(E), bornées à 1.
+
+    :param observes: cas observés O (entiers >= 0)
+    :param attendus: cas attendus E (> 0)
+    """
+    observes = np.asarray(observes, dtype=np.float64).ravel()
+    attendus = np.asarray(attendus, dtype=np.float64).ravel()
+    # P(X <= O) = Q(O + 1, E) ; P(X >= O) = P(O, E) (1 si O = 0)
+    _, au_plus = gamma_incomplete(observes + 1, attendus)
+    au_moins = np.ones(len(observes))
+    positifs = observes > 0
+    au_moins[positifs] = gamma_incomplete(observes[positifs], attendus[positifs])[0]
+    return np.minimum(2 * np.minimum(au_plus, au_moins), 1)
+
+
+def limites_entonnoir(attendus, z: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Limites basse et haute du SMR autour de 1 pour ``attendus`` cas attendus (transformation
+    racine carrée de Poisson : (1 -/+ z / (2 racine(E)))²).
+    """
+    ecart = z / (2 * np.sqrt(np.asarray(attendus, dtype=np.float64)))
+    return np.clip(1 - ecart, 0, None) ** 2, (1 + ecart) ** 2
+
+
+def z_robustes(valeurs: np.ndarray, axe: int = -1) -> np.ndarray:
+    """
+    z-scores robustes 0,6745 x (x - médiane) / MAD le long de ``axe`` (NaN ignorés ; NaN si MAD nulle).
+    """
+    mediane = np.nanmedian(valeurs, axis=axe, keepdims=True)
+    mad = np.nanmedian(np.abs(valeurs - mediane), axis=axe, keepdims=True)
+    return np.divide(FACTEUR_MAD * (valeurs - mediane), mad, out=np.full(valeurs.shape, np.nan), where=mad > 0)
+
+
+def _effectifs_par_strate(cube, positions: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Ntop et Npop par (pathologie, année, département, strate), une strate par (sexe, classe d'âge).
+    """
+    sexes = [s for s in cube.categories["libelle_sexe"] if s != TOUS_SEXES]
+    if not sexes:
+        return effectifs_par_age(cube, positions)
+    strates = [effectifs_par_age(cube, positions, sexe) for sexe in sexes]
+    return np.concatenate([s[0] for s in strates], axis=-1), np.concatenate([s[1] for s in strates], axis=-1)
+
+
+def _attendus(ntop_age: np.ndarray, npop_age: np.ndarray, ntop: np.ndarray, npop: np.ndarray):
+    """
+    Cas observés et attendus par (pathologie, année, département) : standardisation indirecte par
+    strate (dernier axe de ``ntop_age`` / ``npop_age``), ou taux bruts pour les (pathologie, année)
+    sans détail par âge.
+    """
+    taux_age = np.divide(ntop_age.sum(axis=2), npop_age.sum(axis=2), out=np.zeros(ntop_age.shape[:2] + ntop_age.shape[3:]),
+                         where=npop_age.sum(axis=2) > 0)
+    observes = ntop_age.sum(axis=-1).astype(np.float64)
+    attendus = (npop_age * taux_age[:, :, None, :]).sum(axis=-1)
+
+    taux_brut = np.divide(ntop.sum(axis=2), npop.sum(axis=2), out=np.zeros(ntop.shape[:2]), where=npop.sum(axis=2) > 0)
+    sans_age = (npop_age.sum(axis=(2, 3)) == 0)[:, :, None]
+    observes = np.where(sans_age, ntop, observes)
+    attendus = np.where(sans_age, npop * taux_brut[:, :, None], attendus)
+    return observes, attendus
+
+
+def detecter_anomalies(cube, pathologies: list[str] | None = None, cumul: bool = False) -> pd.DataFrame:
+    """
+    z-score robuste, SMR, p-valeur exacte de Poisson et limites de l'entonnoir de chaque
+    (pathologie, année, département), en un seul calcul sur les tableaux du cube.
+
+    :param pathologies: pathologies traitées (toutes celles du cube par défaut)
+    :param cumul: cumuler les années (une ligne par (pathologie, département), annee absente)
+    :return: DataFrame (pathologie, [annee,] dept, departement_nom, Ntop_totale, Npop_totale, prevalence_globale,
+             z_robuste, observes, attendus, smr, p_valeur, limite_basse_95, limite_haute_95, limite_basse_998,
+             limite_haute_998) des cellules où la pathologie a une population
+    """
+    noms = cube.categories["pathologie"] if pathologies is None else [p for p in pathologies if p in cube.index["pathologie"]]
+    positions = [cube.index["pathologie"][p] for p in noms]
+    if not positions:
+        return pd.DataFrame()
+
+    ntop = cube.ntop[positions].sum(axis=(3, 4))
+    npop = cube.npop[positions].sum(axis=(3, 4))
+    ntop_age, npop_age = _effectifs_par_strate(cube, positions)
+    if cumul:
+        ntop, npop = ntop.sum(axis=1, keepdims=True), npop.sum(axis=1, keepdims=True)
+        ntop_age, npop_age = ntop_age.sum(axis=1, keepdims=True), npop_age.sum(axis=1, keepdims=True)
+
+    presence = cube.presence_dept[positions][:, None, :] & (npop > 0)
+    prevalence = np.where(presence, np.divide(ntop, npop, out=np.zeros(npop.shape), where=npop > 0) * 100, np.nan)
+    z = z_robustes(prevalence, axe=2)
+    observes, attendus = _attendus(ntop_age, npop_age, ntop, npop)
+
+    p, a, d = np.nonzero(presence & (attendus > 0))
+    observes, attendus = observes[p, a, d], attendus[p, a, d]
+    stats = {
+        "pathologie": np.asarray(noms, dtype=object)[p],
+        "annee": np.asarray(cube.categories["annee"])[a],
+        "dept": np.asarray(cube.categories["dept"], dtype=object)[d],
+        "Ntop_totale": ntop[p, a, d],
+        "Npop_totale": npop[p, a, d],
+        "prevalence_globale": prevalence[p, a, d],
+        "z_robuste": z[p, a, d],
+        "observes": observes,
+        "attendus": attendus,
+        "smr": observes / attendus,
+        "p_valeur": p_valeurs_poisson(observes, attendus),
+    }
+    for niveau, quantile in NIVEAUX_ENTONNOIR.items():
+        stats[f"limite_basse_{niveau}"], stats[f"limite_haute_{niveau}"] = limites_entonnoir(attendus, quantile)
+
+    stats = pd.DataFrame(stats)
+    if cumul:
+        stats = stats.drop(columns="annee")
+    stats.insert(stats.columns.get_loc("dept") + 1, "departement_nom", stats["dept"].map(Conversion_donnees.departement))
+    return stats.round({"prevalence_globale": 3, "z_robuste": 3, "attendus": 1, "smr": 4, "limite_basse_95": 4,
+                        "limite_haute_95": 4, "limite_basse_998": 4, "limite_haute_998": 4})
+
+
+def anomalies_signalees(resultats: pd.DataFrame, seuil_robuste: float = SEUIL_ROBUSTE,
+                        seuil_p: float = 0.002) -> pd.DataFrame:
+    """
+    Cellules signalées par l'une des deux méthodes : |z_robuste| >= seuil_robuste, ou SMR hors de
+    l'entonnoir (p-valeur exacte <= seuil_p, 0,002 correspondant aux limites à 99,8 %).
+
+    :return: sous-ensemble de ``resultats`` avec la colonne ``methode`` (« z robuste », « SMR » ou « les deux »),
+             trié par p-valeur
+    """
+    if resultats.empty:
+        return resultats
+    robuste = resultats["z_robuste"].abs() >= seuil_robuste
+    smr = resultats["p_valeur"] <= seuil_p
+    signalees = resultats[robuste | smr].copy()
+    signalees["methode"] = np.select([robuste[robuste | smr] & smr[robuste | smr], robuste[robuste | smr]],
+                                     ["les deux", "z robuste"], "SMR")
+    return signalees.sort_values(["p_valeur", "z_robuste"], key=lambda c: c.abs() if c.name == "z_robuste" else c,
+                                 ascending=[True, False]).reset_index(drop=True)
@@ -0,0 +1,168 @@
+"""
+Intervalles de confiance par rééchantillonnage (bootstrap paramétrique) de la prévalence
+et du rang des départements, pour une pathologie ou pour toutes.
+
+Pour chaque département, ``tirages`` valeurs de Ntop sont tirées d'un coup dans une loi
+binomiale (Npop, Ntop / Npop) ou de Poisson (Ntop), en un seul appel numpy de forme
+(tirages, départements). Un département dont le Ntop dépasse le Npop (effectifs incohérents
+de la source) n'a pas de loi binomiale : ses tirages suivent alors la loi de Poisson (Ntop),
+ce qui garde l'intervalle centré sur la prévalence observée (au-delà de 100 %) plutôt que de
+le ramener à 100 % en bornant le taux. Chaque tirage donne une prévalence par département et un
+classement complet (rang 1 = prévalence la plus faible, comme ``classement_departements``) ;
+les bornes des intervalles sont des quantiles de ces tirages.
+
+Les effectifs viennent du cube du jeu (mêmes sommes que ``stats_par_departement``).
+Le générateur de chaque pathologie est dérivé de la graine et de son libellé : les
+résultats ne dépendent ni du nombre de processus, ni de l'ordre de calcul, ni des autres
+pathologies du jeu (un bloc du précalcul donne les mêmes intervalles que le jeu complet).
+"""
+
+from multiprocessing import Pool
+import zlib
+import numpy as np
+import pandas as pd
+from utils.conversion import Conversion_donnees
+
+MODELES = ("binomial", "poisson")
+
+
+def _tirer(ntop: np.ndarray, npop: np.ndarray, tirages: int, modele: str, rng: np.random.Generator) -> np.ndarray:
+    """
+    Prévalences (%) rééchantillonnées, de forme (tirages, départements).
+    """
+    if modele == "binomial":
+        # Ntop > Npop (cellules incohérentes de la source) : pas de loi binomiale, tirage de Poisson
+        incoherents = ntop > npop
+        taux = np.divide(ntop, npop, out=np.zeros(len(npop)), where=(npop > 0) & ~incoherents)
+        cas = rng.binomial(npop, taux, size=(tirages, len(npop)))
+        if incoherents.any():
+            cas[:, incoherents] = rng.poisson(ntop[incoherents], size=(tirages, int(incoherents.sum())))
+    elif modele == "poisson":
+        cas = rng.poisson(ntop, size=(tirages, len(ntop)))
+    else:
+        raise ValueError(f"Modèle inconnu : {modele} (attendu : {', '.join(MODELES)})")
+    return cas / npop * 100
+
+
+def _rangs(prevalences: np.ndarray) -> np.ndarray:
+    """
+    Rang de chaque colonne dans chaque ligne (1 = prévalence la plus faible).
+    """
+    rangs = np.empty(prevalences.shape, dtype=np.int64)
+    ordre = np.argsort(prevalences, axis=1, kind="stable")
+    np.put_along_axis(rangs, ordre, np.arange(1, prevalences.shape[1] + 1), axis=1)
+    return rangs
+
+
+def intervalles(ntop, npop, tirages: int = 1000, niveau: float = 0.95, modele: str = "binomial",
+                rng: np.random.Generator | None = None) -> dict:
+    """
+    Intervalles de confiance de la prévalence et du rang de chaque territoire.
+
+    :param ntop: Ntop par territoire
+    :param npop: Npop par territoire (strictement positifs)
+    :param tirages: nombre de rééchantillonnages
+    :param niveau: niveau de confiance des intervalles
+    :param modele: "binomial" (Ntop ~ B(Npop, Ntop / Npop), P(Ntop) si Ntop > Npop) ou "poisson" (Ntop ~ P(Ntop))
+    :return: dict de tableaux (prevalence, prevalence_basse, prevalence_haute, rang, rang_bas, rang_haut)
+    """
+    ntop = np.asarray(ntop, dtype=np.int64)
+    npop = np.asarray(npop, dtype=np.int64)
+    rng = np.random.default_rng() if rng is None else rng
+    alpha = (1 - niveau) / 2
+
+    prevalence = ntop / npop * 100
+    tirees = _tirer(ntop, npop, tirages, modele, rng)
+    bas, haut = np.quantile(tirees, [alpha, 1 - alpha], axis=0)
+    rangs_bas, rangs_hauts = np.quantile(_rangs(tirees), [alpha, 1 - alpha], axis=0, method="inverted_cdf")
+
+    return {
+        "prevalence": prevalence,
+        "prevalence_basse": bas,
+        "prevalence_haute": haut,
+        "rang": _rangs(prevalence[None, :])[0],
+        "rang_bas": rangs_bas.astype(np.int64),
+        "rang_haut": rangs_hauts.astype(np.int64),
+    }
+
+
+def _generateur(graine: int, pathologie: str) -> np.random.Generator:
+    return np.random.default_rng(np.random.SeedSequence(graine, spawn_key=(zlib.crc32(pathologie.encode("utf-8")),)))
+
+
+def _effectifs_departements(cube, pathologie: str) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """
+    Départements où la pathologie a des lignes (population non nulle) et leurs Ntop / Npop totaux.
+    """
+    i = cube.index["pathologie"][pathologie]
+    ntop, npop = cube.totaux(pathologie, ("dept",))
+    presents = np.flatnonzero(cube.presence_dept[i] & (npop > 0))
+    return [cube.categories["dept"][k] for k in presents], ntop[presents], npop[presents]
+
+
+def _tableau(depts: list[str], ntop, npop, resultat: dict) -> pd.DataFrame:
+    stats = pd.DataFrame({"Ntop_totale": ntop, "Npop_totale": npop, **resultat}, index=pd.Index(depts, name="dept"))
+    stats = stats.rename(columns={"prevalence": "prevalence_globale"})
+    stats["departement_nom"] = [Conversion_donnees.departement(d) for d in depts]
+    return stats.sort_values("rang").round(3)
+
+
+def _tache(tache: tuple) -> pd.DataFrame:
+    """
+    Intervalles d'une pathologie (exécuté dans un processus).
+    """
+    pathologie, depts, ntop, npop, tirages, niveau, modele, graine = tache
+    resultat = intervalles(ntop, npop, tirages, niveau, modele, _generateur(graine, pathologie))
+    return _tableau(depts, ntop, npop, resultat).reset_index().assign(pathologie=pathologie)
+
+
+def intervalles_departements(cube, pathologie: str, tirages: int = 1000, niveau: float = 0.95,
+                             modele: str = "binomial", graine: int = 0) -> pd.DataFrame:
+    """
+    Prévalence et rang de chaque département avec leurs intervalles de confiance, pour une pathologie.
+
+    :param cube: cube du jeu (``JeuDonnees.cube``)
+    :param graine: graine des tirages (mêmes résultats que ``intervalles_toutes_pathologies``)
+    :return: DataFrame indexé par dept, trié par rang (Ntop_totale, Npop_totale, prevalence_globale,
+             prevalence_basse, prevalence_haute, rang, rang_bas, rang_haut, departement_nom) ; vide si
+             la pathologie est absente
+    """
+    if pathologie not in cube.index["pathologie"]:
+        return pd.DataFrame()
+    depts, ntop, npop = _effectifs_departements(cube, pathologie)
+    if not depts:
+        return pd.DataFrame()
+    resultat = intervalles(ntop, npop, tirages, niveau, modele, _generateur(graine, pathologie))
+    return _tableau(depts, ntop, npop, resultat)
+
+
+def intervalles_toutes_pathologies(cube, pathologies: list[str] | None = None, tirages: int = 1000,
+                                   niveau: float = 0.95, modele: str = "binomial", graine: int = 0,
+                                   processus: int = 1) -> pd.DataFrame:
+    """
+    ``intervalles_departements`` pour plusieurs pathologies, réparties sur un pool de processus.
+
+    :param pathologies: pathologies traitées (toutes celles du cube par défaut)
+    :param processus: nombre de processus (1 : calcul dans le processus courant)
+    :return: DataFrame long (pathologie, dept, ...) ; les valeurs d'une pathologie sont celles
+             de ``intervalles_departements`` avec la même graine
+    """
+    pathologies = cube.categories["pathologie"] if pathologies is None else pathologies
+    taches = []
+    for pathologie in pathologies:
+        if pathologie not in cube.index["pathologie"]:
+            continue
+        depts, ntop, npop = _effectifs_departements(cube, pathologie)
+        if depts:
+            taches.append((pathologie, depts, ntop, npop, tirages, niveau, modele, graine))
+
+    if processus > 1 and len(taches) > 1:
+        with Pool(processus) as pool:
+            tableaux = pool.map(_tache, taches, chunksize=max(len(taches) // (processus * 4), 1))
+    else:
+        tableaux = [_tache(tache) for tache in taches]
+
+    if not tableaux:
+        return pd.DataFrame()
+    resultat = pd.concat(tableaux, ignore_index=True)
+    return resultat[["pathologie"] + [c for c in resultat.columns if c != "pathologie"]]
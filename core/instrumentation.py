@@ -0,0 +1,252 @@
+"""
+Instrumentation optionnelle des fonctions d'analyse (core/stats_pandas, core/stats_python).
+
+Chaque fonction décorée par ``@mesurer`` enregistre, quand l'instrumentation est active :
+- le temps d'exécution (horloge murale, appels imbriqués inclus)
+- le nombre de lignes parcourues : lignes de la table reçue en premier argument
+  (DataFrame, Table Arrow, base SQLite ou liste d'enregistrements), ou, pour les
+  chargeurs décorés par ``@mesurer(lignes=...)``, lignes du résultat produit
+- le pic d'allocation pendant l'appel (uniquement si tracemalloc est demandé, et pour les
+  seuls appels du thread principal : le pic de tracemalloc est global au processus, un appel
+  d'un autre thread, comme une tâche de l'ordonnanceur ou un script Streamlit, n'a pas de pic)
+
+Seules les ``MESURES_MAX`` dernières mesures sont conservées (un processus Streamlit lancé
+avec ANALYSE_PROFILAGE=1 ne les accumule pas indéfiniment).
+
+Désactivée (par défaut), l'enveloppe se limite à un test de drapeau avant l'appel.
+Activation par code (``activer()`` / ``session()``) ou par la variable d'environnement
+ANALYSE_PROFILAGE=1 (ou ANALYSE_PROFILAGE=tracemalloc pour mesurer aussi la mémoire).
+"""
+
+import functools
+import json
+from collections import deque
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_ACTIF = False
+_TRACEMALLOC = False
+
+MESURES_MAX = 100_000
+
+_MESURES = deque(maxlen=MESURES_MAX)
+_VERROU = threading.Lock()
+
+# Pile des pics absolus observés par les appels en cours du thread principal (appels imbriqués)
+_PILE_PICS = []
+
+
+def activer(avec_tracemalloc: bool = False):
+    """
+    Active l'enregistrement des mesures.
+
+    :param avec_tracemalloc: mesure aussi le pic d'allocation (ralentit les appels)
+    """
+    global _ACTIF, _TRACEMALLOC
+    _TRACEMALLOC = avec_tracemalloc
+    if avec_tracemalloc and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _ACTIF = True
+
+
+def desactiver():
+    """
+    Désactive l'enregistrement (les mesures déjà prises sont conservées).
+    """
+    global _ACTIF, _TRACEMALLOC
+    _ACTIF = False
+    if _TRACEMALLOC and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _TRACEMALLOC = False
+
+
+def est_actif() -> bool:
+    return _ACTIF
+
+
+def reinitialiser():
+    """
+    Supprime les mesures enregistrées.
+    """
+    with _VERROU:
+        _MESURES.clear()
+
+
+@contextmanager
+def session(avec_tracemalloc: bool = False):
+    """
+    Active l'instrumentation le temps d'un bloc ``with`` sur des mesures remises à zéro.
+    """
+    reinitialiser()
+    activer(avec_tracemalloc)
+    try:
+        yield
+    finally:
+        desactiver()
+
+
+# Types reconnus comme tables (module, classe) ; un module non importé ne peut pas en fournir
+_TYPES_TABLES = (("pandas", "DataFrame"), ("pyarrow", "Table"), ("core.stats_sql", "BaseEffectifs"))
+
+
+def _est_table(valeur) -> bool:
+    if isinstance(valeur, list):
+        return True
+    for module, classe in _TYPES_TABLES:
+        type_table = getattr(sys.modules.get(module), classe, None)
+        if type_table is not None and isinstance(valeur, type_table):
+            return True
+    return False
+
+
+def _nombre_de_lignes(args: tuple) -> int | None:
+    """
+    Lignes de la table passée en premier argument (None si ce n'est pas une table : chemin, valeur...).
+    """
+    if not args or not _est_table(args[0]):
+        return None
+    return len(args[0])
+
+
+def mesurer(fonction=None, *, lignes=None):
+    """
+    Décorateur : enregistre une mesure par appel lorsque l'instrumentation est active.
+
+    S'emploie seul (``@mesurer``) ou avec ``lignes`` (``@mesurer(lignes=len)``) pour les fonctions
+    qui ne reçoivent pas de table, comme les chargeurs : les lignes sont alors comptées sur le résultat.
+
+    :param lignes: fonction résultat -> nombre de lignes parcourues
+    """
+    if fonction is None:
+        return functools.partial(mesurer, lignes=lignes)
+
+    nom = f"{fonction.__module__.split('.')[-1]}.{fonction.__name__}"
+
+    @functools.wraps(fonction)
+    def enveloppe(*args, **kwargs):
+        if not _ACTIF:
+            return fonction(*args, **kwargs)
+
+        memoire = _TRACEMALLOC and tracemalloc.is_tracing() and threading.current_thread() is threading.main_thread()
+        if memoire:
+            pile = _PILE_PICS
+            courant, pic = tracemalloc.get_traced_memory()
+            if pile:
+                pile[-1] = max(pile[-1], pic)
+            tracemalloc.reset_peak()
+            pile.append(courant)
+
+        debut = time.perf_counter()
+        resultat = None
+        try:
+            resultat = fonction(*args, **kwargs)
+            return resultat
+        finally:
+            duree = time.perf_counter() - debut
+
+            pic_octets = None
+            if memoire:
+                pic_absolu = max(pile.pop(), tracemalloc.get_traced_memory()[1])
+                pic_octets = max(0, pic_absolu - courant)
+                if pile:
+                    pile[-1] = max(pile[-1], pic_absolu)
+
+            with _VERROU:
+                _MESURES.append({
+                    "fonction": nom,
+                    "temps_s": duree,
+                    "lignes": (_nombre_de_lignes(args) if lignes is None
+                               else lignes(resultat) if resultat is not None else None),
+                    "pic_memoire_octets": pic_octets,
+                })
+
+    return enveloppe
+
+
+def mesures() -> list[dict]:
+    """
+    Retourne une copie des mesures brutes (une par appel).
+    """
+    with _VERROU:
+        return list(_MESURES)
+
+
+def rapport() -> list[dict]:
+    """
+    Agrège les mesures par fonction, triées par temps cumulé décroissant.
+
+    Les temps sont inclusifs : une fonction qui en appelle une autre
+    (ex. classement_departements -> stats_par_departement) inclut son temps.
+    """
+    agregats = {}
+    for m in mesures():
+        a = agregats.setdefault(m["fonction"], {
+            "fonction": m["fonction"], "appels": 0, "temps_total_s": 0.0, "temps_max_s": 0.0,
+            "lignes_parcourues": 0, "pic_memoire_max_octets": None,
+        })
+        a["appels"] += 1
+        a["temps_total_s"] += m["temps_s"]
+        a["temps_max_s"] = max(a["temps_max_s"], m["temps_s"])
+        a["lignes_parcourues"] += m["lignes"] or 0
+        if m["pic_memoire_octets"] is not None:
+            a["pic_memoire_max_octets"] = max(a["pic_memoire_max_octets"] or 0, m["pic_memoire_octets"])
+
+    resultats = sorted(agregats.values(), key=lambda a: a["temps_total_s"], reverse=True)
+    for a in resultats:
+        a["temps_moyen_s"] = a["temps_total_s"] / a["appels"]
+
+    return resultats
+
+
+def exporter_json(chemin: str, details: bool = False):
+    """
+    Écrit le rapport agrégé (et les mesures brutes si details=True) au format JSON.
+    """
+    contenu = {"rapport": rapport()}
+    if details:
+        contenu["mesures"] = mesures()
+
+    with open(chemin, "w", encoding="utf-8") as f:
+        json.dump(contenu, f, ensure_ascii=False, indent=2)
+
+
+def metriques_texte() -> str:
+    """
+    Rapport agrégé au format texte d'exposition des métriques (type Prometheus).
+    """
+    series = [
+        ("analyse_appels_total", "counter", "Nombre d'appels", "appels"),
+        ("analyse_duree_secondes_total", "counter", "Temps cumulé (s)", "temps_total_s"),
+        ("analyse_duree_secondes_max", "gauge", "Temps maximal d'un appel (s)", "temps_max_s"),
+        ("analyse_lignes_parcourues_total", "counter", "Lignes parcourues", "lignes_parcourues"),
+        ("analyse_pic_memoire_octets_max", "gauge", "Pic d'allocation maximal (octets)", "pic_memoire_max_octets"),
+    ]
+
+    agregats = rapport()
+    lignes = []
+    for nom, type_metrique, aide, cle in series:
+        lignes.append(f"# HELP {nom} {aide}")
+        lignes.append(f"# TYPE {nom} {type_metrique}")
+        for a in agregats:
+            if a[cle] is not None:
+                lignes.append(f'{nom}{{fonction="{a["fonction"]}"}} {a[cle]}')
+
+    return "\n".join(lignes) + "\n"
+
+
+def exporter_metriques(chemin: str):
+    """
+    Écrit le rapport au format texte d'exposition des métriques.
+    """
+    with open(chemin, "w", encoding="utf-8") as f:
+        f.write(metriques_texte())
+
+
+# Activation par variable d'environnement
+_PROFILAGE = os.environ.get("ANALYSE_PROFILAGE", "").strip().lower()
+if _PROFILAGE and _PROFILAGE not in ("0", "non", "false"):
+    activer(avec_tracemalloc=(_PROFILAGE == "tracemalloc"))
@@ -0,0 +1,642 @@
+"""
+Jeu de données partagé en lecture seule pour le dashboard.
+
+Le DataFrame nettoyé par ``stats_pandas.charger_effectifs`` est chargé une fois par
+processus, trié par pathologie puis figé :
+- ``JeuDonnees.df`` et ``JeuDonnees.pathologie()`` renvoient des vues en copy-on-write :
+  une page qui modifie « son » DataFrame ne touche jamais les données partagées
+- un index par pathologie donne directement le bloc de lignes d'une pathologie
+  (les fonctions d'analyse ne parcourent plus que ce bloc)
+- un cube numpy (pathologie x année x département x sexe x âge) des effectifs Ntop / Npop,
+  avec leurs sommes cumulées sur les années : l'agrégat d'une période [debut, fin] est
+  une différence de deux cumuls, sans refiltrer les lignes ; les effectifs par
+  (pathologie, année, région) en sont tirés au chargement pour les vues régionales
+- un résumé du jeu (effectifs, cardinalités, totaux, séries par année, pathologie et
+  département) calculé au chargement, lu tel quel par la page de résumé global
+- un catalogue des dimensions (valeurs distinctes, bornes des années, classes d'âge
+  ordonnées, départements, régions et leurs noms, années et départements disponibles par
+  pathologie), lu par les widgets et les validations au lieu de parcourir les colonnes
+- la hiérarchie des pathologies (patho_niv1 > patho_niv2 > patho_niv3) en tables d'entiers,
+  avec les effectifs de chaque nœud par année : la navigation d'une catégorie vers ses
+  groupes et ses formes lit ces effectifs sans revenir aux lignes
+- la population standard (répartition nationale par âge) de la standardisation directe
+  des prévalences (``core/standardisation.py``)
+
+Les pages reçoivent ce jeu plutôt qu'un DataFrame brut.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from pathlib import Path
+from core.stats_pandas import charger_effectifs, classer_prevalences, z_scores_prevalence
+from core.standardisation import population_standard
+from utils.conversion import Conversion_donnees
+
+# Copy-on-write : natif à partir de pandas 3, à activer explicitement avant
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+class Cube:
+    """
+    Effectifs Ntop / Npop sur la grille complète des dimensions.
+
+    Les cellules absentes des données valent 0. Les tableaux sont en lecture seule.
+    La région n'est pas un axe du cube (un département appartient à une seule région) :
+    ``ntop_region`` / ``npop_region`` (pathologie x année x région) sont précalculés.
+    """
+
+    DIMENSIONS = ("pathologie", "annee", "dept", "libelle_sexe", "libelle_classe_age")
+
+    def __init__(self, df: pd.DataFrame):
+        ages_connus = Conversion_donnees.ORDRE_TRANCHES_AGE
+        ages_autres = sorted(set(df["libelle_classe_age"].unique()) - set(ages_connus))
+
+        categories = {
+            "pathologie": sorted(df["pathologie"].unique()),
+            "annee": sorted(df["annee"].unique().tolist()),
+            "dept": sorted(df["dept"].unique()),
+            "libelle_sexe": sorted(df["libelle_sexe"].unique()),
+            "libelle_classe_age": ages_connus + ages_autres,
+        }
+
+        codes = [pd.Categorical(df[d], categories=categories[d]).codes for d in self.DIMENSIONS]
+        forme = tuple(len(categories[d]) for d in self.DIMENSIONS)
+        position = np.ravel_multi_index(codes, forme)
+
+        self.ntop = np.bincount(position, weights=df["Ntop"].to_numpy(dtype=np.float64),
+                                minlength=int(np.prod(forme))).astype(np.int64).reshape(forme)
+        self.npop = np.bincount(position, weights=df["Npop"].to_numpy(dtype=np.float64),
+                                minlength=int(np.prod(forme))).astype(np.int64).reshape(forme)
+        self.ntop.setflags(write=False)
+        self.npop.setflags(write=False)
+
+        # Années présentes dans les lignes de chaque pathologie (une cellule à 0 n'est pas une absence)
+        self.presence = np.bincount(codes[0].astype(np.int64) * forme[1] + codes[1], minlength=forme[0] * forme[1]).reshape(forme[:2]) > 0
+        self.presence.setflags(write=False)
+        # Départements présents dans les lignes de chaque pathologie
+        self.presence_dept = np.bincount(codes[0].astype(np.int64) * forme[2] + codes[2], minlength=forme[0] * forme[2]).reshape(forme[0], forme[2]) > 0
+        self.presence_dept.setflags(write=False)
+
+        # Région de chaque département (colonne region des données), puis effectifs par région
+        regions = df[["dept", "region"]].drop_duplicates("dept")
+        region_par_dept = dict(zip(regions["dept"], regions["region"]))
+        categories["region"] = sorted(set(region_par_dept.values()))
+        position_region = {region: k for k, region in enumerate(categories["region"])}
+        self.region_dept = np.array([position_region[region_par_dept[d]] for d in categories["dept"]], dtype=np.int64)
+        appartenance = np.zeros((forme[2], len(categories["region"])), dtype=np.int64)
+        appartenance[np.arange(forme[2]), self.region_dept] = 1
+
+        self.ntop_region = self.ntop.sum(axis=(3, 4)) @ appartenance
+        self.npop_region = self.npop.sum(axis=(3, 4)) @ appartenance
+        self.presence_region = (self.presence_dept.astype(np.int64) @ appartenance) > 0
+        for tableau in (self.region_dept, self.ntop_region, self.npop_region, self.presence_region):
+            tableau.setflags(write=False)
+
+        self.categories = categories
+        self.index = {d: {valeur: i for i, valeur in enumerate(categories[d])} for d in self.DIMENSIONS + ("region",)}
+        self._cumuls = {}
+
+    def totaux(self, pathologie: str, axes: tuple[str, ...] = ()) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sommes de Ntop et Npop d'une pathologie, en conservant les dimensions ``axes``.
+
+        :param pathologie: nom de la pathologie
+        :param axes: dimensions conservées, parmi annee, dept, libelle_sexe, libelle_classe_age
+        :return: (ntop, npop) ; tableaux de forme (len(axes[0]), ...) ou scalaires si axes est vide
+        """
+        i = self.index["pathologie"][pathologie]
+        dimensions = self.DIMENSIONS[1:]
+        sommees = tuple(k for k, d in enumerate(dimensions) if d not in axes)
+        return self.ntop[i].sum(axis=sommees), self.npop[i].sum(axis=sommees)
+
+    def cumuls(self, pathologie: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sommes cumulées de Ntop et Npop sur les années, calculées à la première demande.
+
+        :return: (ntop, npop) de forme (nb_annees + 1, dept, sexe, âge) ; la ligne k
+                 cumule les k premières années (la ligne 0 est nulle)
+        """
+        cumuls = self._cumuls.get(pathologie)
+        if cumuls is None:
+            i = self.index["pathologie"][pathologie]
+            cumuls = []
+            for effectifs in (self.ntop[i], self.npop[i]):
+                cumul = np.zeros((effectifs.shape[0] + 1,) + effectifs.shape[1:], dtype=np.int64)
+                np.cumsum(effectifs, axis=0, out=cumul[1:])
+                cumul.setflags(write=False)
+                cumuls.append(cumul)
+            cumuls = self._cumuls.setdefault(pathologie, tuple(cumuls))
+        return cumuls
+
+    def bornes_periode(self, periode: tuple[int, int]) -> tuple[int, int]:
+        """
+        Positions [i0, i1) des années de la période [debut, fin] dans ``categories["annee"]``.
+        """
+        annees = self.categories["annee"]
+        return int(np.searchsorted(annees, periode[0], side="left")), int(np.searchsorted(annees, periode[1], side="right"))
+
+    def totaux_periode(self, pathologie: str, periode: tuple[int, int],
+                       axes: tuple[str, ...] = ()) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sommes de Ntop et Npop d'une pathologie sur la période [debut, fin], en conservant
+        les dimensions ``axes`` : différence de deux lignes des cumuls annuels.
+
+        :param pathologie: nom de la pathologie
+        :param periode: (debut, fin), bornes incluses
+        :param axes: dimensions conservées, parmi dept, libelle_sexe, libelle_classe_age
+        :return: (ntop, npop) ; tableaux de forme (len(axes[0]), ...) ou scalaires si axes est vide
+        """
+        i0, i1 = self.bornes_periode(periode)
+        dimensions = self.DIMENSIONS[2:]
+        sommees = tuple(k for k, d in enumerate(dimensions) if d not in axes)
+        return tuple((cumul[i1] - cumul[i0]).sum(axis=sommees) for cumul in self.cumuls(pathologie))
+
+    def stats_par_annee(self, pathologie: str, periode: tuple[int, int] | None = None,
+                        arrondi: bool = True) -> pd.DataFrame:
+        """
+        Équivalent de ``stats_pandas.stats_par_annee`` lu dans le cube (années où la
+        pathologie a des lignes, sur la période [debut, fin] si elle est fournie).
+
+        :param arrondi: arrondir à 3 décimales (la prévalence non arrondie sert aux variations)
+        """
+        i = self.index["pathologie"].get(pathologie)
+        if i is None:
+            return pd.DataFrame()
+
+        i0, i1 = self.bornes_periode(periode) if periode is not None else (0, len(self.categories["annee"]))
+        ntop, npop = self.totaux(pathologie, ("annee",))
+        presentes = np.flatnonzero(self.presence[i, i0:i1]) + i0
+        if len(presentes) == 0:
+            return pd.DataFrame()
+
+        stats = pd.DataFrame(
+            {"Ntop_totale": ntop[presentes], "Npop_totale": npop[presentes]},
+            index=pd.Index([self.categories["annee"][k] for k in presentes], name="annee"))
+
+        stats["prevalence_globale"] = (stats["Ntop_totale"] / stats["Npop_totale"]) * 100
+        stats.loc[stats["Npop_totale"] == 0, "prevalence_globale"] = None
+
+        return stats.round(3) if arrondi else stats
+
+    def stats_par_region(self, pathologie: str, periode: tuple[int, int] | None = None) -> pd.DataFrame:
+        """
+        Équivalent de ``stats_pandas.stats_par_region`` lu dans les effectifs régionaux précalculés
+        (régions où la pathologie a des lignes, sur la période [debut, fin] si elle est fournie).
+        """
+        i = self.index["pathologie"].get(pathologie)
+        if i is None:
+            return pd.DataFrame()
+
+        i0, i1 = self.bornes_periode(periode) if periode is not None else (0, len(self.categories["annee"]))
+        presentes = np.flatnonzero(self.presence_region[i])
+        regions = [self.categories["region"][k] for k in presentes]
+
+        stats = pd.DataFrame(
+            {"Ntop_totale": self.ntop_region[i, i0:i1].sum(axis=0)[presentes],
+             "Npop_totale": self.npop_region[i, i0:i1].sum(axis=0)[presentes]},
+            index=pd.Index(regions, name="region"))
+
+        stats["prevalence_globale"] = (stats["Ntop_totale"] / stats["Npop_totale"]) * 100
+        stats.loc[stats["Npop_totale"] == 0, "prevalence_globale"] = None
+        stats["region_nom"] = [Conversion_donnees.region(r) for r in regions]
+
+        return stats.round(3)
+
+    def classement_regions(self, pathologie: str) -> pd.DataFrame:
+        """
+        Équivalent de ``stats_pandas.classement_regions`` lu dans les effectifs régionaux.
+        """
+        return classer_prevalences(self.stats_par_region(pathologie), "region", "region_nom")
+
+    def z_score_prevalence_region(self, pathologie: str) -> pd.DataFrame:
+        """
+        Équivalent de ``stats_pandas.z_score_prevalence_region`` lu dans les effectifs régionaux.
+        """
+        stats = self.stats_par_region(pathologie)
+        if stats.empty:
+            return pd.DataFrame()
+        npop = stats["Npop_totale"].sum()
+        moyenne = round(stats["Ntop_totale"].sum() / npop * 100, 3) if npop else None
+        return z_scores_prevalence(stats, moyenne)
+
+
+class Catalogue:
+    """
+    Métadonnées des dimensions du jeu, construites une fois au chargement (depuis le cube)
+    ou relues dans le manifeste du magasin de résultats.
+    """
+
+    def __init__(self, dimensions: dict, departements: dict, disponibilite: dict, regions: dict | None = None):
+        """
+        :param dimensions: {dimension: valeurs distinctes ordonnées} (classes d'âge dans l'ordre des tranches)
+        :param departements: {code: nom du département}
+        :param disponibilite: {pathologie: {"annees": [...], "departements": [...]}} (valeurs présentes dans ses lignes)
+        :param regions: {code: nom de la région}
+        """
+        self.dimensions = dimensions
+        self.departements = departements
+        self.disponibilite = disponibilite
+        self.regions = regions or {}
+
+    @classmethod
+    def depuis_cube(cls, cube: Cube) -> "Catalogue":
+        categories = cube.categories
+        dimensions = {
+            "pathologie": list(categories["pathologie"]),
+            "annee": [int(a) for a in categories["annee"]],
+            "dept": [str(d) for d in categories["dept"]],
+            "libelle_sexe": list(categories["libelle_sexe"]),
+            "libelle_classe_age": list(categories["libelle_classe_age"]),
+            "region": [str(r) for r in categories["region"]],
+        }
+        disponibilite = {
+            pathologie: {
+                "annees": [dimensions["annee"][k] for k in np.flatnonzero(cube.presence[i])],
+                "departements": [dimensions["dept"][k] for k in np.flatnonzero(cube.presence_dept[i])],
+            }
+            for i, pathologie in enumerate(dimensions["pathologie"])
+        }
+        departements = {code: Conversion_donnees.departement(code) for code in dimensions["dept"]}
+        regions = {code: Conversion_donnees.region(code) for code in dimensions["region"]}
+        return cls(dimensions, departements, disponibilite, regions)
+
+    @classmethod
+    def depuis_dict(cls, donnees: dict) -> "Catalogue":
+        return cls(donnees["dimensions"], donnees["departements"], donnees["disponibilite"], donnees.get("regions"))
+
+    def en_dict(self) -> dict:
+        """
+        Forme sérialisable en JSON (manifeste du magasin de résultats).
+        """
+        return {"dimensions": self.dimensions, "departements": self.departements, "disponibilite": self.disponibilite,
+                "regions": self.regions}
+
+    @property
+    def pathologies(self) -> list[str]:
+        return self.dimensions["pathologie"]
+
+    @property
+    def annees(self) -> list[int]:
+        return self.dimensions["annee"]
+
+    @property
+    def classes_age(self) -> list[str]:
+        return self.dimensions["libelle_classe_age"]
+
+    @property
+    def sexes(self) -> list[str]:
+        return self.dimensions["libelle_sexe"]
+
+    @property
+    def bornes_annees(self) -> tuple[int, int] | None:
+        """
+        (première année, dernière année) du jeu, None s'il est vide.
+        """
+        annees = self.annees
+        return (annees[0], annees[-1]) if annees else None
+
+    def annees_pathologie(self, pathologie: str) -> list[int]:
+        return self.disponibilite.get(pathologie, {}).get("annees", [])
+
+    def departements_pathologie(self, pathologie: str) -> list[str]:
+        return self.disponibilite.get(pathologie, {}).get("departements", [])
+
+    def valider_pathologie(self, pathologie: str) -> str:
+        """
+        Retourne ``pathologie`` si elle est dans le jeu, lève ValueError sinon.
+        """
+        if pathologie not in self.disponibilite:
+            raise ValueError(f"Pathologie inconnue : {pathologie}")
+        return pathologie
+
+    def annees_periode(self, pathologie: str, periode: tuple[int, int]) -> list[int]:
+        """
+        Années de la période [debut, fin] où la pathologie a des lignes.
+        """
+        debut, fin = periode
+        return [a for a in self.annees_pathologie(pathologie) if debut <= a <= fin]
+
+
+class Hierarchie:
+    """
+    Hiérarchie des pathologies (patho_niv1 > patho_niv2 > patho_niv3) en tables d'entiers,
+    avec les effectifs Ntop / Npop de chaque nœud par année.
+
+    Les nœuds sont numérotés par niveau puis par parent : les nœuds d'un niveau et les enfants
+    d'un nœud sont des plages contiguës de codes (``bornes_niveaux``, ``debut_enfants``).
+    Un nœud qui a ses propres lignes dans les données (agrégat de catégorie ou de groupe)
+    reprend les effectifs de sa pathologie dans le cube : ils ne sont pas la somme de ses
+    enfants, un patient pouvant relever de plusieurs formes. Sinon (``agrege``), son Ntop est la
+    somme de ceux de ses enfants (majorant des patients distincts) et son Npop le plus grand
+    des leurs (la population de référence est la même pour toutes les pathologies).
+    """
+
+    NIVEAUX = ("patho_niv1", "patho_niv2", "patho_niv3")
+
+    def __init__(self, noeuds: pd.DataFrame, annees: list[int], ntop: np.ndarray, npop: np.ndarray,
+                 presence: np.ndarray):
+        """
+        :param noeuds: une ligne par code (dans l'ordre des codes) : niveau, libelle, parent (-1 pour une racine),
+                       pathologie (nom dans le jeu, None si le nœud n'a pas de lignes propres)
+        :param annees: années des colonnes de ``ntop``, ``npop`` et ``presence``
+        :param ntop: effectifs Ntop de forme (nœud, année)
+        :param npop: effectifs Npop de forme (nœud, année)
+        :param presence: années où le nœud (ou, s'il est agrégé, un de ses descendants) a des lignes
+        """
+        self.noeuds = noeuds
+        self.annees = annees
+        self.niveau = noeuds["niveau"].to_numpy(dtype=np.int8)
+        self.parent = noeuds["parent"].to_numpy(dtype=np.int32)
+        self.agrege = noeuds["pathologie"].isna().to_numpy()
+
+        # Codes ordonnés par (niveau, parent) : plages contiguës par niveau et par parent
+        self.bornes_niveaux = np.searchsorted(self.niveau, np.arange(1, len(self.NIVEAUX) + 2))
+        nb_enfants = np.bincount(self.parent[self.parent >= 0], minlength=len(noeuds))
+        premier = np.full(len(noeuds), len(noeuds), dtype=np.int64)
+        np.minimum.at(premier, self.parent[self.parent >= 0], np.flatnonzero(self.parent >= 0))
+        self.debut_enfants, self.nb_enfants = premier, nb_enfants
+
+        self.ntop, self.npop, self.presence = ntop, npop, presence
+        # Cumuls sur les années : l'agrégat d'une période est une différence de deux colonnes
+        self._cumuls = tuple(np.concatenate([np.zeros((len(noeuds), 1), dtype=np.int64), np.cumsum(t, axis=1)], axis=1)
+                             for t in (ntop, npop))
+        for tableau in (self.niveau, self.parent, self.agrege, self.debut_enfants, self.nb_enfants, self.ntop, self.npop, self.presence, *self._cumuls):
+            tableau.setflags(write=False)
+
+        self._codes = {}
+        for code, (niveau, libelle) in enumerate(zip(self.niveau, noeuds["libelle"])):
+            self._codes.setdefault((int(niveau), libelle), code)
+
+    @classmethod
+    def depuis_cube(cls, cube: Cube, chemins: pd.DataFrame | None = None) -> "Hierarchie":
+        """
+        :param cube: cube du jeu (effectifs des pathologies)
+        :param chemins: triplets distincts (patho_niv1, patho_niv2, patho_niv3) des lignes brutes ;
+                        sans eux, chaque pathologie du cube est une racine
+        """
+        pathologies = cube.index["pathologie"]
+
+        # Chemin de chaque triplet : niveaux renseignés, de la catégorie au niveau le plus précis
+        feuilles = set()
+        if chemins is not None:
+            for triplet in chemins[list(cls.NIVEAUX)].itertuples(index=False):
+                chemin = tuple(l for l in (str(v).strip() if isinstance(v, str) else "" for v in triplet) if l)
+                if chemin and chemin[-1] in pathologies:
+                    feuilles.add(chemin)
+        else:
+            feuilles = {(p,) for p in pathologies}
+
+        # Tous les préfixes (un groupe sans lignes propres reste le parent de ses formes)
+        tous = {chemin[:k] for chemin in feuilles for k in range(1, len(chemin) + 1)}
+
+        codes = {}
+        lignes = []
+        for niveau in range(1, len(cls.NIVEAUX) + 1):
+            du_niveau = sorted((c for c in tous if len(c) == niveau), key=lambda c: (codes.get(c[:-1], -1), c[-1]))
+            for chemin in du_niveau:
+                codes[chemin] = len(lignes)
+                lignes.append({"niveau": niveau, "libelle": chemin[-1], "parent": codes.get(chemin[:-1], -1),
+                               "pathologie": chemin[-1] if chemin in feuilles else None})
+        noeuds = pd.DataFrame(lignes, columns=["niveau", "libelle", "parent", "pathologie"])
+
+        # Effectifs par (pathologie, année) du cube, repris par les nœuds qui ont des lignes propres
+        par_annee = [t.sum(axis=(2, 3, 4)) for t in (cube.ntop, cube.npop)]
+        lignes_cube = np.array([pathologies.get(p, -1) if isinstance(p, str) else -1 for p in noeuds["pathologie"]],
+                               dtype=np.int64)
+        propres = lignes_cube >= 0
+        ntop, npop = (np.zeros((len(noeuds), len(cube.categories["annee"])), dtype=np.int64) for _ in range(2))
+        presence = np.zeros(ntop.shape, dtype=bool)
+        for cible, source in ((ntop, par_annee[0]), (npop, par_annee[1]), (presence, cube.presence)):
+            cible[propres] = source[lignes_cube[propres]]
+
+        # Nœuds sans lignes propres, du niveau le plus fin vers les catégories : Ntop des enfants sommés,
+        # population commune (pas de somme des Npop)
+        parent = noeuds["parent"].to_numpy()
+        niveau = noeuds["niveau"].to_numpy()
+        for n in range(len(cls.NIVEAUX), 1, -1):
+            enfants = np.flatnonzero((niveau == n) & ~propres[np.maximum(parent, 0)] & (parent >= 0))
+            np.add.at(ntop, parent[enfants], ntop[enfants])
+            np.maximum.at(npop, parent[enfants], npop[enfants])
+            np.logical_or.at(presence, parent[enfants], presence[enfants])
+
+        return cls(noeuds, [int(a) for a in cube.categories["annee"]], ntop, npop, presence)
+
+    @classmethod
+    def depuis_dict(cls, donnees: dict) -> "Hierarchie":
+        noeuds = pd.DataFrame(donnees["noeuds"], columns=["niveau", "libelle", "parent", "pathologie"])
+        return cls(noeuds, donnees["annees"], np.array(donnees["ntop"], dtype=np.int64).reshape(len(noeuds), -1),
+                   np.array(donnees["npop"], dtype=np.int64).reshape(len(noeuds), -1),
+                   np.array(donnees["presence"], dtype=bool).reshape(len(noeuds), -1))
+
+    def en_dict(self) -> dict:
+        """
+        Forme sérialisable en JSON (manifeste du magasin de résultats).
+        """
+        noeuds = self.noeuds.astype(object).where(self.noeuds.notna(), None)
+        return {"noeuds": noeuds.to_dict("records"), "annees": self.annees,
+                "ntop": self.ntop.tolist(), "npop": self.npop.tolist(), "presence": self.presence.tolist()}
+
+    def __len__(self) -> int:
+        return len(self.noeuds)
+
+    def code(self, libelle: str, niveau: int | None = None) -> int | None:
+        """
+        Code du nœud ``libelle`` (au niveau ``niveau``, ou au niveau le moins précis qui le contient).
+        """
+        niveaux = [niveau] if niveau is not None else range(1, len(self.NIVEAUX) + 1)
+        for n in niveaux:
+            code = self._codes.get((n, libelle))
+            if code is not None:
+                return code
+        return None
+
+    def codes_niveau(self, niveau: int) -> np.ndarray:
+        return np.arange(self.bornes_niveaux[niveau - 1], self.bornes_niveaux[niveau])
+
+    def enfants(self, code: int) -> np.ndarray:
+        if self.nb_enfants[code] == 0:
+            return np.arange(0)
+        debut = self.debut_enfants[code]
+        return np.arange(debut, debut + self.nb_enfants[code])
+
+    def chemin(self, code: int) -> list[str]:
+        """
+        Libellés de la catégorie jusqu'au nœud.
+        """
+        libelles = []
+        while code >= 0:
+            libelles.append(self.noeuds.at[code, "libelle"])
+            code = int(self.parent[code])
+        return libelles[::-1]
+
+    def effectifs(self, codes, periode: tuple[int, int] | None = None) -> pd.DataFrame:
+        """
+        Ntop / Npop / prévalence des nœuds ``codes`` sur la période [debut, fin] (toutes les années par défaut),
+        lus dans les effectifs précalculés.
+
+        :return: DataFrame indexé par code (niveau, libelle, agrege, nb_enfants, Ntop_totale, Npop_totale,
+                 prevalence_globale)
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        if periode is None:
+            i0, i1 = 0, len(self.annees)
+        else:
+            i0 = int(np.searchsorted(self.annees, periode[0], side="left"))
+            i1 = int(np.searchsorted(self.annees, periode[1], side="right"))
+        ntop, npop = ((cumul[codes, i1] - cumul[codes, i0]) for cumul in self._cumuls)
+
+        resultat = pd.DataFrame({
+            "niveau": self.niveau[codes],
+            "libelle": self.noeuds["libelle"].to_numpy()[codes],
+            "agrege": self.agrege[codes],
+            "nb_enfants": self.nb_enfants[codes],
+            "Ntop_totale": ntop,
+            "Npop_totale": npop,
+        }, index=pd.Index(codes, name="code"))
+        resultat["prevalence_globale"] = (resultat["Ntop_totale"] / resultat["Npop_totale"].where(resultat["Npop_totale"] != 0)) * 100
+        return resultat.round({"prevalence_globale": 3})
+
+    def detail(self, code: int | None = None, periode: tuple[int, int] | None = None) -> pd.DataFrame:
+        """
+        Effectifs des enfants de ``code`` (des catégories si ``code`` est None), par Ntop décroissant.
+        """
+        codes = self.codes_niveau(1) if code is None else self.enfants(code)
+        return self.effectifs(codes, periode).sort_values("Ntop_totale", ascending=False, kind="stable")
+
+    def stats_par_annee(self, code: int) -> pd.DataFrame:
+        """
+        Série annuelle d'un nœud (années où il a des lignes), comme ``Cube.stats_par_annee``.
+        """
+        presentes = np.flatnonzero(self.presence[code])
+        if len(presentes) == 0:
+            return pd.DataFrame()
+        stats = pd.DataFrame({"Ntop_totale": self.ntop[code, presentes], "Npop_totale": self.npop[code, presentes]},
+                             index=pd.Index([self.annees[k] for k in presentes], name="annee"))
+        stats["prevalence_globale"] = (stats["Ntop_totale"] / stats["Npop_totale"]) * 100
+        stats.loc[stats["Npop_totale"] == 0, "prevalence_globale"] = None
+        return stats.round(3)
+
+
+def resumer_jeu(df: pd.DataFrame, cube: Cube) -> dict:
+    """
+    Résumé du jeu de données, calculé une fois : les totaux viennent du cube, seules les
+    grandeurs qu'il ne contient pas (noms de départements, prévalences par ligne) relisent le DataFrame.
+
+    :return: dict avec "stats" (mêmes clés que ``Resume_Global.resume_global``), "cas_par_annee",
+             "volumes_pathologies" et "volumes_departements" (séries de Ntop, volumes décroissants)
+    """
+    total_cas = int(cube.ntop.sum())
+    total_population = int(cube.npop.sum())
+    prevalences = df.loc[df["prev"] != 0, "prev"]
+
+    cas_par_annee = pd.Series(cube.ntop.sum(axis=(0, 2, 3, 4)),
+                              index=pd.Index(cube.categories["annee"], name="annee"), name="Ntop")
+    volumes_pathologies = pd.Series(cube.ntop.sum(axis=(1, 2, 3, 4)),
+                                    index=pd.Index(cube.categories["pathologie"], name="pathologie"), name="Ntop")
+    volumes_departements = df.groupby("departement")["Ntop"].sum()
+
+    return {
+        "stats": {
+            "Nombre de lignes": len(df),
+            "Nombre de pathologies distinctes": len(cube.categories["pathologie"]),
+            "Nombre de départements distincts": len(volumes_departements),
+            "Nombre d'années distinctes": len(cube.categories["annee"]),
+            "Nombre total de cas": total_cas,
+            "Population totale": total_population,
+            "Prévalence globale (%)": round(total_cas / total_population * 100, 3) if total_population else 0.0,
+            "Prévalence moyenne (%)": round(prevalences.mean(), 3) if not prevalences.empty else 0.0,
+        },
+        "cas_par_annee": cas_par_annee,
+        "volumes_pathologies": volumes_pathologies.sort_values(ascending=False),
+        "volumes_departements": volumes_departements.sort_values(ascending=False),
+    }
+
+
+class JeuDonnees:
+    """
+    Poignée en lecture seule sur les données du dashboard, partagée entre les sessions.
+    """
+
+    def __init__(self, df: pd.DataFrame, chemins: pd.DataFrame | None = None, standard: pd.Series | None = None):
+        """
+        :param df: données nettoyées par ``stats_pandas.charger_effectifs``
+        :param chemins: triplets distincts (patho_niv1, patho_niv2, patho_niv3) des lignes brutes
+                        (voir ``chemins_pathologies``) ; sans eux, la hiérarchie n'a qu'un niveau
+        :param standard: population standard de la standardisation sur l'âge ; par défaut la répartition
+                         par âge de ce jeu (à transmettre au jeu d'une seule pathologie pour garder le même standard)
+        """
+        # Tri stable : dans chaque bloc, les lignes gardent leur ordre et leurs index d'origine
+        df = df.sort_values("pathologie", kind="stable")
+
+        pathologies = df["pathologie"].to_numpy()
+        debuts = np.flatnonzero(np.r_[True, pathologies[1:] != pathologies[:-1]])
+        fins = np.r_[debuts[1:], len(df)]
+        self._blocs = {pathologies[d]: slice(d, f) for d, f in zip(debuts, fins)}
+
+        self._df = df
+        self._vide = df.iloc[0:0]
+        self.cube = Cube(df)
+        self.resume = resumer_jeu(df, self.cube)
+        self.catalogue = Catalogue.depuis_cube(self.cube)
+        self.hierarchie = Hierarchie.depuis_cube(self.cube, chemins)
+        self.standard = population_standard(self.cube) if standard is None else standard
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """
+        Données complètes (vue copy-on-write, sans copie des colonnes).
+        """
+        return self._df.copy(deep=False)
+
+    @property
+    def pathologies(self) -> list[str]:
+        return self.catalogue.pathologies
+
+    @property
+    def annees(self) -> list[int]:
+        return self.catalogue.annees
+
+    def bloc(self, nom: str) -> slice | None:
+        """
+        Positions des lignes d'une pathologie dans ``df`` (tranche contiguë), None si elle est absente.
+        """
+        return self._blocs.get(nom)
+
+    def pathologie(self, nom: str) -> pd.DataFrame:
+        """
+        Lignes d'une pathologie (vue copy-on-write) ; DataFrame vide si elle est absente.
+
+        Les fonctions de stats_pandas donnent le même résultat sur ce bloc que sur ``df``.
+        """
+        bloc = self._blocs.get(nom)
+        if bloc is None:
+            return self._vide.copy(deep=False)
+        return self._df.iloc[bloc].copy(deep=False)
+
+
+def chemins_pathologies(parquet_path=None) -> pd.DataFrame:
+    """
+    Triplets distincts (patho_niv1, patho_niv2, patho_niv3) de effectifs.parquet, lus en
+    dictionnaires Arrow (seules les trois colonnes sont décodées).
+
+    :param parquet_path: autre fichier parquet au même format (par défaut data/effectifs.parquet)
+    """
+    if parquet_path is None:
+        parquet_path = Path(__file__).parent.parent / "data" / "effectifs.parquet"
+    niveaux = list(Hierarchie.NIVEAUX)
+    table = pq.read_table(parquet_path, columns=niveaux, read_dictionary=niveaux)
+    return table.group_by(niveaux).aggregate([]).to_pandas().astype(object)
+
+
+def charger_jeu_donnees(parquet_path=None) -> JeuDonnees:
+    """
+    Charge et nettoie effectifs.parquet puis construit le jeu partagé.
+
+    :param parquet_path: autre fichier parquet au même format (par défaut data/effectifs.parquet)
+    """
+    return JeuDonnees(charger_effectifs(parquet_path), chemins_pathologies(parquet_path))
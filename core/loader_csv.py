@@ -3,61 +3,89 @@ import urllib.request
 import utils.conversion as conversion
 
 
-def charger_effectifs() -> list[dict]:
+URL_EFFECTIFS = "https://www.data.gouv.fr/api/1/datasets/r/5f71ba43-afc8-43a0-b306-dafe29940f9c"
 
+
+def nettoyer_lignes(lecteur_csv) -> list[dict]:
     """
-    Charge le fichier effectifs.csv depuis data.gouv.fr
-    et retourne une liste de dictionnaires nettoyés.
-    """
+    Filtre et nettoie les lignes brutes du fichier effectifs.csv
+    (itérable de dictionnaires, ex. csv.DictReader, ou lignes typées lues
+    dans effectifs.parquet : valeurs manquantes à None).
 
-    url = "https://www.data.gouv.fr/api/1/datasets/r/5f71ba43-afc8-43a0-b306-dafe29940f9c"
+    :param lecteur_csv: itérable de lignes brutes
+    :return: liste de dictionnaires nettoyés
+    """
 
     #les données sont enregistrées ici
     donnees = []
     conv = conversion.Conversion_donnees()
 
-    with urllib.request.urlopen(url) as response:
-        lignes = response.read().decode("utf-8-sig").splitlines()
-        lecteur_csv = csv.DictReader(lignes, delimiter=";")
+    #Code et nom de département calculés une fois par valeur brute de "dept"
+    departements = {}
+
+    for l in lecteur_csv:
+
+        #Exlusion des lignes agrégées non exploitables
+        if l["patho_niv1"] == "Total consommants tous régimes":
+            continue
+
+        if l["top"] == "POP_TOT_IND":
+            continue
+
+        if l["dept"] == "999":
+            continue
+
+        #Exclusion des lignes incomplètes
+        if l["Ntop"] in ("", None) or l["prev"] in ("", None):
+            continue
+
+        try:
+
+
+            dept = departements.get(l["dept"])
+            if dept is None:
+                dept = departements[l["dept"]] = (l["dept"].strip().upper(), conv.departement(l["dept"]))
+            code_departement, departement = dept
+            pathologie, niveau_patho = conv.pathologie(l)
 
-    
-        for l in lecteur_csv:
-
-            #Exlusion des lignes agrégées non exploitables
-            if l["patho_niv1"] == "Total consommants tous régimes":
-                continue
-
-            if l["top"] == "POP_TOT_IND":
-                continue
-
-            if l["dept"] == "999":
-                continue 
-
-            #Exclusion des lignes incomplètes
-            if not l["Ntop"] or not l["prev"]:
-                continue
-            
-            try:
-                
-
-                departement = conv.departement(l["dept"])
-                pathologie, niveau_patho = conv.pathologie(l)
-
-                donnees.append({
-                    "Annee" : int(l["annee"]),
-                    "Pathologie": pathologie,
-                    "Niveau_pathologie": niveau_patho,
-                    "Age" : l["libelle_classe_age"],
-                    "Sexe" : l["libelle_sexe"],
-                    "Code_departement": l["dept"].strip().upper(),
-                    "Departement": departement,
-                    "Ntop": int(l["Ntop"]),
-                    "Npop": int(l["Npop"]),
-                    "prev": float(l["prev"])
-                })
-
-            except ValueError:
-                #Ignore les lignes avec données non convertibles
-                continue
+            donnees.append({
+                "Annee" : int(l["annee"]),
+                "Pathologie": pathologie,
+                "Niveau_pathologie": niveau_patho,
+                "Age" : l["libelle_classe_age"],
+                "Sexe" : l["libelle_sexe"],
+                "Code_departement": code_departement,
+                "Code_region": str(l.get("region") or "").strip(),
+                "Departement": departement,
+                "Ntop": int(l["Ntop"]),
+                "Npop": int(l["Npop"]),
+                "prev": float(l["prev"])
+            })
+
+        except (ValueError, TypeError):
+            #Ignore les lignes avec données non convertibles ou manquantes
+            continue
 
     return donnees
+
+
+def charger_effectifs(chemin: str | None = None) -> list[dict]:
+
+    """
+    Charge le fichier effectifs.csv depuis data.gouv.fr
+    et retourne une liste de dictionnaires nettoyés.
+
+    :param chemin: fichier CSV local au même format (ex. data/echantillon_effectifs.csv),
+        à la place du téléchargement
+    :return: liste de dictionnaires nettoyés
+    """
+
+    if chemin is not None:
+        with open(chemin, "r", encoding="utf-8-sig", newline="") as f:
+            return nettoyer_lignes(csv.DictReader(f, delimiter=";"))
+
+    with urllib.request.urlopen(URL_EFFECTIFS) as response:
+        lignes = response.read().decode("utf-8-sig").splitlines()
+        lecteur_csv = csv.DictReader(lignes, delimiter=";")
+
+        return nettoyer_lignes(lecteur_csv)
@@ -0,0 +1,84 @@
+"""
+Chargement de effectifs.parquet pour le cœur Python pur (``core/stats_python``).
+
+Le fichier est parcouru par lots (``ParquetFile.iter_batches``) : seules les colonnes
+utiles sont décodées, les lignes agrégées (population totale, « Total consommants »,
+France entière) sont écartées dans Arrow, puis chaque lot est converti en
+dictionnaires et nettoyé par ``loader_csv.nettoyer_lignes``. Les enregistrements ont
+donc exactement les champs de ``loader_csv.charger_effectifs`` (Annee, Pathologie,
+Niveau_pathologie, Age, Sexe, Code_departement, Code_region, Departement, Ntop, Npop, prev).
+
+La mémoire utilisée par le parcours est bornée par la taille d'un lot ; seule la
+liste finale de ``charger_effectifs`` contient tout le jeu.
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from core.loader_csv import nettoyer_lignes
+
+COLONNES = ["annee", "patho_niv1", "patho_niv2", "patho_niv3", "libelle_classe_age",
+            "libelle_sexe", "region", "dept", "top", "Ntop", "Npop", "prev"]
+TAILLE_LOT = 65_536
+
+
+def _chemin(chemin: str | Path | None) -> Path:
+    if chemin is None:
+        chemin = Path(__file__).parent.parent / "data" / "effectifs.parquet"
+    chemin = Path(chemin)
+    if not chemin.exists():
+        raise FileNotFoundError(f"{chemin} non trouvé !")
+    return chemin
+
+
+def _prefiltrer(lot: pa.RecordBatch) -> pa.RecordBatch:
+    """
+    Écarte dans Arrow les lignes que ``nettoyer_lignes`` exclut de toute façon
+    (une valeur manquante garde la ligne, comme une chaîne vide du CSV).
+    """
+    garder = pc.and_(
+        pc.fill_null(pc.not_equal(lot.column("patho_niv1"), "Total consommants tous régimes"), True),
+        pc.fill_null(pc.not_equal(lot.column("top"), "POP_TOT_IND"), True),
+    )
+    if pa.types.is_string(lot.schema.field("dept").type) or pa.types.is_large_string(lot.schema.field("dept").type):
+        garder = pc.and_(garder, pc.fill_null(pc.not_equal(lot.column("dept"), "999"), True))
+    garder = pc.and_(garder, pc.and_(pc.is_valid(lot.column("Ntop")), pc.is_valid(lot.column("prev"))))
+    return lot.filter(garder)
+
+
+def iterer_lots(chemin: str | Path | None = None, taille_lot: int = TAILLE_LOT) -> Iterator[list[dict]]:
+    """
+    Parcourt effectifs.parquet et produit les enregistrements nettoyés lot par lot.
+
+    :param chemin: fichier parquet au format effectifs.parquet (par défaut data/effectifs.parquet)
+    :param taille_lot: nombre de lignes brutes lues à la fois
+    :return: itérateur de listes de dictionnaires nettoyés
+    """
+    fichier = pq.ParquetFile(_chemin(chemin))
+    for lot in fichier.iter_batches(batch_size=taille_lot, columns=COLONNES):
+        yield nettoyer_lignes(_prefiltrer(lot).to_pylist())
+
+
+def iterer_effectifs(chemin: str | Path | None = None, taille_lot: int = TAILLE_LOT) -> Iterator[dict]:
+    """
+    Enregistrements nettoyés un à un (agrégations en un seul passage, mémoire bornée).
+    """
+    for lignes in iterer_lots(chemin, taille_lot):
+        yield from lignes
+
+
+def charger_effectifs(chemin: str | Path | None = None, taille_lot: int = TAILLE_LOT,
+                      pathologies: set[str] | None = None) -> list[dict]:
+    """
+    Charge effectifs.parquet en liste de dictionnaires nettoyés, comme ``loader_csv.charger_effectifs``.
+
+    :param chemin: fichier parquet au format effectifs.parquet (par défaut data/effectifs.parquet)
+    :param taille_lot: nombre de lignes brutes lues à la fois
+    :param pathologies: pathologies à conserver (toutes par défaut) : seules leurs lignes sont gardées en mémoire
+    :return: liste de dictionnaires nettoyés
+    """
+    if pathologies is None:
+        return [ligne for lignes in iterer_lots(chemin, taille_lot) for ligne in lignes]
+    return [ligne for ligne in iterer_effectifs(chemin, taille_lot) if ligne["Pathologie"] in pathologies]
@@ -0,0 +1,389 @@
+"""
+Autocorrélation spatiale des prévalences départementales : I de Moran global et
+indicateurs locaux (LISA), avec p-valeurs par permutations.
+
+Voisinage : deux départements de ``data/departements.geojson`` sont voisins s'ils ont un
+sommet de contour en commun (contiguïté « reine »). La matrice d'adjacence est construite
+une fois par processus et gardée en format CSR (``indptr``, ``indices``) ; les poids sont
+normalisés par ligne (1 / nombre de voisins), le décalage spatial Wz est donc la moyenne
+des voisins.
+
+Toutes les séries (une colonne par pathologie x année) sont traitées ensemble : le
+produit creux Wz s'applique à une matrice (départements, séries), et chaque lot de
+permutations est une seule somme sur les arêtes d'une matrice (départements,
+permutations x séries).
+
+Une cellule sans population (département absent pour la pathologie ou l'année) est
+retirée de la série : W est restreinte aux départements présents de chaque colonne et
+ses lignes sont de nouveau normalisées (moyenne des seuls voisins présents), les
+permutations ne mélangent que les départements présents et ses valeurs locales sont
+NaN. I est multiplié par n / S0 (S0 : départements présents ayant au moins un voisin
+présent), les départements isolés (outre-mer) n'ayant pas de ligne de poids.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from utils.conversion import Conversion_donnees
+
+SEUIL_LISA = 0.05
+ELEMENTS_PAR_LOT = 4_000_000
+
+
+class Adjacence:
+    """
+    Matrice d'adjacence creuse (CSR) des départements, poids normalisés par ligne.
+    """
+
+    def __init__(self, codes: list[str], indptr: np.ndarray, indices: np.ndarray):
+        """
+        :param codes: codes des départements, dans l'ordre des lignes
+        :param indptr: début des voisins de chaque ligne dans ``indices`` (longueur n + 1)
+        :param indices: positions des voisins, triées par ligne
+        """
+        self.codes = list(codes)
+        self.position = {code: i for i, code in enumerate(self.codes)}
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.degres = np.diff(self.indptr)
+        self.poids = np.repeat(1 / np.maximum(self.degres, 1), self.degres)
+        self.lignes = np.repeat(np.arange(len(self.codes)), self.degres)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @classmethod
+    def depuis_paires(cls, codes: list[str], paires) -> "Adjacence":
+        """
+        Adjacence symétrique à partir de paires (i, j) de positions voisines.
+        """
+        voisins = [set() for _ in codes]
+        for i, j in paires:
+            if i != j:
+                voisins[i].add(j)
+                voisins[j].add(i)
+        indptr = np.concatenate([[0], np.cumsum([len(v) for v in voisins])])
+        indices = np.fromiter((j for v in voisins for j in sorted(v)), dtype=np.int64, count=int(indptr[-1]))
+        return cls(codes, indptr, indices)
+
+    def voisins(self, code: str) -> list[str]:
+        i = self.position[code]
+        return [self.codes[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def _sommer_lignes(self, par_arete: np.ndarray) -> np.ndarray:
+        """
+        Somme par ligne (département) de valeurs portées par les arêtes.
+        """
+        cumuls = np.concatenate([np.zeros((1,) + par_arete.shape[1:]), np.cumsum(par_arete, axis=0)])
+        return cumuls[self.indptr[1:]] - cumuls[self.indptr[:-1]]
+
+    def degres_presents(self, presentes: np.ndarray) -> np.ndarray:
+        """
+        Nombre de voisins présents de chaque département, pour chaque colonne.
+
+        :param presentes: masque (n, séries) des valeurs présentes
+        """
+        return self._sommer_lignes((presentes[self.lignes] & presentes[self.indices]).astype(np.float64))
+
+    def poids_presents(self, presentes: np.ndarray) -> np.ndarray:
+        """
+        Poids des arêtes restreints aux départements présents de chaque colonne, normalisés par ligne.
+
+        :param presentes: masque (n, séries) des valeurs présentes
+        :return: tableau (arêtes, séries) ; 0 pour une arête touchant un département manquant
+        """
+        aretes = presentes[self.lignes] & presentes[self.indices]
+        return aretes / np.maximum(self.degres_presents(presentes), 1)[self.lignes]
+
+    def decaler(self, valeurs: np.ndarray, poids: np.ndarray | None = None) -> np.ndarray:
+        """
+        Décalage spatial W x (moyenne des voisins) de chaque colonne de ``valeurs``.
+
+        :param valeurs: tableau (n,) ou (n, séries)
+        :param poids: poids des arêtes (arêtes, séries), par défaut ``self.poids``
+        :return: tableau de même forme ; 0 pour un département sans voisin
+        """
+        if poids is None:
+            poids = self.poids.reshape((-1,) + (1,) * (valeurs.ndim - 1))
+        return self._sommer_lignes(poids * valeurs[self.indices])
+
+    def forme_quadratique(self, valeurs: np.ndarray, poids: np.ndarray | None = None) -> np.ndarray:
+        """
+        z' W z de chaque colonne de ``valeurs`` (n, séries), ou (n, lots, séries), sommé directement sur les arêtes.
+
+        :param poids: poids des arêtes (arêtes, séries), par défaut ``self.poids``
+        """
+        if poids is None:
+            poids = np.broadcast_to(self.poids[:, None], (len(self.poids), valeurs.shape[-1]))
+        if valeurs.ndim == 3:
+            return np.einsum("em,elm,elm->lm", poids, valeurs[self.lignes], valeurs[self.indices])
+        return np.einsum("em,em,em->m", poids, valeurs[self.lignes], valeurs[self.indices])
+
+
+def _sommets(geometrie: dict):
+    polygones = geometrie["coordinates"] if geometrie["type"] == "MultiPolygon" else [geometrie["coordinates"]]
+    for polygone in polygones:
+        for anneau in polygone:
+            for x, y in anneau:
+                yield round(x, 6), round(y, 6)
+
+
+@lru_cache(maxsize=None)
+def adjacence_departements(chemin: str | None = None) -> Adjacence:
+    """
+    Adjacence des départements du fichier GeoJSON (sommet commun), construite une fois par processus.
+
+    :param chemin: fichier GeoJSON des départements (par défaut data/departements.geojson)
+    """
+    if chemin is None:
+        chemin = Path(__file__).parent.parent / "data" / "departements.geojson"
+    with open(chemin, "r", encoding="utf-8") as f:
+        entites = json.load(f)["features"]
+
+    codes = sorted(e["properties"]["code"] for e in entites)
+    position = {code: i for i, code in enumerate(codes)}
+    par_sommet = {}
+    for entite in entites:
+        i = position[entite["properties"]["code"]]
+        for sommet in _sommets(entite["geometry"]):
+            par_sommet.setdefault(sommet, set()).add(i)
+
+    paires = {(i, j) for departements in par_sommet.values() if len(departements) > 1
+              for i in departements for j in departements if i < j}
+    return Adjacence.depuis_paires(codes, paires)
+
+
+def _centrer(valeurs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Écarts à la moyenne de chaque colonne (0 pour une valeur manquante) et masque des valeurs présentes.
+    """
+    presentes = ~np.isnan(valeurs)
+    effectifs = presentes.sum(axis=0)
+    moyennes = np.divide(np.where(presentes, valeurs, 0).sum(axis=0), effectifs,
+                         out=np.zeros(valeurs.shape[1]), where=effectifs > 0)
+    return np.where(presentes, valeurs - moyennes, 0.0), presentes
+
+
+def _lots(permutations: int, taille_permutation: int) -> list[int]:
+    """
+    Découpe des permutations en lots d'au plus ``ELEMENTS_PAR_LOT`` valeurs tirées.
+    """
+    par_lot = max(ELEMENTS_PAR_LOT // max(taille_permutation, 1), 1)
+    return [min(par_lot, permutations - debut) for debut in range(0, permutations, par_lot)]
+
+
+def _permuter_presents(rng: np.random.Generator, presentes: np.ndarray, lot: int) -> np.ndarray:
+    """
+    ``lot`` permutations des départements présents de chaque colonne entre eux (un manquant
+    reste à sa place) ; les colonnes de même masque de présence partagent leurs permutations.
+
+    :return: positions (lot, n, séries)
+    """
+    n, series = presentes.shape
+    ordres = np.empty((lot, n, series), dtype=np.int64)
+    masques, groupes = np.unique(presentes.T, axis=0, return_inverse=True)
+    for g, masque in enumerate(masques):
+        ordre = np.broadcast_to(np.arange(n), (lot, n)).copy()
+        ordre[:, masque] = rng.permuted(np.broadcast_to(np.flatnonzero(masque), (lot, int(masque.sum()))), axis=1)
+        ordres[:, :, groupes.reshape(-1) == g] = ordre[:, :, None]
+    return ordres
+
+
+def _p_valeur(extremes_hauts: np.ndarray, extremes_bas: np.ndarray, permutations: int) -> np.ndarray:
+    """
+    p-valeur par permutations, sur la queue du côté de la valeur observée.
+    """
+    return (np.minimum(extremes_hauts, extremes_bas) + 1) / (permutations + 1)
+
+
+def moran_global(adjacence: Adjacence, valeurs: np.ndarray, permutations: int = 999, graine: int = 0) -> dict:
+    """
+    I de Moran global de chaque colonne de ``valeurs``, avec p-valeur par permutations.
+
+    :param valeurs: tableau (départements, séries) dans l'ordre de ``adjacence.codes`` (NaN : manquant)
+    :param permutations: nombre de permutations des départements (0 : pas de p-valeur)
+    :return: dict de tableaux par série (moran_i, esperance, p_valeur, departements)
+    """
+    z, presentes = _centrer(np.asarray(valeurs, dtype=np.float64))
+    n, series = z.shape
+    poids = adjacence.poids_presents(presentes)
+    # I = (n / S0) z'Wz / z'z, S0 = somme des poids (départements présents ayant un voisin présent)
+    s0 = poids.sum(axis=0)
+    denominateur = (z ** 2).sum(axis=0) * s0 / np.maximum(presentes.sum(axis=0), 1)
+    valides = denominateur > 0
+
+    moran = np.full(series, np.nan)
+    moran[valides] = adjacence.forme_quadratique(z, poids)[valides] / denominateur[valides]
+
+    p_valeur = np.full(series, np.nan)
+    if permutations:
+        rng = np.random.default_rng(graine)
+        hauts, bas = np.zeros(series), np.zeros(series)
+        for lot in _lots(permutations, max(len(adjacence.indices), n) * series):
+            permutes = z[_permuter_presents(rng, presentes, lot), np.arange(series)].transpose(1, 0, 2)
+            tires = adjacence.forme_quadratique(permutes, poids)
+            tires = np.divide(tires, denominateur, out=np.zeros_like(tires), where=valides)
+            hauts += (tires >= moran).sum(axis=0)
+            bas += (tires <= moran).sum(axis=0)
+        p_valeur[valides] = _p_valeur(hauts, bas, permutations)[valides]
+
+    return {"moran_i": moran, "esperance": -1 / (presentes.sum(axis=0) - 1).clip(min=1),
+            "p_valeur": p_valeur, "departements": presentes.sum(axis=0)}
+
+
+def lisa(adjacence: Adjacence, valeurs: np.ndarray, permutations: int = 999, graine: int = 0) -> dict:
+    """
+    Indicateurs locaux de Moran (LISA) de chaque département pour chaque colonne de ``valeurs``.
+
+    Les p-valeurs sont obtenues par permutations conditionnelles : pour chaque département,
+    sa valeur est fixée et ses k voisins présents sont remplacés par des départements tirés
+    parmi les autres départements présents. Un même tirage sert à tous les départements
+    (les k premiers départements d'une permutation des présents, le département lui-même
+    sauté), ce qui garde chaque lot de permutations vectoriel.
+
+    :return: dict de tableaux (départements, séries) : z, decalage, i_local, p_valeur
+    """
+    z, presentes = _centrer(np.asarray(valeurs, dtype=np.float64))
+    n, series = z.shape
+    m2 = np.divide((z ** 2).sum(axis=0), presentes.sum(axis=0), out=np.zeros(series), where=presentes.any(axis=0))
+    echelle = np.divide(z, m2, out=np.zeros_like(z), where=m2 > 0)
+
+    decalage = adjacence.decaler(z, adjacence.poids_presents(presentes))
+    i_local = echelle * decalage
+
+    p_valeur = np.full((n, series), np.nan)
+    if permutations:
+        rng = np.random.default_rng(graine)
+        # nombre de voisins présents de chaque département, pour chaque colonne
+        degres = adjacence.degres_presents(presentes)
+        k_max = int(degres.max(initial=0))
+        departements = np.arange(n)[None, :, None, None]
+        # présents d'abord (dans l'ordre des lignes), pour lire les présents permutés en tête
+        presents_en_tete = np.argsort(~presentes, axis=0, kind="stable")[None]
+        hauts, bas = np.zeros((n, series)), np.zeros((n, series))
+        for lot in _lots(permutations, n * (k_max + 1) * series):
+            # k_max + 1 premiers présents tirés : les k premiers autres que le département lui-même
+            tirages = np.take_along_axis(_permuter_presents(rng, presentes, lot), presents_en_tete, axis=1)[:, :k_max + 1]
+            autres = tirages[:, None, :, :] != departements
+            retenus = autres & (np.cumsum(autres, axis=2) <= degres[None, :, None, :])
+            sommes = np.einsum("likm,lkm->lim", retenus.astype(np.float64), z[tirages, np.arange(series)])
+            tires = np.divide(sommes, degres, out=np.zeros_like(sommes), where=degres > 0) * echelle
+            hauts += (tires >= i_local).sum(axis=0)
+            bas += (tires <= i_local).sum(axis=0)
+        p_valeur = _p_valeur(hauts, bas, permutations)
+
+    for tableau in (decalage, i_local, p_valeur):
+        tableau[~presentes] = np.nan
+    return {"z": np.where(presentes, z, np.nan), "decalage": decalage, "i_local": i_local, "p_valeur": p_valeur}
+
+
+def groupes_lisa(z: np.ndarray, decalage: np.ndarray, p_valeur: np.ndarray, seuil: float = SEUIL_LISA) -> np.ndarray:
+    """
+    Groupe de chaque département : « Haut-Haut », « Bas-Bas », « Haut-Bas », « Bas-Haut »
+    (valeur du département - moyenne de ses voisins) si p_valeur <= seuil, « Non significatif » sinon.
+    """
+    groupes = np.select(
+        [(z > 0) & (decalage > 0), (z < 0) & (decalage < 0), (z > 0) & (decalage <= 0), (z < 0) & (decalage >= 0)],
+        ["Haut-Haut", "Bas-Bas", "Haut-Bas", "Bas-Haut"], "Non significatif")
+    return np.where(p_valeur <= seuil, groupes, "Non significatif")
+
+
+def prevalences_spatiales(cube, adjacence: Adjacence) -> np.ndarray:
+    """
+    Prévalence (%) de chaque (département, pathologie, année), départements dans l'ordre de ``adjacence``.
+
+    :return: tableau (départements, pathologies, années) ; NaN sans population ou hors du cube
+    """
+    ntop = cube.ntop.sum(axis=(3, 4))
+    npop = cube.npop.sum(axis=(3, 4))
+    prevalences = np.full((len(adjacence),) + ntop.shape[:2], np.nan)
+    for i, code in enumerate(adjacence.codes):
+        d = cube.index["dept"].get(code)
+        if d is not None:
+            valides = cube.presence_dept[:, d][:, None] & (npop[:, :, d] > 0)
+            prevalences[i] = np.divide(ntop[:, :, d], npop[:, :, d], out=np.full(valides.shape, np.nan), where=valides) * 100
+    return prevalences
+
+
+def moran_toutes_pathologies(cube, adjacence: Adjacence | None = None, permutations: int = 999,
+                             graine: int = 0) -> pd.DataFrame:
+    """
+    I de Moran de la prévalence départementale pour chaque (pathologie, année) du cube, en un seul calcul.
+
+    :return: DataFrame (pathologie, annee, moran_i, esperance, p_valeur, departements) des cellules présentes
+    """
+    adjacence = adjacence_departements() if adjacence is None else adjacence
+    prevalences = prevalences_spatiales(cube, adjacence)
+    nb_pathologies, nb_annees = prevalences.shape[1:]
+    resultat = moran_global(adjacence, prevalences.reshape(len(adjacence), -1), permutations, graine)
+
+    p, a = np.divmod(np.arange(nb_pathologies * nb_annees), nb_annees)
+    stats = pd.DataFrame({
+        "pathologie": np.asarray(cube.categories["pathologie"], dtype=object)[p],
+        "annee": np.asarray(cube.categories["annee"])[a],
+        **resultat,
+    })
+    return stats[cube.presence.reshape(-1) & (stats["departements"] > 1).to_numpy()].reset_index(drop=True).round(4)
+
+
+def _series_pathologie(cube, pathologie: str, adjacence: Adjacence) -> tuple[np.ndarray, list]:
+    """
+    Prévalences d'une pathologie : une colonne par année, plus la période complète en dernière colonne.
+    """
+    i = cube.index["pathologie"][pathologie]
+    ntop = cube.ntop[i].sum(axis=(2, 3))
+    npop = cube.npop[i].sum(axis=(2, 3))
+    ntop = np.concatenate([ntop, ntop.sum(axis=0, keepdims=True)])
+    npop = np.concatenate([npop, npop.sum(axis=0, keepdims=True)])
+    valeurs = np.full((len(adjacence), ntop.shape[0]), np.nan)
+    for k, code in enumerate(adjacence.codes):
+        d = cube.index["dept"].get(code)
+        if d is not None and cube.presence_dept[i, d]:
+            valeurs[k] = np.divide(ntop[:, d], npop[:, d], out=np.full(ntop.shape[0], np.nan), where=npop[:, d] > 0) * 100
+    return valeurs, list(cube.categories["annee"]) + [None]
+
+
+def moran_pathologie(cube, pathologie: str, adjacence: Adjacence | None = None, permutations: int = 999,
+                     graine: int = 0) -> pd.DataFrame:
+    """
+    I de Moran d'une pathologie pour chaque année et sur toute la période (annee = « Toutes »).
+    """
+    if pathologie not in cube.index["pathologie"]:
+        return pd.DataFrame()
+    adjacence = adjacence_departements() if adjacence is None else adjacence
+    valeurs, annees = _series_pathologie(cube, pathologie, adjacence)
+    stats = pd.DataFrame({"annee": [str(a) if a is not None else "Toutes" for a in annees],
+                          **moran_global(adjacence, valeurs, permutations, graine)})
+    return stats[stats["departements"] > 1].reset_index(drop=True).round(4)
+
+
+def lisa_pathologie(cube, pathologie: str, adjacence: Adjacence | None = None, annee: int | None = None,
+                    permutations: int = 999, graine: int = 0, seuil: float = SEUIL_LISA) -> pd.DataFrame:
+    """
+    Indicateurs locaux de Moran d'une pathologie, pour une année ou sur toute la période.
+
+    :return: DataFrame (dept, departement_nom, prevalence_globale, decalage, i_local, p_valeur, groupe)
+             des départements où la pathologie a une population ; ``decalage`` est la moyenne des
+             écarts des départements voisins à la moyenne des départements
+    """
+    if pathologie not in cube.index["pathologie"]:
+        return pd.DataFrame()
+    adjacence = adjacence_departements() if adjacence is None else adjacence
+    valeurs, annees = _series_pathologie(cube, pathologie, adjacence)
+    if annee not in annees:
+        return pd.DataFrame()
+    colonne = valeurs[:, [annees.index(annee)]]
+    resultat = lisa(adjacence, colonne, permutations, graine)
+
+    stats = pd.DataFrame({
+        "dept": adjacence.codes,
+        "departement_nom": [Conversion_donnees.departement(code) for code in adjacence.codes],
+        "prevalence_globale": colonne[:, 0],
+        "decalage": resultat["decalage"][:, 0],
+        "i_local": resultat["i_local"][:, 0],
+        "p_valeur": resultat["p_valeur"][:, 0],
+    })
+    stats["groupe"] = groupes_lisa(resultat["z"][:, 0], stats["decalage"].to_numpy(), stats["p_valeur"].to_numpy(), seuil)
+    return stats.dropna(subset=["prevalence_globale"]).reset_index(drop=True).round(4)
@@ -0,0 +1,175 @@
+"""
+Standardisation directe sur l'âge des prévalences du cube (``core.jeu_donnees.Cube``).
+
+La prévalence brute d'un département dépend de la structure par âge de sa population :
+un département âgé a mécaniquement plus de cas de pathologies liées à l'âge. La
+prévalence standardisée applique les taux par classe d'âge du département à une
+population de référence commune, la répartition nationale par âge :
+
+    prévalence standardisée = somme_a poids_a x Ntop_a / Npop_a
+
+Les classes d'âge sont celles de ``Conversion_donnees.ORDRE_TRANCHES_AGE`` (les lignes
+« tous âges » et « tous sexes » sont des agrégats, écartées pour ne pas compter deux fois
+les mêmes patients). Une classe d'âge sans population dans une cellule est écartée et
+les poids restants renormalisés ; ``couverture`` donne la part des poids utilisée.
+
+Les taux de toutes les cellules (pathologie, année, département) sont obtenus par un
+seul produit matriciel des taux par âge (pathologie x année x département x âge) avec
+le vecteur des poids, sans boucle sur les départements.
+"""
+
+import numpy as np
+import pandas as pd
+from utils.conversion import Conversion_donnees
+
+TOUS_SEXES = "tous sexes"
+
+
+def _positions(cube, sexe: str | None = None) -> tuple[list[int], list[int]]:
+    """
+    Positions dans le cube des sexes retenus (hommes et femmes, ou ``sexe``) et des classes d'âge.
+    """
+    index_sexe = cube.index["libelle_sexe"]
+    if sexe is None:
+        sexes = [i for valeur, i in index_sexe.items() if valeur != TOUS_SEXES]
+    else:
+        sexes = [index_sexe[sexe]] if sexe in index_sexe else []
+    index_age = cube.index["libelle_classe_age"]
+    ages = [index_age[a] for a in Conversion_donnees.ORDRE_TRANCHES_AGE if a in index_age]
+    return sexes, ages
+
+
+def population_standard(cube, annees: list[int] | None = None) -> pd.Series:
+    """
+    Répartition nationale de la population par classe d'âge (poids de somme 1), population standard
+    de la standardisation directe.
+
+    La population d'une cellule (année, département, sexe, âge) est la même pour toutes les
+    pathologies : elle est lue une fois par cellule (maximum sur les pathologies du cube).
+
+    :param annees: années de référence (toutes par défaut)
+    :return: Series des poids, indexée par classe d'âge
+    """
+    sexes, ages = _positions(cube)
+    population = cube.npop.max(axis=0)
+    if annees is not None:
+        population = population[[cube.index["annee"][a] for a in annees if a in cube.index["annee"]]]
+    effectifs = population[:, :, sexes][..., ages].sum(axis=(0, 1, 2)).astype(np.float64)
+    total = effectifs.sum()
+    poids = effectifs / total if total else effectifs
+    return pd.Series(poids, index=pd.Index([cube.categories["libelle_classe_age"][a] for a in ages],
+                                           name="libelle_classe_age"), name="poids")
+
+
+def effectifs_par_age(cube, pathologies=slice(None), sexe: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Ntop et Npop par (pathologie, année, département, âge), sexes retenus sommés.
+
+    :param pathologies: positions des pathologies dans le cube (toutes par défaut)
+    :return: (ntop, npop) de forme (pathologie, année, département, âge)
+    """
+    sexes, ages = _positions(cube, sexe)
+    return tuple(t[pathologies][..., sexes, :].sum(axis=-2)[..., ages] for t in (cube.ntop, cube.npop))
+
+
+def taux_standardises(ntop: np.ndarray, npop: np.ndarray, poids) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Prévalences standardisées (%) de toutes les cellules : taux par âge (dernier axe) x poids.
+
+    :param ntop: effectifs Ntop, dernier axe = classes d'âge
+    :param npop: effectifs Npop, même forme
+    :param poids: poids de la population standard par classe d'âge
+    :return: (taux, couverture) de la forme de ``ntop`` sans son dernier axe ; taux NaN sans aucune population
+    """
+    poids = np.asarray(poids, dtype=np.float64)
+    valides = npop > 0
+    taux_age = np.divide(ntop, npop, out=np.zeros(npop.shape, dtype=np.float64), where=valides)
+
+    couverture = valides @ poids
+    taux = np.divide(taux_age @ poids, couverture, out=np.full(couverture.shape, np.nan), where=couverture > 0) * 100
+    return taux, couverture
+
+
+def _poids(cube, standard: pd.Series) -> np.ndarray:
+    """
+    Poids de ``standard`` dans l'ordre des classes d'âge du cube retenues (0 pour une classe absente).
+    """
+    _, ages = _positions(cube)
+    libelles = [cube.categories["libelle_classe_age"][a] for a in ages]
+    return standard.reindex(libelles, fill_value=0.0).to_numpy(dtype=np.float64)
+
+
+def prevalences_standardisees(cube, standard: pd.Series | None = None, sexe: str | None = None) -> pd.DataFrame:
+    """
+    Prévalence standardisée de chaque (pathologie, année, département) où la pathologie a des lignes.
+
+    :param standard: population standard (``population_standard(cube)`` par défaut)
+    :param sexe: standardiser sur un seul sexe (hommes et femmes par défaut)
+    :return: DataFrame (pathologie, annee, dept, prevalence_standardisee, couverture)
+    """
+    standard = population_standard(cube) if standard is None else standard
+    taux, couverture = taux_standardises(*effectifs_par_age(cube, sexe=sexe), _poids(cube, standard))
+
+    p, a, d = np.nonzero(cube.presence[:, :, None] & cube.presence_dept[:, None, :] & ~np.isnan(taux))
+    categories = cube.categories
+    return pd.DataFrame({
+        "pathologie": np.asarray(categories["pathologie"], dtype=object)[p],
+        "annee": np.asarray(categories["annee"])[a],
+        "dept": np.asarray(categories["dept"], dtype=object)[d],
+        "prevalence_standardisee": taux[p, a, d],
+        "couverture": couverture[p, a, d],
+    }).round({"prevalence_standardisee": 3, "couverture": 3})
+
+
+def _effectifs_periode(cube, pathologie: str, periode: tuple[int, int] | None, sexe: str | None):
+    i = cube.index["pathologie"].get(pathologie)
+    if i is None:
+        return None
+    i0, i1 = cube.bornes_periode(periode) if periode is not None else (0, len(cube.categories["annee"]))
+    ntop, npop = effectifs_par_age(cube, i, sexe)
+    return i, ntop[i0:i1].sum(axis=0), npop[i0:i1].sum(axis=0)
+
+
+def stats_par_departement_standardise(cube, pathologie: str, standard: pd.Series | None = None,
+                                      periode: tuple[int, int] | None = None, sexe: str | None = None) -> pd.DataFrame:
+    """
+    Prévalences brute et standardisée sur l'âge par département pour une pathologie
+    (sur la période [debut, fin] si elle est fournie).
+
+    :return: DataFrame indexé par dept (Ntop_totale, Npop_totale, prevalence_brute, prevalence_standardisee,
+             couverture, departement_nom) ; effectifs et prévalence brute sur les mêmes cellules que le taux standardisé
+    """
+    effectifs = _effectifs_periode(cube, pathologie, periode, sexe)
+    if effectifs is None:
+        return pd.DataFrame()
+    i, ntop, npop = effectifs
+    standard = population_standard(cube) if standard is None else standard
+    taux, couverture = taux_standardises(ntop, npop, _poids(cube, standard))
+
+    presents = np.flatnonzero(cube.presence_dept[i])
+    depts = [cube.categories["dept"][k] for k in presents]
+    stats = pd.DataFrame({
+        "Ntop_totale": ntop[presents].sum(axis=1),
+        "Npop_totale": npop[presents].sum(axis=1),
+        "prevalence_standardisee": taux[presents],
+        "couverture": couverture[presents],
+    }, index=pd.Index(depts, name="dept"))
+
+    stats.insert(2, "prevalence_brute", (stats["Ntop_totale"] / stats["Npop_totale"].where(stats["Npop_totale"] != 0)) * 100)
+    stats["departement_nom"] = [Conversion_donnees.departement(d) for d in depts]
+
+    return stats.round(3)
+
+
+def prevalence_nationale_standardisee(cube, pathologie: str, standard: pd.Series | None = None,
+                                      periode: tuple[int, int] | None = None, sexe: str | None = None) -> float | None:
+    """
+    Prévalence standardisée sur l'âge de la France entière (départements sommés par classe d'âge).
+    """
+    effectifs = _effectifs_periode(cube, pathologie, periode, sexe)
+    if effectifs is None:
+        return None
+    _, ntop, npop = effectifs
+    standard = population_standard(cube) if standard is None else standard
+    taux, _ = taux_standardises(ntop.sum(axis=0), npop.sum(axis=0), _poids(cube, standard))
+    return None if np.isnan(taux) else round(float(taux), 3)
@@ -0,0 +1,675 @@
+"""
+Cœur d'analyse Arrow : mêmes fonctions que ``core/stats_pandas`` sur une ``pyarrow.Table``.
+
+- le parquet est lu et nettoyé sans passer par pandas ; les colonnes texte sont des
+  tableaux dictionnaire (pathologie, département, sexe, classe d'âge) : les opérations
+  sur le texte (nettoyage, nom du département) portent sur les valeurs distinctes, et
+  un filtre ``colonne == valeur`` compare les indices entiers du dictionnaire
+- les filtres et agrégations (``pyarrow.compute``, ``Table.group_by().aggregate()``)
+  s'exécutent dans Arrow ; seuls les petits résultats agrégés sont convertis en
+  pandas, où sont appliqués les mêmes arrondis et tris que dans stats_pandas
+  (mêmes formes de retour)
+
+Utilisation :
+    table = stats_arrow.charger_effectifs("data/effectifs.parquet")
+    stats_arrow.classement_departements(table, "Diabète")
+"""
+
+import math
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from core import stats_pandas
+from core.instrumentation import mesurer
+from utils import conversion
+
+COLONNES_TEXTE = ["patho_niv1", "patho_niv2", "patho_niv3", "libelle_classe_age", "libelle_sexe", "dept", "top"]
+TOTAL_CONSOMMANTS = "Total consommants tous régimes"
+# Nombre décimal éventuellement entouré d'espaces (équivalent de pd.to_numeric)
+_NOMBRE = r"^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$"
+
+
+# Chargement
+
+def _par_valeur(colonne: pa.ChunkedArray, fonction) -> pa.ChunkedArray:
+    """
+    Applique ``fonction`` aux valeurs distinctes d'une colonne dictionnaire puis redistribue
+    le résultat sur les lignes (directement sur la colonne si elle n'est pas un dictionnaire).
+    """
+    if not pa.types.is_dictionary(colonne.type):
+        return fonction(colonne)
+    return pa.chunked_array([pc.take(fonction(morceau.dictionary), morceau.indices) for morceau in colonne.chunks])
+
+
+def _texte(colonne: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Texte sans espaces autour, chaîne vide pour une valeur manquante.
+    """
+    texte = _par_valeur(colonne, lambda v: pc.utf8_trim_whitespace(pc.cast(v, pa.large_string())))
+    return pc.fill_null(texte, "")
+
+
+def _numerique(colonne: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Colonne numérique ; pour une colonne texte, les valeurs non numériques deviennent manquantes.
+    """
+    if pa.types.is_integer(colonne.type) or pa.types.is_floating(colonne.type):
+        return colonne
+    texte = pc.cast(colonne, pa.large_string())
+    valide = pc.match_substring_regex(texte, _NOMBRE)
+    return pc.cast(pc.utf8_trim_whitespace(pc.if_else(valide, texte, None)), pa.float64())
+
+
+def _dictionnaire(colonne: pa.ChunkedArray) -> pa.ChunkedArray:
+    if pa.types.is_dictionary(colonne.type):
+        return colonne
+    return pc.dictionary_encode(colonne)
+
+
+def pathologie_la_plus_precise(table: pa.Table) -> pa.ChunkedArray:
+    """
+    Colonne ``pathologie`` de stats_pandas : patho_niv3 si renseigné, sinon patho_niv2, sinon patho_niv1.
+    """
+    niv3, niv2, niv1 = [_texte(table.column(nom)) for nom in ("patho_niv3", "patho_niv2", "patho_niv1")]
+    return pc.if_else(pc.not_equal(niv3, ""), niv3, pc.if_else(pc.not_equal(niv2, ""), niv2, niv1))
+
+
+def nettoyer_effectifs(table: pa.Table) -> pa.Table:
+    """
+    Filtre et nettoie des lignes brutes de effectifs.parquet comme ``stats_pandas.nettoyer_effectifs``.
+
+    :param table: Table Arrow des colonnes ``stats_pandas.COLONNES_ENTETE``
+    :return: Table Arrow nettoyée (colonnes texte en dictionnaire)
+    """
+    table = table.rename_columns([nom.strip() for nom in table.column_names]).combine_chunks()
+
+    numeriques = {nom: _numerique(table.column(nom)) for nom in ("annee", "Ntop", "Npop", "prev")}
+
+    # Exclusion des lignes agrégées non exploitables et des lignes incomplètes
+    niv1, niv2, niv3 = [
+        pc.fill_null(_par_valeur(table.column(nom), lambda v: pc.match_substring(v, TOTAL_CONSOMMANTS)), False)
+        for nom in ("patho_niv1", "patho_niv2", "patho_niv3")
+    ]
+    garder = pc.invert(pc.or_(pc.or_(niv1, niv2), niv3))
+    garder = pc.and_(garder, pc.fill_null(
+        _par_valeur(table.column("top"), lambda v: pc.not_equal(v, "POP_TOT_IND")), True))
+    garder = pc.and_(garder, pc.fill_null(
+        _par_valeur(table.column("dept"), lambda v: pc.not_equal(pc.cast(v, pa.large_string()), "999")), True))
+    for nom in ("annee", "Ntop", "prev"):
+        garder = pc.and_(garder, pc.is_valid(numeriques[nom]))
+
+    colonnes = {nom: pc.filter(colonne, garder) for nom, colonne in numeriques.items()}
+    lignes = table.filter(garder)
+
+    # Nom du département calculé une fois par code distinct
+    dept = pc.dictionary_encode(_texte(lignes.column("dept")))
+    departement = pa.chunked_array([
+        pc.take(pa.array([conversion.Conversion_donnees.departement(code) for code in morceau.dictionary.to_pylist()],
+                         pa.large_string()), morceau.indices)
+        for morceau in dept.chunks
+    ], pa.large_string())
+
+    return pa.table({
+        "annee": pc.cast(colonnes["annee"], pa.int64(), safe=False),
+        "libelle_classe_age": _dictionnaire(lignes.column("libelle_classe_age")),
+        "libelle_sexe": _dictionnaire(lignes.column("libelle_sexe")),
+        "dept": dept,
+        "Ntop": pc.cast(colonnes["Ntop"], pa.int64(), safe=False),
+        "Npop": pc.cast(colonnes["Npop"], pa.int64(), safe=False),
+        "prev": pc.cast(colonnes["prev"], pa.float64()),
+        "pathologie": pc.dictionary_encode(pathologie_la_plus_precise(lignes)),
+        "departement": pc.dictionary_encode(departement),
+    })
+
+
+@mesurer(lignes=len)
+def charger_effectifs(parquet_path: str | Path | None = None) -> pa.Table:
+    """
+    Lit effectifs.parquet (colonnes texte lues directement en dictionnaire) et le nettoie.
+
+    :param parquet_path: autre fichier parquet au même format (par défaut data/effectifs.parquet)
+    :return: Table Arrow nettoyée
+    """
+    if parquet_path is None:
+        parquet_path = Path(__file__).parent.parent / "data" / "effectifs.parquet"
+    parquet_path = Path(parquet_path)
+    if not parquet_path.exists():
+        raise FileNotFoundError(f"{parquet_path} non trouvé !")
+
+    schema = pq.read_schema(parquet_path)
+    texte = [nom for nom in COLONNES_TEXTE
+             if nom in schema.names and (pa.types.is_string(schema.field(nom).type)
+                                         or pa.types.is_large_string(schema.field(nom).type))]
+    table = pq.read_table(parquet_path, columns=stats_pandas.COLONNES_ENTETE, read_dictionary=texte)
+    return nettoyer_effectifs(table)
+
+
+# Filtres et conversions
+
+def _egal(table: pa.Table, colonne: str, valeur) -> pa.ChunkedArray:
+    """
+    Masque ``colonne == valeur`` ; pour une colonne dictionnaire, comparaison des indices entiers.
+    """
+    morceaux = []
+    for morceau in table.column(colonne).chunks:
+        if pa.types.is_dictionary(morceau.type):
+            position = pc.index(morceau.dictionary, valeur).as_py()
+            morceaux.append(pc.equal(morceau.indices, pa.scalar(position, morceau.indices.type)))
+        else:
+            morceaux.append(pc.equal(morceau, valeur))
+    return pa.chunked_array(morceaux, pa.bool_())
+
+
+def _filtrer(table: pa.Table, sexe=None, age=None, departement=None, annee=None,
+             pathologie=None, periode=None) -> pa.Table:
+    masques = [_egal(table, colonne, valeur) for colonne, valeur in (
+        ("pathologie", pathologie), ("libelle_sexe", sexe), ("libelle_classe_age", age),
+        ("departement", departement), ("annee", annee)) if valeur is not None]
+    if periode is not None:
+        masques += [pc.greater_equal(table.column("annee"), periode[0]),
+                    pc.less_equal(table.column("annee"), periode[1])]
+    if not masques:
+        return table
+    masque = masques[0]
+    for autre in masques[1:]:
+        masque = pc.and_(masque, autre)
+    return table.filter(masque)
+
+
+def _distincts(table: pa.Table, colonne: str) -> int:
+    """
+    Nombre de valeurs distinctes ; pour une colonne dictionnaire, des indices (dictionnaires unifiés).
+    """
+    valeurs = table.unify_dictionaries().column(colonne)
+    if pa.types.is_dictionary(valeurs.type):
+        valeurs = pa.chunked_array([morceau.indices for morceau in valeurs.chunks], valeurs.type.index_type)
+    return pc.count_distinct(valeurs).as_py()
+
+
+def _en_pandas(table: pa.Table) -> pd.DataFrame:
+    """
+    Petit résultat agrégé -> DataFrame (dictionnaires décodés, mêmes types que stats_pandas).
+    """
+    return pd.DataFrame({nom: table.column(nom).to_pylist() for nom in table.column_names})
+
+
+def _valeur(scalaire) -> float:
+    valeur = scalaire.as_py()
+    return math.nan if valeur is None else valeur
+
+
+def _totaux_par(table: pa.Table, cles: list[str]) -> pd.DataFrame:
+    """
+    Sommes de Ntop et Npop par ``cles``, triées par clé.
+    """
+    stats = table.group_by(cles).aggregate([("Ntop", "sum"), ("Npop", "sum")])
+    stats = _en_pandas(stats).rename(columns={"Ntop_sum": "Ntop_totale", "Npop_sum": "Npop_totale"})
+    return stats[cles + ["Ntop_totale", "Npop_totale"]].sort_values(cles).reset_index(drop=True)
+
+
+def _prevalence(stats: pd.DataFrame, colonne: str = "prevalence_globale") -> pd.DataFrame:
+    stats[colonne] = (stats["Ntop_totale"] / stats["Npop_totale"]) * 100
+    stats.loc[stats["Npop_totale"] == 0, colonne] = None
+    return stats
+
+
+# Statistiques globales
+
+@mesurer
+def nombre_de_lignes(table: pa.Table) -> int:
+    return table.num_rows
+
+
+@mesurer
+def pathologies_distinctes(table: pa.Table) -> int:
+    return _distincts(table, "pathologie")
+
+
+@mesurer
+def departements_distincts(table: pa.Table) -> int:
+    return _distincts(table, "departement")
+
+
+@mesurer
+def annees_distinctes(table: pa.Table) -> int:
+    return _distincts(table, "annee")
+
+
+@mesurer
+def nombre_de_cas(table: pa.Table) -> int:
+    return int(pc.sum(table.column("Ntop")).as_py() or 0)
+
+
+@mesurer
+def population_reference(table: pa.Table) -> int:
+    return int(pc.sum(table.column("Npop")).as_py() or 0)
+
+
+@mesurer
+def prevalence_globale(table: pa.Table) -> float:
+    total_cas = pc.sum(table.column("Ntop")).as_py() or 0
+    total_population = pc.sum(table.column("Npop")).as_py() or 0
+    if total_population == 0:
+        return 0.0
+    return round((total_cas / total_population) * 100, 3)
+
+
+@mesurer
+def prevalence_moyenne(table: pa.Table) -> float:
+    prev = table.column("prev")
+    moyenne = pc.mean(pc.filter(prev, pc.not_equal(prev, 0))).as_py()
+    return round(moyenne, 3) if moyenne is not None else 0.0
+
+
+# Statistiques descriptives
+
+def _descriptives(ntop: int, npop: int, prev) -> dict:
+    """
+    Statistiques de stats_patho sur les valeurs ``prev`` d'un groupe de lignes.
+    """
+    minmax = pc.min_max(prev)
+    return {
+        "Ntop_totale": ntop,
+        "Npop_totale": npop,
+        "prevalence_globale": round((ntop / npop * 100) if npop else 0, 3),
+        "prevalence_moyenne": round(_valeur(pc.mean(prev)), 3),
+        "prevalence_mediane": round(_valeur(pc.quantile(prev, q=0.5)[0]), 3),
+        "prevalence_min": round(_valeur(minmax["min"]), 3),
+        "prevalence_max": round(_valeur(minmax["max"]), 3),
+        "ecart_type": round(_valeur(pc.stddev(prev, ddof=1)), 3),
+    }
+
+
+@mesurer
+def stats_patho(table: pa.Table,
+                pathologie: str,
+                sexe: str | None = None,
+                age: str | None = None,
+                departement: str | None = None,
+                annee: int | None = None
+                ) -> pd.Series:
+    """
+    Équivalent Arrow de ``stats_pandas.stats_patho``.
+    """
+    filtre = _filtrer(table, sexe or None, age or None, departement or None, annee or None, pathologie)
+
+    if filtre.num_rows == 0:
+        return pd.Series({
+            "Ntop_totale": 0, "Npop_totale": 0,
+            "prevalence_globale": 0.0,
+            "prevalence_moyenne": 0.0, "prevalence_mediane": 0.0,
+            "prevalence_min": 0.0, "prevalence_max": 0.0, "ecart_type": 0.0
+        })
+
+    return pd.Series(_descriptives(pc.sum(filtre.column("Ntop")).as_py(), pc.sum(filtre.column("Npop")).as_py(),
+                                   filtre.column("prev")))
+
+
+# Sexe et âge
+
+@mesurer
+def stats_par_sexe(table: pa.Table, pathologie: str) -> pd.DataFrame:
+    filtre = _filtrer(table, pathologie=pathologie)
+    filtre = filtre.filter(pc.invert(_egal(filtre, "libelle_sexe", "tous sexes")))
+    if filtre.num_rows == 0:
+        return pd.DataFrame()
+
+    groupes = filtre.group_by("libelle_sexe").aggregate([("Ntop", "sum"), ("Npop", "sum"), ("prev", "list")])
+    resultats = [
+        {"sexe": sexe, **_descriptives(ntop, npop, pa.array(prev, pa.float64()))}
+        for sexe, ntop, npop, prev in zip(*(groupes.column(nom).to_pylist()
+                                            for nom in ("libelle_sexe", "Ntop_sum", "Npop_sum", "prev_list")))
+    ]
+    return pd.DataFrame(resultats).sort_values("sexe").set_index("sexe")
+
+
+@mesurer
+def ratio_cas_hf(table: pa.Table, pathologie: str) -> float | None:
+    stats = _totaux_par(_filtrer(table, pathologie=pathologie), ["libelle_sexe"]).set_index("libelle_sexe")
+    stats = stats[stats.index != "tous sexes"]
+    if "hommes" not in stats.index or "femmes" not in stats.index or stats.loc["femmes", "Ntop_totale"] == 0:
+        return None
+    return round(stats.loc["hommes", "Ntop_totale"] / stats.loc["femmes", "Ntop_totale"], 3)
+
+
+@mesurer
+def difference_prevalence_sexe(table: pa.Table, pathologie: str) -> float | None:
+    stats = _totaux_par(_filtrer(table, pathologie=pathologie), ["libelle_sexe"])
+    stats = stats.groupby(stats["libelle_sexe"].str.lower())[["Ntop_totale", "Npop_totale"]].sum()
+    stats = stats[stats.index != "tous sexes"]
+
+    if "hommes" not in stats.index or "femmes" not in stats.index:
+        return None
+    if stats.loc["hommes", "Npop_totale"] == 0 or stats.loc["femmes", "Npop_totale"] == 0:
+        return None
+
+    prev_h = stats.loc["hommes", "Ntop_totale"] / stats.loc["hommes", "Npop_totale"] * 100
+    prev_f = stats.loc["femmes", "Ntop_totale"] / stats.loc["femmes", "Npop_totale"] * 100
+    return round(prev_h - prev_f, 3)
+
+
+@mesurer
+def stats_par_tranche_age(table: pa.Table, pathologie: str) -> pd.DataFrame:
+    stats = _totaux_par(_filtrer(table, pathologie=pathologie), ["libelle_classe_age"])
+    if stats.empty:
+        return pd.DataFrame()
+
+    # Tranches connues uniquement, dans l'ordre croissant (comme stats_pandas)
+    ordre = conversion.Conversion_donnees().ordre_tranches_age()
+    stats = stats[stats["libelle_classe_age"].isin(ordre)]
+    stats["libelle_classe_age"] = pd.Categorical(stats["libelle_classe_age"], categories=ordre, ordered=True)
+    stats = stats.sort_values("libelle_classe_age").set_index("libelle_classe_age")
+
+    return _prevalence(stats).round(3)
+
+
+@mesurer
+def difference_prevalence_age(table: pa.Table, pathologie: str, tranche_age_1: str, tranche_age_2: str) -> float | None:
+    stats_tranche_age = stats_par_tranche_age(table, pathologie)
+
+    if tranche_age_1 not in stats_tranche_age.index or tranche_age_2 not in stats_tranche_age.index:
+        return None
+
+    prev_t1 = stats_tranche_age.loc[tranche_age_1, "prevalence_globale"]
+    prev_t2 = stats_tranche_age.loc[tranche_age_2, "prevalence_globale"]
+
+    if prev_t1 is None or prev_t2 is None:
+        return None
+
+    return round(prev_t1 - prev_t2, 3)
+
+
+@mesurer
+def age_central_pathologie(table: pa.Table, pathologie: str) -> tuple[str, float] | None:
+    stats_tranche_age = stats_par_tranche_age(table, pathologie)
+
+    if stats_tranche_age.empty:
+        return None
+
+    return stats_tranche_age["prevalence_globale"].idxmax(), round(stats_tranche_age["prevalence_globale"].max(), 3)
+
+
+# Évolution annuelle
+
+def _totaux_annuels(table: pa.Table, pathologie: str, periode: tuple[int, int] | None) -> pd.DataFrame:
+    stats = _totaux_par(_filtrer(table, pathologie=pathologie, periode=periode), ["annee"]).set_index("annee")
+    return _prevalence(stats)
+
+
+@mesurer
+def stats_par_annee(table: pa.Table, pathologie: str,
+                    periode: tuple[int, int] | None = None) -> pd.DataFrame | None:
+    stats = _totaux_annuels(table, pathologie, periode)
+    if stats.empty:
+        return pd.DataFrame()
+    return stats.round(3)
+
+
+@mesurer
+def variation_annuelle(table: pa.Table, pathologie: str, periode: tuple[int, int] | None = None) -> dict:
+    stats = _totaux_annuels(table, pathologie, periode)
+    if stats.empty:
+        return None
+    return stats_pandas.variations_prevalence(stats)
+
+
+@mesurer
+def tendance_generale(table: pa.Table, pathologie: str, periode: tuple[int, int] | None = None) -> str | None:
+    return stats_pandas.tendance_variations(variation_annuelle(table, pathologie, periode))
+
+
+@mesurer
+def pente_tendance(table: pa.Table, pathologie: str, periode: tuple[int, int] | None = None) -> float | None:
+    return stats_pandas.pente_prevalence(stats_par_annee(table, pathologie, periode))
+
+
+# Départements
+
+@mesurer
+def stats_par_departement(table: pa.Table, pathologie: str) -> pd.DataFrame | None:
+    stats = _totaux_par(_filtrer(table, pathologie=pathologie), ["dept"]).set_index("dept")
+    if stats.empty:
+        return pd.DataFrame()
+
+    stats = _prevalence(stats)
+    stats["departement_nom"] = stats.index.map(conversion.Conversion_donnees.departement)
+    return stats.round(3)
+
+
+@mesurer
+def classement_departements(table: pa.Table, pathologie: str) -> pd.DataFrame | None:
+    stats = stats_par_departement(table, pathologie)
+    if stats.empty:
+        return pd.DataFrame()
+
+    classement = stats.sort_values("prevalence_globale", ascending=True).reset_index()
+    classement = classement[["dept", "departement_nom", "prevalence_globale"]]
+    classement.index += 1
+    return classement
+
+
+@mesurer
+def moyenne_nationale(table: pa.Table, pathologie: str) -> float | None:
+    filtre = _filtrer(table, pathologie=pathologie)
+    if filtre.num_rows == 0:
+        return None
+
+    total_ntop = pc.sum(filtre.column("Ntop")).as_py()
+    total_npop = pc.sum(filtre.column("Npop")).as_py()
+    if total_npop == 0:
+        return None
+    return round((total_ntop / total_npop) * 100, 3)
+
+
+@mesurer
+def ecart_a_la_moyenne(table: pa.Table, pathologie: str) -> pd.DataFrame | None:
+    stats = stats_par_departement(table, pathologie)
+    moyenne_nat = moyenne_nationale(table, pathologie)
+    if stats.empty or moyenne_nat is None:
+        return pd.DataFrame()
+
+    stats["ecart_a_la_moyenne"] = stats["prevalence_globale"] - moyenne_nat
+    stats = stats.drop(columns=["Ntop_totale", "Npop_totale", "prevalence_globale"])
+    return stats.sort_values("ecart_a_la_moyenne", ascending=True).round(3)
+
+
+@mesurer
+def bottom_departements(table: pa.Table, pathologie: str) -> pd.DataFrame:
+    classement = classement_departements(table, pathologie)
+    if classement.empty:
+        return pd.DataFrame()
+    return classement.sort_values("prevalence_globale").head(10)
+
+
+@mesurer
+def top_departements(table: pa.Table, pathologie: str) -> pd.DataFrame:
+    classement = classement_departements(table, pathologie)
+    if classement.empty:
+        return pd.DataFrame()
+
+    top10 = classement.sort_values("prevalence_globale", ascending=False).head(10).reset_index(drop=True)
+    top10.index = top10.index + 1
+    return top10
+
+
+@mesurer
+def z_score_prevalence(table: pa.Table, pathologie: str) -> pd.DataFrame:
+    stats = stats_par_departement(table, pathologie)
+    moyenne_nat = moyenne_nationale(table, pathologie)
+    if stats.empty or moyenne_nat is None:
+        return pd.DataFrame()
+
+    stats["z_score"] = (stats["prevalence_globale"] - moyenne_nat) / stats["prevalence_globale"].std()
+    stats = stats.drop(columns=["Ntop_totale", "Npop_totale", "prevalence_globale"])
+    stats = stats.sort_values("z_score").reset_index()
+    stats.index = stats.index + 1
+    return stats
+
+
+@mesurer
+def valeurs_aberrantes(table: pa.Table, pathologie: str, seuil=2) -> pd.DataFrame:
+    z_scores = z_score_prevalence(table, pathologie)
+    if z_scores.empty:
+        return pd.DataFrame()
+
+    z_scores = z_scores[(z_scores["z_score"] <= -seuil) | (z_scores["z_score"] >= seuil)].reset_index(drop=True)
+    z_scores.index += 1
+    return z_scores
+
+
+@mesurer
+def stats_par_departement_annee(table: pa.Table, pathologie: str,
+                                periode: tuple[int, int] | None = None) -> pd.DataFrame:
+    stats = _totaux_par(_filtrer(table, pathologie=pathologie, periode=periode), ["annee", "dept"])
+    if stats.empty:
+        return pd.DataFrame()
+
+    stats["prevalence_globale"] = stats["Ntop_totale"] / stats["Npop_totale"] * 100
+    stats.loc[stats["Npop_totale"] == 0, "prevalence_globale"] = pd.NA
+    stats["departement_nom"] = stats["dept"].map(conversion.Conversion_donnees.departement)
+
+    stats = stats[["annee", "dept", "departement_nom", "Ntop_totale", "Npop_totale", "prevalence_globale"]]
+    return stats.round(3)
+
+
+@mesurer
+def moyenne_nationale_annee(table: pa.Table, pathologie: str,
+                            periode: tuple[int, int] | None = None) -> pd.DataFrame:
+    stats = _totaux_par(_filtrer(table, pathologie=pathologie, periode=periode), ["annee"])
+    if stats.empty:
+        return pd.DataFrame()
+
+    stats["moyenne_nationale"] = stats["Ntop_totale"] / stats["Npop_totale"] * 100
+    stats.loc[stats["Npop_totale"] == 0, "moyenne_nationale"] = pd.NA
+    return stats[["annee", "moyenne_nationale"]].round(3)
+
+
+@mesurer
+def z_score_prevalence_annee(table: pa.Table, pathologie: str,
+                             periode: tuple[int, int] | None = None) -> pd.DataFrame:
+    stats = stats_par_departement_annee(table, pathologie, periode)
+    moyennes = moyenne_nationale_annee(table, pathologie, periode)
+    if stats.empty or moyennes.empty:
+        return pd.DataFrame()
+
+    z = stats.merge(moyennes, on="annee", how="left")
+    z["ecart_type"] = z.groupby("annee")["prevalence_globale"].transform(lambda x: x.std(ddof=1))
+    z["z_score"] = ((z["prevalence_globale"] - z["moyenne_nationale"]) / z["ecart_type"]).round(3)
+
+    z = z.sort_values(["annee", "z_score"]).reset_index(drop=True)
+    return z[["annee", "dept", "departement_nom", "z_score"]]
+
+
+@mesurer
+def annees_anormales(table: pa.Table, pathologie: str, seuil=2) -> pd.DataFrame:
+    z = z_score_prevalence_annee(table, pathologie)
+    if z.empty:
+        return pd.DataFrame()
+
+    moyennes = z.groupby("annee")["z_score"].apply(lambda x: x.abs().mean()).reset_index(name="moyenne_abs_z")
+    anormales = moyennes[moyennes["moyenne_abs_z"] >= seuil].copy()
+    anormales["moyenne_abs_z"] = anormales["moyenne_abs_z"].round(3)
+    return anormales
+
+
+# Classements de pathologies
+
+@mesurer
+def top_pathologies(table: pa.Table,
+                    sexe: str | None = None,
+                    age: str | None = None,
+                    departement: str | None = None,
+                    annee: int | None = None,
+                    top_n: int | None = None
+                    ) -> pd.DataFrame | None:
+    filtre = _filtrer(table, sexe, age, departement, annee)
+    if filtre.num_rows == 0:
+        return None
+
+    stats = _totaux_par(filtre, ["pathologie"])
+    stats["prevalence_globale"] = (stats["Ntop_totale"] / stats["Npop_totale"]).fillna(0).mul(100).round(3)
+    stats = stats.drop(columns=["Ntop_totale", "Npop_totale"])
+    stats = stats.sort_values("prevalence_globale", ascending=False).reset_index(drop=True)
+    stats.index = stats.index + 1
+
+    if top_n is not None:
+        return stats.head(top_n)
+    return stats
+
+
+@mesurer
+def pathologies_croissance_forte(table: pa.Table,
+                                 annee_depart: int,
+                                 annee_arrivee: int,
+                                 sexe: str | None = None,
+                                 age: str | None = None,
+                                 departement: str | None = None,
+                                 top_n: int | None = None) -> pd.DataFrame | None:
+    filtre = _filtrer(table, sexe, age, departement)
+    if filtre.num_rows == 0:
+        return None
+    if annee_depart is None or annee_arrivee is None or annee_depart > annee_arrivee:
+        return None
+
+    # Seules les deux années comparées sont agrégées
+    filtre = filtre.filter(pc.is_in(filtre.column("annee"), value_set=pa.array([annee_depart, annee_arrivee], pa.int64())))
+    stats = _totaux_par(filtre, ["pathologie", "annee"])
+    stats["prevalence_globale_annuelle"] = (stats["Ntop_totale"] / stats["Npop_totale"]).fillna(0).mul(100).round(3)
+
+    croissance = stats.pivot(index="pathologie", columns="annee", values="prevalence_globale_annuelle")
+    croissance = croissance.reindex(columns=list(dict.fromkeys([annee_depart, annee_arrivee]))).dropna()
+    croissance.columns.name = None
+
+    croissance["croissance"] = croissance[annee_arrivee] - croissance[annee_depart]
+    croissance = croissance.sort_values("croissance", ascending=False).reset_index()
+    croissance.index = croissance.index + 1
+
+    if top_n is not None:
+        croissance = croissance.head(top_n)
+    return croissance
+
+
+@mesurer
+def resume_global_avance(table: pa.Table,
+                         sexe: str | None = None,
+                         age: str | None = None,
+                         departement: str | None = None,
+                         annee: int | None = None) -> dict | None:
+    filtre = _filtrer(table, sexe or None, age or None, departement or None, annee or None)
+    if filtre.num_rows == 0:
+        return None
+
+    total_ntop = pc.sum(filtre.column("Ntop")).as_py()
+    total_npop = pc.sum(filtre.column("Npop")).as_py()
+
+    def meilleure(colonne: str) -> tuple:
+        groupes = _totaux_par(filtre, [colonne]).set_index(colonne)
+        prevalence = groupes["Ntop_totale"] / groupes["Npop_totale"] * 100
+        return prevalence.idxmax(), round(prevalence.max(), 3), prevalence
+
+    patho_top, patho_top_val, _ = meilleure("pathologie")
+    dep_top, dep_top_val, _ = meilleure("departement")
+    annee_critique, annee_critique_val, prevalence_annees = meilleure("annee")
+
+    tendance = None
+    if len(prevalence_annees) > 1:
+        tendance = round(prevalence_annees.diff().mean(), 3)
+
+    return {
+        "nb_lignes": filtre.num_rows,
+        "nb_pathologies": _distincts(filtre, "pathologie"),
+        "nb_departements": _distincts(filtre, "departement"),
+        "nb_annees": _distincts(filtre, "annee"),
+        "total_cas": int(total_ntop),
+        "population_totale": int(total_npop),
+        "prevalence_globale": round((total_ntop / total_npop) * 100, 3) if total_npop != 0 else 0.0,
+        "pathologie_plus_prevalente": patho_top,
+        "prevalence_pathologie_top": patho_top_val,
+        "departement_plus_impacte": dep_top,
+        "prevalence_departement_top": dep_top_val,
+        "annee_plus_critique": int(annee_critique),
+        "prevalence_annee_critique": annee_critique_val,
+        "tendance_moyenne_annuelle": tendance,
+    }
@@ -1,32 +1,54 @@
 import pandas as pd
 from utils import conversion
 from pathlib import Path
-
-def charger_effectifs() -> pd.DataFrame:
+from core.instrumentation import mesurer
+
+#Initialisation des en-têtes pour le tableau
+COLONNES_ENTETE = ['annee', 
+                   'patho_niv1',
+                   'patho_niv2',
+                   'patho_niv3', 
+                   'libelle_classe_age', 
+                   'libelle_sexe', 
+                   'region', 
+                   'dept', 
+                   'top',
+                   'Ntop', 
+                   'Npop', 
+                   'prev',
+                   ]
+
+
+@mesurer(lignes=len)
+def charger_effectifs(parquet_path: str | Path | None = None) -> pd.DataFrame:
     """
     Charge le fichier effectifs.parquet situé dans le dossier data/ qui est une conversion en parquet du fichier effectif.csv
     disponible sur data.gouv, puis filtre et nettoie les données avec la bibliothèque pandas
+
+    :param parquet_path: autre fichier parquet au même format (par défaut data/effectifs.parquet)
     """
-    parquet_path = Path(__file__).parent.parent / "data" / "effectifs.parquet"
+    if parquet_path is None:
+        parquet_path = Path(__file__).parent.parent / "data" / "effectifs.parquet"
+    parquet_path = Path(parquet_path)
     if not parquet_path.exists():
         raise FileNotFoundError(f"{parquet_path} non trouvé !")    
 
-    #Initialisation des en-têtes pour le tableau
-    colonnes_entete = ['annee', 
-                       'patho_niv1',
-                       'patho_niv2',
-                       'patho_niv3', 
-                       'libelle_classe_age', 
-                       'libelle_sexe', 
-                       'dept', 
-                       'top',
-                       'Ntop', 
-                       'Npop', 
-                       'prev',
-                       ]
-
-    df = pd.read_parquet(parquet_path, columns=colonnes_entete)
-    
+    df = nettoyer_effectifs(pd.read_parquet(parquet_path, columns=COLONNES_ENTETE))
+
+    # Ne plus utiliser la notation scientifique, pour plus de lisibilité
+    pd.set_option('display.float_format', '{:,.3f}'.format)
+
+    return df
+
+
+def nettoyer_effectifs(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Filtre et nettoie des lignes brutes de effectifs.parquet (colonnes ``COLONNES_ENTETE``) ;
+    s'applique aussi bien au fichier entier qu'à un lot de lignes.
+
+    :param df: DataFrame Pandas des lignes brutes
+    :return: DataFrame Pandas nettoyé
+    """
     #Enlève les espaces inutiles
     df.columns = df.columns.str.strip()
 
@@ -52,6 +74,7 @@ def charger_effectifs() -> pd.DataFrame:
     
     # Conversion du code département en str et suppression espaces
     df["dept"] = df["dept"].astype(str).str.strip()
+    df["region"] = df["region"].astype(str).str.strip()
 
     """
     Crée la colonne ``pathologie`` en utilisant le niveau de pathologie
@@ -93,12 +116,10 @@ def charger_effectifs() -> pd.DataFrame:
         "prev": float
     })
 
-    # Ne plus utiliser la notation scientifique, pour plus de lisibilité
-    pd.set_option('display.float_format', '{:,.3f}'.format)
-
     return df
 
 
+@mesurer
 def nombre_de_lignes(df: pd.DataFrame) -> int:
     """
     Retourne le nombre total d'enregistrements dans les données.
@@ -109,6 +130,7 @@ def nombre_de_lignes(df: pd.DataFrame) -> int:
     return len(df)
 
 
+@mesurer
 def pathologies_distinctes(df: pd.DataFrame) -> int:
     """
     Retourne le nombre des pathologies distinctes présentes dans les données.
@@ -119,6 +141,7 @@ def pathologies_distinctes(df: pd.DataFrame) -> int:
     return df["pathologie"].nunique()
 
 
+@mesurer
 def departements_distincts(df: pd.DataFrame) -> int:
     """
     Retourne le nombre des départements distincts présents dans les données.
@@ -129,6 +152,7 @@ def departements_distincts(df: pd.DataFrame) -> int:
     return df["departement"].nunique()
 
 
+@mesurer
 def annees_distinctes(df: pd.DataFrame) -> int:
     """
     Retourne le nombre d'années distinctes présentes dans les données.
@@ -139,6 +163,7 @@ def annees_distinctes(df: pd.DataFrame) -> int:
     return df["annee"].nunique()
 
 
+@mesurer
 def nombre_de_cas(df: pd.DataFrame) -> int:
     """
     Calcule le nombre total de cas observés (somme des Ntop).
@@ -149,6 +174,7 @@ def nombre_de_cas(df: pd.DataFrame) -> int:
     return int(df["Ntop"].sum())
 
 
+@mesurer
 def population_reference(df: pd.DataFrame) -> int:
     """
     Calcule la population totale de référence (somme des Npop).
@@ -159,6 +185,7 @@ def population_reference(df: pd.DataFrame) -> int:
     return int(df["Npop"].sum())
 
 
+@mesurer
 def prevalence_globale(df: pd.DataFrame) -> float:
     """
     Calcule la prévalence globale en pourcentage sur l'ensemble des données.
@@ -176,6 +203,7 @@ def prevalence_globale(df: pd.DataFrame) -> float:
     return round((total_cas / total_population) * 100, 3)        
 
 
+@mesurer
 def prevalence_moyenne(df: pd.DataFrame) -> float:
     """
     Calcule la moyenne arithmétique des prévalences individuelles non nulles.
@@ -192,6 +220,7 @@ def prevalence_moyenne(df: pd.DataFrame) -> float:
 
 
 
+@mesurer
 def stats_patho(df: pd.DataFrame,
                 pathologie: str,
                 sexe: str | None = None,
@@ -254,6 +283,7 @@ def stats_patho(df: pd.DataFrame,
 
 
 
+@mesurer
 def stats_par_sexe(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
     """
     Statistiques par sexe pour une pathologie.
@@ -286,6 +316,7 @@ def stats_par_sexe(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
 
 
 
+@mesurer
 def ratio_cas_hf(df: pd.DataFrame, pathologie: str) -> float | None:
     """
     Calcule le ratio hommes / femmes pour une pathologie donnée à partir d'un DataFrame Pandas.
@@ -308,6 +339,7 @@ def ratio_cas_hf(df: pd.DataFrame, pathologie: str) -> float | None:
     return round(stats_hf['hommes'] / stats_hf['femmes'], 3)
 
 
+@mesurer
 def difference_prevalence_sexe(df: pd.DataFrame, pathologie: str) -> float | None:
     """
     Calcule la différence de prévalence globale hommes - femmes pour une pathologie.
@@ -333,6 +365,7 @@ def difference_prevalence_sexe(df: pd.DataFrame, pathologie: str) -> float | Non
     return round(prev_h - prev_f, 3)
 
 
+@mesurer
 def stats_par_tranche_age(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
     """
     Statistiques par tranche d'âge pour une pathologie.
@@ -367,6 +400,7 @@ def stats_par_tranche_age(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
     return stats.round(3)
 
 
+@mesurer
 def difference_prevalence_age(df: pd.DataFrame,
                               pathologie: str,
                               tranche_age_1: str,
@@ -395,6 +429,7 @@ def difference_prevalence_age(df: pd.DataFrame,
     return round(prev_t1 - prev_t2, 3)
 
 
+@mesurer
 def age_central_pathologie(df: pd.DataFrame, pathologie: str) -> tuple[str, float] | None:
     """
     Retourne la tranche d'âge pour laquelle la prévalence globale
@@ -413,64 +448,59 @@ def age_central_pathologie(df: pd.DataFrame, pathologie: str) -> tuple[str, floa
 
 
 
-def stats_par_annee(df: pd.DataFrame, pathologie: str) -> pd.DataFrame | None:
+def filtrer_periode(df: pd.DataFrame, periode: tuple[int, int] | None) -> pd.DataFrame:
     """
-    Statistiques par annee pour une pathologie.
-    
-    :param df: DataFrame Pandas
-    :param pathologie: nom du traitement/pathologie étudiée
-    :return: DataFrame Pandas avec les années en lignes et les statistiques en colonnes
+    Lignes des années comprises dans la période [debut, fin] (toutes si periode vaut None).
     """
-    df_filtre = df[df["pathologie"] == pathologie].copy()
-    if df_filtre.empty:
-        return pd.DataFrame()
+    if periode is None:
+        return df
+    debut, fin = periode
+    return df[(df["annee"] >= debut) & (df["annee"] <= fin)]
 
-    df_filtre = df_filtre.sort_values("annee")
 
-    stats= (
-        df_filtre
-        .groupby("annee", sort=True).agg(Ntop_totale=("Ntop", "sum"), Npop_totale=("Npop", "sum"),)
-    )
+def _totaux_annuels(df_patho: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ntop, Npop et prévalence globale (non arrondie) par année.
+    """
+    stats = df_patho.groupby("annee", sort=True).agg(Ntop_totale=("Ntop", "sum"), Npop_totale=("Npop", "sum"))
 
     stats["prevalence_globale"] = (stats["Ntop_totale"] / stats["Npop_totale"]) * 100
 
     stats.loc[stats["Npop_totale"] == 0, "prevalence_globale"] = None
 
-    if stats.empty:
-        return None
+    return stats
 
-    return stats.round(3)
 
-
-def variation_annuelle(df: pd.DataFrame, pathologie: str) -> dict:
+@mesurer
+def stats_par_annee(df: pd.DataFrame, pathologie: str,
+                    periode: tuple[int, int] | None = None) -> pd.DataFrame | None:
     """
-    Calcule la variation annuelle de la prévalence globale pour une pathologie donnée.
-
-    Pour chaque année (à partir de la deuxième), retourne :
-    - la différence absolue de prévalence par rapport à l'année précédente
-    - la variation relative en pourcentage
-
-    Si la prévalence de l'année précédente est nulle, la variation relative est None.
-
+    Statistiques par annee pour une pathologie.
+    
     :param df: DataFrame Pandas
     :param pathologie: nom du traitement/pathologie étudiée
-    :return: dict avec pour chaque annee la difference absolue et la "valeur relative
+    :param periode: (debut, fin) pour se limiter à une période, bornes incluses
+    :return: DataFrame Pandas avec les années en lignes et les statistiques en colonnes
     """
+    df_filtre = filtrer_periode(df[df["pathologie"] == pathologie], periode)
+    if df_filtre.empty:
+        return pd.DataFrame()
 
-    df_patho = df[df['pathologie'] == pathologie].copy()
-    if df_patho.empty:
+    stats = _totaux_annuels(df_filtre)
+
+    if stats.empty:
         return None
 
-    stats_annee = (
-        df_patho.groupby('annee', sort=True)
-        .agg(Ntop_totale=('Ntop', 'sum'), Npop_totale=('Npop', 'sum'))
-    )
-    stats_annee['prevalence_globale'] = (
-        stats_annee['Ntop_totale'] / stats_annee['Npop_totale'] * 100
-    )
-    stats_annee.loc[stats_annee['Npop_totale'] == 0, 'prevalence_globale'] = None
+    return stats.round(3)
 
 
+def variations_prevalence(stats_annee: pd.DataFrame) -> dict:
+    """
+    Variations d'une année à l'autre d'une prévalence annuelle.
+
+    :param stats_annee: années en index (triées), colonne prevalence_globale non arrondie
+    :return: dict avec pour chaque annee la difference absolue et la "valeur relative"
+    """
     variation = {}
     prev_values = stats_annee['prevalence_globale'].tolist()
     annees = stats_annee.index.tolist()
@@ -489,28 +519,35 @@ def variation_annuelle(df: pd.DataFrame, pathologie: str) -> dict:
     return variation
 
 
-def tendance_generale(df: pd.DataFrame, pathologie: str) -> str | None:
+@mesurer
+def variation_annuelle(df: pd.DataFrame, pathologie: str, periode: tuple[int, int] | None = None) -> dict:
     """
-    Détermine la tendance générale de la prévalence globale
-    d'une pathologie sur la période étudiée.
-
-    La tendance est calculée à partir de la moyenne des variations
-    annuelles absolues de prévalence :
+    Calcule la variation annuelle de la prévalence globale pour une pathologie donnée.
 
-    - moyenne > 0  → "hausse"
-    - moyenne < 0  → "baisse"
-    - moyenne = 0  → "stable"
+    Pour chaque année (à partir de la deuxième), retourne :
+    - la différence absolue de prévalence par rapport à l'année précédente
+    - la variation relative en pourcentage
 
-    Si aucune variation ne peut être calculée (ex. une seule année
-    disponible ou données absentes), la fonction retourne None.
+    Si la prévalence de l'année précédente est nulle, la variation relative est None.
 
-    :param df: DataFrame contenant les données
-    :param pathologie: nom de la pathologie étudiée
-    :return: "hausse", "baisse", "stable" ou None
+    :param df: DataFrame Pandas
+    :param pathologie: nom du traitement/pathologie étudiée
+    :param periode: (debut, fin) pour se limiter à une période, bornes incluses
+    :return: dict avec pour chaque annee la difference absolue et la "valeur relative
     """
 
-    variations = variation_annuelle(df, pathologie)
+    df_patho = filtrer_periode(df[df['pathologie'] == pathologie], periode)
+    if df_patho.empty:
+        return None
+
+    return variations_prevalence(_totaux_annuels(df_patho))
+
 
+def tendance_variations(variations: dict | None) -> str | None:
+    """
+    "hausse", "baisse" ou "stable" selon la moyenne des différences absolues
+    produites par ``variation_annuelle`` (None si aucune variation).
+    """
     if not variations:
         return None
 
@@ -534,18 +571,35 @@ def tendance_generale(df: pd.DataFrame, pathologie: str) -> str | None:
         return "stable"
 
 
-def pente_tendance(df: pd.DataFrame, pathologie: str) -> float | None:
+@mesurer
+def tendance_generale(df: pd.DataFrame, pathologie: str, periode: tuple[int, int] | None = None) -> str | None:
     """
-    Retourne la moyenne d'évolution annuelle de la prévalence entre
-    la première année d'observation et la dernière année.
+    Détermine la tendance générale de la prévalence globale
+    d'une pathologie sur la période étudiée.
 
-    :param df: DataFrame Pandas
+    La tendance est calculée à partir de la moyenne des variations
+    annuelles absolues de prévalence :
+
+    - moyenne > 0  → "hausse"
+    - moyenne < 0  → "baisse"
+    - moyenne = 0  → "stable"
+
+    Si aucune variation ne peut être calculée (ex. une seule année
+    disponible ou données absentes), la fonction retourne None.
+
+    :param df: DataFrame contenant les données
     :param pathologie: nom de la pathologie étudiée
-    :return: pente annuelle (float) ou None
+    :param periode: (debut, fin) pour se limiter à une période, bornes incluses
+    :return: "hausse", "baisse", "stable" ou None
     """
 
-    stats_annee = stats_par_annee(df, pathologie)
+    return tendance_variations(variation_annuelle(df, pathologie, periode))
+
 
+def pente_prevalence(stats_annee: pd.DataFrame) -> float | None:
+    """
+    Pente annuelle moyenne entre la première et la dernière année de ``stats_par_annee``.
+    """
     if stats_annee.shape[0] < 2:
         return None
 
@@ -570,6 +624,22 @@ def pente_tendance(df: pd.DataFrame, pathologie: str) -> float | None:
     return round(pente, 3)
 
 
+@mesurer
+def pente_tendance(df: pd.DataFrame, pathologie: str, periode: tuple[int, int] | None = None) -> float | None:
+    """
+    Retourne la moyenne d'évolution annuelle de la prévalence entre
+    la première année d'observation et la dernière année.
+
+    :param df: DataFrame Pandas
+    :param pathologie: nom de la pathologie étudiée
+    :param periode: (debut, fin) pour se limiter à une période, bornes incluses
+    :return: pente annuelle (float) ou None
+    """
+
+    return pente_prevalence(stats_par_annee(df, pathologie, periode))
+
+
+@mesurer
 def stats_par_departement(df: pd.DataFrame, pathologie: str) -> pd.DataFrame | None:
     """
     Calcule les statistiques descriptives par département
@@ -600,22 +670,94 @@ def stats_par_departement(df: pd.DataFrame, pathologie: str) -> pd.DataFrame | N
     return stats.round(3)
 
 
+@mesurer
+def stats_par_region(df: pd.DataFrame, pathologie: str) -> pd.DataFrame | None:
+    """
+    Calcule les statistiques descriptives par région
+    pour une pathologie donnée.
+    """
+    df_filtre = df[df["pathologie"] == pathologie]
+    if df_filtre.empty:
+        return pd.DataFrame()
+
+    stats = (
+        df_filtre
+        .groupby("region", sort=True)
+        .agg(Ntop_totale=("Ntop", "sum"), Npop_totale=("Npop", "sum"))
+    )
+
+    stats["prevalence_globale"] = (stats["Ntop_totale"] / stats["Npop_totale"]) * 100
+    stats.loc[stats["Npop_totale"] == 0, "prevalence_globale"] = None
+
+    stats["region_nom"] = stats.index.map(conversion.Conversion_donnees.region)
+
+    if stats.empty:
+        return None
+
+    return stats.round(3)
+
+
+def classer_prevalences(stats: pd.DataFrame | None, code: str, nom: str,
+                        colonne: str = "prevalence_globale") -> pd.DataFrame:
+    """
+    Classement des territoires d'un tableau de ``stats_par_departement`` ou ``stats_par_region``
+    par prévalence globale, de la plus petite à la plus grande
+
+    :param code: colonne du code du territoire (dept, region)
+    :param nom: colonne de son nom (departement_nom, region_nom)
+    :param colonne: prévalence classée (prevalence_standardisee pour la prévalence standardisée sur l'âge)
+    """
+    if stats is None or stats.empty:
+        return pd.DataFrame()
+
+    classement = stats.drop(columns=["Ntop_totale", "Npop_totale"])
+    classement = classement.sort_values(colonne, ascending=True).reset_index()
+    classement = classement[[code, nom, colonne]]
+    classement.index +=1
+
+    return classement
+
+
+def z_scores_prevalence(stats: pd.DataFrame | None, moyenne: float | None,
+                        colonne: str = "prevalence_globale") -> pd.DataFrame:
+    """
+    z-score de la prévalence de chaque territoire d'un tableau de ``stats_par_departement``
+    ou ``stats_par_region`` par rapport à la moyenne nationale, trié par ordre croissant
+
+    :param colonne: prévalence comparée à ``moyenne`` (prevalence_standardisee pour la prévalence standardisée sur l'âge)
+    """
+    if stats is None or stats.empty or moyenne is None:
+        return pd.DataFrame()
+
+    df_z_score = stats.copy()
+
+    df_z_score["z_score"] = (df_z_score[colonne] - moyenne) / df_z_score[colonne].std()
+    df_z_score = df_z_score.drop(columns=[c for c in ("Ntop_totale", "Npop_totale", "prevalence_globale", "prevalence_brute", colonne)
+                                          if c in df_z_score.columns])
+    df_z_score = df_z_score.sort_values("z_score").reset_index()
+
+    df_z_score.index = df_z_score.index + 1
+
+    return df_z_score
+
+
+@mesurer
 def classement_departements(df: pd.DataFrame, pathologie: str) -> pd.DataFrame | None:
     """
     Classement par département de la prévalence globale, de la plus petite à la plus grande
     """
-    df_tri_prev_depts = stats_par_departement(df, pathologie)
-    if df_tri_prev_depts.empty:
-        return pd.DataFrame()
+    return classer_prevalences(stats_par_departement(df, pathologie), "dept", "departement_nom")
 
-    df_tri_prev_depts = df_tri_prev_depts.drop(columns=["Ntop_totale", "Npop_totale"])
-    df_tri_prev_depts = df_tri_prev_depts.sort_values("prevalence_globale", ascending=True).reset_index()
-    df_tri_prev_depts = df_tri_prev_depts[["dept", "departement_nom", "prevalence_globale"]]
-    df_tri_prev_depts.index +=1
 
-    return df_tri_prev_depts
+@mesurer
+def classement_regions(df: pd.DataFrame, pathologie: str) -> pd.DataFrame | None:
+    """
+    Classement par région de la prévalence globale, de la plus petite à la plus grande
+    """
+    return classer_prevalences(stats_par_region(df, pathologie), "region", "region_nom")
 
 
+@mesurer
 def moyenne_nationale(df: pd.DataFrame, pathologie: str) -> float | None:
     """
     Calcule la prévalence nationale pondérée pour une pathologie (total_ntop / total_npop).
@@ -635,6 +777,7 @@ def moyenne_nationale(df: pd.DataFrame, pathologie: str) -> float | None:
 
 
 
+@mesurer
 def ecart_a_la_moyenne(df: pd.DataFrame, pathologie: str) -> pd.DataFrame | None:
     """
     Calcul pour chaque département l'écart à la moyenne calculée dans la fonction
@@ -660,6 +803,7 @@ def ecart_a_la_moyenne(df: pd.DataFrame, pathologie: str) -> pd.DataFrame | None
     return df_ecart.round(3)
 
 
+@mesurer
 def bottom_departements(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
     """
     Renvoie les 10 départements avec la prévalence la plus faible pour une pathologie donnée
@@ -672,6 +816,7 @@ def bottom_departements(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
 
 
 
+@mesurer
 def top_departements(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
     """
     Renvoie les 10 départements avec la prévalence la plus forte pour une pathologie donnée
@@ -689,6 +834,7 @@ def top_departements(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
 
 
 
+@mesurer
 def z_score_prevalence(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
     """
     Calcule le z-score pour chaque département et retourne une liste triée par ordre croissant
@@ -700,22 +846,25 @@ def z_score_prevalence(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
     if df_z_score is None or df_z_score.empty:
         return pd.DataFrame()
 
-    moyenne_nat = moyenne_nationale(df, pathologie)
+    return z_scores_prevalence(df_z_score, moyenne_nationale(df, pathologie))
 
-    if moyenne_nat is None:
-        return pd.DataFrame()
 
-    df_z_score = df_z_score.copy()
+@mesurer
+def z_score_prevalence_region(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
+    """
+    Calcule le z-score pour chaque région et retourne une liste triée par ordre croissant
+    (attention, c'est un z-score sur un cumul de toutes les années étudiées)
+    """
 
-    df_z_score["z_score"] = (df_z_score["prevalence_globale"] - moyenne_nat) / df_z_score["prevalence_globale"].std()
-    df_z_score = df_z_score.drop(columns=["Ntop_totale", "Npop_totale", "prevalence_globale"])
-    df_z_score = df_z_score.sort_values("z_score").reset_index()
+    df_z_score = stats_par_region(df, pathologie)
 
-    df_z_score.index = df_z_score.index + 1
+    if df_z_score is None or df_z_score.empty:
+        return pd.DataFrame()
 
-    return df_z_score
+    return z_scores_prevalence(df_z_score, moyenne_nationale(df, pathologie))
 
 
+@mesurer
 def valeurs_aberrantes(df: pd.DataFrame, pathologie: str, seuil=2) -> pd.DataFrame:
     """
     Retourne les départements ayant une valeur aberrante, soit une valeur de z-score égale ou dépassant le seuil de 2 ou -2
@@ -736,12 +885,15 @@ def valeurs_aberrantes(df: pd.DataFrame, pathologie: str, seuil=2) -> pd.DataFra
 
 
 
-def stats_par_departement_annee(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
+@mesurer
+def stats_par_departement_annee(df: pd.DataFrame, pathologie: str,
+                                periode: tuple[int, int] | None = None) -> pd.DataFrame:
     """
-    Calcule les statistiques descriptives par département et par année pour une pathologie donnée.
+    Calcule les statistiques descriptives par département et par année pour une pathologie donnée
+    (sur la période [debut, fin] si ``periode`` est fourni).
     """
 
-    df_filtre = df[df["pathologie"] == pathologie].copy()
+    df_filtre = filtrer_periode(df[df["pathologie"] == pathologie], periode).copy()
 
     if df_filtre.empty:
         return pd.DataFrame()
@@ -769,12 +921,14 @@ def stats_par_departement_annee(df: pd.DataFrame, pathologie: str) -> pd.DataFra
 
 
 
-def moyenne_nationale_annee(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
+@mesurer
+def moyenne_nationale_annee(df: pd.DataFrame, pathologie: str,
+                            periode: tuple[int, int] | None = None) -> pd.DataFrame:
     """
     Calcule la prévalence nationale pondérée par année (somme Ntop / somme Npop * 100).
     """
 
-    df_filtre = df[df["pathologie"] == pathologie].copy()
+    df_filtre = filtrer_periode(df[df["pathologie"] == pathologie], periode).copy()
 
     if df_filtre.empty:
         return pd.DataFrame()
@@ -790,17 +944,19 @@ def moyenne_nationale_annee(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
     return df_moy_nat.round(3)
 
 
-def z_score_prevalence_annee(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
+@mesurer
+def z_score_prevalence_annee(df: pd.DataFrame, pathologie: str,
+                             periode: tuple[int, int] | None = None) -> pd.DataFrame:
     """
     Calcule le z-score de la prévalence pour chaque département et par année
     en utilisant la moyenne nationale par année.
     """
 
-    df_prev = stats_par_departement_annee(df, pathologie)
+    df_prev = stats_par_departement_annee(df, pathologie, periode)
     if df_prev.empty:
         return pd.DataFrame()
 
-    df_moy = moyenne_nationale_annee(df, pathologie)
+    df_moy = moyenne_nationale_annee(df, pathologie, periode)
     if df_moy.empty:
         return pd.DataFrame()
 
@@ -817,6 +973,7 @@ def z_score_prevalence_annee(df: pd.DataFrame, pathologie: str) -> pd.DataFrame:
     return df_z
 
 
+@mesurer
 def annees_anormales(df: pd.DataFrame, pathologie: str, seuil=2) -> pd.DataFrame:
     """
     Retourne les années aberrantes, c'est-à-dire les années où la moyenne absolue des z-scores (ensemble des départements)
@@ -836,6 +993,7 @@ def annees_anormales(df: pd.DataFrame, pathologie: str, seuil=2) -> pd.DataFrame
 
 
 
+@mesurer
 def top_pathologies(df: pd.DataFrame, 
                 sexe: str | None = None,
                 age: str | None = None,
@@ -876,6 +1034,7 @@ def top_pathologies(df: pd.DataFrame,
     return df_filtre
 
 
+@mesurer
 def pathologies_croissance_forte(df: pd.DataFrame,
                                  annee_depart: int,
                                  annee_arrivee: int,
@@ -928,6 +1087,7 @@ def pathologies_croissance_forte(df: pd.DataFrame,
 
 
 
+@mesurer
 def resume_global_avance(df,
                          sexe: str | None = None,
                          age: str | None = None,
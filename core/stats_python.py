@@ -1,5 +1,7 @@
+from core.instrumentation import mesurer
 
 
+@mesurer
 def nombre_de_lignes(donnees: list[dict]) -> int:
     """
     Retourne le nombre total d'enregistrements dans les données.
@@ -10,6 +12,7 @@ def nombre_de_lignes(donnees: list[dict]) -> int:
     return len(donnees)
 
 
+@mesurer
 def pathologies_distinctes(donnees: list[dict]) -> set:
     """
     Retourne l'ensemble des pathologies distinctes présentes dans les données.
@@ -20,6 +23,7 @@ def pathologies_distinctes(donnees: list[dict]) -> set:
     return set(d["Pathologie"] for d in donnees)
 
 
+@mesurer
 def tranches_age_distinctes(donnees: list[dict]) -> list:
     """
     Retourne les tranches d'âge distinctes présentes dans les données,
@@ -44,6 +48,7 @@ def tranches_age_distinctes(donnees: list[dict]) -> list:
     return tranches_tries
 
 
+@mesurer
 def departements_distincts(donnees: list[dict]) -> set:
     """
     Retourne l'ensemble des départements distincts présents dans les données.
@@ -55,6 +60,7 @@ def departements_distincts(donnees: list[dict]) -> set:
 
 
 
+@mesurer
 def annees_distinctes(donnees: list[dict]) -> set:
     """
     Retourne l'ensemble des années distinctes présentes dans les données.
@@ -66,6 +72,7 @@ def annees_distinctes(donnees: list[dict]) -> set:
 
 
 
+@mesurer
 def nombre_de_cas(donnees: list[dict]) -> int:
     """
     Calcule le nombre total de cas observés (somme des Ntop).
@@ -77,6 +84,7 @@ def nombre_de_cas(donnees: list[dict]) -> int:
 
 
 
+@mesurer
 def population_reference(donnees: list[dict]) -> int:
     """
     Calcule la population totale de référence (somme des Npop).
@@ -88,6 +96,7 @@ def population_reference(donnees: list[dict]) -> int:
 
 
 
+@mesurer
 def prevalence_globale(donnees: list[dict]) -> float:
     """
     Calcule la prévalence globale en pourcentage sur l'ensemble des données.
@@ -108,6 +117,7 @@ def prevalence_globale(donnees: list[dict]) -> float:
 
 
 
+@mesurer
 def prevalence_moyenne(donnees: list[dict]) -> float:
     """
     Calcule la moyenne arithmétique des prévalences individuelles non nulles.
@@ -169,6 +179,7 @@ def filtrer_multi_criteres(donnees : list[dict],
 
 
 
+@mesurer
 def statistiques_descriptives(donnees : list[dict]) -> dict | None:
     """
     Calcule des statistiques descriptives de prévalence :
@@ -232,6 +243,7 @@ def statistiques_descriptives(donnees : list[dict]) -> dict | None:
 
 
 
+@mesurer
 def stats_par_sexe(donnees: list[dict], pathologie: str) -> dict:
     """
     Calcule les statistiques descriptives par sexe (H / F)
@@ -251,6 +263,7 @@ def stats_par_sexe(donnees: list[dict], pathologie: str) -> dict:
 
 
 
+@mesurer
 def ratio_cas_hf(donnees: list[dict], pathologie: str) -> float | None:
     """
     Calcule le ratio hommes / femmes pour une pathologie donnée.
@@ -295,6 +308,7 @@ def ratio_cas_hf(donnees: list[dict], pathologie: str) -> float | None:
 
 
 
+@mesurer
 def difference_prevalence_sexe(donnees: list[dict], pathologie: str) -> float | None:
     """
     Calcule la différence de prévalence globale entre les hommes et les femmes
@@ -326,6 +340,7 @@ def difference_prevalence_sexe(donnees: list[dict], pathologie: str) -> float |
 
 
 
+@mesurer
 def stats_par_tranche_age(donnees: list[dict], pathologie: str) -> dict:
     """
     Calcule les statistiques descriptives par tranche d'age
@@ -344,6 +359,7 @@ def stats_par_tranche_age(donnees: list[dict], pathologie: str) -> dict:
     return resultats
 
 
+@mesurer
 def variation_prevalence_entre_ages(
     donnees: list[dict],
     pathologie: str,
@@ -370,6 +386,7 @@ def variation_prevalence_entre_ages(
 
 
 
+@mesurer
 def age_central_pathologie(donnees: list[dict], pathologie: str) -> tuple | None:
     """
     Retourne la tranche d'âge pour laquelle la prévalence de la pathologie
@@ -387,11 +404,15 @@ def age_central_pathologie(donnees: list[dict], pathologie: str) -> tuple | None
         sous_ensemble = filtrer_par_age(donnees_patho, age)
         resultats[age] = prevalence_globale(sous_ensemble)
 
+    if not resultats:
+        return None
+
     tranche_max = max(resultats, key=resultats.get)
     return tranche_max, resultats[tranche_max]
 
 
 
+@mesurer
 def stats_par_annee(donnees:list[dict], pathologie: str) -> dict:
     """
     Calcule les statistiques descriptives par année
@@ -410,6 +431,7 @@ def stats_par_annee(donnees:list[dict], pathologie: str) -> dict:
     return dict(sorted(resultats.items()))
 
 
+@mesurer
 def variation_annuelle(donnees: list[dict], pathologie: str) -> dict:
     """
     Calcule la variation annuelle de la prévalence globale pour une pathologie donnée.
@@ -462,6 +484,7 @@ def variation_annuelle(donnees: list[dict], pathologie: str) -> dict:
 
 
 
+@mesurer
 def tendance_generale(donnees: list[dict], pathologie: str) -> str | None:
     """
     Détermine la tendance générale de la prévalence globale
@@ -510,6 +533,7 @@ def tendance_generale(donnees: list[dict], pathologie: str) -> str | None:
     
 
 
+@mesurer
 def pente_tendance(donnees: list[dict], pathologie: str) -> float | None:
     """
     Retourne la moyenne d'évolution annuelle de la prévalence entre
@@ -545,6 +569,7 @@ def pente_tendance(donnees: list[dict], pathologie: str) -> float | None:
     return round(pente, 3)
 
 
+@mesurer
 def stats_par_departement(donnees: list[dict], pathologie: str) -> dict:
     """
     Calcule les statistiques descriptives par département
@@ -578,6 +603,7 @@ def stats_par_departement(donnees: list[dict], pathologie: str) -> dict:
 
 
 
+@mesurer
 def classement_departements(donnees: list[dict], pathologie: str) -> list[tuple]:
     """
     Classement par département de la prévalence globale, de la plus petite à la plus grande
@@ -601,6 +627,7 @@ def classement_departements(donnees: list[dict], pathologie: str) -> list[tuple]
     return classement
 
 
+@mesurer
 def moyenne_nationale(donnees: list[dict], pathologie: str) -> float | None:
     """
     Calcule la prévalence nationale pondérée pour une pathologie (total_ntop / total_npop).
@@ -624,6 +651,7 @@ def moyenne_nationale(donnees: list[dict], pathologie: str) -> float | None:
 
 
 
+@mesurer
 def ecart_a_la_moyenne(donnees: list[dict], pathologie: str) -> list[tuple]:
     """
     Calcul pour chaque département l'écart à la moyenne calculée dans la fonction
@@ -651,6 +679,7 @@ def ecart_a_la_moyenne(donnees: list[dict], pathologie: str) -> list[tuple]:
     return resultats_tries
 
 
+@mesurer
 def bottom_departements(donnees: list[dict], pathologie: str) -> list[tuple] | None:
     """
     Renvoie les 10 départements avec la prévalence la plus faible pour une pathologie donnée
@@ -664,6 +693,7 @@ def bottom_departements(donnees: list[dict], pathologie: str) -> list[tuple] | N
     return classement[:10]
 
 
+@mesurer
 def top_departements(donnees: list[dict], pathologie: str) -> list[tuple] | None:
     """
     Renvoie les 10 départements avec la prévalence la plus forte pour une pathologie donnée
@@ -685,6 +715,7 @@ def top_departements(donnees: list[dict], pathologie: str) -> list[tuple] | None
 
 
 
+@mesurer
 def z_score_prevalence(donnees: list[dict], pathologie: str) -> list[tuple] | None:
     """
     Calcule le z-score pour chaque département et retourne une liste triée par ordre croissant
@@ -700,10 +731,10 @@ def z_score_prevalence(donnees: list[dict], pathologie: str) -> list[tuple] | No
 
     for dept in depts_distincts:
         sous_ensemble = filtrer_par_departement(donnees_patho, dept)
-        prev = prevalence_globale(sous_ensemble)
 
-        if prev is not None:
-            list_prev.append((dept, prev))
+        # prevalence_globale vaut 0.0 sans population : département sans prévalence, ignoré
+        if population_reference(sous_ensemble) > 0:
+            list_prev.append((dept, prevalence_globale(sous_ensemble)))
 
     nb_valeurs = len(list_prev)
 
@@ -724,6 +755,7 @@ def z_score_prevalence(donnees: list[dict], pathologie: str) -> list[tuple] | No
     return resultats_tries
 
 
+@mesurer
 def valeurs_aberrantes(donnees: list[dict], pathologie: str, seuil=2) -> list[tuple] :
     """
     Retourne les départements ayant une valeur aberrante, soit une valeur de z-score égale ou dépassant le seuil de 2 ou -2
@@ -745,6 +777,7 @@ def valeurs_aberrantes(donnees: list[dict], pathologie: str, seuil=2) -> list[tu
 
 
 
+@mesurer
 def stats_par_departement_annee(donnees, pathologie) -> list[tuple[int, dict]]:
     """
     Calcule les statistiques descriptives par département et par année pour une pathologie donnée.
@@ -793,6 +826,7 @@ def stats_par_departement_annee(donnees, pathologie) -> list[tuple[int, dict]]:
 
 
 
+@mesurer
 def moyenne_nationale_annee(donnees: list[dict], pathologie: str) -> dict:
     """
     Calcule la prévalence nationale pondérée par année (somme Ntop / somme Npop * 100).
@@ -822,6 +856,7 @@ def moyenne_nationale_annee(donnees: list[dict], pathologie: str) -> dict:
 
 
 
+@mesurer
 def z_score_prevalence_annee(donnees: list[dict], pathologie: str) -> dict | None:
     """
     Calcule le z-score de la prévalence pour chaque département et par année.
@@ -845,10 +880,10 @@ def z_score_prevalence_annee(donnees: list[dict], pathologie: str) -> dict | Non
 
         for dept in depts_distincts:
             sous_ensemble_dept = filtrer_par_departement(sous_ensemble_annee, dept)
-            prev = prevalence_globale(sous_ensemble_dept)
 
-            if prev is not None:
-                list_prev.append((dept, prev))
+            # département sans ligne (ou sans population) cette année : ignoré
+            if population_reference(sous_ensemble_dept) > 0:
+                list_prev.append((dept, prevalence_globale(sous_ensemble_dept)))
 
         nb_valeurs = len(list_prev)
 
@@ -875,6 +910,7 @@ def z_score_prevalence_annee(donnees: list[dict], pathologie: str) -> dict | Non
 
 
 
+@mesurer
 def annees_anormales(donnees: list[dict], pathologie: str, seuil=2) -> list[dict]:
     """
     Retourne les années aberrantes, c'est-à-dire les années où la moyenne absolue des z-scores (ensemble des départements)
@@ -897,6 +933,7 @@ def annees_anormales(donnees: list[dict], pathologie: str, seuil=2) -> list[dict
 
 
 
+@mesurer
 def top_pathologies(donnees: list[dict], *, 
                     sexe=None,
                     age= None,
@@ -949,6 +986,7 @@ def top_pathologies(donnees: list[dict], *,
 
 
 
+@mesurer
 def pathologies_croissance_forte(donnees: list[dict],
                                  annee_depart: int,
                                  annee_arrivee: int,
@@ -1033,6 +1071,7 @@ def pathologies_croissance_forte(donnees: list[dict],
 
 
 
+@mesurer
 def resume_global_avance(donnees: list[dict],
                              sexe: str | None = None,
                              age: str | None = None,
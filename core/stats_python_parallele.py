@@ -0,0 +1,385 @@
+"""
+Exécution partitionnée des analyses de ``core/stats_python`` sur un pool de processus.
+
+Deux modes de partition :
+- par plage de lignes : chaque processus agrège une tranche contiguë de la liste,
+  les résultats partiels sont fusionnés par des combinateurs associatifs
+  (sommes de Ntop/Npop, moments fusionnables de la prévalence)
+- par pathologie : chaque processus exécute une fonction de ``stats_python``
+  sur les seules lignes d'une pathologie
+
+Les sommes d'effectifs étant entières et les partitions contiguës (l'ordre de
+première apparition des clés est conservé), les résultats sont identiques à ceux
+des fonctions séquentielles.
+"""
+
+import os
+from multiprocessing import Pool
+from core import stats_python
+
+# Données du processus de travail (héritées par fork ou transmises une fois par processus)
+_DONNEES = None
+_GROUPES = None
+
+
+def _initialiser_processus(donnees: list[dict], groupes: dict):
+    global _DONNEES, _GROUPES
+    _DONNEES = donnees
+    _GROUPES = groupes
+
+
+class Moments:
+    """
+    Moments fusionnables (effectif, moyenne, somme des carrés des écarts, min, max)
+    d'une série de valeurs, selon la formule de fusion de Chan et al.
+    """
+
+    def __init__(self, n: int = 0, moyenne: float = 0.0, m2: float = 0.0,
+                 minimum: float | None = None, maximum: float | None = None):
+        self.n = n
+        self.moyenne = moyenne
+        self.m2 = m2
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def depuis_valeurs(cls, valeurs: list[float]) -> "Moments":
+        if not valeurs:
+            return cls()
+        n = len(valeurs)
+        moyenne = sum(valeurs) / n
+        m2 = sum((v - moyenne) ** 2 for v in valeurs)
+        return cls(n, moyenne, m2, min(valeurs), max(valeurs))
+
+    def fusionner(self, autre: "Moments") -> "Moments":
+        if autre.n == 0:
+            return self
+        if self.n == 0:
+            return autre
+        n = self.n + autre.n
+        delta = autre.moyenne - self.moyenne
+        moyenne = self.moyenne + delta * autre.n / n
+        m2 = self.m2 + autre.m2 + delta ** 2 * self.n * autre.n / n
+        return Moments(n, moyenne, m2, min(self.minimum, autre.minimum), max(self.maximum, autre.maximum))
+
+    def ecart_type(self) -> float:
+        if self.n < 2:
+            return 0.0
+        return (self.m2 / (self.n - 1)) ** 0.5
+
+
+def partitionner_par_lignes(nb_lignes: int, nb_parts: int) -> list[tuple[int, int]]:
+    """
+    Découpe [0, nb_lignes) en nb_parts plages contiguës de tailles équilibrées.
+
+    :return: liste de couples (début, fin)
+    """
+    nb_parts = max(1, min(nb_parts, nb_lignes)) if nb_lignes else 1
+    taille, reste = divmod(nb_lignes, nb_parts)
+
+    plages = []
+    debut = 0
+    for i in range(nb_parts):
+        fin = debut + taille + (1 if i < reste else 0)
+        plages.append((debut, fin))
+        debut = fin
+
+    return plages
+
+
+def partitionner_par_pathologie(donnees: list[dict]) -> dict[str, list[dict]]:
+    """
+    Regroupe les lignes par pathologie en conservant leur ordre d'origine.
+    """
+    groupes = {}
+    for ligne in donnees:
+        groupes.setdefault(ligne["Pathologie"], []).append(ligne)
+    return groupes
+
+
+def _filtrer(lignes: list[dict], sexe=None, age=None, departement=None, annee=None) -> list[dict]:
+    return stats_python.filtrer_multi_criteres(lignes, sexe=sexe, age=age, departement=departement, annee=annee)
+
+
+def _ajouter(agregation: dict, cle, ntop: int, npop: int):
+    if cle not in agregation:
+        agregation[cle] = [0, 0]
+    agregation[cle][0] += ntop
+    agregation[cle][1] += npop
+
+
+def _fusionner_sommes(cible: dict, partiel: dict):
+    for cle, (ntop, npop) in partiel.items():
+        _ajouter(cible, cle, ntop, npop)
+
+
+# Agrégations partielles (exécutées dans les processus de travail)
+
+def _partiel_totaux(debut: int, fin: int) -> tuple[int, int]:
+    lignes = _DONNEES[debut:fin]
+    return sum(d["Ntop"] for d in lignes), sum(d["Npop"] for d in lignes)
+
+
+def _partiel_moments(debut: int, fin: int) -> Moments:
+    return Moments.depuis_valeurs([d["prev"] for d in _DONNEES[debut:fin] if d["prev"] != 0])
+
+
+def _partiel_par_pathologie(debut: int, fin: int, filtres: dict) -> dict:
+    agregation = {}
+    for ligne in _filtrer(_DONNEES[debut:fin], **filtres):
+        _ajouter(agregation, ligne["Pathologie"], ligne["Ntop"], ligne["Npop"])
+    return agregation
+
+
+def _partiel_croissance(debut: int, fin: int, annee_depart: int, annee_arrivee: int, filtres: dict) -> tuple:
+    annee_dep = {}
+    annee_arr = {}
+    lignes = _filtrer(_DONNEES[debut:fin], **filtres)
+    for ligne in lignes:
+        if ligne["Annee"] == annee_depart:
+            _ajouter(annee_dep, ligne["Pathologie"], ligne["Ntop"], ligne["Npop"])
+        elif ligne["Annee"] == annee_arrivee:
+            _ajouter(annee_arr, ligne["Pathologie"], ligne["Ntop"], ligne["Npop"])
+    return len(lignes), annee_dep, annee_arr
+
+
+def _partiel_resume(debut: int, fin: int, filtres: dict) -> dict:
+    partiel = {"nb_lignes": 0, "ntop": 0, "npop": 0, "pathologies": {}, "departements": {}, "annees": {}}
+    for ligne in _DONNEES[debut:fin]:
+        if filtres["sexe"] and ligne["Sexe"] != filtres["sexe"]:
+            continue
+        if filtres["age"] and ligne["Age"] != filtres["age"]:
+            continue
+        if filtres["departement"] and ligne["Departement"] != filtres["departement"]:
+            continue
+        if filtres["annee"] and ligne["Annee"] != filtres["annee"]:
+            continue
+        partiel["nb_lignes"] += 1
+        partiel["ntop"] += ligne["Ntop"]
+        partiel["npop"] += ligne["Npop"]
+        _ajouter(partiel["pathologies"], ligne["Pathologie"], ligne["Ntop"], ligne["Npop"])
+        _ajouter(partiel["departements"], ligne["Departement"], ligne["Ntop"], ligne["Npop"])
+        _ajouter(partiel["annees"], ligne["Annee"], ligne["Ntop"], ligne["Npop"])
+    return partiel
+
+
+def _appliquer_par_pathologie(nom_fonction: str, pathologie: str, args: tuple):
+    fonction = getattr(stats_python, nom_fonction)
+    return fonction(_GROUPES.get(pathologie, []), pathologie, *args)
+
+
+def _prevalence(ntop: int, npop: int) -> float:
+    return (ntop / npop) * 100
+
+
+def _maximum(agregation: dict) -> tuple:
+    # Même règle que resume_global_avance : première clé atteignant le maximum strict
+    cle_max = None
+    valeur_max = -1
+    for cle, (ntop, npop) in agregation.items():
+        if npop > 0:
+            prev = _prevalence(ntop, npop)
+            if prev > valeur_max:
+                valeur_max = prev
+                cle_max = cle
+    return cle_max, round(valeur_max, 3)
+
+
+class AnalyseParallele:
+    """
+    Pool de processus partagé par plusieurs analyses d'un même jeu de données.
+
+    Les données sont transmises une seule fois à chaque processus (sans copie
+    avec la méthode de démarrage fork). S'utilise comme gestionnaire de contexte :
+
+        with AnalyseParallele(donnees, processus=4) as analyse:
+            analyse.top_pathologies(annee=2023, top_n=10)
+    """
+
+    def __init__(self, donnees: list[dict], processus: int | None = None, parts: int | None = None):
+        self.donnees = donnees
+        self.processus = processus or os.cpu_count() or 1
+        self.plages = partitionner_par_lignes(len(donnees), parts or self.processus)
+        self.groupes = partitionner_par_pathologie(donnees)
+        self._pool = Pool(self.processus, initializer=_initialiser_processus, initargs=(donnees, self.groupes))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self):
+        self._pool.close()
+        self._pool.join()
+
+    def _par_plage(self, fonction, *args) -> list:
+        return self._pool.starmap(fonction, [(debut, fin, *args) for debut, fin in self.plages])
+
+
+    def nombre_de_cas(self) -> int:
+        return sum(ntop for ntop, _ in self._par_plage(_partiel_totaux))
+
+
+    def population_reference(self) -> int:
+        return sum(npop for _, npop in self._par_plage(_partiel_totaux))
+
+
+    def prevalence_globale(self) -> float:
+        partiels = self._par_plage(_partiel_totaux)
+        total_cas = sum(p[0] for p in partiels)
+        total_population = sum(p[1] for p in partiels)
+
+        if total_population == 0:
+            return 0.0
+
+        return round((total_cas / total_population) * 100, 3)
+
+
+    def prevalence_moyenne(self) -> float:
+        moments = Moments()
+        for partiel in self._par_plage(_partiel_moments):
+            moments = moments.fusionner(partiel)
+        return round(moments.moyenne if moments.n else 0, 3)
+
+
+    def top_pathologies(self, *, sexe=None, age=None, departement=None, annee=None, top_n=None) -> list[tuple]:
+        """
+        Équivalent partitionné de stats_python.top_pathologies.
+        """
+        filtres = {"sexe": sexe, "age": age, "departement": departement, "annee": annee}
+
+        agregation = {}
+        for partiel in self._par_plage(_partiel_par_pathologie, filtres):
+            _fusionner_sommes(agregation, partiel)
+
+        resultats = []
+        for patho, (ntop, npop) in agregation.items():
+            prevalence = 0.0 if npop == 0 else round(_prevalence(ntop, npop), 3)
+            resultats.append((patho, prevalence))
+
+        resultats_tries = sorted(resultats, key=lambda x: x[1], reverse=True)
+
+        if top_n is not None:
+            return resultats_tries[:top_n]
+
+        return resultats_tries
+
+
+    def pathologies_croissance_forte(self, annee_depart: int, annee_arrivee: int,
+                                     sexe: str | None = None,
+                                     age: str | None = None,
+                                     departement: str | None = None,
+                                     top_n: int | None = None) -> list[tuple] | None:
+        """
+        Équivalent partitionné de stats_python.pathologies_croissance_forte.
+        """
+        if annee_depart is None or annee_arrivee is None or annee_depart > annee_arrivee:
+            return None
+
+        filtres = {"sexe": sexe, "age": age, "departement": departement}
+
+        nb_lignes = 0
+        annee_dep = {}
+        annee_arr = {}
+        for nb, dep, arr in self._par_plage(_partiel_croissance, annee_depart, annee_arrivee, filtres):
+            nb_lignes += nb
+            _fusionner_sommes(annee_dep, dep)
+            _fusionner_sommes(annee_arr, arr)
+
+        if nb_lignes == 0:
+            return None
+
+        resultats = []
+        for patho, (ntop_dep, npop_dep) in annee_dep.items():
+            if patho in annee_arr:
+                ntop_arr, npop_arr = annee_arr[patho]
+                if npop_dep > 0 and npop_arr > 0:
+                    croissance = round(_prevalence(ntop_arr, npop_arr) - _prevalence(ntop_dep, npop_dep), 3)
+                    resultats.append((patho, croissance))
+
+        resultats.sort(key=lambda x: x[1], reverse=True)
+
+        if top_n is not None:
+            resultats = resultats[:top_n]
+
+        return resultats
+
+
+    def resume_global_avance(self, sexe: str | None = None,
+                             age: str | None = None,
+                             departement: str | None = None,
+                             annee: int | None = None) -> dict | None:
+        """
+        Équivalent partitionné de stats_python.resume_global_avance.
+        """
+        filtres = {"sexe": sexe, "age": age, "departement": departement, "annee": annee}
+
+        nb_lignes = total_ntop = total_npop = 0
+        patho_dict = {}
+        dep_dict = {}
+        annee_dict = {}
+
+        for partiel in self._par_plage(_partiel_resume, filtres):
+            nb_lignes += partiel["nb_lignes"]
+            total_ntop += partiel["ntop"]
+            total_npop += partiel["npop"]
+            _fusionner_sommes(patho_dict, partiel["pathologies"])
+            _fusionner_sommes(dep_dict, partiel["departements"])
+            _fusionner_sommes(annee_dict, partiel["annees"])
+
+        if nb_lignes == 0:
+            return None
+
+        prevalence_globale = (round(_prevalence(total_ntop, total_npop), 3) if total_npop != 0 else 0.0)
+
+        patho_top, patho_top_val = _maximum(patho_dict)
+        dep_top, dep_top_val = _maximum(dep_dict)
+        annee_critique, annee_critique_val = _maximum(dict(sorted(annee_dict.items())))
+
+        liste_prevalences = [_prevalence(ntop, npop) for _, (ntop, npop) in sorted(annee_dict.items()) if npop > 0]
+
+        tendance = None
+        if len(liste_prevalences) > 1:
+            differences = [liste_prevalences[i] - liste_prevalences[i - 1] for i in range(1, len(liste_prevalences))]
+            tendance = round(sum(differences) / len(differences), 3)
+
+        return {
+            "nb_lignes": nb_lignes,
+            "nb_pathologies": len(patho_dict),
+            "nb_departements": len(dep_dict),
+            "nb_annees": len(annee_dict),
+
+            "total_cas": total_ntop,
+            "population_totale": total_npop,
+            "prevalence_globale": prevalence_globale,
+
+            "pathologie_plus_prevalente": patho_top,
+            "prevalence_pathologie_top": patho_top_val,
+
+            "departement_plus_impacte": dep_top,
+            "prevalence_departement_top": dep_top_val,
+
+            "annee_plus_critique": annee_critique,
+            "prevalence_annee_critique": annee_critique_val,
+
+            "tendance_moyenne_annuelle": tendance
+        }
+
+
+    def par_pathologie(self, nom_fonction: str, pathologies: list[str] | None = None, *args) -> dict:
+        """
+        Exécute une fonction de stats_python de signature (donnees, pathologie, ...)
+        pour chaque pathologie, chaque processus ne recevant que les lignes de la pathologie.
+
+        :param nom_fonction: nom de la fonction de core/stats_python (ex. "z_score_prevalence")
+        :param pathologies: pathologies à traiter (toutes par défaut)
+        :param args: arguments supplémentaires transmis à la fonction
+        :return: dict {pathologie: résultat}
+        """
+        if pathologies is None:
+            pathologies = list(self.groupes)
+
+        resultats = self._pool.starmap(_appliquer_par_pathologie, [(nom_fonction, p, args) for p in pathologies])
+
+        return dict(zip(pathologies, resultats))
@@ -0,0 +1,682 @@
+"""
+Cœur d'analyse SQL : les données nettoyées sont chargées dans une base SQLite locale
+et les fonctions de ``core/stats_pandas`` y sont réécrites en requêtes.
+
+- les agrégations (sommes, comptes, moyennes, médianes, sommes de carrés) sont faites
+  par SQLite ; seuls les petits résultats agrégés remontent en DataFrame, où sont
+  appliqués les mêmes arrondis et tris que dans stats_pandas (mêmes formes de retour)
+- un index composite (pathologie, annee, dept) sert les requêtes par pathologie,
+  par pathologie et période, et par pathologie, année et département ; un index
+  sur l'année sert les filtres globaux
+- la base peut être un fichier : le chargement lit le parquet par lots (nettoyés avec
+  ``stats_pandas.nettoyer_effectifs``) et les requêtes lisent le disque, sans que le jeu
+  tienne en mémoire ; une base déjà construite se rouvre avec ``ouvrir_base``
+
+Utilisation :
+    base = charger_effectifs("data/effectifs.parquet", "data/effectifs.sqlite")
+    stats_sql.classement_departements(base, "Diabète")
+"""
+
+import math
+import sqlite3
+from pathlib import Path
+import pandas as pd
+import pyarrow.parquet as pq
+from core import stats_pandas
+from core.instrumentation import mesurer
+from utils import conversion
+
+TABLE = "effectifs"
+COLONNES = ["annee", "libelle_classe_age", "libelle_sexe", "dept", "Ntop", "Npop", "prev", "pathologie", "departement"]
+INDEX = {
+    "idx_effectifs_pathologie_annee_dept": ("pathologie", "annee", "dept"),
+    "idx_effectifs_annee": ("annee",),
+}
+TAILLE_LOT = 250_000
+
+
+class BaseEffectifs:
+    """
+    Connexion à une base d'effectifs nettoyés ; ``len(base)`` est son nombre de lignes.
+    """
+
+    def __init__(self, connexion: sqlite3.Connection, chemin: str = ":memory:"):
+        self.connexion = connexion
+        self.chemin = chemin
+        self._nb_lignes = None
+
+    def __len__(self) -> int:
+        if self._nb_lignes is None:
+            self._nb_lignes = self.valeur(f"SELECT COUNT(*) FROM {TABLE}")
+        return self._nb_lignes
+
+    def requete(self, sql: str, parametres: tuple = ()) -> pd.DataFrame:
+        return pd.read_sql_query(sql, self.connexion, params=parametres)
+
+    def valeur(self, sql: str, parametres: tuple = ()):
+        ligne = self.connexion.execute(sql, parametres).fetchone()
+        return ligne[0] if ligne is not None else None
+
+    def fermer(self):
+        self.connexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+def _creer_table(connexion: sqlite3.Connection):
+    types = {"annee": "INTEGER", "Ntop": "INTEGER", "Npop": "INTEGER", "prev": "REAL"}
+    colonnes = ", ".join(f'"{c}" {types.get(c, "TEXT")}' for c in COLONNES)
+    connexion.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    connexion.execute(f"CREATE TABLE {TABLE} ({colonnes})")
+
+
+def inserer(connexion: sqlite3.Connection, df: pd.DataFrame):
+    """
+    Ajoute des lignes nettoyées à la table.
+    """
+    marqueurs = ", ".join("?" for _ in COLONNES)
+    lignes = df[COLONNES].astype(object).itertuples(index=False, name=None)
+    connexion.executemany(f"INSERT INTO {TABLE} VALUES ({marqueurs})", lignes)
+
+
+def indexer(connexion: sqlite3.Connection):
+    """
+    Crée les index (après le chargement : plus rapide qu'une mise à jour ligne à ligne) et les statistiques du planificateur.
+    """
+    for nom, colonnes in INDEX.items():
+        connexion.execute(f"CREATE INDEX IF NOT EXISTS {nom} ON {TABLE} ({', '.join(colonnes)})")
+    connexion.execute("ANALYZE")
+    connexion.commit()
+
+
+def depuis_dataframe(df: pd.DataFrame, base: str | Path = ":memory:") -> BaseEffectifs:
+    """
+    Construit la base à partir d'un DataFrame déjà nettoyé (``stats_pandas.charger_effectifs``).
+    """
+    connexion = sqlite3.connect(str(base))
+    connexion.execute("PRAGMA journal_mode=OFF")
+    connexion.execute("PRAGMA synchronous=OFF")
+    _creer_table(connexion)
+    for debut in range(0, len(df), TAILLE_LOT):
+        inserer(connexion, df.iloc[debut:debut + TAILLE_LOT])
+    indexer(connexion)
+    return BaseEffectifs(connexion, str(base))
+
+
+@mesurer(lignes=len)
+def charger_effectifs(parquet_path: str | Path | None = None, base: str | Path = ":memory:",
+                      taille_lot: int = TAILLE_LOT) -> BaseEffectifs:
+    """
+    Lit effectifs.parquet par lots, nettoie chaque lot comme stats_pandas et le charge dans la base.
+
+    :param parquet_path: autre fichier parquet au même format (par défaut data/effectifs.parquet)
+    :param base: fichier SQLite (remplacé s'il existe) ou ":memory:"
+    :param taille_lot: lignes brutes lues et nettoyées à la fois (borne la mémoire utilisée)
+    """
+    if parquet_path is None:
+        parquet_path = Path(__file__).parent.parent / "data" / "effectifs.parquet"
+    parquet_path = Path(parquet_path)
+    if not parquet_path.exists():
+        raise FileNotFoundError(f"{parquet_path} non trouvé !")
+
+    if str(base) != ":memory:" and Path(base).exists():
+        Path(base).unlink()
+
+    connexion = sqlite3.connect(str(base))
+    connexion.execute("PRAGMA journal_mode=OFF")
+    connexion.execute("PRAGMA synchronous=OFF")
+    _creer_table(connexion)
+
+    fichier = pq.ParquetFile(parquet_path)
+    for lot in fichier.iter_batches(batch_size=taille_lot, columns=stats_pandas.COLONNES_ENTETE):
+        inserer(connexion, stats_pandas.nettoyer_effectifs(lot.to_pandas()))
+
+    indexer(connexion)
+    return BaseEffectifs(connexion, str(base))
+
+
+def ouvrir_base(chemin: str | Path) -> BaseEffectifs:
+    """
+    Rouvre une base construite par ``charger_effectifs`` (lecture seule).
+    """
+    chemin = Path(chemin)
+    if not chemin.exists():
+        raise FileNotFoundError(f"{chemin} non trouvé !")
+    return BaseEffectifs(sqlite3.connect(f"file:{chemin}?mode=ro", uri=True), str(chemin))
+
+
+# Filtres
+
+def _clause(conditions: list[tuple[str, object]]) -> tuple[str, tuple]:
+    """
+    Clause WHERE des conditions dont la valeur est renseignée : [(expression avec ?, valeur), ...].
+    """
+    retenues = [(expression, valeur) for expression, valeur in conditions if valeur is not None]
+    if not retenues:
+        return "", ()
+    return " WHERE " + " AND ".join(e for e, _ in retenues), tuple(v for _, v in retenues)
+
+
+def _filtres(sexe=None, age=None, departement=None, annee=None, pathologie=None, periode=None) -> tuple[str, tuple]:
+    conditions = [
+        ("pathologie = ?", pathologie),
+        ("libelle_sexe = ?", sexe),
+        ("libelle_classe_age = ?", age),
+        ("departement = ?", departement),
+        ("annee = ?", annee),
+    ]
+    if periode is not None:
+        conditions += [("annee >= ?", periode[0]), ("annee <= ?", periode[1])]
+    return _clause(conditions)
+
+
+def _ecart_type(somme: float, somme_carres: float, n: int) -> float:
+    """
+    Écart-type d'échantillon (ddof=1) à partir des sommes ; NaN pour moins de deux valeurs.
+    """
+    if n is None or n < 2:
+        return math.nan
+    variance = (somme_carres - somme * somme / n) / (n - 1)
+    return math.sqrt(max(variance, 0.0))
+
+
+# Statistiques globales
+
+@mesurer
+def nombre_de_lignes(base: BaseEffectifs) -> int:
+    return len(base)
+
+
+@mesurer
+def pathologies_distinctes(base: BaseEffectifs) -> int:
+    return base.valeur(f"SELECT COUNT(DISTINCT pathologie) FROM {TABLE}")
+
+
+@mesurer
+def departements_distincts(base: BaseEffectifs) -> int:
+    return base.valeur(f"SELECT COUNT(DISTINCT departement) FROM {TABLE}")
+
+
+@mesurer
+def annees_distinctes(base: BaseEffectifs) -> int:
+    return base.valeur(f"SELECT COUNT(DISTINCT annee) FROM {TABLE}")
+
+
+@mesurer
+def nombre_de_cas(base: BaseEffectifs) -> int:
+    return int(base.valeur(f"SELECT COALESCE(SUM(Ntop), 0) FROM {TABLE}"))
+
+
+@mesurer
+def population_reference(base: BaseEffectifs) -> int:
+    return int(base.valeur(f"SELECT COALESCE(SUM(Npop), 0) FROM {TABLE}"))
+
+
+@mesurer
+def prevalence_globale(base: BaseEffectifs) -> float:
+    total_cas, total_population = base.connexion.execute(
+        f"SELECT COALESCE(SUM(Ntop), 0), COALESCE(SUM(Npop), 0) FROM {TABLE}").fetchone()
+    if total_population == 0:
+        return 0.0
+    return round((total_cas / total_population) * 100, 3)
+
+
+@mesurer
+def prevalence_moyenne(base: BaseEffectifs) -> float:
+    moyenne = base.valeur(f"SELECT AVG(prev) FROM {TABLE} WHERE prev != 0")
+    return round(moyenne, 3) if moyenne is not None else 0.0
+
+
+# Statistiques descriptives d'un groupe de lignes : sommes, moments et médiane de prev
+
+def _descriptives(base: BaseEffectifs, where: str, parametres: tuple, groupe: str | None = None) -> pd.DataFrame:
+    """
+    Ntop, Npop, moyenne, médiane, min, max et écart-type de prev, par ``groupe`` (ou sur toutes les lignes).
+    """
+    cle = groupe or "NULL"
+    partition = f"PARTITION BY {groupe}" if groupe else ""
+    sql = f"""
+        WITH lignes AS (
+            SELECT {cle} AS cle, Ntop, Npop, prev,
+                   ROW_NUMBER() OVER ({partition} ORDER BY prev) AS rang,
+                   COUNT(*) OVER ({partition}) AS n
+            FROM {TABLE}{where}
+        ),
+        agregats AS (
+            SELECT cle, SUM(Ntop) AS Ntop_totale, SUM(Npop) AS Npop_totale, AVG(prev) AS moyenne,
+                   MIN(prev) AS minimum, MAX(prev) AS maximum, SUM(prev) AS somme,
+                   SUM(prev * prev) AS somme_carres, COUNT(*) AS n
+            FROM lignes GROUP BY cle
+        ),
+        medianes AS (
+            SELECT cle, AVG(prev) AS mediane FROM lignes
+            WHERE rang IN ((n + 1) / 2, (n + 2) / 2) GROUP BY cle
+        )
+        SELECT a.*, m.mediane FROM agregats a JOIN medianes m ON a.cle IS m.cle ORDER BY a.cle
+    """
+    return base.requete(sql, parametres)
+
+
+def _ligne_descriptive(ligne) -> dict:
+    prevalence = (ligne["Ntop_totale"] / ligne["Npop_totale"] * 100) if ligne["Npop_totale"] else 0
+    return {
+        "Ntop_totale": ligne["Ntop_totale"],
+        "Npop_totale": ligne["Npop_totale"],
+        "prevalence_globale": round(prevalence, 3),
+        "prevalence_moyenne": round(ligne["moyenne"], 3),
+        "prevalence_mediane": round(ligne["mediane"], 3),
+        "prevalence_min": round(ligne["minimum"], 3),
+        "prevalence_max": round(ligne["maximum"], 3),
+        "ecart_type": round(_ecart_type(ligne["somme"], ligne["somme_carres"], ligne["n"]), 3),
+    }
+
+
+@mesurer
+def stats_patho(base: BaseEffectifs,
+                pathologie: str,
+                sexe: str | None = None,
+                age: str | None = None,
+                departement: str | None = None,
+                annee: int | None = None
+                ) -> pd.Series:
+    """
+    Équivalent SQL de ``stats_pandas.stats_patho``.
+    """
+    where, parametres = _filtres(sexe or None, age or None, departement or None, annee or None, pathologie)
+    stats = _descriptives(base, where, parametres)
+
+    if stats.empty:
+        return pd.Series({
+            "Ntop_totale": 0, "Npop_totale": 0,
+            "prevalence_globale": 0.0,
+            "prevalence_moyenne": 0.0, "prevalence_mediane": 0.0,
+            "prevalence_min": 0.0, "prevalence_max": 0.0, "ecart_type": 0.0
+        })
+    return pd.Series(_ligne_descriptive(stats.iloc[0]))
+
+
+# Sexe et âge
+
+@mesurer
+def stats_par_sexe(base: BaseEffectifs, pathologie: str) -> pd.DataFrame:
+    stats = _descriptives(base, " WHERE pathologie = ? AND libelle_sexe != 'tous sexes'", (pathologie,), "libelle_sexe")
+    if stats.empty:
+        return pd.DataFrame()
+    return pd.DataFrame([{"sexe": ligne["cle"], **_ligne_descriptive(ligne)} for _, ligne in stats.iterrows()]).set_index("sexe")
+
+
+def _totaux_par(base: BaseEffectifs, colonnes: str, pathologie: str, condition: str = "",
+                parametres: tuple = (), periode: tuple[int, int] | None = None) -> pd.DataFrame:
+    """
+    Sommes de Ntop et Npop d'une pathologie par ``colonnes`` (parcours de l'index composite).
+    """
+    where, valeurs = _filtres(pathologie=pathologie, periode=periode)
+    sql = (f"SELECT {colonnes}, SUM(Ntop) AS Ntop_totale, SUM(Npop) AS Npop_totale "
+           f"FROM {TABLE}{where}{condition} GROUP BY {colonnes} ORDER BY {colonnes}")
+    return base.requete(sql, valeurs + parametres)
+
+
+@mesurer
+def ratio_cas_hf(base: BaseEffectifs, pathologie: str) -> float | None:
+    stats = _totaux_par(base, "libelle_sexe", pathologie, " AND libelle_sexe != 'tous sexes'").set_index("libelle_sexe")
+    if "hommes" not in stats.index or "femmes" not in stats.index or stats.loc["femmes", "Ntop_totale"] == 0:
+        return None
+    return round(stats.loc["hommes", "Ntop_totale"] / stats.loc["femmes", "Ntop_totale"], 3)
+
+
+@mesurer
+def difference_prevalence_sexe(base: BaseEffectifs, pathologie: str) -> float | None:
+    stats = base.requete(
+        f"SELECT LOWER(libelle_sexe) AS sexe, SUM(Ntop) AS Ntop, SUM(Npop) AS Npop FROM {TABLE} "
+        f"WHERE pathologie = ? AND LOWER(libelle_sexe) != 'tous sexes' GROUP BY LOWER(libelle_sexe)",
+        (pathologie,)).set_index("sexe")
+
+    if "hommes" not in stats.index or "femmes" not in stats.index:
+        return None
+    if stats.loc["hommes", "Npop"] == 0 or stats.loc["femmes", "Npop"] == 0:
+        return None
+
+    prev_h = stats.loc["hommes", "Ntop"] / stats.loc["hommes", "Npop"] * 100
+    prev_f = stats.loc["femmes", "Ntop"] / stats.loc["femmes", "Npop"] * 100
+    return round(prev_h - prev_f, 3)
+
+
+def _prevalence(stats: pd.DataFrame) -> pd.DataFrame:
+    stats["prevalence_globale"] = (stats["Ntop_totale"] / stats["Npop_totale"]) * 100
+    stats.loc[stats["Npop_totale"] == 0, "prevalence_globale"] = None
+    return stats
+
+
+@mesurer
+def stats_par_tranche_age(base: BaseEffectifs, pathologie: str) -> pd.DataFrame:
+    stats = _totaux_par(base, "libelle_classe_age", pathologie)
+    if stats.empty:
+        return pd.DataFrame()
+
+    # Ordre des tranches de stats_pandas : tranches connues uniquement, dans l'ordre croissant
+    ordre = conversion.Conversion_donnees().ordre_tranches_age()
+    stats = stats[stats["libelle_classe_age"].isin(ordre)]
+    stats["libelle_classe_age"] = pd.Categorical(stats["libelle_classe_age"], categories=ordre, ordered=True)
+    stats = stats.sort_values("libelle_classe_age").set_index("libelle_classe_age")
+
+    return _prevalence(stats).round(3)
+
+
+@mesurer
+def difference_prevalence_age(base: BaseEffectifs, pathologie: str, tranche_age_1: str, tranche_age_2: str) -> float | None:
+    stats_tranche_age = stats_par_tranche_age(base, pathologie)
+
+    if tranche_age_1 not in stats_tranche_age.index or tranche_age_2 not in stats_tranche_age.index:
+        return None
+
+    prev_t1 = stats_tranche_age.loc[tranche_age_1, "prevalence_globale"]
+    prev_t2 = stats_tranche_age.loc[tranche_age_2, "prevalence_globale"]
+
+    if prev_t1 is None or prev_t2 is None:
+        return None
+
+    return round(prev_t1 - prev_t2, 3)
+
+
+@mesurer
+def age_central_pathologie(base: BaseEffectifs, pathologie: str) -> tuple[str, float] | None:
+    stats_tranche_age = stats_par_tranche_age(base, pathologie)
+
+    if stats_tranche_age.empty:
+        return None
+
+    return stats_tranche_age["prevalence_globale"].idxmax(), round(stats_tranche_age["prevalence_globale"].max(), 3)
+
+
+# Évolution annuelle
+
+def _totaux_annuels(base: BaseEffectifs, pathologie: str, periode: tuple[int, int] | None) -> pd.DataFrame:
+    stats = _totaux_par(base, "annee", pathologie, periode=periode).set_index("annee")
+    return _prevalence(stats)
+
+
+@mesurer
+def stats_par_annee(base: BaseEffectifs, pathologie: str,
+                    periode: tuple[int, int] | None = None) -> pd.DataFrame | None:
+    stats = _totaux_annuels(base, pathologie, periode)
+    if stats.empty:
+        return pd.DataFrame()
+    return stats.round(3)
+
+
+@mesurer
+def variation_annuelle(base: BaseEffectifs, pathologie: str, periode: tuple[int, int] | None = None) -> dict:
+    stats = _totaux_annuels(base, pathologie, periode)
+    if stats.empty:
+        return None
+    return stats_pandas.variations_prevalence(stats)
+
+
+@mesurer
+def tendance_generale(base: BaseEffectifs, pathologie: str, periode: tuple[int, int] | None = None) -> str | None:
+    return stats_pandas.tendance_variations(variation_annuelle(base, pathologie, periode))
+
+
+@mesurer
+def pente_tendance(base: BaseEffectifs, pathologie: str, periode: tuple[int, int] | None = None) -> float | None:
+    return stats_pandas.pente_prevalence(stats_par_annee(base, pathologie, periode))
+
+
+# Départements
+
+@mesurer
+def stats_par_departement(base: BaseEffectifs, pathologie: str) -> pd.DataFrame | None:
+    stats = _totaux_par(base, "dept", pathologie).set_index("dept")
+    if stats.empty:
+        return pd.DataFrame()
+
+    stats = _prevalence(stats)
+    stats["departement_nom"] = stats.index.map(conversion.Conversion_donnees.departement)
+    return stats.round(3)
+
+
+@mesurer
+def classement_departements(base: BaseEffectifs, pathologie: str) -> pd.DataFrame | None:
+    stats = stats_par_departement(base, pathologie)
+    if stats.empty:
+        return pd.DataFrame()
+
+    classement = stats.sort_values("prevalence_globale", ascending=True).reset_index()
+    classement = classement[["dept", "departement_nom", "prevalence_globale"]]
+    classement.index += 1
+    return classement
+
+
+@mesurer
+def moyenne_nationale(base: BaseEffectifs, pathologie: str) -> float | None:
+    total_ntop, total_npop = base.connexion.execute(
+        f"SELECT SUM(Ntop), SUM(Npop) FROM {TABLE} WHERE pathologie = ?", (pathologie,)).fetchone()
+    if total_npop is None or total_npop == 0:
+        return None
+    return round((total_ntop / total_npop) * 100, 3)
+
+
+@mesurer
+def ecart_a_la_moyenne(base: BaseEffectifs, pathologie: str) -> pd.DataFrame | None:
+    stats = stats_par_departement(base, pathologie)
+    moyenne_nat = moyenne_nationale(base, pathologie)
+    if stats.empty or moyenne_nat is None:
+        return pd.DataFrame()
+
+    stats["ecart_a_la_moyenne"] = stats["prevalence_globale"] - moyenne_nat
+    stats = stats.drop(columns=["Ntop_totale", "Npop_totale", "prevalence_globale"])
+    return stats.sort_values("ecart_a_la_moyenne", ascending=True).round(3)
+
+
+@mesurer
+def bottom_departements(base: BaseEffectifs, pathologie: str) -> pd.DataFrame:
+    classement = classement_departements(base, pathologie)
+    if classement.empty:
+        return pd.DataFrame()
+    return classement.sort_values("prevalence_globale").head(10)
+
+
+@mesurer
+def top_departements(base: BaseEffectifs, pathologie: str) -> pd.DataFrame:
+    classement = classement_departements(base, pathologie)
+    if classement.empty:
+        return pd.DataFrame()
+
+    top10 = classement.sort_values("prevalence_globale", ascending=False).head(10).reset_index(drop=True)
+    top10.index = top10.index + 1
+    return top10
+
+
+@mesurer
+def z_score_prevalence(base: BaseEffectifs, pathologie: str) -> pd.DataFrame:
+    stats = stats_par_departement(base, pathologie)
+    moyenne_nat = moyenne_nationale(base, pathologie)
+    if stats.empty or moyenne_nat is None:
+        return pd.DataFrame()
+
+    stats["z_score"] = (stats["prevalence_globale"] - moyenne_nat) / stats["prevalence_globale"].std()
+    stats = stats.drop(columns=["Ntop_totale", "Npop_totale", "prevalence_globale"])
+    stats = stats.sort_values("z_score").reset_index()
+    stats.index = stats.index + 1
+    return stats
+
+
+@mesurer
+def valeurs_aberrantes(base: BaseEffectifs, pathologie: str, seuil=2) -> pd.DataFrame:
+    z_scores = z_score_prevalence(base, pathologie)
+    if z_scores.empty:
+        return pd.DataFrame()
+
+    z_scores = z_scores[(z_scores["z_score"] <= -seuil) | (z_scores["z_score"] >= seuil)].reset_index(drop=True)
+    z_scores.index += 1
+    return z_scores
+
+
+@mesurer
+def stats_par_departement_annee(base: BaseEffectifs, pathologie: str,
+                                periode: tuple[int, int] | None = None) -> pd.DataFrame:
+    stats = _totaux_par(base, "annee, dept", pathologie, periode=periode)
+    if stats.empty:
+        return pd.DataFrame()
+
+    stats["prevalence_globale"] = stats["Ntop_totale"] / stats["Npop_totale"] * 100
+    stats.loc[stats["Npop_totale"] == 0, "prevalence_globale"] = pd.NA
+    stats["departement_nom"] = stats["dept"].map(conversion.Conversion_donnees.departement)
+
+    stats = stats[["annee", "dept", "departement_nom", "Ntop_totale", "Npop_totale", "prevalence_globale"]]
+    return stats.round(3)
+
+
+@mesurer
+def moyenne_nationale_annee(base: BaseEffectifs, pathologie: str,
+                            periode: tuple[int, int] | None = None) -> pd.DataFrame:
+    stats = _totaux_par(base, "annee", pathologie, periode=periode)
+    if stats.empty:
+        return pd.DataFrame()
+
+    stats["moyenne_nationale"] = stats["Ntop_totale"] / stats["Npop_totale"] * 100
+    stats.loc[stats["Npop_totale"] == 0, "moyenne_nationale"] = pd.NA
+    return stats[["annee", "moyenne_nationale"]].round(3)
+
+
+@mesurer
+def z_score_prevalence_annee(base: BaseEffectifs, pathologie: str,
+                             periode: tuple[int, int] | None = None) -> pd.DataFrame:
+    stats = stats_par_departement_annee(base, pathologie, periode)
+    moyennes = moyenne_nationale_annee(base, pathologie, periode)
+    if stats.empty or moyennes.empty:
+        return pd.DataFrame()
+
+    z = stats.merge(moyennes, on="annee", how="left")
+    z["ecart_type"] = z.groupby("annee")["prevalence_globale"].transform(lambda x: x.std(ddof=1))
+    z["z_score"] = ((z["prevalence_globale"] - z["moyenne_nationale"]) / z["ecart_type"]).round(3)
+
+    z = z.sort_values(["annee", "z_score"]).reset_index(drop=True)
+    return z[["annee", "dept", "departement_nom", "z_score"]]
+
+
+@mesurer
+def annees_anormales(base: BaseEffectifs, pathologie: str, seuil=2) -> pd.DataFrame:
+    z = z_score_prevalence_annee(base, pathologie)
+    if z.empty:
+        return pd.DataFrame()
+
+    moyennes = z.groupby("annee")["z_score"].apply(lambda x: x.abs().mean()).reset_index(name="moyenne_abs_z")
+    anormales = moyennes[moyennes["moyenne_abs_z"] >= seuil].copy()
+    anormales["moyenne_abs_z"] = anormales["moyenne_abs_z"].round(3)
+    return anormales
+
+
+# Classements de pathologies
+
+@mesurer
+def top_pathologies(base: BaseEffectifs,
+                    sexe: str | None = None,
+                    age: str | None = None,
+                    departement: str | None = None,
+                    annee: int | None = None,
+                    top_n: int | None = None
+                    ) -> pd.DataFrame | None:
+    where, parametres = _filtres(sexe, age, departement, annee)
+    stats = base.requete(
+        f"SELECT pathologie, SUM(Ntop) AS total_ntop, SUM(Npop) AS total_npop FROM {TABLE}{where} "
+        f"GROUP BY pathologie ORDER BY pathologie", parametres)
+
+    if stats.empty:
+        return None
+
+    stats["prevalence_globale"] = (stats["total_ntop"] / stats["total_npop"]).fillna(0).mul(100).round(3)
+    stats = stats.drop(columns=["total_ntop", "total_npop"])
+    stats = stats.sort_values("prevalence_globale", ascending=False).reset_index(drop=True)
+    stats.index = stats.index + 1
+
+    if top_n is not None:
+        return stats.head(top_n)
+    return stats
+
+
+@mesurer
+def pathologies_croissance_forte(base: BaseEffectifs,
+                                 annee_depart: int,
+                                 annee_arrivee: int,
+                                 sexe: str | None = None,
+                                 age: str | None = None,
+                                 departement: str | None = None,
+                                 top_n: int | None = None) -> pd.DataFrame | None:
+    if annee_depart is None or annee_arrivee is None or annee_depart > annee_arrivee:
+        return None
+
+    where, parametres = _filtres(sexe, age, departement)
+    if base.valeur(f"SELECT EXISTS (SELECT 1 FROM {TABLE}{where})", parametres) == 0:
+        return None
+
+    # Seules les deux années comparées sont agrégées (index sur l'année)
+    condition = (" AND " if where else " WHERE ") + "annee IN (?, ?)"
+    stats = base.requete(
+        f"SELECT pathologie, annee, SUM(Ntop) AS total_ntop, SUM(Npop) AS total_npop FROM {TABLE}{where}{condition} "
+        f"GROUP BY pathologie, annee", parametres + (annee_depart, annee_arrivee))
+    stats["prevalence_globale_annuelle"] = (stats["total_ntop"] / stats["total_npop"]).fillna(0).mul(100).round(3)
+
+    croissance = stats.pivot(index="pathologie", columns="annee", values="prevalence_globale_annuelle")
+    croissance = croissance.reindex(columns=list(dict.fromkeys([annee_depart, annee_arrivee]))).dropna()
+    croissance.columns.name = None
+
+    croissance["croissance"] = croissance[annee_arrivee] - croissance[annee_depart]
+    croissance = croissance.sort_values("croissance", ascending=False).reset_index()
+    croissance.index = croissance.index + 1
+
+    if top_n is not None:
+        croissance = croissance.head(top_n)
+    return croissance
+
+
+@mesurer
+def resume_global_avance(base: BaseEffectifs,
+                         sexe: str | None = None,
+                         age: str | None = None,
+                         departement: str | None = None,
+                         annee: int | None = None) -> dict | None:
+    where, parametres = _filtres(sexe or None, age or None, departement or None, annee or None)
+
+    nb_lignes, nb_pathologies, nb_departements, nb_annees, total_ntop, total_npop = base.connexion.execute(
+        f"SELECT COUNT(*), COUNT(DISTINCT pathologie), COUNT(DISTINCT departement), COUNT(DISTINCT annee), "
+        f"SUM(Ntop), SUM(Npop) FROM {TABLE}{where}", parametres).fetchone()
+
+    if nb_lignes == 0:
+        return None
+
+    def meilleure(colonne: str) -> tuple:
+        groupes = base.requete(
+            f"SELECT {colonne} AS cle, SUM(Ntop) AS Ntop, SUM(Npop) AS Npop FROM {TABLE}{where} "
+            f"GROUP BY {colonne} ORDER BY {colonne}", parametres).set_index("cle")
+        prevalence = groupes["Ntop"] / groupes["Npop"] * 100
+        return prevalence.idxmax(), round(prevalence.max(), 3), prevalence
+
+    patho_top, patho_top_val, _ = meilleure("pathologie")
+    dep_top, dep_top_val, _ = meilleure("departement")
+    annee_critique, annee_critique_val, prevalence_annees = meilleure("annee")
+
+    tendance = None
+    if len(prevalence_annees) > 1:
+        tendance = round(prevalence_annees.diff().mean(), 3)
+
+    return {
+        "nb_lignes": nb_lignes,
+        "nb_pathologies": nb_pathologies,
+        "nb_departements": nb_departements,
+        "nb_annees": nb_annees,
+        "total_cas": int(total_ntop),
+        "population_totale": int(total_npop),
+        "prevalence_globale": round((total_ntop / total_npop) * 100, 3) if total_npop != 0 else 0.0,
+        "pathologie_plus_prevalente": patho_top,
+        "prevalence_pathologie_top": patho_top_val,
+        "departement_plus_impacte": dep_top,
+        "prevalence_departement_top": dep_top_val,
+        "annee_plus_critique": int(annee_critique),
+        "prevalence_annee_critique": annee_critique_val,
+        "tendance_moyenne_annuelle": tendance,
+    }
@@ -0,0 +1,142 @@
+"""
+Réorganisation de effectifs.parquet pour les lectures par pathologie.
+
+Le fichier est réécrit trié par (pathologie, annee, dept), avec une colonne ``pathologie``
+(niveau le plus précis, comme après nettoyage) ajoutée aux colonnes d'origine, en
+groupes de lignes (row groups) assez petits pour que les statistiques min/max de cette
+colonne permettent d'écarter sans les décoder les groupes d'autres pathologies.
+En option, le jeu est partitionné par année (dossiers ``annee=AAAA``, format hive).
+
+Le fichier trié reste lisible par ``stats_pandas.charger_effectifs`` (mêmes colonnes
+d'origine) ; ``charger_pathologie`` lit une seule pathologie via un filtre
+``pyarrow.dataset`` et ne décode que les groupes de lignes qui peuvent la contenir.
+
+Utilisation (depuis la racine du projet) :
+    python disposition_parquet.py --destination data/effectifs_trie.parquet
+    python disposition_parquet.py --destination data/effectifs_annees --partitionner-annee
+"""
+
+import argparse
+import shutil
+import time
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from core import stats_pandas
+from core.stats_arrow import pathologie_la_plus_precise
+
+SOURCE_PAR_DEFAUT = Path(__file__).parent / "data" / "effectifs.parquet"
+TRI = [("pathologie", "ascending"), ("annee", "ascending"), ("dept", "ascending")]
+LIGNES_PAR_GROUPE_MIN = 16_384
+LIGNES_PAR_GROUPE_MAX = 262_144
+
+
+def lignes_par_groupe(table: pa.Table) -> int:
+    """
+    Taille de groupe de lignes proche du nombre moyen de lignes par pathologie :
+    une pathologie tient alors dans un ou deux groupes.
+    """
+    moyenne = table.num_rows // max(pc.count_distinct(table.column("pathologie")).as_py(), 1)
+    return min(max(moyenne, LIGNES_PAR_GROUPE_MIN), LIGNES_PAR_GROUPE_MAX)
+
+
+def _partitionnement(table: pa.Table) -> ds.Partitioning:
+    return ds.partitioning(pa.schema([table.schema.field("annee")]), flavor="hive")
+
+
+def reorganiser(source: str | Path, destination: str | Path, partitionner_annee: bool = False,
+                taille_groupe: int | None = None, compression: str = "snappy") -> dict:
+    """
+    Réécrit ``source`` trié par (pathologie, annee, dept).
+
+    :param source: fichier effectifs.parquet d'origine
+    :param destination: fichier parquet (ou dossier si ``partitionner_annee``), remplacé s'il existe
+    :param partitionner_annee: un dossier ``annee=AAAA`` par année
+    :param taille_groupe: lignes par groupe (par défaut ``lignes_par_groupe``)
+    :param compression: codec parquet
+    :return: description de la disposition écrite
+    """
+    destination = Path(destination)
+    table = pq.read_table(source)
+    if "pathologie" in table.column_names:
+        table = table.drop_columns(["pathologie"])
+    table = table.append_column("pathologie", pathologie_la_plus_precise(table)).sort_by(TRI)
+    taille_groupe = taille_groupe or lignes_par_groupe(table)
+
+    if destination.is_dir():
+        shutil.rmtree(destination)
+    elif destination.exists():
+        destination.unlink()
+
+    if partitionner_annee:
+        ds.write_dataset(
+            table, destination, format="parquet",
+            partitioning=_partitionnement(table),
+            file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+            min_rows_per_group=taille_groupe, max_rows_per_group=taille_groupe,
+            max_rows_per_file=max(table.num_rows, 1), preserve_order=True,
+        )
+    else:
+        pq.write_table(
+            table, destination, row_group_size=taille_groupe, compression=compression,
+            sorting_columns=pq.SortingColumn.from_ordering(table.schema, TRI),
+        )
+
+    return {"lignes": table.num_rows, "lignes_par_groupe": taille_groupe, **groupes_de_lignes(destination)}
+
+
+def ouvrir(chemin: str | Path) -> ds.Dataset:
+    """
+    Jeu parquet réorganisé (fichier trié ou dossier partitionné par année).
+    """
+    chemin = Path(chemin)
+    if chemin.is_dir():
+        return ds.dataset(chemin, format="parquet", partitioning="hive")
+    return ds.dataset(chemin, format="parquet")
+
+
+def groupes_de_lignes(chemin: str | Path, pathologie: str | None = None) -> dict:
+    """
+    Nombre de groupes de lignes du jeu et, pour ``pathologie``, de ceux que le filtre
+    ne peut pas écarter par les statistiques (les seuls décodés par ``charger_pathologie``).
+    """
+    jeu = ouvrir(chemin)
+    fragments = list(jeu.get_fragments())
+    resultat = {"fichiers": len(fragments), "groupes": sum(f.num_row_groups for f in fragments)}
+    if pathologie is not None:
+        filtre = ds.field("pathologie") == pathologie
+        resultat["groupes_lus"] = sum(len(f.split_by_row_group(filtre)) for f in jeu.get_fragments(filter=filtre))
+    return resultat
+
+
+def charger_pathologie(chemin: str | Path, pathologie: str) -> pd.DataFrame:
+    """
+    Lignes nettoyées d'une pathologie, lues dans un jeu réorganisé : mêmes lignes que
+    ``stats_pandas.charger_effectifs`` filtré sur ``pathologie``.
+    """
+    table = ouvrir(chemin).to_table(columns=stats_pandas.COLONNES_ENTETE, filter=ds.field("pathologie") == pathologie)
+    return stats_pandas.nettoyer_effectifs(table.to_pandas())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=str(SOURCE_PAR_DEFAUT), help="fichier parquet d'origine")
+    parser.add_argument("--destination", required=True, help="fichier parquet trié (dossier avec --partitionner-annee)")
+    parser.add_argument("--partitionner-annee", action="store_true", help="un dossier annee=AAAA par année")
+    parser.add_argument("--lignes-par-groupe", type=int, default=None, help="lignes par groupe de lignes")
+    parser.add_argument("--compression", default="snappy")
+    args = parser.parse_args()
+
+    debut = time.perf_counter()
+    disposition = reorganiser(args.source, args.destination, args.partitionner_annee,
+                              args.lignes_par_groupe, args.compression)
+    print(f"{disposition['lignes']:,} lignes écrites dans {args.destination} : {disposition['fichiers']} fichier(s), "
+          f"{disposition['groupes']} groupes de {disposition['lignes_par_groupe']:,} lignes au plus "
+          f"({time.perf_counter() - debut:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,69 @@ import matplotlib.ticker as ticker
 from core.stats_pandas import (stats_patho, stats_par_sexe, stats_par_tranche_age, age_central_pathologie,
                                ratio_cas_hf, difference_prevalence_sexe, prevalence_globale)
 from utils.conversion import Conversion_donnees
-
-def analyse_pathologie(df: pd.DataFrame, pathologie: str):
+from utils import latence
+from utils.cache_pages import CachePages, obtenir
+from core.jeu_donnees import JeuDonnees
+
+PAGE = "Analyse par pathologie"
+
+
+def tables_analyse_pathologie(jeu: JeuDonnees, pathologie: str) -> dict:
+    """
+    Tableaux de la page d'analyse d'une pathologie (sans affichage).
+    """
+    with latence.calcul():
+        df = jeu.pathologie(pathologie)
+
+        # Répartition par tranche d'âge et par sexe
+        df_filtered = df[
+            (df["pathologie"] == pathologie) &
+            (df["libelle_classe_age"] != "tous âges") &
+            (df["libelle_sexe"] != "tous sexes")
+        ]
+
+        df_filtered["libelle_classe_age"] = pd.Categorical(
+            df_filtered["libelle_classe_age"],
+            categories=Conversion_donnees.ORDRE_TRANCHES_AGE,
+            ordered=True
+        )
+
+        pivot = df_filtered.groupby(["libelle_classe_age", "libelle_sexe"])["Ntop"].sum().unstack(fill_value=0)
+
+        # Prévalences et parts par tranche d'âge
+        stats_age = stats_par_tranche_age(df, pathologie)
+        total_age = stats_age["Ntop_totale"].sum()
+        stats_age["%"] = (stats_age["Ntop_totale"] / total_age * 100).round(3)
+        stats_age = stats_age.reset_index().rename(columns={"libelle_classe_age" : "Tranche d'âge", "Ntop_totale": "Nombre total de cas", "Npop_totale": "Population totale", 
+                                                            "prevalence_globale" : "Prevalence globale", "%": "Part (%)"})
+        stats_age.index = stats_age.index + 1
+
+        return {
+            "stats_globales": stats_patho(df, pathologie),
+            "prevalence_globale": prevalence_globale(df),
+            "stats_sexe": stats_par_sexe(df, pathologie),
+            "ratio": ratio_cas_hf(df, pathologie),
+            "diff_prev": difference_prevalence_sexe(df, pathologie),
+            "pivot_age_sexe": pivot,
+            "stats_age": stats_age,
+            "age_central": age_central_pathologie(df, pathologie),
+            "part_la_plus_elevee": stats_age.loc[stats_age["Part (%)"].idxmax(), "Tranche d'âge"],
+        }
+
+
+def analyse_pathologie(jeu: JeuDonnees, pathologie: str, cache: CachePages | None = None):
 
     st.title("Analyse d'une pathologie/traitement")
     st.caption(f"Analyse démographique du traitement ou de la pathologie suivant(e) : {pathologie}")
 
-    df_patho = df[df["pathologie"] == pathologie]
+    latence.section("Calcul")
+    resultats = obtenir(cache, (PAGE, pathologie, None), lambda: tables_analyse_pathologie(jeu, pathologie))
 
     # Indicateurs globaux
 
-    stats_globales = stats_patho(df, pathologie)
+    latence.section("Indicateurs globaux")
+    stats_globales = resultats["stats_globales"]
+    prevalence_patho = resultats["prevalence_globale"]
 
     st.subheader("Indicateurs globaux")
 
@@ -23,7 +75,7 @@ def analyse_pathologie(df: pd.DataFrame, pathologie: str):
 
     col1.metric("Cas totaux", f"{int(stats_globales['Ntop_totale']):,}")
     col2.metric("Population totale", f"{int(stats_globales['Npop_totale']):,}")
-    col3.metric("Prévalence globale (%)", f"{prevalence_globale(df_patho):.2f}")
+    col3.metric("Prévalence globale (%)", f"{prevalence_patho:.2f}")
 
     st.markdown("""
     Cette section présente les indicateurs agrégés pour la pathologie sélectionnée.
@@ -40,11 +92,12 @@ def analyse_pathologie(df: pd.DataFrame, pathologie: str):
 
     # Répartition par sexe
 
+    latence.section("Structure par sexe")
     st.subheader("Structure par sexe")
 
-    stats_sexe = stats_par_sexe(df, pathologie)
-    ratio = ratio_cas_hf(df, pathologie)
-    diff_prev = difference_prevalence_sexe(df, pathologie)
+    stats_sexe = resultats["stats_sexe"]
+    ratio = resultats["ratio"]
+    diff_prev = resultats["diff_prev"]
 
     col4, col5, col6, col7 = st.columns(4)
 
@@ -62,14 +115,15 @@ def analyse_pathologie(df: pd.DataFrame, pathologie: str):
     
     st.markdown("### Répartition des cas par sexe")
 
-    fig1, ax1 = plt.subplots()
-    ax1.bar(stats_sexe.index, stats_sexe["Ntop_totale"])
-    ax1.set_xlabel("Sexe")
-    ax1.set_ylabel("Nombre de cas")
-    ax1.set_title(f"Nombre de cas par sexe ({pathologie})")
-    ax1.ticklabel_format(style='plain', axis='y')
-    ax1.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))  
-    st.pyplot(fig1)
+    with latence.figure():
+        fig1, ax1 = plt.subplots()
+        ax1.bar(stats_sexe.index, stats_sexe["Ntop_totale"])
+        ax1.set_xlabel("Sexe")
+        ax1.set_ylabel("Nombre de cas")
+        ax1.set_title(f"Nombre de cas par sexe ({pathologie})")
+        ax1.ticklabel_format(style='plain', axis='y')
+        ax1.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))  
+    latence.pyplot(fig1)
 
     st.markdown("""
     Ce graphique montre le **nombre total de patients pris en charge** pour cette pathologie,  
@@ -96,22 +150,23 @@ def analyse_pathologie(df: pd.DataFrame, pathologie: str):
             return f"{pct:.1f}%\n({val:.2f}%)"
         return inter_autopct
 
-    fig2, ax2 = plt.subplots()
-    wedges, texts, autotexts = ax2.pie(
-        sizes,
-        labels=labels,
-        autopct=autopct_remplissage(sizes),
-        startangle=90,
-        colors=["#1d45b3", "#f82408"],
-        textprops=dict(color="w")
-    )
+    with latence.figure():
+        fig2, ax2 = plt.subplots()
+        wedges, texts, autotexts = ax2.pie(
+            sizes,
+            labels=labels,
+            autopct=autopct_remplissage(sizes),
+            startangle=90,
+            colors=["#1d45b3", "#f82408"],
+            textprops=dict(color="w")
+        )
 
-    ax2.set_title(f"Prévalence globale par sexe ({pathologie})")
+        ax2.set_title(f"Prévalence globale par sexe ({pathologie})")
 
 
-    ax2.legend(wedges, labels, title="Sexe", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
+        ax2.legend(wedges, labels, title="Sexe", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
 
-    st.pyplot(fig2)
+    latence.pyplot(fig2)
 
     st.markdown("""
     Le graphique suivant représente la **prévalence** (taux de cas par population) pour chaque sexe.  
@@ -136,6 +191,7 @@ def analyse_pathologie(df: pd.DataFrame, pathologie: str):
     
     st.divider()
 
+    latence.section("Dispersion des prévalences")
     st.markdown("### **Dispersion des prévalences : hommes**")
 
     col8, col9, col10, col11 = st.columns(4)
@@ -175,34 +231,24 @@ def analyse_pathologie(df: pd.DataFrame, pathologie: str):
 
     st.divider()
 
+    latence.section("Répartition par tranche d'âge et par sexe")
     st.markdown("### Répartition des cas par tranche d'âge et par sexe (empilé)")
 
-    df_filtered = df[
-        (df["pathologie"] == pathologie) &
-        (df["libelle_classe_age"] != "tous âges") &
-        (df["libelle_sexe"] != "tous sexes")
-    ]
-
-    df_filtered["libelle_classe_age"] = pd.Categorical(
-        df_filtered["libelle_classe_age"],
-        categories=Conversion_donnees.ORDRE_TRANCHES_AGE,
-        ordered=True
-    )
+    pivot = resultats["pivot_age_sexe"]
 
-    pivot = df_filtered.groupby(["libelle_classe_age", "libelle_sexe"])["Ntop"].sum().unstack(fill_value=0)
+    with latence.figure():
+        fig, ax = plt.subplots(figsize=(8, 6))
+        pivot.plot(kind="barh", stacked=True, ax=ax, color={"hommes":"#1d45b3", "femmes":"#f82408"})
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-    pivot.plot(kind="barh", stacked=True, ax=ax, color={"hommes":"#1d45b3", "femmes":"#f82408"})
+        ax.set_xlabel("Nombre de cas")
+        ax.set_ylabel("Tranche d'âge")
+        ax.set_title(f"Répartition des cas par tranche d'âge et par sexe ({pathologie})")
+        ax.ticklabel_format(style='plain', axis='x')
+        ax.xaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))
 
-    ax.set_xlabel("Nombre de cas")
-    ax.set_ylabel("Tranche d'âge")
-    ax.set_title(f"Répartition des cas par tranche d'âge et par sexe ({pathologie})")
-    ax.ticklabel_format(style='plain', axis='x')
-    ax.xaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))
+        ax.legend(title="Sexe", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
 
-    ax.legend(title="Sexe", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-
-    st.pyplot(fig)
+    latence.pyplot(fig)
 
     st.markdown("""
     Ce graphique empilé permet d’analyser **simultanément le volume total de cas par tranche d’âge** et la **répartition entre hommes et femmes**.
@@ -216,22 +262,17 @@ def analyse_pathologie(df: pd.DataFrame, pathologie: str):
     st.write("")
     st.write("")
 
+    latence.section("Tableau par tranche d'âge")
     st.markdown("### **Tableau des prévalences et parts par tranche d'âge**")
-    stats_age = stats_par_tranche_age(df, pathologie)
-    total_age = stats_age["Ntop_totale"].sum()
-    stats_age["%"] = (stats_age["Ntop_totale"] / total_age * 100).round(3)
-    stats_age = stats_age.reset_index().rename(columns={"libelle_classe_age" : "Tranche d'âge", "Ntop_totale": "Nombre total de cas", "Npop_totale": "Population totale", 
-                                                        "prevalence_globale" : "Prevalence globale", "%": "Part (%)"})
-    stats_age.index = stats_age.index + 1
-
-    st.dataframe(stats_age)
+    latence.dataframe(resultats["stats_age"])
 
     st.divider()
 
     # Âge central
 
-    age_label, age_valeur = age_central_pathologie(df, pathologie)
-    part_la_plus_elevee = stats_age.loc[stats_age["Part (%)"].idxmax(), "Tranche d'âge"]
+    latence.section("Tranche d'âge centrale")
+    age_label, age_valeur = resultats["age_central"]
+    part_la_plus_elevee = resultats["part_la_plus_elevee"]
 
     st.subheader("Tranche d'âge centrale")
     st.markdown(f"**La tranche d'âge la plus représentée est** : {age_label} ({age_valeur:.3f} %)")
@@ -3,10 +3,114 @@ import streamlit as st
 import matplotlib.pyplot as plt
 import seaborn as sns
 from core.stats_pandas import (
-    stats_par_annee, variation_annuelle, tendance_generale, pente_tendance, z_score_prevalence_annee, stats_par_departement_annee
+    stats_par_annee, variations_prevalence, tendance_variations, pente_prevalence, z_score_prevalence_annee,
+    stats_par_departement_annee
 )
+from utils import latence
+from utils.cache_pages import CachePages, obtenir
+from core.jeu_donnees import JeuDonnees
+
+PAGE = "Analyse temporelle"
+
+
+def tables_annuelles_temporelle(jeu: JeuDonnees, pathologie: str) -> dict:
+    """
+    Tableaux annuels de la page d'analyse temporelle, sur toutes les années (sans affichage).
+
+    Chaque ligne ne dépend que de son année : ``restreindre_periode`` en extrait une période.
+    """
+    with latence.calcul():
+        df = jeu.pathologie(pathologie)
+
+        stats_annee = stats_par_annee(df, pathologie)
+        if stats_annee is None or stats_annee.empty:
+            return {"stats_annee": stats_annee}
+
+        df_z_score = z_score_prevalence_annee(df, pathologie)
+        df_moy_abs = None
+        if not df_z_score.empty:
+            df_moy_abs = (
+                df_z_score.groupby("annee")["z_score"].apply(lambda x: x.abs().mean()).reset_index(name="moyenne_abs_z"))
+
+        return {
+            "stats_annee": stats_annee,
+            "moyenne_abs_z": df_moy_abs,
+            "box": stats_par_departement_annee(df, pathologie),
+        }
+
+
+def tables_periode_temporelle(jeu: JeuDonnees, pathologie: str, periode: tuple[int, int]) -> dict:
+    """
+    Indicateurs de la page d'analyse temporelle propres à la période [debut, fin] (sans affichage).
+
+    Lus dans le cube du jeu de données (totaux annuels et cumuls sur les années) :
+    aucune ligne n'est refiltrée quand la période change.
+    """
+    with latence.calcul():
+        cube = jeu.cube
+        totaux = cube.stats_par_annee(pathologie, periode, arrondi=False)
+        if totaux.empty:
+            return {"tendance": None, "pente": None, "variation": None, "prevalence_periode": None}
+
+        variations = variations_prevalence(totaux)
+        df_variation = None
+        if variations:
+            df_variation = pd.DataFrame(variations).T
+            df_variation.index.name = "Année"
+
+        ntop, npop = cube.totaux_periode(pathologie, periode)
+        prevalence_periode = round(ntop / npop * 100, 3) if npop else None
+
+        return {
+            "tendance": tendance_variations(variations),
+            "pente": pente_prevalence(totaux.round(3)),
+            "variation": df_variation,
+            "prevalence_periode": prevalence_periode,
+        }
+
+
+def restreindre_periode(annuelles: dict, periode: tuple[int, int]) -> dict:
+    """
+    Extrait des tableaux annuels les lignes des années comprises dans [debut, fin].
+    """
+    debut, fin = periode
+    stats_annee = annuelles["stats_annee"]
+    if stats_annee is None or stats_annee.empty:
+        return {"stats_annee": stats_annee}
+
+    df_moy_abs = annuelles["moyenne_abs_z"]
+    if df_moy_abs is not None:
+        df_moy_abs = df_moy_abs[df_moy_abs["annee"].between(debut, fin)].reset_index(drop=True)
+        if df_moy_abs.empty:
+            df_moy_abs = None
+
+    df_box = annuelles["box"]
+    return {
+        "stats_annee": stats_annee.loc[(stats_annee.index >= debut) & (stats_annee.index <= fin)],
+        "moyenne_abs_z": df_moy_abs,
+        "box": df_box[df_box["annee"].between(debut, fin)],
+    }
+
+
+def calculer_analyse_temporelle(jeu: JeuDonnees, pathologie: str, periode: tuple[int, int],
+                                cache: CachePages | None = None) -> dict:
+    """
+    Tableaux de la page d'analyse temporelle sur la période [debut, fin].
+
+    Les tableaux annuels sont obtenus une fois par pathologie (clé de période ``None``)
+    puis restreints ; seuls les indicateurs propres à la période sont obtenus par période.
+    """
+    annuelles = obtenir(cache, (PAGE, pathologie, None), lambda: tables_annuelles_temporelle(jeu, pathologie))
+    resultats = restreindre_periode(annuelles, periode)
+    if resultats["stats_annee"] is None or resultats["stats_annee"].empty:
+        return resultats
+
+    resultats.update(obtenir(cache, (PAGE, pathologie, periode),
+                             lambda: tables_periode_temporelle(jeu, pathologie, periode)))
+    return resultats
+
 
-def analyse_temporelle(df: pd.DataFrame, pathologie: str) -> dict:
+def analyse_temporelle(jeu: JeuDonnees, pathologie: str, cache: CachePages | None = None) -> dict:
 
     st.title("Analyse temporelle d'une pathologie/traitement")
     st.caption(f"Analyse temporelle de la pathologie/traitement suivant : {pathologie}")
@@ -14,8 +118,8 @@ def analyse_temporelle(df: pd.DataFrame, pathologie: str) -> dict:
 
     # Filtre période
 
-    annee_disponibles = sorted(df["annee"].unique())
-    annee_min, annee_max = min(annee_disponibles), max(annee_disponibles)
+    catalogue = jeu.catalogue
+    annee_min, annee_max = catalogue.bornes_annees
 
     st.markdown("""
                 ### Sélection de la période d'étude
@@ -30,12 +134,19 @@ def analyse_temporelle(df: pd.DataFrame, pathologie: str) -> dict:
         value=(annee_min, annee_max)
     )
 
-    df_periode = df[(df["annee"] >= periode[0]) & (df["annee"] <= periode[1])]
+    # Aucune année de la pathologie dans la période : inutile de calculer
+    if not catalogue.annees_periode(pathologie, periode):
+        st.warning("Aucune donnée disponible sur cette périodes.")
+        return
+
+    latence.section("Calcul")
+    resultats = calculer_analyse_temporelle(jeu, pathologie, tuple(periode), cache)
 
 
     # Indicateurs synthètiques
 
-    stats_annee = stats_par_annee(df_periode, pathologie)
+    latence.section("Indicateurs clés")
+    stats_annee = resultats["stats_annee"]
 
     if stats_annee is None or stats_annee.empty:
         st.warning("Aucune donnée disponible sur cette périodes.")
@@ -48,8 +159,8 @@ def analyse_temporelle(df: pd.DataFrame, pathologie: str) -> dict:
     prev_debut = stats_annee.iloc[0]["prevalence_globale"]
     prev_fin = stats_annee.iloc[-1]['prevalence_globale']
 
-    tendance = tendance_generale(df_periode, pathologie)
-    pente= pente_tendance(df_periode, pathologie)
+    tendance = resultats["tendance"]
+    pente= resultats["pente"]
 
     st.subheader("Indicateurs clés")
     
@@ -69,9 +180,11 @@ def analyse_temporelle(df: pd.DataFrame, pathologie: str) -> dict:
     st.write("")
     st.write("")
 
-    col5, col6 = st.columns(2)
+    col5, col6, col7 = st.columns(3)
     col5.metric("Tendance générale", tendance)
     col6.metric("Pente annuelle moyenne", pente)
+    if resultats.get("prevalence_periode") is not None:
+        col7.metric("Prévalence sur la période (%)", resultats["prevalence_periode"])
 
     st.markdown(f"""Nous voyons donc qu'entre l'année {annee_debut} et l'année {annee_fin}, la prévalence globale est en {tendance} 
     avec une pente annuelle moyenne de {pente}%.""")
@@ -82,24 +195,26 @@ def analyse_temporelle(df: pd.DataFrame, pathologie: str) -> dict:
     
     # Courbe d'évolution et moyenne nationale
 
+    latence.section("Evolution annuelle de la prévalence")
     st.subheader("Evolution annuelle de la prévalence")
 
 
-    fig1, ax1 = plt.subplots()
+    with latence.figure():
+        fig1, ax1 = plt.subplots()
 
-    ax1.plot(
-        stats_annee.index,
-        stats_annee["prevalence_globale"],
-        marker="o",
-        label="Prévalence pathologie"
-    )
+        ax1.plot(
+            stats_annee.index,
+            stats_annee["prevalence_globale"],
+            marker="o",
+            label="Prévalence pathologie"
+        )
 
 
-    ax1.set_xlabel("Année")
-    ax1.set_ylabel("Prévalence (%)")
-    ax1.set_title(f"Evolution annuelle ({pathologie})")
-    ax1.legend()
-    st.pyplot(fig1)
+        ax1.set_xlabel("Année")
+        ax1.set_ylabel("Prévalence (%)")
+        ax1.set_title(f"Evolution annuelle ({pathologie})")
+        ax1.legend()
+    latence.pyplot(fig1)
 
     st.markdown("""La courbe montre l'évolution annuelle de la prévalence nationale.""")
     
@@ -108,25 +223,25 @@ def analyse_temporelle(df: pd.DataFrame, pathologie: str) -> dict:
 
     # Variations absolues
 
+    latence.section("Variations annuelles de la prévalence")
     st.subheader("Variations annuelles de la prévalence")
 
-    variations = variation_annuelle(df_periode, pathologie)
+    df_variation = resultats["variation"]
 
-    if variations:
-        df_variation = pd.DataFrame(variations).T
-        df_variation.index.name = "Année"
+    if df_variation is not None:
 
-        fig2, ax2 = plt.subplots()
+        with latence.figure():
+            fig2, ax2 = plt.subplots()
 
-        ax2.bar(
-            df_variation.index,
-            df_variation["difference absolue"]
-        )
-        ax2.axhline(0)
-        ax2.set_xlabel("Année")
-        ax2.set_ylabel("Variation absolue (%)")
-        ax2.set_title(f"Variation annuelle ({pathologie})")
-        st.pyplot(fig2)
+            ax2.bar(
+                df_variation.index,
+                df_variation["difference absolue"]
+            )
+            ax2.axhline(0)
+            ax2.set_xlabel("Année")
+            ax2.set_ylabel("Variation absolue (%)")
+            ax2.set_title(f"Variation annuelle ({pathologie})")
+        latence.pyplot(fig2)
 
         st.markdown("""
         Chaque barre représente l’évolution entre une année et l’année précédente.
@@ -144,7 +259,7 @@ def analyse_temporelle(df: pd.DataFrame, pathologie: str) -> dict:
         st.write("")
         st.write("")
         
-        st.dataframe(df_variation)
+        latence.dataframe(df_variation)
 
         st.markdown("""
         Le tableau détaille les variations d’une année à l’autre :
@@ -163,25 +278,25 @@ def analyse_temporelle(df: pd.DataFrame, pathologie: str) -> dict:
 
     # Intensité écarts territoriaux
 
+    latence.section("Intensité des écarts territoriaux")
     st.subheader("Intensité des écarts territoriaux")
 
-    df_z_score = z_score_prevalence_annee(df_periode, pathologie)
+    df_moy_abs = resultats["moyenne_abs_z"]
 
-    if not df_z_score.empty:
-        df_moy_abs = (
-            df_z_score.groupby("annee")["z_score"].apply(lambda x: x.abs().mean()).reset_index(name="moyenne_abs_z"))
+    if df_moy_abs is not None:
 
-        fig3, ax3 = plt.subplots(figsize=(8,5))
-        ax3.plot(df_moy_abs["annee"], df_moy_abs["moyenne_abs_z"], marker="o", label="Dispersion moyenne")
+        with latence.figure():
+            fig3, ax3 = plt.subplots(figsize=(8,5))
+            ax3.plot(df_moy_abs["annee"], df_moy_abs["moyenne_abs_z"], marker="o", label="Dispersion moyenne")
         
-        seuil = 2
-        ax3.axhline(seuil, color='red', linestyle='--', label=f'Seuil de forte dispersion ({seuil})')
+            seuil = 2
+            ax3.axhline(seuil, color='red', linestyle='--', label=f'Seuil de forte dispersion ({seuil})')
         
-        ax3.set_xlabel("Année")
-        ax3.set_ylabel("Moyenne absolue des z-scores")
-        ax3.set_title(f"Dispersion territoriale annuelle ({pathologie})")
-        ax3.legend()
-        st.pyplot(fig3)
+            ax3.set_xlabel("Année")
+            ax3.set_ylabel("Moyenne absolue des z-scores")
+            ax3.set_title(f"Dispersion territoriale annuelle ({pathologie})")
+            ax3.legend()
+        latence.pyplot(fig3)
 
         st.markdown(f"""
         Chaque point représente la **dispersion moyenne des départements** pour cette année.  
@@ -202,26 +317,28 @@ def analyse_temporelle(df: pd.DataFrame, pathologie: str) -> dict:
 
     # Distribution départementale annuelle (boxplot)
 
+    latence.section("Distribution départementale des prévalences")
     st.subheader("Distribution départementale des prévalences")
 
-    df_box = stats_par_departement_annee(df_periode, pathologie)
+    df_box = resultats["box"]
 
     if not df_box.empty:
 
-        fig4, ax4 = plt.subplots(figsize=(10, 6))
+        with latence.figure():
+            fig4, ax4 = plt.subplots(figsize=(10, 6))
 
-        sns.boxplot(
-            data=df_box,
-            x="annee",
-            y="prevalence_globale",
-            ax=ax4
-        )
+            sns.boxplot(
+                data=df_box,
+                x="annee",
+                y="prevalence_globale",
+                ax=ax4
+            )
 
-        ax4.set_xlabel("Année")
-        ax4.set_ylabel("Prévalence départementale (%)")
-        ax4.set_title(f"Distribution annuelle des prévalences départementales ({pathologie})")
+            ax4.set_xlabel("Année")
+            ax4.set_ylabel("Prévalence départementale (%)")
+            ax4.set_title(f"Distribution annuelle des prévalences départementales ({pathologie})")
 
-        st.pyplot(fig4)
+        latence.pyplot(fig4)
 
         st.markdown("""
         Chaque boîte représente la distribution des 101 départements pour une année donnée :
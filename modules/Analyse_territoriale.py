@@ -4,27 +4,176 @@ import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 from core.stats_pandas import (
     stats_par_departement, classement_departements, moyenne_nationale, ecart_a_la_moyenne,
-    top_departements, bottom_departements, z_score_prevalence, valeurs_aberrantes
+    top_departements, bottom_departements, z_score_prevalence, valeurs_aberrantes,
+    classer_prevalences, z_scores_prevalence
 )
 from utils.conversion import Conversion_donnees
+from utils import latence
+from utils.cache_pages import CachePages, lire, deposer
+from utils.ordonnanceur import Ordonnanceur
+from core.jeu_donnees import JeuDonnees
+from core.standardisation import stats_par_departement_standardise, prevalence_nationale_standardisee
+from core.bootstrap import intervalles_departements
+from core.spatial import moran_pathologie, lisa_pathologie
 import plotly.express as px
 import json
 
+PAGE = "Analyse territoriale"
 
+# Résultats intermédiaires de l'ordonnanceur, ni mis en cache ni précalculés
+INTERMEDIAIRES = ("stats_dept", "stats_region", "stats_standardise")
 
-def analyse_territoriale(df: pd.DataFrame, pathologie: str):
 
-    st.title("Analyse territoriale d'une pathologie/traitement")
-    st.caption(f"Analyse géographique de la pathologie/traitement suivant : {pathologie}")
-    stats_dept = stats_par_departement(df, pathologie)
+@st.cache_data
+def charger_geojson():
+    with open("data/departements.geojson", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def figure_carte(stats_carte: pd.DataFrame, geojson: dict):
+    """
+    Carte choroplèthe de la prévalence par département.
+    """
+    fig = px.choropleth(
+        stats_carte,
+        geojson=geojson,
+        locations="dept",
+        featureidkey="properties.code",
+        color="prevalence_globale",
+        hover_name="departement_nom",
+        color_continuous_scale="Reds"
+    )
+
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(margin={"r":0,"t":0,"l":0,"b":0})
+    return fig
+
+
+COULEURS_LISA = {"Haut-Haut": "#b2182b", "Bas-Bas": "#2166ac", "Haut-Bas": "#f4a582",
+                 "Bas-Haut": "#92c5de", "Non significatif": "#e0e0e0"}
+
+
+def figure_lisa(df_lisa: pd.DataFrame, geojson: dict):
+    """
+    Carte des groupes LISA (agrégats de départements à prévalence haute ou basse).
+    """
+    fig = px.choropleth(
+        df_lisa,
+        geojson=geojson,
+        locations="dept",
+        featureidkey="properties.code",
+        color="groupe",
+        hover_name="departement_nom",
+        hover_data=["prevalence_globale", "p_valeur"],
+        color_discrete_map=COULEURS_LISA,
+        category_orders={"groupe": list(COULEURS_LISA)}
+    )
+
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(margin={"r":0,"t":0,"l":0,"b":0})
+    return fig
+
+
+def figure_ecart(df_ecart: pd.DataFrame):
+    """
+    Barres de l'écart de chaque département à la moyenne nationale.
+    """
+    return px.bar(
+        df_ecart,
+        x="ecart_a_la_moyenne",
+        y="departement_nom",
+        orientation="h",
+        title="Ecart à la moyenne nationale",
+        height=1500,
+        labels={"ecart_a_la_moyenne": "Écart de prévalence (points)", "departement_nom": "Département"})
+
+
+def _classement_standardise(stats: pd.DataFrame) -> pd.DataFrame:
+    """
+    Classement des départements par prévalence standardisée, avec leur prévalence brute et leur rang brut.
+    """
+    classement = classer_prevalences(stats, "dept", "departement_nom", "prevalence_standardisee")
+    if classement.empty:
+        return classement
+    brute = stats["prevalence_brute"]
+    classement.insert(2, "prevalence_brute", classement["dept"].map(brute).to_numpy())
+    classement["rang_brut"] = classement["dept"].map(brute.rank(method="min")).astype("Int64").to_numpy()
+    return classement
+
 
-    # Indicateurs nationaux
+def ordonnancer_analyse_territoriale(jeu: JeuDonnees, pathologie: str, geojson: dict | None = None,
+                                     connus: dict | None = None) -> Ordonnanceur:
+    """
+    Calculs de la page d'analyse territoriale et leurs dépendances.
+
+    :param geojson: contour des départements ; sans lui, les figures ne sont pas déclarées
+    :param connus: résultats déjà disponibles (cache ou magasin), qui ne sont pas recalculés
+    """
+    df = jeu.pathologie(pathologie)
+    ordonnanceur = Ordonnanceur(connus)
+
+    ordonnanceur.ajouter("stats_dept", lambda: stats_par_departement(df, pathologie), intermediaire=True)
+    ordonnanceur.ajouter("carte", lambda stats: stats.reset_index(), ("stats_dept",))
+    ordonnanceur.ajouter("max_prev", lambda stats: stats["prevalence_globale"].max(), ("stats_dept",))
+    ordonnanceur.ajouter("min_prev", lambda stats: stats["prevalence_globale"].min(), ("stats_dept",))
+    ordonnanceur.ajouter("ecart_type", lambda stats: stats["prevalence_globale"].std(), ("stats_dept",))
+    ordonnanceur.ajouter("moy_nationale", lambda: moyenne_nationale(df, pathologie))
+    ordonnanceur.ajouter("ecart", lambda: ecart_a_la_moyenne(df, pathologie))
+    ordonnanceur.ajouter("classement", lambda: classement_departements(df, pathologie))
+    ordonnanceur.ajouter("top10", lambda: top_departements(df, pathologie))
+    ordonnanceur.ajouter("bottom10", lambda: bottom_departements(df, pathologie))
+    ordonnanceur.ajouter("aberrantes", lambda: valeurs_aberrantes(df, pathologie))
+
+    # Vues régionales : lues dans les effectifs (pathologie, année, région) précalculés du cube
+    ordonnanceur.ajouter("stats_region", lambda: jeu.cube.stats_par_region(pathologie), intermediaire=True)
+    ordonnanceur.ajouter("classement_regions", lambda stats: classer_prevalences(stats, "region", "region_nom"),
+                         ("stats_region",))
+    ordonnanceur.ajouter("z_regions", z_scores_prevalence, ("stats_region", "moy_nationale"))
+
+    # Prévalences standardisées sur l'âge (population standard : répartition nationale par âge)
+    ordonnanceur.ajouter("stats_standardise", lambda: stats_par_departement_standardise(jeu.cube, pathologie, jeu.standard),
+                         intermediaire=True)
+    ordonnanceur.ajouter("moy_standardisee", lambda: prevalence_nationale_standardisee(jeu.cube, pathologie, jeu.standard))
+    ordonnanceur.ajouter("classement_standardise", _classement_standardise, ("stats_standardise",))
+    ordonnanceur.ajouter("z_standardise", lambda stats, moyenne: z_scores_prevalence(stats, moyenne, "prevalence_standardisee"),
+                         ("stats_standardise", "moy_standardisee"))
+
+    # Intervalles de confiance de la prévalence et du rang (rééchantillonnage, graine fixe)
+    ordonnanceur.ajouter("intervalles", lambda: intervalles_departements(jeu.cube, pathologie))
+
+    # Autocorrélation spatiale (voisinage des départements lu une fois dans le GeoJSON)
+    ordonnanceur.ajouter("moran", lambda: moran_pathologie(jeu.cube, pathologie))
+    ordonnanceur.ajouter("lisa", lambda: lisa_pathologie(jeu.cube, pathologie))
+
+    if geojson is not None:
+        ordonnanceur.ajouter("fig_carte", lambda carte: figure_carte(carte, geojson), ("carte",))
+        ordonnanceur.ajouter("fig_ecart", figure_ecart, ("ecart",))
+        ordonnanceur.ajouter("fig_lisa", lambda df_lisa: figure_lisa(df_lisa, geojson), ("lisa",))
+
+    return ordonnanceur
+
+
+def tables_analyse_territoriale(jeu: JeuDonnees, pathologie: str) -> dict:
+    """
+    Tableaux de la page d'analyse territoriale (sans affichage).
+    """
+    with latence.calcul():
+        resultats = ordonnancer_analyse_territoriale(jeu, pathologie).resultats()
+        for nom in INTERMEDIAIRES:
+            resultats.pop(nom, None)
+        return resultats
+
+
+def _afficher_resume_national(resultats: dict):
+    """
+    Indicateurs nationaux.
+    """
     st.subheader("Résumé national")
 
-    moy_nationale = moyenne_nationale(df, pathologie)
-    max_prev = stats_dept["prevalence_globale"].max()
-    min_prev = stats_dept["prevalence_globale"].min()
-    ecart_type = stats_dept["prevalence_globale"].std()
+    moy_nationale = resultats["moy_nationale"]
+    max_prev = resultats["max_prev"]
+    min_prev = resultats["min_prev"]
+    ecart_type = resultats["ecart_type"]
 
     col1, col2, col3, col4 = st.columns(4)
 
@@ -42,13 +191,14 @@ def analyse_territoriale(df: pd.DataFrame, pathologie: str):
 
     st.divider()
 
-    # Classement départements
 
+def _afficher_classement(resultats: dict):
+    """
+    Classement des départements.
+    """
     st.subheader("Classement des départements")
 
-    classement = classement_departements(df, pathologie)
-
-    st.dataframe(classement)
+    latence.dataframe(resultats["classement"])
 
     st.markdown(
     """
@@ -64,34 +214,13 @@ def analyse_territoriale(df: pd.DataFrame, pathologie: str):
     st.divider()
 
 
-    #Carte Prévalence par département
-
+def _afficher_carte(resultats: dict):
+    """
+    Carte de prévalence par département.
+    """
     st.subheader("Carte de prévalence par département (hors DOM-TOM)")
 
-
-    stats_carte = stats_dept.reset_index()
-
-    @st.cache_data
-    def charger_geojson():
-        with open("data/departements.geojson", "r", encoding="utf-8") as f:
-            return json.load(f)
-        
-    geojson = charger_geojson()
-
-    fig2 = px.choropleth(
-        stats_carte,
-        geojson=geojson,
-        locations="dept",
-        featureidkey="properties.code",
-        color="prevalence_globale",
-        hover_name="departement_nom",
-        color_continuous_scale="Reds"
-    )
-
-    fig2.update_geos(fitbounds="locations", visible=False)
-    fig2.update_layout(margin={"r":0,"t":0,"l":0,"b":0})
-
-    st.plotly_chart(fig2, use_container_width=True)   
+    latence.plotly_chart(resultats["fig_carte"], use_container_width=True)   
 
     st.markdown(
     """
@@ -106,21 +235,22 @@ def analyse_territoriale(df: pd.DataFrame, pathologie: str):
 
     st.divider()
 
-    # Top / Bottom 10
 
+def _afficher_top_bottom(resultats: dict):
+    """
+    Top / Bottom 10 des départements.
+    """
     st.subheader("Top / Bottom 10")
 
     col5, col6 = st.columns(2)
 
     with col5:
         st.markdown("### Top 10")
-        top10 = top_departements(df, pathologie)
-        st.dataframe(top10)
+        latence.dataframe(resultats["top10"])
 
     with col6:
         st.markdown("### Bottom 10")
-        bottom10 = bottom_departements(df, pathologie)
-        st.dataframe(bottom10)
+        latence.dataframe(resultats["bottom10"])
 
     st.markdown(
     """
@@ -138,20 +268,11 @@ def analyse_territoriale(df: pd.DataFrame, pathologie: str):
     st.divider()
 
 
-    # Ecart à la moyenne nationale
-
-    df_ecart = ecart_a_la_moyenne(df, pathologie)
-
-    fig3 = px.bar(
-    df_ecart,
-    x="ecart_a_la_moyenne",
-    y="departement_nom",
-    orientation="h",
-    title="Ecart à la moyenne nationale",
-    height=1500,
-    labels={"ecart_a_la_moyenne": "Écart de prévalence (points)", "departement_nom": "Département"})
-
-    st.plotly_chart(fig3, use_container_width=True)
+def _afficher_ecart(resultats: dict):
+    """
+    Écart à la moyenne nationale.
+    """
+    latence.plotly_chart(resultats["fig_ecart"], use_container_width=True)
 
     st.markdown(
     """
@@ -167,17 +288,19 @@ def analyse_territoriale(df: pd.DataFrame, pathologie: str):
     st.divider()
 
 
-    # Valeur aberrantes (z-score)
-
+def _afficher_aberrantes(resultats: dict):
+    """
+    Départements atypiques (z-score).
+    """
     st.subheader("Départements atypiques (z-score) >= 2")
 
-    df_aberrantes = valeurs_aberrantes(df, pathologie)
+    df_aberrantes = resultats["aberrantes"]
 
     if df_aberrantes.empty:
         st.info("Aucune valeur aberrante détectée")
 
     else:
-        st.dataframe(df_aberrantes)
+        latence.dataframe(df_aberrantes)
 
     st.markdown(
     """
@@ -186,4 +309,189 @@ def analyse_territoriale(df: pd.DataFrame, pathologie: str):
 
     - Un z-score supérieur ou égal à 2 indique que la prévalence du département est **significativement différente de la moyenne nationale**.  
     - Le tableau affiche les départements concernés ainsi que leurs valeurs correspondantes, permettant d’identifier rapidement les anomalies géographiques.  
-    - Si aucun département n’est détecté, cela signifie que toutes les prévalences sont proches de la moyenne nationale.""")
\ No newline at end of file
+    - Si aucun département n’est détecté, cela signifie que toutes les prévalences sont proches de la moyenne nationale.""")
+
+
+def _afficher_regions(resultats: dict):
+    """
+    Classement et z-score des régions.
+    """
+    st.subheader("Analyse régionale")
+
+    classement = resultats["classement_regions"]
+
+    if classement.empty:
+        st.info("Aucune donnée régionale pour cette pathologie")
+        return
+
+    col7, col8 = st.columns(2)
+
+    with col7:
+        st.markdown("### Classement des régions")
+        latence.dataframe(classement)
+
+    with col8:
+        st.markdown("### z-score des régions")
+        latence.dataframe(resultats["z_regions"])
+
+    st.markdown(
+    """
+    Cette section reprend le classement et le z-score à l'échelle des **régions**.  
+
+    - Les effectifs régionaux sont agrégés une seule fois au chargement des données (pathologie x année x région),
+    l'analyse régionale ne relit donc aucune ligne.  
+    - Le z-score compare la prévalence de chaque région à la moyenne nationale, en écarts-types des prévalences régionales.  
+    - Une région regroupant des départements contrastés peut masquer des écarts visibles à l'échelle départementale.
+    """)
+
+    st.divider()
+
+
+def _afficher_standardise(resultats: dict):
+    """
+    Prévalence standardisée sur l'âge.
+    """
+    st.subheader("Prévalence standardisée sur l'âge")
+
+    classement = resultats["classement_standardise"]
+
+    if classement.empty:
+        st.info("Aucune donnée par classe d'âge pour cette pathologie")
+        return
+
+    if resultats["moy_standardisee"] is not None:
+        st.metric("Prévalence nationale standardisée (%)", resultats["moy_standardisee"])
+
+    col9, col10 = st.columns(2)
+
+    with col9:
+        st.markdown("### Classement standardisé")
+        latence.dataframe(classement)
+
+    with col10:
+        st.markdown("### z-score standardisé")
+        latence.dataframe(resultats["z_standardise"])
+
+    st.markdown(
+    """
+    La prévalence brute d'un département dépend de l'âge de sa population : un département âgé
+    a mécaniquement plus de cas des pathologies liées à l'âge.  
+
+    - La **prévalence standardisée** applique les taux par classe d'âge du département à la répartition
+    nationale de la population par âge (standardisation directe), ce qui rend les départements comparables.  
+    - `prevalence_brute` et `rang_brut` rappellent la prévalence et le rang avant standardisation : un écart
+    de rang important signale un effet de la structure par âge.  
+    - Les lignes « tous âges » et « tous sexes » sont des agrégats et ne sont pas utilisées ici.
+    """)
+
+    st.divider()
+
+
+def _afficher_intervalles(resultats: dict):
+    """
+    Intervalles de confiance de la prévalence et du rang des départements.
+    """
+    st.subheader("Incertitude du classement")
+
+    intervalles = resultats["intervalles"]
+
+    if intervalles.empty:
+        st.info("Aucune donnée départementale pour cette pathologie")
+        return
+
+    latence.dataframe(intervalles)
+
+    st.markdown(
+    """
+    Le classement des départements repose sur des prévalences observées : avec de petits effectifs,
+    deux départements proches peuvent échanger leur rang par simple fluctuation.  
+
+    - Les effectifs Ntop de chaque département sont tirés 1 000 fois dans une loi binomiale (Npop, prévalence observée) ;
+    chaque tirage donne une prévalence et un classement complet des départements.  
+    - `prevalence_basse` / `prevalence_haute` et `rang_bas` / `rang_haut` sont les bornes des intervalles à 95 %.  
+    - Un intervalle de rang large signale un département dont la position dans le classement n'est pas établie.  
+    - La graine des tirages est fixe : les intervalles sont les mêmes à chaque affichage.
+    """)
+
+    st.divider()
+
+
+def _afficher_spatial(resultats: dict):
+    """
+    Autocorrélation spatiale : I de Moran et agrégats LISA.
+    """
+    st.subheader("Autocorrélation spatiale")
+
+    if resultats["lisa"].empty:
+        st.info("Aucune donnée départementale pour cette pathologie")
+        return
+
+    col11, col12 = st.columns(2)
+
+    with col11:
+        st.markdown("### I de Moran par année")
+        latence.dataframe(resultats["moran"])
+
+    with col12:
+        st.markdown("### Agrégats locaux (période complète)")
+        latence.plotly_chart(resultats["fig_lisa"], use_container_width=True)
+
+    st.markdown(
+    """
+    Les analyses précédentes traitent les départements comme indépendants ; cette section mesure
+    si des départements **voisins** ont des prévalences semblables.  
+
+    - L'**I de Moran** est positif quand les départements voisins se ressemblent (agrégats géographiques),
+    proche de `esperance` (-1 / (n - 1)) sans structure spatiale. `p_valeur` est obtenue en permutant
+    999 fois les prévalences entre départements.  
+    - La carte montre les **indicateurs locaux (LISA)** : `Haut-Haut` (département à forte prévalence entouré
+    de départements à forte prévalence), `Bas-Bas`, et les départements atypiques par rapport à leurs voisins
+    (`Haut-Bas`, `Bas-Haut`), au seuil de 5 %.  
+    - Deux départements sont voisins s'ils ont une frontière commune (DOM-TOM exclus).
+    """)
+
+    st.divider()
+
+
+# Sections de la page, dans l'ordre d'affichage : (nom, résultats requis, affichage)
+SECTIONS = [
+    ("Résumé national", ("moy_nationale", "max_prev", "min_prev", "ecart_type"), _afficher_resume_national),
+    ("Classement des départements", ("classement",), _afficher_classement),
+    ("Carte de prévalence", ("fig_carte",), _afficher_carte),
+    ("Top / Bottom 10", ("top10", "bottom10"), _afficher_top_bottom),
+    ("Ecart à la moyenne nationale", ("fig_ecart",), _afficher_ecart),
+    ("Départements atypiques", ("aberrantes",), _afficher_aberrantes),
+    ("Analyse régionale", ("classement_regions", "z_regions"), _afficher_regions),
+    ("Prévalence standardisée sur l'âge", ("classement_standardise", "z_standardise", "moy_standardisee"),
+     _afficher_standardise),
+    ("Incertitude du classement", ("intervalles",), _afficher_intervalles),
+    ("Autocorrélation spatiale", ("moran", "lisa", "fig_lisa"), _afficher_spatial),
+]
+
+
+def analyse_territoriale(jeu: JeuDonnees, pathologie: str, cache: CachePages | None = None):
+
+    st.title("Analyse territoriale d'une pathologie/traitement")
+    st.caption(f"Analyse géographique de la pathologie/traitement suivant : {pathologie}")
+
+    # Un emplacement par section, rempli dès que ses résultats sont prêts
+    emplacements = [st.container() for _ in SECTIONS]
+    a_afficher = list(range(len(SECTIONS)))
+
+    cle = (PAGE, pathologie, None)
+    latence.section("Calcul")
+    ordonnanceur = ordonnancer_analyse_territoriale(jeu, pathologie, charger_geojson(), lire(cache, cle))
+
+    resultats = {}
+    for nom, valeur in latence.au_fil_du_calcul(ordonnanceur.executer()):
+        resultats[nom] = valeur
+        for i in [i for i in a_afficher if all(r in resultats for r in SECTIONS[i][1])]:
+            a_afficher.remove(i)
+            section, _, afficher = SECTIONS[i]
+            latence.section(section)
+            with emplacements[i]:
+                afficher(resultats)
+
+    for nom in INTERMEDIAIRES:
+        resultats.pop(nom, None)
+    deposer(cache, cle, resultats)
@@ -1,25 +1,160 @@
 import streamlit as st
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 from core.stats_pandas import (z_score_prevalence, valeurs_aberrantes, z_score_prevalence_annee, annees_anormales)
 import plotly.express as px
+from utils import latence
+from utils.cache_pages import CachePages, obtenir
+from core.jeu_donnees import JeuDonnees
+from core.anomalies import detecter_anomalies, anomalies_signalees, limites_entonnoir, NIVEAUX_ENTONNOIR
 
-def anomalies(df: pd.DataFrame, pathologie: str):
+PAGE = "Anomalies"
+
+
+def tables_anomalies(jeu: JeuDonnees, pathologie: str) -> dict:
+    """
+    Tableaux de la page des anomalies (sans affichage).
+    """
+    with latence.calcul():
+        df = jeu.pathologie(pathologie)
+        df_z = z_score_prevalence(df, pathologie)
+        if df_z.empty:
+            return {"z": df_z}
+
+        resultats = {
+            "z": df_z,
+            "aberrants": valeurs_aberrantes(df, pathologie),
+            "annees": annees_anormales(df, pathologie),
+            "instabilite": df_z["z_score"].abs().mean(),
+            # Méthodes robustes : SMR du cumul (entonnoir) et cellules (année, département) signalées
+            "smr": detecter_anomalies(jeu.cube, [pathologie], cumul=True).drop(columns="pathologie"),
+            "signalees": anomalies_signalees(detecter_anomalies(jeu.cube, [pathologie])).drop(columns="pathologie"),
+        }
+
+        df_z_annuel = z_score_prevalence_annee(df, pathologie)
+        if not df_z_annuel.empty:
+            resultats["z_annuel"] = df_z_annuel
+            resultats["volatilite"] = (df_z_annuel.groupby("departement_nom")["z_score"]
+                .std().reset_index().rename(columns={"z_score": "volatilite"})
+                .sort_values("volatilite", ascending=False))
+
+        return resultats
+
+
+def figure_entonnoir(df_smr: pd.DataFrame):
+    """
+    Entonnoir (funnel plot) : SMR de chaque département selon ses cas attendus, avec les limites à 95 % et 99,8 %.
+    """
+    fig = px.scatter(
+        df_smr,
+        x="attendus",
+        y="smr",
+        hover_name="departement_nom",
+        hover_data=["observes", "p_valeur"],
+        log_x=True,
+        title="SMR des départements selon les cas attendus")
+
+    attendus = np.geomspace(df_smr["attendus"].min(), df_smr["attendus"].max(), 200)
+    for niveau, z in NIVEAUX_ENTONNOIR.items():
+        style = "dash" if niveau == "95" else "solid"
+        for limite in limites_entonnoir(attendus, z):
+            fig.add_scatter(x=attendus, y=limite, mode="lines", line={"color": "red", "dash": style, "width": 1},
+                            showlegend=False, hoverinfo="skip")
+    fig.add_hline(y=1, line_color="grey", line_width=1)
+
+    fig.update_layout(xaxis_title="Cas attendus", yaxis_title="SMR (observés / attendus)", height=600)
+    return fig
+
+
+def figures_anomalies(tables: dict) -> dict:
+    """
+    Ajoute aux tableaux les figures plotly de la page (z-scores, heatmap, volatilité).
+    """
+    df_z = tables["z"]
+    if df_z.empty:
+        return tables
+
+    resultats = dict(tables)
+
+    with latence.figure():
+        df_z_sorted = df_z.sort_values("z_score")
+        fig = px.bar(
+            df_z_sorted,
+            x="z_score",
+            y="departement_nom",
+            orientation="h",
+            title="Distribution des écarts standardisés départementaux",)
+
+        fig.add_vline(x=2, line_dash="dash",
+                            line_color="red",
+                            line_width=2)
+        fig.add_vline(x=-2, line_dash="dash",
+                            line_color="red",
+                            line_width=2)
+
+        fig.update_layout(
+            yaxis_title="Département",
+            xaxis_title="Z-score",
+            height=2000)
+        resultats["fig_z"] = fig
+
+        if not tables["smr"].empty:
+            resultats["fig_entonnoir"] = figure_entonnoir(tables["smr"])
+
+        if "z_annuel" not in tables:
+            return resultats
+
+        pivot = tables["z_annuel"].pivot(
+            index="departement_nom",
+            columns="annee",
+            values="z_score")
+
+        fig3 = px.imshow(pivot,
+            aspect="auto",
+            color_continuous_scale="RdBu",
+            origin="lower",
+            title="Heatmap des z-scores par année")
+    
+        fig3.update_layout(height=1000)
+        resultats["fig_heatmap"] = fig3
+
+        df_vol_top = tables["volatilite"].head(20)
+        fig4 = px.bar(df_vol_top.sort_values("volatilite"),
+            x="volatilite",
+            y="departement_nom",
+            orientation="h",
+            title="Top 20 des départements les plus volatils")
+
+        fig4.update_layout(yaxis_title="Département",
+            xaxis_title="Écart-type des z-scores",
+            height=800)
+        resultats["fig_volatilite"] = fig4
+
+    return resultats
+
+
+def anomalies(jeu: JeuDonnees, pathologie: str, cache: CachePages | None = None):
 
     st.title("Analyse des anomalies statistiques d'une pathologie/traitement")
     st.caption(f"Analyse des anomalies de la pathologie/traitement suivant : {pathologie}")
 
     st.divider()
 
+    latence.section("Calcul")
+    resultats = obtenir(cache, (PAGE, pathologie, None), lambda: tables_anomalies(jeu, pathologie),
+                        figures_anomalies)
+
     # Anomalies départementales (cumul sur la période étudiée)
 
+    latence.section("Départements atypiques")
     st.subheader("Départements atypiques (z-score cumulé sur les 9 ans étudiés, seuil = 2)")
-    df_z = z_score_prevalence(df, pathologie)
+    df_z = resultats["z"]
     if df_z.empty:
         st.info("Aucune donnée disponible.")
         return
 
-    df_aberrants = valeurs_aberrantes(df, pathologie)
+    df_aberrants = resultats["aberrants"]
 
     col1, col2, col3 = st.columns(3)
 
@@ -33,26 +168,7 @@ def anomalies(df: pd.DataFrame, pathologie: str):
         st.metric("Z-score maximal", round(df_z["z_score"].abs().max(), 3))
 
 
-    df_z_sorted = df_z.sort_values("z_score")
-    fig = px.bar(
-        df_z_sorted,
-        x="z_score",
-        y="departement_nom",
-        orientation="h",
-        title="Distribution des écarts standardisés départementaux",)
-
-    fig.add_vline(x=2, line_dash="dash",
-                        line_color="red",
-                        line_width=2)
-    fig.add_vline(x=-2, line_dash="dash",
-                        line_color="red",
-                        line_width=2)
-
-    fig.update_layout(
-        yaxis_title="Département",
-        xaxis_title="Z-score",
-        height=2000)
-    st.plotly_chart(fig, use_container_width=True)
+    latence.plotly_chart(resultats["fig_z"], use_container_width=True)
 
     st.markdown(
         """
@@ -69,28 +185,60 @@ def anomalies(df: pd.DataFrame, pathologie: str):
 
     if not df_aberrants.empty:
         st.markdown("#### Départements présentant une anomalie statistique")
-        st.dataframe(df_aberrants)
+        latence.dataframe(df_aberrants)
     else:
         st.success("Aucun département ne dépasse le seuil de ±2.")
 
     st.divider()
 
+    # Méthodes robustes (médiane / MAD, SMR de Poisson)
+
+    latence.section("Détection robuste")
+    st.subheader("Détection robuste : z-score médiane / MAD et SMR")
+
+    if "fig_entonnoir" in resultats:
+        latence.plotly_chart(resultats["fig_entonnoir"], use_container_width=True)
+
+    st.markdown(
+        """
+    **Interprétation**
+
+    - Le **SMR** (ratio standardisé de morbidité) rapporte les cas observés aux cas attendus si le département avait
+    les taux nationaux de chaque classe d'âge : SMR > 1 signale un excès de cas à structure d'âge égale.
+    - L'entonnoir trace les limites à 95 % (pointillés) et 99,8 % (traits pleins) : elles se resserrent quand le
+    nombre de cas attendus augmente. Un petit département n'est signalé que si son écart est improbable pour son effectif.
+    - Le **z-score robuste** utilise la médiane et l'écart absolu médian (MAD) des départements de chaque année :
+    contrairement à la moyenne et à l'écart-type, ils ne sont pas déplacés par les valeurs extrêmes. Seuil : 3,5.
+    - Le tableau liste les cellules (année, département) signalées par au moins une méthode
+    (p-valeur exacte de Poisson ≤ 0,002 ou |z robuste| ≥ 3,5).
+    """)
+
+    signalees = resultats["signalees"]
+    if signalees.empty:
+        st.success("Aucune cellule (année, département) signalée par les méthodes robustes.")
+    else:
+        latence.dataframe(signalees)
+
+    st.divider()
+
     # Années normales (dispersion territoriale)
 
 
+    latence.section("Années à dispersion atypique")
     st.subheader("Années présentant une dispersion atypique (seuil = 2)")
 
-    df_annees = annees_anormales(df, pathologie)
+    df_annees = resultats["annees"]
 
     if df_annees.empty:
         st.success("Aucune année ne présente une dispersion moyenne ≥ 2.")
     else:
-        fig2, ax2 = plt.subplots()
-        ax2.bar(df_annees["annee"], df_annees["moyenne_abs_z"])
-        ax2.set_xlabel("Année")
-        ax2.set_ylabel("Moyenne absolue des z-scores")
-        ax2.set_title("Années à forte hétérogénéité territoriale")
-        st.pyplot(fig2)
+        with latence.figure():
+            fig2, ax2 = plt.subplots()
+            ax2.bar(df_annees["annee"], df_annees["moyenne_abs_z"])
+            ax2.set_xlabel("Année")
+            ax2.set_ylabel("Moyenne absolue des z-scores")
+            ax2.set_title("Années à forte hétérogénéité territoriale")
+        latence.pyplot(fig2)
 
         st.markdown(
             """
@@ -105,33 +253,20 @@ def anomalies(df: pd.DataFrame, pathologie: str):
     - un changement de méthodologie,
     - une dynamique territoriale exceptionnelle.""")
 
-        st.dataframe(df_annees)
+        latence.dataframe(df_annees)
 
     st.divider()
 
     # Heatmap dynamique (anomalies par année)
 
+    latence.section("Cartographie des anomalies")
     st.subheader("Cartographie des anomalies département et année")
 
-    df_z_annuel = z_score_prevalence_annee(df, pathologie)
-
-    if df_z_annuel.empty:
+    if "fig_heatmap" not in resultats:
         st.info("Données insuffisantes pour analyse annuelle.")
         return
 
-    pivot = df_z_annuel.pivot(
-        index="departement_nom",
-        columns="annee",
-        values="z_score")
-
-    fig3 = px.imshow(pivot,
-        aspect="auto",
-        color_continuous_scale="RdBu",
-        origin="lower",
-        title="Heatmap des z-scores par année")
-    
-    fig3.update_layout(height=1000)
-    st.plotly_chart(fig3, use_container_width=True)
+    latence.plotly_chart(resultats["fig_heatmap"], use_container_width=True)
 
     st.markdown(
             """
@@ -149,24 +284,10 @@ def anomalies(df: pd.DataFrame, pathologie: str):
 
     #Volatilité des département
 
+    latence.section("Volatilité des départements")
     st.subheader("Volatilité des départements dans le temps")
 
-    df_vol = (df_z_annuel.groupby("departement_nom")["z_score"]
-        .std().reset_index().rename(columns={"z_score": "volatilite"})
-        .sort_values("volatilite", ascending=False))
-    
-    df_vol_top = df_vol.head(20)
-    fig4 = px.bar(df_vol_top.sort_values("volatilite"),
-        x="volatilite",
-        y="departement_nom",
-        orientation="h",
-        title="Top 20 des départements les plus volatils")
-
-    fig4.update_layout(yaxis_title="Département",
-        xaxis_title="Écart-type des z-scores",
-        height=800)
-
-    st.plotly_chart(fig4, use_container_width=True)
+    latence.plotly_chart(resultats["fig_volatilite"], use_container_width=True)
     st.markdown(
     """
     **Interprétation**
@@ -178,13 +299,14 @@ def anomalies(df: pd.DataFrame, pathologie: str):
     Ce score permet d’identifier les territoires instables même sans anomalie ponctuelle majeure.
     """
     )
-    st.dataframe(df_vol.head(10))
+    latence.dataframe(resultats["volatilite"].head(10))
 
     #Instabilité territoriale
 
+    latence.section("Indice global d'instabilité")
     st.subheader("Indice global d’instabilité territoriale")
 
-    instabilite = df_z["z_score"].abs().mean()
+    instabilite = resultats["instabilite"]
 
     st.metric("Moyenne absolue des z-scores", round(instabilite, 3))
 
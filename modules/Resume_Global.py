@@ -2,6 +2,9 @@ import pandas as pd
 import streamlit as st
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
+from utils import latence
+from utils.cache_pages import CachePages, obtenir
+from core.jeu_donnees import JeuDonnees
 from core.stats_pandas import (
     nombre_de_lignes, pathologies_distinctes, departements_distincts, annees_distinctes,
     nombre_de_cas, population_reference, prevalence_globale, prevalence_moyenne
@@ -23,7 +26,37 @@ def resume_global(df: pd.DataFrame) -> dict:
         "Prévalence moyenne (%)": prevalence_moyenne(df)
     }
 
-def page_resume_global(df: pd.DataFrame):
+PAGE = "Résumé global"
+
+
+def tables_resume_global(jeu: JeuDonnees) -> dict:
+    """
+    Tableaux de la page de résumé global (sans affichage), extraits du résumé calculé
+    au chargement du jeu : aucune agrégation.
+    """
+    with latence.calcul():
+        resume = jeu.resume
+        top_pathologies = resume["volumes_pathologies"].iloc[2:22]
+        top_pathologies = top_pathologies[::-1]
+
+        return {
+            "stats": dict(resume["stats"]),
+            "cas_par_annee": resume["cas_par_annee"],
+            "top_pathologies": top_pathologies,
+            "cas_par_departement": resume["volumes_departements"].head(10),
+        }
+
+
+def tableau_hierarchie(effectifs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Effectifs de nœuds de la hiérarchie (``Hierarchie.effectifs``) mis en forme pour l'affichage.
+    """
+    return effectifs.set_index("libelle")[["agrege", "nb_enfants", "Ntop_totale", "Npop_totale", "prevalence_globale"]].rename(
+        columns={"agrege": "Agrégé", "nb_enfants": "Sous-niveaux", "Ntop_totale": "Cas",
+                 "Npop_totale": "Population", "prevalence_globale": "Prévalence (%)"})
+
+
+def page_resume_global(jeu: JeuDonnees, cache: CachePages | None = None):
 
     st.title("Analyse des pathologies – Assurance Maladie (France)")
 
@@ -77,7 +110,11 @@ def page_resume_global(df: pd.DataFrame):
     st.title("Résumé global")
     st.caption("Synthèse du jeu de données et des indicateurs épidémiologiques.")
 
-    stats = resume_global(df)
+    latence.section("Calcul")
+    resultats = obtenir(cache, (PAGE, None, None), lambda: tables_resume_global(jeu))
+
+    latence.section("Structure du jeu de données")
+    stats = resultats["stats"]
 
     st.subheader("Structure du jeu de données")
 
@@ -109,6 +146,7 @@ def page_resume_global(df: pd.DataFrame):
     st.divider()
 
 
+    latence.section("Indicateurs généraux")
     st.subheader("Indicateurs généraux")
 
     col1, col2, col3, col4 = st.columns(4)
@@ -136,20 +174,22 @@ def page_resume_global(df: pd.DataFrame):
     st.divider()
 
 
+    latence.section("Évolution globale des cas")
     st.subheader("Évolution globale des cas")
 
-    cas_par_annee = df.groupby("annee")["Ntop"].sum().sort_index()
+    cas_par_annee = resultats["cas_par_annee"]
 
-    fig, ax = plt.subplots()
-    ax.plot(cas_par_annee.index, cas_par_annee.values)
-    ax.set_xlabel("Année")
-    ax.set_ylabel("Nombre total de cas")
-    ax.set_title("Nombre total de cas par année")
-    ax.ticklabel_format(style='plain', axis='y')
-    ax.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))    
-    ax.grid(True)
+    with latence.figure():
+        fig, ax = plt.subplots()
+        ax.plot(cas_par_annee.index, cas_par_annee.values)
+        ax.set_xlabel("Année")
+        ax.set_ylabel("Nombre total de cas")
+        ax.set_title("Nombre total de cas par année")
+        ax.ticklabel_format(style='plain', axis='y')
+        ax.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))    
+        ax.grid(True)
 
-    st.pyplot(fig)
+    latence.pyplot(fig)
 
 
     st.markdown(
@@ -169,16 +209,16 @@ def page_resume_global(df: pd.DataFrame):
     st.divider()
 
 
+    latence.section("Top 20 des pathologies")
     st.subheader("Top 20 des pathologies et traitements pris en charge (cas cumulés)")
 
-    top_pathologies = (df.groupby("pathologie")["Ntop"].sum().sort_values(ascending=False))
-    top_pathologies = top_pathologies.iloc[2:22]
-    top_pathologies = top_pathologies[::-1]
-    fig2, ax2 = plt.subplots()
-    ax2.barh(top_pathologies.index, top_pathologies.values)
-    ax2.set_xlabel("Nombre total de cas")
-    ax2.set_title("Pathologies/traitements les plus représentées")
-    st.pyplot(fig2)
+    top_pathologies = resultats["top_pathologies"]
+    with latence.figure():
+        fig2, ax2 = plt.subplots()
+        ax2.barh(top_pathologies.index, top_pathologies.values)
+        ax2.set_xlabel("Nombre total de cas")
+        ax2.set_title("Pathologies/traitements les plus représentées")
+    latence.pyplot(fig2)
 
     st.markdown(
         """
@@ -201,20 +241,22 @@ def page_resume_global(df: pd.DataFrame):
     st.divider()
 
 
+    latence.section("Répartition globale des cas par département")
     st.subheader("Répartition globale des cas par département")
 
-    cas_par_departement = (df.groupby("departement")["Ntop"].sum().sort_values(ascending=False).head(10))
+    cas_par_departement = resultats["cas_par_departement"]
 
-    fig3, ax3 = plt.subplots()
-    ax3.bar(cas_par_departement.index.astype(str), cas_par_departement.values)
-    ax3.set_xlabel("Département")
-    ax3.set_ylabel("Nombre total de cas")
-    ax3.set_title("Top 10 départements en volume de cas")
-    ax3.tick_params(axis='x', rotation=45)
-    ax3.ticklabel_format(style='plain', axis='y')
-    ax3.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))    
+    with latence.figure():
+        fig3, ax3 = plt.subplots()
+        ax3.bar(cas_par_departement.index.astype(str), cas_par_departement.values)
+        ax3.set_xlabel("Département")
+        ax3.set_ylabel("Nombre total de cas")
+        ax3.set_title("Top 10 départements en volume de cas")
+        ax3.tick_params(axis='x', rotation=45)
+        ax3.ticklabel_format(style='plain', axis='y')
+        ax3.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))    
 
-    st.pyplot(fig3)
+    latence.pyplot(fig3)
 
     st.markdown(
         """
@@ -225,4 +267,48 @@ def page_resume_global(df: pd.DataFrame):
         L'analyse territoriale détaillée permettra d'examiner les prévalences
         afin d'ajuster pour l'effet population.
         """
-    )
\ No newline at end of file
+    )
+
+    st.divider()
+
+
+    latence.section("Hiérarchie des pathologies")
+    st.subheader("Des catégories de pathologies à leurs formes détaillées")
+
+    # Effectifs par nœud précalculés au chargement : aucune agrégation des lignes
+    hierarchie = jeu.hierarchie
+    categories = hierarchie.detail()
+    categorie = st.selectbox("Catégorie (niveau 1)", categories.index,
+                             format_func=lambda code: hierarchie.noeuds.at[code, "libelle"])
+
+    latence.dataframe(tableau_hierarchie(hierarchie.effectifs([categorie])))
+
+    groupes = hierarchie.detail(categorie)
+    if groupes.empty:
+        st.info("Cette catégorie n'est pas détaillée en groupes dans les données.")
+    else:
+        st.markdown("**Groupes (niveau 2)**")
+        latence.dataframe(tableau_hierarchie(groupes))
+
+        groupe = st.selectbox("Groupe (niveau 2)", groupes.index,
+                              format_func=lambda code: hierarchie.noeuds.at[code, "libelle"])
+        formes = hierarchie.detail(groupe)
+        if not formes.empty:
+            st.markdown("**Formes (niveau 3)**")
+            latence.dataframe(tableau_hierarchie(formes))
+
+            with latence.figure():
+                fig4, ax4 = plt.subplots()
+                ax4.barh(formes["libelle"][::-1], formes["prevalence_globale"][::-1])
+                ax4.set_xlabel("Prévalence globale (%)")
+                ax4.set_title(hierarchie.noeuds.at[groupe, "libelle"])
+            latence.pyplot(fig4)
+
+    st.markdown(
+        """
+        Les effectifs d'une catégorie ou d'un groupe sont ceux de ses propres lignes dans les données,
+        et non la somme de ses formes : un même patient peut relever de plusieurs formes d'une pathologie.
+        Un niveau sans lignes propres est marqué comme **agrégé** : son nombre de cas est alors la somme
+        de ses sous-niveaux, qui majore le nombre de patients distincts.
+        """
+    )
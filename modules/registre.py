@@ -0,0 +1,49 @@
+"""
+Registre des pages du dashboard, importées à la première sélection.
+
+``app.py`` ne connaît que les noms des pages : le module d'une page (et sa pile de
+graphiques : matplotlib, seaborn, plotly.express) n'est importé que lorsqu'elle est
+choisie pour la première fois, ce qui réduit le démarrage à froid du processus.
+"""
+
+import importlib
+import threading
+
+# Nom affiché -> (module, fonction d'affichage, la page prend-elle une pathologie)
+PAGES = {
+    "Résumé global": ("modules.Resume_Global", "page_resume_global", False),
+    "Analyse par pathologie": ("modules.Analyse_Pathologies", "analyse_pathologie", True),
+    "Analyse territoriale": ("modules.Analyse_territoriale", "analyse_territoriale", True),
+    "Analyse temporelle": ("modules.Analyse_temporelle", "analyse_temporelle", True),
+    "Anomalies": ("modules.Anomalies", "anomalies", True),
+}
+
+PAGE_ACCUEIL = "Résumé global"
+
+_CHARGEES = {}
+_VERROU = threading.Lock()
+
+
+def avec_pathologie(page: str) -> bool:
+    return PAGES[page][2]
+
+
+def charger_page(page: str):
+    """
+    Fonction d'affichage de ``page`` ; importe son module au premier appel.
+    """
+    with _VERROU:
+        if page not in _CHARGEES:
+            module, fonction, _ = PAGES[page]
+            _CHARGEES[page] = getattr(importlib.import_module(module), fonction)
+        return _CHARGEES[page]
+
+
+def afficher_page(page: str, jeu, pathologie: str | None, cache=None):
+    """
+    Affiche ``page`` (la pathologie n'est transmise qu'aux pages qui en prennent une).
+    """
+    afficher = charger_page(page)
+    if avec_pathologie(page):
+        return afficher(jeu, pathologie, cache)
+    return afficher(jeu, cache)
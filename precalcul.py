@@ -0,0 +1,100 @@
+"""
+Précalcul hors ligne des tableaux de toutes les pages du dashboard.
+
+Chaque processus reçoit le bloc de lignes d'une pathologie et calcule les tableaux de
+toutes les pages pour cette pathologie (et toutes les périodes de l'analyse temporelle).
+Le résultat est écrit dans un magasin colonnaire (voir ``utils/resultats_precalcules.py``)
+que le dashboard lit au démarrage, sans agréger les données brutes.
+
+Utilisation (depuis la racine du projet) :
+    python precalcul.py --processus 4
+"""
+
+import argparse
+import os
+import time
+from multiprocessing import Pool
+from pathlib import Path
+from core.jeu_donnees import JeuDonnees, charger_jeu_donnees
+from modules import Resume_Global, Analyse_Pathologies, Analyse_territoriale, Analyse_temporelle, Anomalies
+from utils.resultats_precalcules import DOSSIER_PAR_DEFAUT, encoder_tables, ecrire_magasin
+
+SOURCE_PAR_DEFAUT = Path(__file__).parent / "data" / "effectifs.parquet"
+
+
+def periodes(annees: list[int]) -> list[tuple[int, int]]:
+    """
+    Toutes les périodes [debut, fin] que peut sélectionner le curseur de l'analyse temporelle.
+    """
+    return [(debut, fin) for i, debut in enumerate(annees) for fin in annees[i:]]
+
+
+def _precalculer_pathologie(tache: tuple) -> list[tuple]:
+    """
+    Tableaux encodés de toutes les pages pour une pathologie (exécuté dans un processus).
+    """
+    nom, bloc, annees, standard = tache
+    # Standard d'âge du jeu complet : les prévalences standardisées sont celles du dashboard
+    jeu = JeuDonnees(bloc, standard=standard)
+
+    resultats = [
+        (Analyse_Pathologies.PAGE, None, Analyse_Pathologies.tables_analyse_pathologie(jeu, nom)),
+        (Analyse_territoriale.PAGE, None, Analyse_territoriale.tables_analyse_territoriale(jeu, nom)),
+        (Anomalies.PAGE, None, Anomalies.tables_anomalies(jeu, nom)),
+        (Analyse_temporelle.PAGE, None, Analyse_temporelle.tables_annuelles_temporelle(jeu, nom)),
+    ]
+    for periode in periodes(annees):
+        resultats.append((Analyse_temporelle.PAGE, periode,
+                          Analyse_temporelle.tables_periode_temporelle(jeu, nom, periode)))
+
+    return [(page, nom, periode, *encoder_tables(tables)) for page, periode, tables in resultats]
+
+
+def precalculer(jeu: JeuDonnees, dossier, processus: int = 1, source=None) -> int:
+    """
+    Calcule les tableaux de toutes les pages et écrit le magasin de résultats.
+
+    :param jeu: données nettoyées
+    :param dossier: dossier du magasin
+    :param processus: nombre de processus de calcul
+    :param source: fichier parquet d'origine (enregistré dans le manifeste)
+    :return: nombre de clés (page, pathologie, période) écrites
+    """
+    taches = [(nom, jeu.pathologie(nom), jeu.annees, jeu.standard) for nom in jeu.pathologies]
+
+    resultats = [(Resume_Global.PAGE, None, None, *encoder_tables(Resume_Global.tables_resume_global(jeu)))]
+    if processus > 1:
+        with Pool(processus) as pool:
+            for lot in pool.imap_unordered(_precalculer_pathologie, taches):
+                resultats.extend(lot)
+    else:
+        for tache in taches:
+            resultats.extend(_precalculer_pathologie(tache))
+
+    ecrire_magasin(dossier, resultats, jeu.catalogue, source, jeu.hierarchie)
+    return len(resultats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parquet", default=None, help="fichier effectifs.parquet (par défaut data/effectifs.parquet)")
+    parser.add_argument("--sortie", default=str(DOSSIER_PAR_DEFAUT), help="dossier du magasin de résultats")
+    parser.add_argument("--processus", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    source = Path(args.parquet) if args.parquet else SOURCE_PAR_DEFAUT
+
+    debut = time.perf_counter()
+    jeu = charger_jeu_donnees(source)
+    chargement = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    nb_cles = precalculer(jeu, args.sortie, args.processus, source)
+    calcul = time.perf_counter() - debut
+
+    print(f"{len(jeu.pathologies)} pathologies, {nb_cles} clés écrites dans {args.sortie}")
+    print(f"Chargement : {chargement:.2f} s, précalcul : {calcul:.2f} s ({args.processus} processus)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Génération non interactive de rapports par pathologie.
+
+Le jeu nettoyé est écrit une fois dans un fichier Arrow IPC non compressé que chaque
+processus du pool ouvre en mémoire partagée (``pyarrow.memory_map``) : un processus
+ne convertit en DataFrame que le bloc de lignes de la pathologie qu'il traite.
+
+Chaque rapport contient :
+- le classement territorial (départements, moyenne nationale)
+- les anomalies (départements et années atypiques, z-score)
+- la tendance temporelle (prévalence par année, variations, tendance, pente)
+- la répartition démographique (sexe, classe d'âge, ratio H/F, âge central)
+
+et est écrit dans ``<sortie>/<pathologie>/`` : un fichier CSV et/ou parquet par tableau,
+``indicateurs.json`` et une page HTML statique ``rapport.html``.
+
+Le manifeste ``<sortie>/manifeste.json`` garde l'empreinte des lignes de chaque pathologie :
+une pathologie dont les données n'ont pas changé depuis la dernière exécution est ignorée.
+
+Utilisation (depuis la racine du projet) :
+    python rapports.py tout --processus 4
+    python rapports.py "Cancers" "Diabète" --format csv parquet --sortie rapports
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import tempfile
+import time
+import unicodedata
+from datetime import datetime
+from multiprocessing import Pool
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+from core import stats_pandas
+from core.jeu_donnees import JeuDonnees, charger_jeu_donnees
+
+DOSSIER_PAR_DEFAUT = Path(__file__).parent / "rapports"
+MANIFESTE = "manifeste.json"
+# À incrémenter quand le contenu des rapports change (tous les rapports sont alors régénérés)
+VERSION = 1
+
+# Jeu en mémoire partagée, ouvert par chaque processus du pool
+_TABLE = None
+
+
+def _dossier_pathologie(pathologie: str) -> str:
+    """
+    Nom de dossier ASCII d'une pathologie, suffixé d'une empreinte courte (noms distincts garantis).
+    """
+    ascii_ = unicodedata.normalize("NFKD", pathologie.lower()).encode("ascii", "ignore").decode()
+    lisible = "".join(c if c.isalnum() else "_" for c in ascii_).strip("_")[:60]
+    return f"{lisible}_{hashlib.blake2b(pathologie.encode(), digest_size=4).hexdigest()}"
+
+
+def empreinte_bloc(bloc: pd.DataFrame, formats: tuple[str, ...]) -> str:
+    """
+    Empreinte des lignes d'une pathologie (valeurs et ordre), de la version et des formats des rapports.
+    """
+    empreinte = hashlib.blake2b(digest_size=16)
+    empreinte.update(pd.util.hash_pandas_object(bloc, index=False).to_numpy().tobytes())
+    empreinte.update(json.dumps([VERSION, sorted(formats)]).encode())
+    return empreinte.hexdigest()
+
+
+def rapport_pathologie(df: pd.DataFrame, pathologie: str) -> tuple[dict, dict]:
+    """
+    Tableaux et indicateurs du rapport d'une pathologie.
+
+    :param df: lignes de la pathologie (ou jeu complet)
+    :return: (tableaux {nom: DataFrame}, indicateurs {nom: valeur sérialisable})
+    """
+    stats_annee = stats_pandas.stats_par_annee(df, pathologie)
+    age_central = stats_pandas.age_central_pathologie(df, pathologie)
+
+    tableaux = {
+        "classement_departements": stats_pandas.classement_departements(df, pathologie),
+        "departements_atypiques": stats_pandas.valeurs_aberrantes(df, pathologie),
+        "annees_atypiques": stats_pandas.annees_anormales(df, pathologie),
+        "prevalence_par_annee": stats_annee.reset_index() if not stats_annee.empty else stats_annee,
+        "repartition_sexe": stats_pandas.stats_par_sexe(df, pathologie).reset_index(),
+        "repartition_age": stats_pandas.stats_par_tranche_age(df, pathologie).reset_index(),
+    }
+    variations = stats_pandas.variation_annuelle(df, pathologie) or {}
+    tableaux["variations_annuelles"] = pd.DataFrame(
+        [{"annee": annee, **valeurs} for annee, valeurs in variations.items()],
+        columns=["annee", "difference absolue", "valeur relative"])
+
+    indicateurs = {
+        "pathologie": pathologie,
+        "lignes": int((df["pathologie"] == pathologie).sum()),
+        "prevalence_nationale": stats_pandas.moyenne_nationale(df, pathologie),
+        "tendance": stats_pandas.tendance_generale(df, pathologie),
+        "pente": stats_pandas.pente_tendance(df, pathologie),
+        "ratio_cas_hf": stats_pandas.ratio_cas_hf(df, pathologie),
+        "difference_prevalence_sexe": stats_pandas.difference_prevalence_sexe(df, pathologie),
+        "age_central": age_central[0] if age_central else None,
+        "prevalence_age_central": age_central[1] if age_central else None,
+    }
+    indicateurs = {nom: v.item() if hasattr(v, "item") else v for nom, v in indicateurs.items()}
+    tableaux = {nom: t if t is not None else pd.DataFrame() for nom, t in tableaux.items()}
+    return tableaux, indicateurs
+
+
+_TITRES = {
+    "classement_departements": "Classement territorial",
+    "departements_atypiques": "Départements atypiques (z-score >= 2)",
+    "annees_atypiques": "Années atypiques",
+    "prevalence_par_annee": "Prévalence par année",
+    "variations_annuelles": "Variations annuelles",
+    "repartition_sexe": "Répartition par sexe",
+    "repartition_age": "Répartition par classe d'âge",
+}
+
+
+def page_html(tableaux: dict, indicateurs: dict) -> str:
+    """
+    Page HTML statique du rapport (indicateurs puis un tableau par section).
+    """
+    titre = html.escape(indicateurs["pathologie"])
+    lignes = "".join(f"<tr><th>{html.escape(nom)}</th><td>{html.escape(str(valeur))}</td></tr>"
+                     for nom, valeur in indicateurs.items() if nom != "pathologie")
+    sections = []
+    for nom, df in tableaux.items():
+        contenu = "<p>Aucune donnée.</p>" if df.empty else df.to_html(index=False, border=0, classes="tableau")
+        sections.append(f"<h2>{html.escape(_TITRES.get(nom, nom))}</h2>\n{contenu}")
+
+    return f"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>Rapport : {titre}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 1.5em; }}
+th, td {{ padding: 0.2em 0.8em; border-bottom: 1px solid #ddd; text-align: left; }}
+</style>
+</head>
+<body>
+<h1>{titre}</h1>
+<p>Généré le {datetime.now().isoformat(timespec="seconds")}</p>
+<h2>Indicateurs</h2>
+<table>{lignes}</table>
+{chr(10).join(sections)}
+</body>
+</html>
+"""
+
+
+def ecrire_rapport(dossier: Path, tableaux: dict, indicateurs: dict, formats: tuple[str, ...]):
+    dossier.mkdir(parents=True, exist_ok=True)
+    for nom, df in tableaux.items():
+        if "csv" in formats:
+            df.to_csv(dossier / f"{nom}.csv", index=False)
+        if "parquet" in formats:
+            df.to_parquet(dossier / f"{nom}.parquet", index=False)
+    (dossier / "indicateurs.json").write_text(json.dumps(indicateurs, ensure_ascii=False, indent=2), encoding="utf-8")
+    (dossier / "rapport.html").write_text(page_html(tableaux, indicateurs), encoding="utf-8")
+
+
+def _initialiser(chemin_arrow: str):
+    """
+    Ouvre le jeu partagé (une fois par processus) : les pages du fichier sont partagées
+    entre les processus par le cache du système, sans copie.
+    """
+    global _TABLE
+    _TABLE = pa.ipc.open_file(pa.memory_map(chemin_arrow, "r")).read_all()
+
+
+def _generer(tache: tuple) -> tuple[str, int, float]:
+    """
+    Calcule et écrit le rapport d'une pathologie (exécuté dans un processus du pool).
+
+    :param tache: (pathologie, début du bloc, nombre de lignes, dossier, formats)
+    :return: (pathologie, lignes, durée en s)
+    """
+    pathologie, debut_bloc, longueur, dossier, formats = tache
+    debut = time.perf_counter()
+    df = _TABLE.slice(debut_bloc, longueur).to_pandas()
+    tableaux, indicateurs = rapport_pathologie(df, pathologie)
+    ecrire_rapport(Path(dossier), tableaux, indicateurs, formats)
+    return pathologie, longueur, time.perf_counter() - debut
+
+
+def _lire_manifeste(sortie: Path) -> dict:
+    chemin = sortie / MANIFESTE
+    if not chemin.exists():
+        return {}
+    return json.loads(chemin.read_text(encoding="utf-8")).get("pathologies", {})
+
+
+def generer_rapports(jeu: JeuDonnees, pathologies: list[str], sortie, formats: tuple[str, ...] = ("csv",),
+                     processus: int = 1, forcer: bool = False, afficher=print) -> dict:
+    """
+    Génère les rapports des pathologies demandées, en ignorant celles dont les données
+    et les rapports sont inchangés depuis la dernière exécution.
+
+    :param pathologies: pathologies du jeu à traiter
+    :param sortie: dossier des rapports
+    :param formats: formats des tableaux, parmi "csv" et "parquet"
+    :param processus: taille du pool de processus
+    :param forcer: régénère aussi les rapports à jour
+    :param afficher: fonction d'affichage de la progression (None : silencieux)
+    :return: {"generes", "ignores", "lignes", "duree_s"}
+    """
+    sortie = Path(sortie)
+    sortie.mkdir(parents=True, exist_ok=True)
+    manifeste = _lire_manifeste(sortie)
+    afficher = afficher or (lambda *_: None)
+
+    # Les lignes du jeu sont triées par pathologie : chaque bloc est une tranche contiguë
+    df = jeu.df
+    taches, empreintes, ignores = [], {}, []
+    for pathologie in pathologies:
+        bloc = jeu.bloc(pathologie)
+        empreinte = empreinte_bloc(df.iloc[bloc], formats)
+        dossier = sortie / _dossier_pathologie(pathologie)
+        connu = manifeste.get(pathologie, {})
+        if not forcer and connu.get("empreinte") == empreinte and (dossier / "rapport.html").exists():
+            ignores.append(pathologie)
+            continue
+        empreintes[pathologie] = {"empreinte": empreinte, "dossier": dossier.name}
+        taches.append((pathologie, bloc.start, bloc.stop - bloc.start, str(dossier), tuple(formats)))
+
+    afficher(f"{len(taches)} rapports à générer, {len(ignores)} à jour ignorés")
+    debut = time.perf_counter()
+    lignes = 0
+
+    try:
+        for k, (pathologie, nb_lignes, duree) in enumerate(_executer(df, taches, processus), start=1):
+            lignes += nb_lignes
+            manifeste[pathologie] = empreintes[pathologie]
+            afficher(f"[{k}/{len(taches)}] {pathologie} ({nb_lignes:,} lignes, {duree:.2f} s) "
+                     f"- {k / (time.perf_counter() - debut):.1f} rapports/s")
+    finally:
+        # Les rapports déjà écrits restent acquis si une pathologie échoue
+        (sortie / MANIFESTE).write_text(json.dumps({
+            "version": VERSION,
+            "genere_le": datetime.now().isoformat(timespec="seconds"),
+            "pathologies": manifeste,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    return {"generes": len(taches), "ignores": len(ignores), "lignes": lignes, "duree_s": time.perf_counter() - debut}
+
+
+def _executer(df: pd.DataFrame, taches: list[tuple], processus: int):
+    """
+    Écrit le jeu en Arrow IPC puis génère les rapports ; rend le résultat de chaque tâche terminée.
+    """
+    if not taches:
+        return
+
+    with tempfile.TemporaryDirectory() as temporaire:
+        chemin_arrow = str(Path(temporaire) / "jeu.arrow")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(chemin_arrow, "wb") as puits, pa.ipc.new_file(puits, table.schema) as fichier:
+            fichier.write_table(table)
+        del table
+
+        if processus > 1:
+            with Pool(processus, initializer=_initialiser, initargs=(chemin_arrow,)) as pool:
+                yield from pool.imap_unordered(_generer, taches)
+        else:
+            global _TABLE
+            _initialiser(chemin_arrow)
+            try:
+                for tache in taches:
+                    yield _generer(tache)
+            finally:
+                _TABLE = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pathologies", nargs="+", help='pathologies à traiter, ou "tout"')
+    parser.add_argument("--parquet", default=None, help="fichier effectifs.parquet (par défaut data/effectifs.parquet)")
+    parser.add_argument("--sortie", default=str(DOSSIER_PAR_DEFAUT), help="dossier des rapports")
+    parser.add_argument("--format", nargs="+", choices=("csv", "parquet"), default=["csv"], dest="formats")
+    parser.add_argument("--processus", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--forcer", action="store_true", help="régénère aussi les rapports à jour")
+    args = parser.parse_args()
+
+    debut = time.perf_counter()
+    jeu = charger_jeu_donnees(Path(args.parquet) if args.parquet else None)
+    print(f"Chargement : {time.perf_counter() - debut:.2f} s ({len(jeu):,} lignes)")
+
+    if [p.lower() for p in args.pathologies] in (["tout"], ["all"]):
+        pathologies = jeu.pathologies
+    else:
+        inconnues = [p for p in args.pathologies if p not in jeu.catalogue.disponibilite]
+        if inconnues:
+            parser.error(f"pathologies inconnues : {inconnues}")
+        pathologies = list(dict.fromkeys(args.pathologies))
+
+    bilan = generer_rapports(jeu, pathologies, args.sortie, tuple(args.formats), args.processus, args.forcer)
+
+    duree = bilan["duree_s"]
+    debit = f"{bilan['generes'] / duree:.1f} rapports/s, {bilan['lignes'] / duree:,.0f} lignes/s" if duree and bilan["generes"] else "-"
+    print(f"{bilan['generes']} rapports générés, {bilan['ignores']} ignorés en {duree:.2f} s ({debit}) dans {args.sortie}")
+
+
+if __name__ == "__main__":
+    main()
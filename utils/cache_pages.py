@@ -0,0 +1,138 @@
+"""
+Cache des résultats de pages du dashboard.
+
+Chaque page sépare le calcul de l'affichage : ``tables_*`` renvoie les tableaux et
+indicateurs, ``figures_*`` (facultatif) en déduit les spécifications de figures plotly.
+Les résultats sont conservés par clé (page, pathologie, période) dans un cache LRU borné,
+partagé par toutes les sessions : revenir sur une pathologie récemment consultée ne
+relance aucun calcul.
+
+Si un magasin de résultats précalculés est fourni (voir ``utils.resultats_precalcules``),
+les tableaux y sont lus au lieu d'être calculés sur les données brutes.
+
+Les objets mis en cache sont partagés : l'affichage ne doit pas les modifier.
+"""
+
+import threading
+from collections import OrderedDict
+
+TAILLE_PAR_DEFAUT = 64
+
+
+class CachePages:
+    """
+    Cache LRU borné (nombre d'entrées) avec statistiques de succès.
+    """
+
+    def __init__(self, taille_max: int = TAILLE_PAR_DEFAUT, magasin=None):
+        if taille_max < 1:
+            raise ValueError("La taille du cache doit être au moins 1")
+        self.taille_max = taille_max
+        self.magasin = magasin
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entrees)
+
+    def __contains__(self, cle) -> bool:
+        return cle in self._entrees
+
+    def obtenir(self, cle: tuple, calcul, completer=None):
+        """
+        Retourne le résultat associé à ``cle`` ; à défaut, l'obtient et le met en cache
+        (l'entrée la moins récemment utilisée est évincée si besoin).
+
+        Les tableaux viennent du magasin s'il contient ``cle``, sinon de ``calcul()`` ;
+        ``completer`` y ajoute ensuite les figures.
+
+        :param cle: (page, pathologie, période)
+        :param calcul: fonction sans argument qui produit les tableaux
+        :param completer: fonction tableaux -> résultat complet (par défaut, les tableaux)
+        """
+        with self._verrou:
+            if cle in self._entrees:
+                self._entrees.move_to_end(cle)
+                self.succes += 1
+                return self._entrees[cle]
+            self.echecs += 1
+
+        # Calcul hors verrou : les autres sessions ne sont pas bloquées
+        resultat = _produire(self.magasin, cle, calcul, completer)
+        self.deposer(cle, resultat)
+        return resultat
+
+    def lire(self, cle: tuple):
+        """
+        Résultat en cache de ``cle``, ou None (compté comme échec).
+        """
+        with self._verrou:
+            if cle in self._entrees:
+                self._entrees.move_to_end(cle)
+                self.succes += 1
+                return self._entrees[cle]
+            self.echecs += 1
+            return None
+
+    def deposer(self, cle: tuple, resultat):
+        """
+        Met ``resultat`` en cache (pour une page qui l'a produit elle-même, section par section).
+        """
+        with self._verrou:
+            self._entrees[cle] = resultat
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+                self.evictions += 1
+
+    def vider(self):
+        with self._verrou:
+            self._entrees.clear()
+
+    def statistiques(self) -> dict:
+        with self._verrou:
+            demandes = self.succes + self.echecs
+            return {
+                "entrees": len(self._entrees),
+                "taille_max": self.taille_max,
+                "succes": self.succes,
+                "echecs": self.echecs,
+                "evictions": self.evictions,
+                "taux_succes": round(self.succes / demandes, 3) if demandes else 0.0,
+            }
+
+
+def _produire(magasin, cle: tuple, calcul, completer):
+    tables = magasin.tables(*cle) if magasin is not None else None
+    if tables is None:
+        tables = calcul()
+    return completer(tables) if completer is not None else tables
+
+
+def lire(cache: CachePages | None, cle: tuple) -> dict | None:
+    """
+    Résultat en cache de ``cle``, à défaut ses tableaux précalculés (magasin), sinon None.
+    """
+    if cache is None:
+        return None
+    resultat = cache.lire(cle)
+    if resultat is None and cache.magasin is not None:
+        resultat = cache.magasin.tables(*cle)
+    return resultat
+
+
+def deposer(cache: CachePages | None, cle: tuple, resultat):
+    if cache is not None:
+        cache.deposer(cle, resultat)
+
+
+def obtenir(cache: CachePages | None, cle: tuple, calcul, completer=None):
+    """
+    ``cache.obtenir(cle, calcul, completer)``, ou simple calcul si aucun cache n'est fourni.
+    """
+    if cache is None:
+        return _produire(None, cle, calcul, completer)
+    return cache.obtenir(cle, calcul, completer)
@@ -105,6 +105,49 @@ class Conversion_donnees:
         "999": "France entière"
     }
 
+    # Régions (codes INSEE 2016) et leurs départements
+    REGIONS = {
+        "01": "Guadeloupe",
+        "02": "Martinique",
+        "03": "Guyane",
+        "04": "La Réunion",
+        "06": "Mayotte",
+        "11": "Île-de-France",
+        "24": "Centre-Val de Loire",
+        "27": "Bourgogne-Franche-Comté",
+        "28": "Normandie",
+        "32": "Hauts-de-France",
+        "44": "Grand Est",
+        "52": "Pays de la Loire",
+        "53": "Bretagne",
+        "75": "Nouvelle-Aquitaine",
+        "76": "Occitanie",
+        "84": "Auvergne-Rhône-Alpes",
+        "93": "Provence-Alpes-Côte d'Azur",
+        "94": "Corse",
+        "99": "France entière"
+    }
+
+    DEPARTEMENTS_PAR_REGION = {
+        "84": ["01", "03", "07", "15", "26", "38", "42", "43", "63", "69", "73", "74"],
+        "27": ["21", "25", "39", "58", "70", "71", "89", "90"],
+        "53": ["22", "29", "35", "56"],
+        "24": ["18", "28", "36", "37", "41", "45"],
+        "94": ["2A", "2B"],
+        "44": ["08", "10", "51", "52", "54", "55", "57", "67", "68", "88"],
+        "32": ["02", "59", "60", "62", "80"],
+        "11": ["75", "77", "78", "91", "92", "93", "94", "95"],
+        "28": ["14", "27", "50", "61", "76"],
+        "75": ["16", "17", "19", "23", "24", "33", "40", "47", "64", "79", "86", "87"],
+        "76": ["09", "11", "12", "30", "31", "32", "34", "46", "48", "65", "66", "81", "82"],
+        "52": ["44", "49", "53", "72", "85"],
+        "93": ["04", "05", "06", "13", "83", "84"],
+        "01": ["971"], "02": ["972"], "03": ["973"], "04": ["974"], "06": ["976"],
+        "99": ["999"]
+    }
+
+    REGION_PAR_DEPARTEMENT = {dept: region for region, depts in DEPARTEMENTS_PAR_REGION.items() for dept in depts}
+
     ORDRE_TRANCHES_AGE = [
         "de 0 à 4 ans",
         "de 5 à 9 ans",
@@ -141,6 +184,34 @@ class Conversion_donnees:
 
         return cls.DEPARTEMENTS.get(code_str, "Inconnu")
 
+    @classmethod
+    def region(cls, code):
+
+        if code is None:
+            return "Inconnu"
+
+        code_str = str(code).strip()
+
+        if code_str.isdigit() and len(code_str) == 1:
+            code_str = f"0{code_str}"
+
+        return cls.REGIONS.get(code_str, "Inconnu")
+
+    @classmethod
+    def region_du_departement(cls, code):
+        """
+        Code de la région d'un département (None s'il est inconnu)
+        """
+        if code is None:
+            return None
+
+        code_str = str(code).strip().upper()
+
+        if code_str.isdigit() and len(code_str) == 1:
+            code_str = f"0{code_str}"
+
+        return cls.REGION_PAR_DEPARTEMENT.get(code_str)
+
 
 
     def pathologie(self, ligne: dict) -> tuple[str, str]:
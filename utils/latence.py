@@ -0,0 +1,251 @@
+"""
+Suivi de la latence de rendu des pages du dashboard (panneau développeur).
+
+Pour chaque rerun suivi, chaque section de page enregistre :
+- le temps de calcul (blocs ``with calcul():``)
+- le temps de construction des figures (blocs ``with figure():``)
+- le temps d'envoi et la taille sérialisée de chaque graphique / tableau envoyé au navigateur
+et, pour le rerun, le délai avant le premier graphique / tableau affiché.
+
+Le coût de la mesure des tailles (rendu PNG, JSON, Arrow supplémentaire) est
+exclu des temps affichés.
+
+Hors suivi, ces fonctions se limitent à appeler Streamlit. Le suivi est propre
+au thread de la session en cours : les autres sessions du serveur ne sont pas affectées.
+Un historique glissant des reruns (toutes sessions) est conservé en mémoire du processus.
+"""
+
+import io
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import streamlit as st
+
+TAILLE_HISTORIQUE = 200
+
+_HISTORIQUE = deque(maxlen=TAILLE_HISTORIQUE)
+_VERROU = threading.Lock()
+_COURANT = threading.local()
+
+
+class SuiviRendu:
+    """
+    Mesures d'un rerun : une entrée par section de la page.
+    """
+
+    def __init__(self, page: str, pathologie: str | None):
+        self.page = page
+        self.pathologie = pathologie
+        self.debut = time.perf_counter()
+        self.surcout_s = 0.0
+        self.total_s = None
+        self.premier_affichage_s = None
+        self.sections = []
+        self.section("En-tête")
+
+    def section(self, nom: str):
+        maintenant = time.perf_counter()
+        if self.sections:
+            self._clore(maintenant)
+        self.sections.append({"section": nom, "calcul_s": 0.0, "figure_s": 0.0, "envoi_s": 0.0,
+                              "sorties": [], "_debut": maintenant, "_surcout": self.surcout_s})
+
+    def _clore(self, maintenant: float):
+        s = self.sections[-1]
+        s["total_s"] = maintenant - s["_debut"] - (self.surcout_s - s["_surcout"])
+
+    def terminer(self):
+        maintenant = time.perf_counter()
+        self._clore(maintenant)
+        self.total_s = maintenant - self.debut - self.surcout_s
+
+    def tableau(self) -> list[dict]:
+        """
+        Une ligne par section (tailles cumulées des sorties).
+        """
+        return [{
+            "section": s["section"],
+            "calcul (s)": round(s["calcul_s"], 4),
+            "figures (s)": round(s["figure_s"], 4),
+            "envoi (s)": round(s["envoi_s"], 4),
+            "total (s)": round(s.get("total_s", 0.0), 4),
+            "sorties": len(s["sorties"]),
+            "taille (Ko)": round(sum(t for _, t in s["sorties"]) / 1024, 1),
+        } for s in self.sections]
+
+
+def _suivi() -> SuiviRendu | None:
+    return getattr(_COURANT, "suivi", None)
+
+
+@contextmanager
+def suivre(page: str, pathologie: str | None):
+    """
+    Suit le rendu d'une page dans le thread courant et l'ajoute à l'historique.
+    """
+    suivi = SuiviRendu(page, pathologie)
+    _COURANT.suivi = suivi
+    try:
+        yield suivi
+    finally:
+        _COURANT.suivi = None
+        suivi.terminer()
+        with _VERROU:
+            _HISTORIQUE.append({
+                "horodatage": time.strftime("%H:%M:%S"),
+                "page": page,
+                "pathologie": pathologie,
+                "total (s)": round(suivi.total_s, 3),
+                "premier affichage (s)": (round(suivi.premier_affichage_s, 3)
+                                          if suivi.premier_affichage_s is not None else None),
+                "calcul (s)": round(sum(s["calcul_s"] for s in suivi.sections), 3),
+                "figures (s)": round(sum(s["figure_s"] for s in suivi.sections), 3),
+                "envoi (s)": round(sum(s["envoi_s"] for s in suivi.sections), 3),
+                "taille (Ko)": round(sum(t for s in suivi.sections for _, t in s["sorties"]) / 1024, 1),
+            })
+
+
+def historique() -> list[dict]:
+    with _VERROU:
+        return list(_HISTORIQUE)
+
+
+def section(nom: str):
+    """
+    Marque le début d'une section de page.
+    """
+    suivi = _suivi()
+    if suivi is not None:
+        suivi.section(nom)
+
+
+@contextmanager
+def _chronometre(cle: str):
+    suivi = _suivi()
+    if suivi is None:
+        yield
+        return
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        suivi.sections[-1][cle] += time.perf_counter() - debut
+
+
+def calcul():
+    """
+    Bloc de calcul (appels aux fonctions d'analyse) de la section courante.
+    """
+    return _chronometre("calcul_s")
+
+
+def figure():
+    """
+    Bloc de construction de figure (matplotlib / plotly) de la section courante.
+    """
+    return _chronometre("figure_s")
+
+
+def au_fil_du_calcul(iterable):
+    """
+    Itère sur ``iterable`` (par exemple ``Ordonnanceur.executer()``) en comptant
+    l'attente de chaque élément comme temps de calcul de la section courante.
+    """
+    iterateur = iter(iterable)
+    while True:
+        with calcul():
+            try:
+                element = next(iterateur)
+            except StopIteration:
+                return
+        yield element
+
+
+def _envoyer(nature: str, taille, envoi, objet, **kwargs):
+    """
+    Envoie ``objet`` avec la fonction Streamlit ``envoi`` ; en cours de suivi,
+    enregistre le temps d'envoi et la taille calculée par ``taille(objet)``.
+    """
+    suivi = _suivi()
+    if suivi is None:
+        return envoi(objet, **kwargs)
+
+    debut = time.perf_counter()
+    octets = taille(objet)
+    suivi.surcout_s += time.perf_counter() - debut
+
+    if suivi.premier_affichage_s is None:
+        suivi.premier_affichage_s = time.perf_counter() - suivi.debut - suivi.surcout_s
+
+    debut = time.perf_counter()
+    resultat = envoi(objet, **kwargs)
+    section = suivi.sections[-1]
+    section["envoi_s"] += time.perf_counter() - debut
+    section["sorties"].append((nature, octets))
+    return resultat
+
+
+def _taille_png(fig) -> int:
+    tampon = io.BytesIO()
+    fig.savefig(tampon, format="png")
+    return tampon.getbuffer().nbytes
+
+
+def _taille_arrow(df) -> int:
+    import pyarrow as pa
+    return pa.Table.from_pandas(df).nbytes
+
+
+def pyplot(fig, **kwargs):
+    """
+    st.pyplot avec mesure de la taille de l'image PNG envoyée.
+    """
+    return _envoyer("pyplot", _taille_png, st.pyplot, fig, **kwargs)
+
+
+def plotly_chart(fig, **kwargs):
+    """
+    st.plotly_chart avec mesure de la taille de la spécification JSON envoyée.
+    """
+    return _envoyer("plotly", lambda f: len(f.to_json()), st.plotly_chart, fig, **kwargs)
+
+
+def dataframe(df, **kwargs):
+    """
+    st.dataframe avec mesure de la taille Arrow du tableau envoyé.
+    """
+    return _envoyer("dataframe", _taille_arrow, st.dataframe, df, **kwargs)
+
+
+def panneau(suivi: SuiviRendu, budget_s: float):
+    """
+    Affiche le détail du rerun courant et l'historique glissant.
+    """
+    with st.expander("Panneau développeur : latence du rendu", expanded=True):
+        depassement = suivi.total_s > budget_s
+        col1, col2 = st.columns(2)
+        col1.metric("Rerun courant (s)", round(suivi.total_s, 3),
+                    delta="budget dépassé" if depassement else "dans le budget",
+                    delta_color="inverse" if depassement else "normal")
+        if suivi.premier_affichage_s is not None:
+            col2.metric("Premier graphique / tableau affiché (s)", round(suivi.premier_affichage_s, 3))
+
+        st.markdown("**Détail par section**")
+        st.dataframe(suivi.tableau(), use_container_width=True)
+
+        lignes = historique()
+        st.markdown(f"**Historique des {len(lignes)} derniers reruns (toutes sessions)**")
+        st.dataframe(lignes[::-1], use_container_width=True)
+
+        hors_budget = [l for l in lignes if l["total (s)"] > budget_s]
+        if hors_budget:
+            pires = {}
+            for l in hors_budget:
+                cle = (l["page"], l["pathologie"])
+                pires[cle] = max(pires.get(cle, 0.0), l["total (s)"])
+            st.markdown(f"**Combinaisons page / pathologie au-delà de {budget_s} s**")
+            st.dataframe(
+                [{"page": p, "pathologie": pa, "pire total (s)": t}
+                 for (p, pa), t in sorted(pires.items(), key=lambda x: x[1], reverse=True)],
+                use_container_width=True)
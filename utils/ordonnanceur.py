@@ -0,0 +1,108 @@
+"""
+Ordonnanceur de tâches de calcul d'une page, avec dépendances, sur un pool de threads.
+
+Chaque tâche est nommée et déclare les tâches dont elle reçoit les résultats.
+Les tâches indépendantes s'exécutent en parallèle (les noyaux numpy / pandas
+relâchent le GIL) ; ``executer()`` rend les résultats dans le thread appelant,
+au fur et à mesure qu'ils sont prêts, pour que la page affiche chaque section
+dès que ses données sont disponibles.
+
+Les tâches ne doivent pas appeler Streamlit : l'affichage reste dans le thread du script.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+MAX_THREADS = min(4, os.cpu_count() or 1)
+
+
+class Ordonnanceur:
+    """
+    Graphe de tâches nommées ; les résultats déjà connus ne sont pas recalculés,
+    ni les tâches intermédiaires dont plus aucune tâche à calculer n'a besoin.
+    """
+
+    def __init__(self, connus: dict | None = None, max_threads: int = MAX_THREADS):
+        """
+        :param connus: résultats disponibles par nom (cache), rendus sans calcul
+        :param max_threads: taille du pool de threads
+        """
+        self.connus = dict(connus or {})
+        self.max_threads = max(1, max_threads)
+        self._taches = {}
+        self._intermediaires = set()
+
+    def ajouter(self, nom: str, fonction, dependances: tuple[str, ...] = (), intermediaire: bool = False):
+        """
+        Déclare la tâche ``nom`` : ``fonction(*résultats des dépendances)``.
+
+        :param intermediaire: résultat calculé seulement si une tâche à calculer en dépend
+        """
+        if nom in self._taches:
+            raise ValueError(f"Tâche déjà déclarée : {nom}")
+        self._taches[nom] = (fonction, tuple(dependances))
+        if intermediaire:
+            self._intermediaires.add(nom)
+
+    def _a_calculer(self) -> dict:
+        """
+        Tâches non connues nécessaires : les tâches finales et leurs dépendances (récursivement).
+        """
+        for nom, (_, dependances) in self._taches.items():
+            inconnues = [d for d in dependances if d not in self._taches]
+            if inconnues:
+                raise ValueError(f"Dépendances inconnues pour {nom} : {inconnues}")
+
+        requises = set()
+        pile = [nom for nom in self._taches if nom not in self._intermediaires and nom not in self.connus]
+        while pile:
+            nom = pile.pop()
+            if nom in requises or nom in self.connus:
+                continue
+            requises.add(nom)
+            pile.extend(self._taches[nom][1])
+        return {nom: tache for nom, tache in self._taches.items() if nom in requises}
+
+    def executer(self):
+        """
+        Exécute les tâches et rend les couples (nom, résultat) dans l'ordre où ils sont prêts,
+        en commençant par les résultats connus. Une exception d'une tâche est relancée ici.
+        """
+        resultats = {}
+        for nom in self._taches:
+            if nom in self.connus:
+                resultats[nom] = self.connus[nom]
+                yield nom, resultats[nom]
+
+        restantes = self._a_calculer()
+        if not restantes:
+            return
+
+        pool = ThreadPoolExecutor(max_workers=self.max_threads)
+        en_cours = {}
+
+        def lancer_pretes():
+            for nom, (fonction, dependances) in list(restantes.items()):
+                if all(d in resultats for d in dependances):
+                    del restantes[nom]
+                    en_cours[pool.submit(fonction, *(resultats[d] for d in dependances))] = nom
+            if restantes and not en_cours:
+                raise ValueError(f"Dépendances circulaires entre : {sorted(restantes)}")
+
+        try:
+            lancer_pretes()
+            while en_cours:
+                terminees, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+                for future in terminees:
+                    nom = en_cours.pop(future)
+                    resultats[nom] = future.result()
+                    yield nom, resultats[nom]
+                lancer_pretes()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def resultats(self) -> dict:
+        """
+        Exécute toutes les tâches et retourne {nom: résultat}.
+        """
+        return dict(self.executer())
@@ -0,0 +1,353 @@
+"""
+Magasin de résultats précalculés des pages du dashboard.
+
+Les tableaux et indicateurs renvoyés par les fonctions ``tables_*`` des pages sont
+calculés hors ligne (voir ``precalcul.py``) pour toutes les pathologies et périodes,
+puis écrits dans un magasin colonnaire :
+
+    <dossier>/manifeste.json              catalogue des dimensions, hiérarchie des pathologies,
+                                          pages, fichier source
+    <dossier>/<page>/scalaires.parquet    une ligne par clé : _cle, _pathologie, _debut, _fin,
+                                          indicateurs scalaires et description des entrées (__types__)
+    <dossier>/<page>/<tableau>.parquet    lignes de ce tableau pour toutes les clés (colonne _cle)
+
+Au démarrage, le dashboard lit ce magasin au lieu d'agréger les données brutes :
+``MagasinResultats.tables(page, pathologie, periode)`` reconstruit le dictionnaire de
+tableaux d'une clé, les figures restant construites par les pages.
+"""
+
+import json
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from core.jeu_donnees import Catalogue, Hierarchie, charger_jeu_donnees
+
+DOSSIER_PAR_DEFAUT = Path(__file__).parent.parent / "data" / "resultats"
+MANIFESTE = "manifeste.json"
+SCALAIRES = "scalaires"
+VERSION = 1
+
+
+def _python(valeur):
+    """
+    Convertit un scalaire numpy en scalaire Python (sérialisable en JSON et en parquet).
+    """
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    return valeur
+
+
+def _mettre_a_plat(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    """
+    Met à plat un DataFrame : index en colonnes ``__index_i__``, noms de colonnes en texte.
+    """
+    index = df.index.to_frame(index=False)
+    index.columns = [f"__index_{i}__" for i in range(df.index.nlevels)]
+    valeurs = df.reset_index(drop=True)
+    valeurs.columns = [str(c) for c in df.columns]
+    plat = pd.concat([index, valeurs], axis=1)
+
+    description = {
+        "index": [_python(n) for n in df.index.names],
+        "colonnes": [_python(c) for c in df.columns],
+        "nom_colonnes": _python(df.columns.name),
+        "dtypes": {c: str(t) for c, t in plat.dtypes.items()},
+    }
+    return plat, description
+
+
+def encoder_tables(tables: dict) -> tuple[dict, dict, dict]:
+    """
+    Découpe un dictionnaire de résultats de page en scalaires et tableaux stockables.
+
+    :param tables: résultat d'une fonction ``tables_*``
+    :return: (scalaires {colonne: valeur}, tableaux {nom: DataFrame à plat}, types {nom: description})
+    """
+    scalaires, tableaux, types = {}, {}, {}
+
+    for nom, valeur in tables.items():
+        if valeur is None:
+            types[nom] = {"type": "none"}
+
+        elif isinstance(valeur, pd.DataFrame):
+            if valeur.empty and len(valeur.columns) == 0:
+                types[nom] = {"type": "df_vide"}
+            else:
+                tableaux[nom], description = _mettre_a_plat(valeur)
+                types[nom] = {"type": "df", **description}
+
+        elif isinstance(valeur, pd.Series):
+            tableaux[nom], description = _mettre_a_plat(valeur.to_frame("__valeur__"))
+            types[nom] = {"type": "serie", "nom": _python(valeur.name), **description}
+
+        elif isinstance(valeur, tuple):
+            for i, element in enumerate(valeur):
+                scalaires[f"{nom}.{i}"] = _python(element)
+            types[nom] = {"type": "tuple", "taille": len(valeur)}
+
+        elif isinstance(valeur, dict):
+            for cle, element in valeur.items():
+                scalaires[f"{nom}.{cle}"] = _python(element)
+            types[nom] = {"type": "dict", "cles": list(valeur)}
+
+        else:
+            scalaires[nom] = _python(valeur)
+            types[nom] = {"type": "scalaire"}
+
+    return scalaires, tableaux, types
+
+
+def _scalaire(valeur):
+    if valeur is None or (not isinstance(valeur, str) and pd.isna(valeur)):
+        return None
+    return _python(valeur)
+
+
+def _reconstruire(plat: pd.DataFrame | None, description: dict) -> pd.DataFrame:
+    if plat is None:
+        # Tableau vide pour toutes les clés : aucun fichier n'a été écrit
+        plat = pd.DataFrame(columns=list(description["dtypes"]))
+    colonnes_index = [f"__index_{i}__" for i in range(len(description["index"]))]
+    colonnes = [str(c) for c in description["colonnes"]]
+    plat = plat[colonnes_index + colonnes]
+
+    # Types d'origine (les valeurs manquantes introduites par la concaténation des clés ont disparu)
+    for colonne, dtype in description["dtypes"].items():
+        if dtype != "category" and str(plat[colonne].dtype) != dtype:
+            plat = plat.astype({colonne: dtype})
+
+    df = plat.set_index(colonnes_index) if len(colonnes_index) > 1 else plat.set_index(colonnes_index[0])
+    df.index.names = description["index"]
+    df.columns = pd.Index(description["colonnes"], name=description["nom_colonnes"])
+    return df
+
+
+def decoder_tables(ligne: dict, tableaux: dict) -> dict:
+    """
+    Reconstruit le dictionnaire de résultats d'une clé.
+
+    :param ligne: ligne de ``scalaires.parquet`` de la clé (dont ``__types__``)
+    :param tableaux: {nom: lignes à plat de la clé}
+    """
+    tables = {}
+    for nom, description in json.loads(ligne["__types__"]).items():
+        nature = description["type"]
+
+        if nature == "none":
+            tables[nom] = None
+        elif nature == "df_vide":
+            tables[nom] = pd.DataFrame()
+        elif nature == "df":
+            tables[nom] = _reconstruire(tableaux.get(nom), description)
+        elif nature == "serie":
+            serie = _reconstruire(tableaux.get(nom), description)["__valeur__"]
+            tables[nom] = serie.rename(description["nom"])
+        elif nature == "tuple":
+            tables[nom] = tuple(_scalaire(ligne[f"{nom}.{i}"]) for i in range(description["taille"]))
+        elif nature == "dict":
+            tables[nom] = {cle: _scalaire(ligne[f"{nom}.{cle}"]) for cle in description["cles"]}
+        else:
+            tables[nom] = _scalaire(ligne[nom])
+
+    return tables
+
+
+def _periode(periode) -> tuple[int, int] | None:
+    return None if periode is None else (int(periode[0]), int(periode[1]))
+
+
+def _dossier_page(page: str) -> str:
+    ascii_ = unicodedata.normalize("NFKD", page.lower()).encode("ascii", "ignore").decode()
+    return "".join(c if c.isalnum() else "_" for c in ascii_)
+
+
+def _signature_source(source: Path) -> dict | None:
+    if not source.exists():
+        return None
+    etat = source.stat()
+    return {"chemin": str(source), "taille": etat.st_size, "modifie_le": etat.st_mtime_ns}
+
+
+def ecrire_magasin(dossier, resultats, catalogue: Catalogue, source=None, hierarchie: Hierarchie | None = None):
+    """
+    Écrit le magasin de résultats.
+
+    :param dossier: dossier de sortie (créé si besoin, fichiers existants remplacés)
+    :param resultats: itérable de (page, pathologie, periode, scalaires, tableaux, types),
+                      tels que produits par ``encoder_tables``
+    :param catalogue: catalogue des dimensions du jeu (pathologies, années, disponibilité…)
+    :param source: fichier de données brutes utilisé (pour détecter un magasin périmé)
+    :param hierarchie: hiérarchie des pathologies et ses effectifs par année
+    """
+    dossier = Path(dossier)
+    lignes, morceaux = {}, {}
+
+    for page, pathologie, periode, scalaires, tableaux, types in resultats:
+        lignes_page = lignes.setdefault(page, [])
+        cle = len(lignes_page)
+        periode = _periode(periode)
+        lignes_page.append({
+            "_cle": cle,
+            "_pathologie": pathologie,
+            "_debut": None if periode is None else periode[0],
+            "_fin": None if periode is None else periode[1],
+            **scalaires,
+            "__types__": json.dumps(types, ensure_ascii=False),
+        })
+        for nom, plat in tableaux.items():
+            morceaux.setdefault(page, {}).setdefault(nom, []).append(plat.assign(_cle=cle))
+
+    pages = {}
+    for page, lignes_page in lignes.items():
+        sous_dossier = dossier / _dossier_page(page)
+        sous_dossier.mkdir(parents=True, exist_ok=True)
+        for ancien in sous_dossier.glob("*.parquet"):
+            ancien.unlink()
+
+        scalaires = pd.DataFrame(lignes_page).astype({"_debut": "Int64", "_fin": "Int64"})
+        scalaires.to_parquet(sous_dossier / f"{SCALAIRES}.parquet", index=False)
+        for nom, liste in morceaux.get(page, {}).items():
+            pd.concat(liste, ignore_index=True).to_parquet(sous_dossier / f"{nom}.parquet", index=False)
+        pages[page] = sous_dossier.name
+
+    manifeste = {
+        "version": VERSION,
+        "cree_le": datetime.now().isoformat(timespec="seconds"),
+        "source": _signature_source(Path(source)) if source is not None else None,
+        "pathologies": catalogue.pathologies,
+        "annees": catalogue.annees,
+        "catalogue": catalogue.en_dict(),
+        "pages": pages,
+    }
+    if hierarchie is not None:
+        manifeste["hierarchie"] = hierarchie.en_dict()
+    (dossier / MANIFESTE).write_text(json.dumps(manifeste, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+class _PageStockee:
+    """
+    Résultats d'une page chargés en mémoire, indexés par clé (pathologie, période).
+    """
+
+    def __init__(self, dossier: Path):
+        scalaires = pd.read_parquet(dossier / f"{SCALAIRES}.parquet")
+        self._lignes = scalaires.to_dict("records")
+        self._cles = {}
+        for i, ligne in enumerate(self._lignes):
+            debut, fin = ligne["_debut"], ligne["_fin"]
+            periode = None if pd.isna(debut) else (int(debut), int(fin))
+            pathologie = None if pd.isna(ligne["_pathologie"]) else ligne["_pathologie"]
+            self._cles[(pathologie, periode)] = i
+
+        self._tableaux = {}
+        for fichier in dossier.glob("*.parquet"):
+            if fichier.stem == SCALAIRES:
+                continue
+            df = pd.read_parquet(fichier)
+            self._tableaux[fichier.stem] = (df, df.groupby("_cle").indices)
+
+    def __len__(self) -> int:
+        return len(self._lignes)
+
+    def tables(self, pathologie: str | None, periode) -> dict | None:
+        i = self._cles.get((pathologie, _periode(periode)))
+        if i is None:
+            return None
+        ligne = self._lignes[i]
+        cle = ligne["_cle"]
+        # Un tableau vide de la clé n'a aucune ligne dans son fichier
+        tableaux = {nom: df.iloc[indices.get(cle, [])].reset_index(drop=True)
+                    for nom, (df, indices) in self._tableaux.items()}
+        return decoder_tables(ligne, tableaux)
+
+
+class MagasinResultats:
+    """
+    Magasin de résultats précalculés, utilisable par le dashboard à la place du jeu de données.
+
+    Expose ``pathologies``, ``annees``, ``catalogue`` et ``hierarchie`` comme ``JeuDonnees`` ; pour une clé absente du
+    magasin, ``pathologie()``, ``df``, ``cube`` et ``resume`` chargent (une fois) les données brutes.
+    """
+
+    def __init__(self, dossier=None):
+        self.dossier = Path(dossier) if dossier is not None else DOSSIER_PAR_DEFAUT
+        self.manifeste = json.loads((self.dossier / MANIFESTE).read_text(encoding="utf-8"))
+        if self.manifeste.get("version") != VERSION:
+            raise ValueError(f"Version de magasin non prise en charge : {self.manifeste.get('version')}")
+
+        self.pathologies = self.manifeste["pathologies"]
+        self.annees = self.manifeste["annees"]
+        # Un magasin écrit avant le catalogue le reconstruit depuis les données brutes
+        self._catalogue = Catalogue.depuis_dict(self.manifeste["catalogue"]) if "catalogue" in self.manifeste else None
+        self._hierarchie = Hierarchie.depuis_dict(self.manifeste["hierarchie"]) if "hierarchie" in self.manifeste else None
+        self._pages = {page: _PageStockee(self.dossier / nom) for page, nom in self.manifeste["pages"].items()}
+        self._jeu = None
+        self._verrou = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(page) for page in self._pages.values())
+
+    def tables(self, page: str, pathologie: str | None, periode=None) -> dict | None:
+        """
+        Tableaux précalculés d'une page pour (pathologie, période), ou None s'ils sont absents.
+        """
+        stockee = self._pages.get(page)
+        if stockee is None:
+            return None
+        return stockee.tables(pathologie, periode)
+
+    def est_a_jour(self) -> bool:
+        """
+        Faux si le fichier source a changé depuis le précalcul (vrai s'il n'est pas disponible).
+        """
+        source = self.manifeste.get("source")
+        if source is None:
+            return True
+        actuelle = _signature_source(Path(source["chemin"]))
+        return actuelle is None or actuelle == source
+
+    def _jeu_donnees(self):
+        with self._verrou:
+            if self._jeu is None:
+                source = self.manifeste.get("source")
+                self._jeu = charger_jeu_donnees(source["chemin"] if source else None)
+            return self._jeu
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._jeu_donnees().df
+
+    @property
+    def catalogue(self) -> Catalogue:
+        if self._catalogue is None:
+            self._catalogue = self._jeu_donnees().catalogue
+        return self._catalogue
+
+    @property
+    def hierarchie(self) -> Hierarchie:
+        if self._hierarchie is None:
+            self._hierarchie = self._jeu_donnees().hierarchie
+        return self._hierarchie
+
+    @property
+    def cube(self):
+        return self._jeu_donnees().cube
+
+    @property
+    def standard(self) -> pd.Series:
+        return self._jeu_donnees().standard
+
+    @property
+    def resume(self) -> dict:
+        return self._jeu_donnees().resume
+
+    def pathologie(self, nom: str) -> pd.DataFrame:
+        return self._jeu_donnees().pathologie(nom)
+
+
+def magasin_disponible(dossier=None) -> bool:
+    dossier = Path(dossier) if dossier is not None else DOSSIER_PAR_DEFAUT
+    return (dossier / MANIFESTE).exists()